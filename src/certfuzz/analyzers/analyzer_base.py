@@ -5,6 +5,8 @@ Created on Oct 23, 2012
 '''
 import logging
 import os
+import shutil
+import tempfile
 
 from certfuzz.fuzztools import subprocess_helper as subp
 from certfuzz.analyzers.errors import AnalyzerOutputMissingError, AnalyzerEmptyOutputError
@@ -18,6 +20,10 @@ class Analyzer(object):
     '''
     classdocs
     '''
+    # a private working directory to run in instead of tmpdir, see isolate()
+    workdir = None
+    # on timeout, also kill anything else named progname
+    kill_by_name = True
 
     def __init__(self, cfg, testcase, outfile=None, timeout=None, **options):
         logger.debug('Initializing %s', self.__class__.__name__)
@@ -62,6 +68,25 @@ class Analyzer(object):
     def _get_cmdline(self):
         raise NotImplementedError
 
+    def isolate(self):
+        '''
+        Prepares to run alongside other analyzers on the same testcase. The
+        analyzer gets a working directory of its own, so anything the target
+        drops in its cwd (core files, logs) doesn't collide, and a timeout
+        only kills its own process group instead of every process named
+        progname.
+        '''
+        self.workdir = tempfile.mkdtemp(prefix='%s-' % self.__class__.__name__)
+        self.kill_by_name = False
+
+    def clean_workdir(self):
+        '''
+        Removes the working directory made by isolate()
+        '''
+        if self.workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            self.workdir = None
+
     def _analyzer_exists(self, f):
         f = f.replace('"', '')
         if os.path.exists(f):
@@ -93,8 +118,10 @@ class Analyzer(object):
                 'Skipping analyzer %s: Not found in path.', analyzer)
             return
 
+        progname = self.progname if self.kill_by_name else None
         subp.run_with_timer(
-            args, self.timeout, self.progname, cwd=self.tmpdir, **self.options)
+            args, self.timeout, progname, cwd=self.workdir or self.tmpdir,
+            **self.options)
         if not self.missing_output_ok and not os.path.exists(self.outfile):
             raise AnalyzerOutputMissingError(self.outfile)
         if not self.empty_output_ok and not os.path.getsize(self.outfile):
@@ -6,6 +6,7 @@ Created on Jan 29, 2016
 import logging
 from certfuzz.analyzers.analyzer_base import Analyzer
 from certfuzz.analyzers.drillresults.testcasebundle_base import TestCaseBundle
+from certfuzz.drillresults.common import eif_text
 from certfuzz.drillresults.errors import TestCaseBundleError
 from certfuzz.analyzers.drillresults.testcasebundle_linux import LinuxTestCaseBundle
 from certfuzz.analyzers.drillresults.testcasebundle_darwin import DarwinTestCaseBundle
@@ -36,6 +37,10 @@ class DrillResults(Analyzer):
         # TODO: This should be dynamic, no?
         self.ignore_jit = False
 
+    def isolate(self):
+        # nothing to run, it just reads the debugger output
+        pass
+
     def _process_tcb(self, tcb):
         details = tcb.details
         score = tcb.score
@@ -49,10 +54,8 @@ class DrillResults(Analyzer):
 
         for exception in details['exceptions']:
             shortdesc = details['exceptions'][exception]['shortdesc']
-            eiftext = ''
             efa = '0x' + details['exceptions'][exception]['efa']
-            if details['exceptions'][exception]['EIF']:
-                eiftext = " *** Byte pattern is in fuzzed file! ***"
+            eiftext = eif_text(details['exceptions'][exception])
             output_lines.append(
                 'exception %s: %s accessing %s  %s' % (exception, shortdesc, efa, eiftext))
             if details['exceptions'][exception]['instructionline']:
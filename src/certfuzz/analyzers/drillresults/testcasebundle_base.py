@@ -8,7 +8,10 @@ import logging
 import os
 
 from certfuzz.fuzztools.filetools import read_text_file
+from certfuzz.fuzztools.module_map import ModuleMap
 
+from certfuzz.drillresults.common import find_patterns
+from certfuzz.drillresults.common import find_patterns_in_file
 from certfuzz.drillresults.common import read_bin_file
 from certfuzz.drillresults.errors import TestCaseBundleError
 import binascii
@@ -43,8 +46,9 @@ class TestCaseBundle(object):
         self.reporttext = read_text_file(self.dbg_outfile)
         self._find_testcase_file()
         self._verify_files_exist()
-        # Read in the fuzzed file
-        self.crasherdata = read_bin_file(self.testcase_file)
+        # the fuzzed file only gets read in if something asks for
+        # crasherdata; find_in_testcase() searches it where it lies
+        self._crasherdata = None
         self.current_dir = os.path.dirname(self.dbg_outfile)
 
         self.details = {'reallyexploitable': False,
@@ -56,6 +60,7 @@ class TestCaseBundle(object):
         self.classification = None
         self.shortdesc = None
         self.reg_set = reg_set
+        self._module_map = None
 
     def go(self):
         # See if we're dealing with 64-bit debugger or target app
@@ -90,6 +95,27 @@ class TestCaseBundle(object):
             else:
                 logger.debug('Found file: %s', f)
 
+    @property
+    def crasherdata(self):
+        if self._crasherdata is None:
+            self._crasherdata = read_bin_file(self.testcase_file)
+        return self._crasherdata
+
+    @crasherdata.setter
+    def crasherdata(self, value):
+        self._crasherdata = value
+
+    def find_in_testcase(self, patterns):
+        '''
+        Returns a dict mapping each of patterns to a list of the offsets
+        where it occurs in the fuzzed file (or in its decompressed contents,
+        past the end of the file, if it's a zip)
+        :param patterns: a list of byte strings
+        '''
+        if self._crasherdata is not None:
+            return find_patterns(self._crasherdata, patterns)
+        return find_patterns_in_file(self.testcase_file, patterns)
+
     def __enter__(self):
         return self
 
@@ -201,12 +227,19 @@ class TestCaseBundle(object):
             efapattern = efapattern.zfill(8)
 
         # If there's a match, flag this exception has having Efa In File
-        if binascii.a2b_hex(efapattern) in self.crasherdata:
-            self.details['exceptions'][exceptionnum]['EIF'] = True
-        else:
-            self.details['exceptions'][exceptionnum]['EIF'] = False
+        efabytes = binascii.a2b_hex(efapattern)
+        offsets = self.find_in_testcase([efabytes])[efabytes]
+        self.details['exceptions'][exceptionnum]['EIF'] = bool(offsets)
+        self.details['exceptions'][exceptionnum]['efa_offsets'] = offsets
+
+    def _parse_loaded_module(self, line):
+        '''
+        If the line contains loaded module info, return a (start, end, name)
+        tuple for the module, otherwise return None
+        :param line:
+        '''
+        return None
 
-    @abc.abstractmethod
     def _look_for_loaded_module(self, instraddr, line):
         '''
         If the line contains loaded module info, see if instraddr is in the module.
@@ -214,6 +247,30 @@ class TestCaseBundle(object):
         :param instraddr:
         :param line:
         '''
+        module = self._parse_loaded_module(line)
+        if module is not None:
+            (begin_address, end_address, module_name) = module
+            if begin_address < self._addr_to_int(instraddr) < end_address:
+                return module_name
+
+    @property
+    def module_map(self):
+        '''
+        The loaded modules listed in the debugger output, parsed once on
+        first use
+        '''
+        if self._module_map is None:
+            self._module_map = ModuleMap()
+            for line in self.reporttext.splitlines():
+                module = self._parse_loaded_module(line)
+                if module is not None:
+                    self._module_map.add(*module)
+            logger.debug('found %d loaded modules', len(self._module_map))
+        return self._module_map
+
+    def _addr_to_int(self, addr):
+        # Strip out backticks present on 64-bit systems
+        return int(addr.replace('`', ''), 16)
 
     def format_addr(self, faultaddr):
         '''
@@ -256,12 +313,19 @@ class TestCaseBundle(object):
             return ''
 
         logger.debug('checking if %s is mapped', instraddr)
-        for line in self.reporttext.splitlines():
-            module_name = self._look_for_loaded_module(instraddr, line)
+        if len(self.module_map):
+            module_name = self.module_map.find(self._addr_to_int(instraddr))
             if module_name is not None:
-                # short circuit as soon as we find a mapped module
                 logger.debug('module found: %s', module_name)
                 return module_name
+        else:
+            # no module list we could parse up front, so check line by line
+            for line in self.reporttext.splitlines():
+                module_name = self._look_for_loaded_module(instraddr, line)
+                if module_name is not None:
+                    # short circuit as soon as we find a mapped module
+                    logger.debug('module found: %s', module_name)
+                    return module_name
         # if you got here, instraddr is not in a loaded module
         logger.debug('addr %s is not in loaded module', instraddr)
         return 'unloaded'
@@ -47,23 +47,10 @@ class DarwinTestCaseBundle(TestCaseBundle):
     def _64bit_target_app(self):
         return TestCaseBundle._64bit_target_app
 
-    def _look_for_loaded_module(self, instraddr, line):
-        # convert to an int as hex
-        instraddr = int(instraddr, 16)
-
-        for pattern in [RE_MAPPED_FRAME]:
-            n = re.search(pattern, line)
-            if n:
-                begin_address = int(n.group(1), 16)
-                end_address = int(n.group(2), 16)
-                module_name = n.group(3)
-                logger.debug(
-                    '%x %x %s %x', begin_address, end_address, module_name, instraddr)
-                if begin_address < instraddr < end_address:
-                    logger.debug('Matched: %x in %x %x %s', instraddr,
-                                 begin_address, end_address, module_name)
-                    # as soon as we find this, we're done
-                    return module_name
+    def _parse_loaded_module(self, line):
+        n = RE_MAPPED_FRAME.search(line)
+        if n:
+            return (int(n.group(1), 16), int(n.group(2), 16), n.group(3))
 
     def get_instr(self, instraddr):
         currentinstr = carve(self.reporttext, "instruction_disassembly=", ":")
@@ -63,24 +63,14 @@ class LinuxTestCaseBundle(TestCaseBundle):
     def _64bit_target_app(self):
         return TestCaseBundle._64bit_target_app
 
-    def _look_for_loaded_module(self, instraddr, line):
-        # convert to an int as hex
-        instraddr = int(instraddr, 16)
-
+    def _parse_loaded_module(self, line):
         for pattern in [RE_MAPPED_FRAME, RE_VDSO]:
-            n = re.search(pattern, line)
+            n = pattern.search(line)
             if n:
                 # Strip out backticks present on 64-bit systems
                 begin_address = int(n.group(1).replace('`', ''), 16)
                 end_address = int(n.group(2).replace('`', ''), 16)
-                module_name = n.group(4)
-                logger.debug(
-                    '%x %x %s %x', begin_address, end_address, module_name, instraddr)
-                if begin_address < instraddr < end_address:
-                    logger.debug('Matched: %x in %x %x %s', instraddr,
-                                 begin_address, end_address, module_name)
-                    # as soon as we find this, we're done
-                    return module_name
+                return (begin_address, end_address, n.group(4))
 
     def get_instr(self, instraddr):
         rvfunc = lambda x, l: x.group(3)
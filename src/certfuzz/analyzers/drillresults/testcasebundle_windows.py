@@ -101,10 +101,10 @@ class WindowsTestCaseBundle(TestCaseBundle):
     def _64bit_target_app(self):
         return self._64bit_debugger and not self.wow64_app
 
-    def _look_for_loaded_module(self, instraddr, line):
+    def _parse_loaded_module(self, line):
         '''
-        Returns a string containing the module location if found, None otherwise
-        :param instraddr:
+        Returns a (start, end, module location) tuple if line lists a loaded
+        module, None otherwise
         :param line:
         '''
         patterns = [RE_MAPPED_ADDRESS]
@@ -113,24 +113,13 @@ class WindowsTestCaseBundle(TestCaseBundle):
             # 32-bit style loaded module regexes
             patterns.append(RE_MAPPED_ADDRESS64)
 
-        # convert to an int as hex
-        instraddr = instraddr.replace('`', '')
-        instraddr = int(instraddr, 16)
-
         for pattern in patterns:
-            n = re.match(pattern, line)
+            n = pattern.match(line)
             if n:
                 # Strip out backticks present on 64-bit systems
                 begin_address = int(n.group(1).replace('`', ''), 16)
                 end_address = int(n.group(2).replace('`', ''), 16)
-                module_name = n.group(3)
-                logger.debug(
-                    '%x %x %s %x', begin_address, end_address, module_name, instraddr)
-                if begin_address < instraddr < end_address:
-                    logger.debug('Matched: %x in %x %x %s', instraddr,
-                                 begin_address, end_address, module_name)
-                    # as soon as we find this, we're done
-                    return module_name
+                return (begin_address, end_address, n.group(3))
 
     def fix_efa_offset(self, instructionline, faultaddr):
         '''
@@ -0,0 +1,463 @@
+'''
+Created on Oct 18, 2026
+
+Runs crash analysis (the testcase pipeline: verify, minimize, analyze,
+report) in a pool of worker processes, so that the campaign can keep
+fuzzing while crashes are being looked at.
+
+Each crash becomes a job: the iteration's files get moved into a directory
+of their own under the queue dir, along with a job.json that says where
+they came from. Jobs stay on disk until they're done, so whatever is still
+queued when the campaign stops gets picked up again the next time it
+starts.
+
+The workers share the campaign's SignatureIndex through a manager process.
+Scores and recycled seed files are handled back in the campaign's process,
+as soon as each crash has been verified.
+
+@organization: cert.org
+'''
+import Queue
+import copy
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+from multiprocessing.managers import BaseManager
+
+from certfuzz.campaign.signature_index import SignatureIndex
+from certfuzz.file_handlers.watchdog_file import touch_watchdog_file
+from certfuzz.fuzztools.crash_fingerprint import CrashFingerprint
+from certfuzz.fuzztools.filetools import rm_rf
+
+logger = logging.getLogger(__name__)
+
+JOB_PREFIX = 'job_'
+TMP_PREFIX = 'tmp_'
+JOB_FILE = 'job.json'
+
+# how long to wait for news from the workers at a time
+POLL_INTERVAL = 1.0
+
+# per-process state for workers, set up by _init_worker
+_worker = {}
+
+
+class SignatureIndexManager(BaseManager):
+    pass
+
+
+SignatureIndexManager.register('SignatureIndex', SignatureIndex,
+                               exposed=('__len__', '__contains__', 'load',
+                                        'get', 'record', 'set_exploitability',
+                                        'import_crashers', 'signature_for',
+                                        'learn_fingerprint', 'flush',
+                                        'close'))
+
+
+class AnalysisJob(object):
+    '''
+    A crash waiting to be analyzed. Everything needed to pick it up again
+    lives in its directory.
+    '''
+
+    def __init__(self, path, sf_md5, seednum, range_key=None,
+                 fuzzed_file=None, fingerprint=None, run_seconds=0.0,
+                 verified=None):
+        '''
+        @param path: the job's directory
+        @param range_key: the (min, max) of the range that was fuzzed
+        @param fuzzed_file: the fuzzed file's basename
+        @param verified: None until the pipeline has verified the crash,
+        then whether it was worth analyzing
+        '''
+        self.path = path
+        self.sf_md5 = sf_md5
+        self.seednum = seednum
+        self.range_key = range_key
+        self.fuzzed_file = fuzzed_file
+        self.fingerprint = fingerprint
+        self.run_seconds = run_seconds
+        self.verified = verified
+
+    @property
+    def id(self):
+        return os.path.basename(self.path)
+
+    def as_dict(self):
+        fingerprint = None
+        if self.fingerprint is not None:
+            fingerprint = list(self.fingerprint)
+        range_key = None
+        if self.range_key is not None:
+            range_key = list(self.range_key)
+        return {'sf_md5': self.sf_md5,
+                'seednum': self.seednum,
+                'range_key': range_key,
+                'fuzzed_file': self.fuzzed_file,
+                'fingerprint': fingerprint,
+                'run_seconds': self.run_seconds,
+                'verified': self.verified,
+                }
+
+    def save(self):
+        # write then rename, so a job file is never half written
+        jobfile = os.path.join(self.path, JOB_FILE)
+        tmpfile = jobfile + '.tmp'
+        with open(tmpfile, 'wb') as fp:
+            json.dump(self.as_dict(), fp)
+        os.rename(tmpfile, jobfile)
+
+    @classmethod
+    def load(cls, path):
+        with open(os.path.join(path, JOB_FILE), 'rb') as fp:
+            d = json.load(fp)
+        fingerprint = d['fingerprint']
+        if fingerprint is not None:
+            fingerprint = CrashFingerprint(*fingerprint)
+        range_key = d['range_key']
+        if range_key is not None:
+            range_key = tuple(range_key)
+        return cls(path, str(d['sf_md5']), d['seednum'], range_key,
+                   d['fuzzed_file'], fingerprint, d['run_seconds'],
+                   d['verified'])
+
+
+class AnalysisResult(object):
+    '''
+    What a worker hands back once it's done with a job
+    '''
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.success = False
+        self.recycled = []
+        self.error = None
+
+    def __repr__(self):
+        return '%s' % self.__dict__
+
+
+def _ignore_sigint():
+    # leave ctrl-c handling to the campaign
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _init_worker(iteration_cls, outdir, config, fuzzer_cls, runner_cls,
+                 sig_index, events, queue_dir):
+    # keep the worker (and the debuggers and analyzers it runs) out of the
+    # campaign's process group
+    try:
+        os.setsid()
+    except OSError:
+        pass
+    _ignore_sigint()
+
+    # The campaign empties the system tmp dir between intervals, and the
+    # pipeline empties tmp when it's done with a testcase, so each worker
+    # gets a tmp dir of its own where neither can get in anyone's way
+    tmpdir = tempfile.mkdtemp(prefix=TMP_PREFIX, dir=queue_dir)
+    tempfile.tempdir = tmpdir
+    os.environ['TMPDIR'] = tmpdir
+
+    _worker['iteration_cls'] = iteration_cls
+    _worker['outdir'] = outdir
+    _worker['config'] = config
+    _worker['fuzzer_cls'] = fuzzer_cls
+    _worker['runner_cls'] = runner_cls
+    _worker['sig_index'] = sig_index
+    _worker['events'] = events
+
+
+def _testcase_is_unique(testcase_id, exploitability='UNKNOWN', seednum=None):
+    # same as CampaignBase._testcase_is_unique, against the shared index
+    if _worker['sig_index'].record(testcase_id, exploitability, seednum):
+        logger.debug(
+            '%s did not exist in cache, testcase is unique', testcase_id)
+        return True
+    logger.debug('%s was found, not unique', testcase_id)
+    return False
+
+
+def _verified(job_id, testcase):
+    _worker['events'].put((job_id,
+                           bool(testcase.should_proceed_with_analysis)))
+
+
+def analyze(task):
+    '''
+    Runs the testcase pipeline on a job inside a worker process.
+    :param task: a (job, seedfile, force) tuple. With force set, the crash
+    gets analyzed even if its signature has been seen before (e.g., it was
+    verified as new before the campaign got interrupted).
+    '''
+    (job, seedfile, force) = task
+    result = AnalysisResult(job.id)
+
+    config = _worker['config']
+    if force:
+        config = copy.deepcopy(config)
+        config['runoptions']['keep_duplicates'] = True
+
+    try:
+        iteration = _worker['iteration_cls'](seedfile=seedfile,
+                                             seednum=job.seednum,
+                                             workdirbase=job.path,
+                                             outdir=_worker['outdir'],
+                                             uniq_func=_testcase_is_unique,
+                                             sig_index=_worker['sig_index'],
+                                             config=config,
+                                             fuzzer_cls=_worker['fuzzer_cls'],
+                                             runner_cls=_worker['runner_cls'],
+                                             )
+        iteration.working_dir = job.path
+        iteration.fuzzed_file = os.path.join(job.path, job.fuzzed_file)
+        iteration.saw_crash = True
+        iteration.fingerprint = job.fingerprint
+        iteration.cmd_template = config['target']['cmdline_template']
+        iteration.verified_func = functools.partial(_verified, job.id)
+
+        iteration.construct_testcase()
+        iteration.process_testcases()
+        result.success = iteration.success
+        result.recycled = iteration.recycled
+    except Exception as e:
+        # let the campaign log it
+        result.error = e
+    return result
+
+
+class AnalysisPool(object):
+    '''
+    Analyzes crashes across a multiprocessing.Pool.
+
+    with AnalysisPool(workers, queue_dir, ...) as pool:
+        ...
+        pool.submit(...)
+        pool.poll()
+    '''
+
+    def __init__(self, workers, queue_dir, sf_set, sig_index_file,
+                 crashers_dir, iteration_cls, outdir, config, fuzzer_cls,
+                 runner_cls, limit=None):
+        '''
+        @param sf_set: the campaign's SeedfileSet, for scoring and recycling
+        @param sig_index_file: the campaign's crash signature index
+        @param limit: how many jobs can be waiting or in progress before
+        submit() waits for one to finish (defaults to 4 per worker)
+        '''
+        self.workers = workers
+        self.queue_dir = queue_dir
+        self.sf_set = sf_set
+        self.sig_index_file = sig_index_file
+        self.crashers_dir = crashers_dir
+        self.limit = limit or 4 * workers
+        self._poolargs = (iteration_cls, outdir, config, fuzzer_cls,
+                          runner_cls)
+
+        self.sig_index = None
+        self._manager = None
+        self._pool = None
+        self._events = None
+        # job id -> AnalysisJob, for jobs that aren't done yet
+        self._jobs = {}
+        # job id -> AsyncResult
+        self._pending = {}
+
+    def __enter__(self):
+        if not os.path.isdir(self.queue_dir):
+            os.makedirs(self.queue_dir)
+
+        self._manager = SignatureIndexManager()
+        self._manager.start(_ignore_sigint)
+        self.sig_index = self._manager.SignatureIndex(self.sig_index_file)
+        if not self.sig_index.load():
+            self.sig_index.import_crashers(self.crashers_dir)
+
+        self._events = multiprocessing.Queue()
+        initargs = self._poolargs + (self.sig_index, self._events,
+                                     self.queue_dir)
+        logger.info('Starting %d analysis workers', self.workers)
+        self._pool = multiprocessing.Pool(processes=self.workers,
+                                          initializer=_init_worker,
+                                          initargs=initargs)
+        self._recover()
+        return self
+
+    def __exit__(self, etype, value, traceback):
+        if etype:
+            # whatever isn't done stays queued for next time
+            self._pool.terminate()
+        else:
+            self.drain()
+            self._pool.close()
+        self._pool.join()
+        logger.debug('Analysis workers stopped')
+
+        self.sig_index.close()
+        self._manager.shutdown()
+        self._remove_tmp_dirs()
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def _remove_tmp_dirs(self):
+        for name in os.listdir(self.queue_dir):
+            if name.startswith(TMP_PREFIX):
+                rm_rf(os.path.join(self.queue_dir, name))
+
+    def _recover(self):
+        '''
+        Resubmits the jobs left over from the last time the campaign ran
+        '''
+        self._remove_tmp_dirs()
+        for name in sorted(os.listdir(self.queue_dir)):
+            if not name.startswith(JOB_PREFIX):
+                continue
+            path = os.path.join(self.queue_dir, name)
+            try:
+                job = AnalysisJob.load(path)
+            except (IOError, ValueError, KeyError, TypeError) as e:
+                logger.warning('Discarding unreadable analysis job %s: %s',
+                               path, e)
+                rm_rf(path)
+                continue
+
+            seedfile = self.sf_set.things.get(job.sf_md5)
+            if seedfile is None or job.verified is False:
+                # nothing left to do for it
+                rm_rf(path)
+                continue
+            logger.info('Resuming analysis of seed %d', job.seednum)
+            self._start(job, seedfile, force=bool(job.verified))
+
+    def _start(self, job, seedfile, force=False):
+        self._jobs[job.id] = job
+        self._pending[job.id] = self._pool.apply_async(analyze,
+                                                       ((job, seedfile,
+                                                         force),))
+
+    def submit(self, seedfile, seednum, range_obj, working_dir, fuzzed_file,
+               fingerprint=None, run_seconds=0.0):
+        '''
+        Moves the contents of working_dir into a new job and starts
+        analyzing it. Waits for a job to finish first if there are already
+        self.limit of them.
+        '''
+        while len(self._jobs) >= self.limit:
+            self.wait()
+
+        path = tempfile.mkdtemp(prefix=JOB_PREFIX, dir=self.queue_dir)
+        for name in os.listdir(working_dir):
+            shutil.move(os.path.join(working_dir, name), path)
+
+        range_key = None
+        if range_obj is not None:
+            range_key = (range_obj.min, range_obj.max)
+        job = AnalysisJob(path, seedfile.md5, seednum, range_key,
+                          os.path.basename(fuzzed_file), fingerprint,
+                          run_seconds)
+        job.save()
+        logger.debug('Queued analysis of seed %d as %s', seednum, job.id)
+        self._start(job, seedfile)
+        return job
+
+    def poll(self):
+        '''
+        Handles whatever the workers have finished, without waiting
+        '''
+        while True:
+            try:
+                (job_id, success) = self._events.get_nowait()
+            except Queue.Empty:
+                break
+            self._verified(job_id, success)
+
+        for job_id in [j for (j, r) in self._pending.items() if r.ready()]:
+            self._finish(job_id)
+
+    def wait(self, timeout=POLL_INTERVAL):
+        '''
+        Waits up to timeout seconds for news from the workers, then handles
+        it
+        '''
+        # we might be here for a while
+        touch_watchdog_file()
+        try:
+            (job_id, success) = self._events.get(timeout=timeout)
+        except Queue.Empty:
+            pass
+        else:
+            self._verified(job_id, success)
+        self.poll()
+
+    def drain(self):
+        '''
+        Waits for every job to finish
+        '''
+        if self._jobs:
+            logger.info('Waiting for %d crash analyses to finish',
+                        len(self._jobs))
+        while self._jobs:
+            self.wait()
+
+    def _verified(self, job_id, success):
+        job = self._jobs.get(job_id)
+        if job is None or job.verified is not None:
+            # already scored
+            return
+        job.verified = success
+        job.save()
+        self._score(job, success)
+
+    def _finish(self, job_id):
+        job = self._jobs.pop(job_id)
+        async_result = self._pending.pop(job_id)
+        try:
+            result = async_result.get()
+        except Exception as e:
+            result = AnalysisResult(job_id)
+            result.error = e
+
+        if result.error is not None:
+            logger.warning('Analysis of seed %d failed: %s', job.seednum,
+                           result.error)
+        if job.verified is None:
+            job.verified = result.success
+            self._score(job, result.success)
+        for path in result.recycled:
+            self.sf_set.add_file(path)
+        rm_rf(job.path)
+
+    def _score(self, job, success):
+        '''
+        Scores the job's seedfile and range, the same way
+        IterationBase.record_success() and record_tries() would have
+        '''
+        seedfile = self.sf_set.things.get(job.sf_md5)
+        if seedfile is None:
+            # it's been removed since
+            return
+
+        rangefinder = seedfile.rangefinder
+        range_id = None
+        if job.range_key is not None:
+            for (key, r) in rangefinder.things.iteritems():
+                if (r.min, r.max) == job.range_key:
+                    range_id = key
+                    break
+
+        if success:
+            self.sf_set.record_success(key=job.sf_md5)
+            if range_id is not None:
+                rangefinder.record_success(key=range_id)
+        else:
+            self.sf_set.record_tries(key=job.sf_md5, tries=1,
+                                     seconds=job.run_seconds)
+            if range_id is not None:
+                rangefinder.record_tries(key=range_id, tries=1,
+                                         seconds=job.run_seconds)
@@ -14,7 +14,9 @@ import traceback
 import signal
 
 from certfuzz.campaign.errors import CampaignError
+from certfuzz.file_handlers.metadata_cache import MetadataCache
 from certfuzz.file_handlers.seedfile_set import SeedfileSet
+from certfuzz.campaign.signature_index import SignatureIndex
 from certfuzz.file_handlers.errors import SeedfileSetError
 from certfuzz.fuzztools import filetools
 from certfuzz.runners.errors import RunnerArchitectureError, \
@@ -61,10 +63,13 @@ class CampaignBase(object):
         self.config_file = config_file
         self.config = None
         self.cached_state_file = None
+        self.seedfile_metadata_file = None
+        self.signature_index_file = None
         self.debug = debug
         self._version = __version__
 
-        self.testcases_seen = set()
+        # replaced by a persistent one in __enter__
+        self.testcases_seen = SignatureIndex()
 
         self.runner_module_name = None
         self.runner_module = None
@@ -126,6 +131,10 @@ class CampaignBase(object):
             cachefile = 'campaign_%s.json' % _campaign_id_with_underscores
             self.cached_state_file = os.path.join(
                 self.work_dir_base, cachefile)
+        self.seedfile_metadata_file = os.path.join(self.work_dir_base,
+                                                   'seedfile_metadata.sqlite')
+        self.signature_index_file = os.path.join(self.outdir,
+                                                 'crash_signatures.sqlite')
         if not self.seed_interval:
             self.seed_interval = 1
         if not self.current_seed:
@@ -174,6 +183,7 @@ class CampaignBase(object):
         self._set_runner()
         self._check_runner()
         self._setup_output()
+        self._load_signature_index()
         self._create_seedfile_set()
         self._read_state()
 
@@ -236,6 +246,7 @@ class CampaignBase(object):
         before exiting.
         '''
         self._pre_exit()
+        self.testcases_seen.close()
 
         # handle common errors
         handled = self._handle_common_errors(etype, value, mytraceback)
@@ -319,15 +330,33 @@ class CampaignBase(object):
         else:
             logger.debug('Removed campaign working dir: %s', self.working_dir)
 
+    def _load_signature_index(self):
+        '''
+        Picks up the crash signatures found by earlier runs of this campaign
+        '''
+        index = SignatureIndex(self.signature_index_file)
+        if not index.load():
+            # results from before we kept an index
+            index.import_crashers(os.path.join(self.outdir, 'crashers'))
+        self.testcases_seen = index
+
     def _create_seedfile_set(self):
         if self.seedfile_set is not None:
             return
 
         logger.info('Building seedfile set')
+        metadata_cache = None
+        if self.config['runoptions'].get('seedfile_metadata_cache'):
+            metadata_cache = MetadataCache(self.seedfile_metadata_file)
+        runoptions = self.config['runoptions']
         with SeedfileSet(campaign_id=self.campaign_id,
                          originpath=self.seed_dir_in,
                          localpath=self.seed_dir_local,
-                         outputpath=self.sf_set_out) as sfset:
+                         outputpath=self.sf_set_out,
+                         metadata_cache=metadata_cache,
+                         strategy=runoptions.get('seedfile_strategy'),
+                         range_strategy=runoptions.get('range_strategy'),
+                         cost_aware=runoptions.get('cost_aware_scheduling', False)) as sfset:
             self.seedfile_set = sfset
 
     def _read_cached_data(self, cachefile):
@@ -353,9 +382,12 @@ class CampaignBase(object):
 
             cached_successes = sf_score['successes']
             cached_trials = sf_score['trials']
+            # older caches don't have seconds
+            cached_seconds = sf_score.get('seconds', 0.0)
 
             arm_to_update.update(
-                successes=cached_successes, trials=cached_trials)
+                successes=cached_successes, trials=cached_trials,
+                seconds=cached_seconds)
 
     def _restore_rangefinder_scores(self, rf_scores):
         for sf_md5, rangelist in rf_scores.iteritems():
@@ -394,9 +426,11 @@ class CampaignBase(object):
                 arm_to_update = rangefinder.arms[rk]
                 cached_successes = r['range_score']['successes']
                 cached_trials = r['range_score']['trials']
+                cached_seconds = r['range_score'].get('seconds', 0.0)
 
                 arm_to_update.update(
-                    successes=cached_successes, trials=cached_trials)
+                    successes=cached_successes, trials=cached_trials,
+                    seconds=cached_seconds)
 
     def _restore_campaign_from_cache(self, cached_data):
         self.current_seed = cached_data['current_seed']
@@ -441,7 +475,7 @@ class CampaignBase(object):
                 arm = sf.rangefinder.arms[rk]
                 rkey = {'range_min': rf.min, 'range_max': rf.max}
                 rdata = {'range_key': rkey,
-                         'range_score': dict(arm.__dict__)}
+                         'range_score': arm.as_dict()}
                 d[k].append(rdata)
 
         state['rangefinder_scores'] = d
@@ -458,16 +492,18 @@ class CampaignBase(object):
         state_as_json = self._get_state_as_json()
         write_file(state_as_json, cachefile)
 
-    def _testcase_is_unique(self, testcase_id, exploitability='UNKNOWN'):
+    def _testcase_is_unique(self, testcase_id, exploitability='UNKNOWN',
+                            seednum=None):
         '''
         If testcase_id represents a new testcase, add the testcase_id to testcases_seen
-        and return True. Otherwise return False.
+        and return True. Otherwise return False. Either way, the hit gets
+        counted in testcases_seen.
 
         @param testcase_id: the testcase_id to look up
-        @param exploitability: not used at this time
+        @param exploitability: the exploitability, if known
+        @param seednum: the seednum the testcase was found at
         '''
-        if testcase_id not in self.testcases_seen:
-            self.testcases_seen.add(testcase_id)
+        if self.testcases_seen.record(testcase_id, exploitability, seednum):
             logger.debug(
                 "%s did not exist in cache, testcase is unique", testcase_id)
             return True
@@ -515,6 +551,9 @@ class CampaignBase(object):
         # manually collect garbage
         gc.collect()
 
+        # write out the hit counts from this interval
+        self.testcases_seen.flush()
+
         self.current_seed = interval_limit
         self.first_chunk = False
 
@@ -4,17 +4,22 @@ Created on Feb 12, 2014
 @author: adh
 '''
 
+import itertools
 import logging
 import os
 import subprocess
 import sys
 import time
 
+from certfuzz.campaign.analysis_pool import AnalysisPool
 from certfuzz.campaign.campaign_base import CampaignBase
 from certfuzz.campaign.errors import CampaignScriptError, CmdlineTemplateError
+from certfuzz.campaign.worker_pool import WorkerPool
 from certfuzz.debuggers import crashwrangler  # @UnusedImport
 from certfuzz.debuggers import gdb  # @UnusedImport
+from certfuzz.file_handlers.tmp_reaper import TmpReaper
 from certfuzz.file_handlers.watchdog_file import TWDF, touch_watchdog_file
+from certfuzz.fuzztools import filetools
 from certfuzz.fuzztools import subprocess_helper as subp
 from certfuzz.fuzztools import hostinfo
 from certfuzz.fuzztools.ppid_observer import check_ppid
@@ -63,13 +68,31 @@ class LinuxCampaign(CampaignBase):
 
     def __init__(self, config_file, result_dir=None, debug=False):
         CampaignBase.__init__(self, config_file, result_dir, debug)
-        self.runner_module_name = 'certfuzz.runners.zzufrun'
+        if self.config['runner'].get('forkserver', False):
+            self.runner_module_name = 'certfuzz.runners.forkserver'
+        else:
+            self.runner_module_name = 'certfuzz.runners.zzufrun'
         self.debugger_module_name = 'certfuzz.debuggers.gdb'
         # Assume gdb compatible with CERT Triage Tools
         self.config['debugger']['ctt_compat'] = True
         # Assume we're on Linux, which has /proc
         self.config['debugger']['proc_compat'] = True
 
+        self.workers = self.config['runoptions'].get('workers', 1) or 1
+        if self.workers > 1 and 'copyfuzzedto' in self.config['target']:
+            # every worker would be writing to the same fixed location
+            logger.warning(
+                'copyfuzzedto cannot be used with multiple workers. Using one worker.')
+            self.workers = 1
+        self.worker_pool = None
+
+        self.analysis_workers = self.config['runoptions'].get(
+            'analysis_workers', 0) or 0
+        self.analysis_queue_limit = self.config['runoptions'].get(
+            'analysis_queue_limit')
+        self.analysis_queue_dir = os.path.join(self.outdir, 'analysis_queue')
+        self.analysis_pool = None
+
     def _full_path_original(self, seedfile):
         # yes, two seedfile mentions are intended - adh
         program_basename = os.path.basename(self.program).replace('"', '')
@@ -194,20 +217,30 @@ class LinuxCampaign(CampaignBase):
         '''
         pass
 
+    def _iteration(self, seedfile, seednum):
+        return LinuxIteration(seedfile=seedfile,
+                              seednum=seednum,
+                              workdirbase=self.working_dir,
+                              outdir=self.outdir,
+                              sf_set=self.seedfile_set,
+                              uniq_func=self._testcase_is_unique,
+                              sig_index=self.testcases_seen,
+                              config=self.config,
+                              fuzzer_cls=self.fuzzer_cls,
+                              runner_cls=self.runner_cls,
+                              analysis_queue=self.analysis_pool,
+                              )
+
+    def _poll_analysis_pool(self):
+        if self.analysis_pool is not None:
+            # pick up scores from crashes verified in the meantime
+            self.analysis_pool.poll()
+
     def _do_iteration(self, seedfile, range_obj, seednum):
         # Prevent watchdog from rebooting VM.
         # If /tmp/fuzzing exists and is stale, the machine will reboot
         touch_watchdog_file()
-        with LinuxIteration(seedfile=seedfile,
-                            seednum=seednum,
-                            workdirbase=self.working_dir,
-                            outdir=self.outdir,
-                            sf_set=self.seedfile_set,
-                            uniq_func=self._testcase_is_unique,
-                            config=self.config,
-                            fuzzer_cls=self.fuzzer_cls,
-                            runner_cls=self.runner_cls,
-                            ) as iteration:
+        with self._iteration(seedfile, seednum) as iteration:
             try:
                 iteration()
             except FuzzerExhaustedError:
@@ -216,3 +249,95 @@ class LinuxCampaign(CampaignBase):
                 logger.info(
                     'Done with %s, removing from set', seedfile.basename)
                 self.seedfile_set.remove_file(seedfile)
+        self._poll_analysis_pool()
+
+    def _resume_iteration(self, seedfile, result):
+        touch_watchdog_file()
+        iteration = self._iteration(seedfile, result.seednum)
+        # the worker already created (and filled) the working dir
+        iteration.working_dir = result.working_dir
+        with iteration:
+            try:
+                iteration.resume(result)
+            except FuzzerExhaustedError:
+                logger.info(
+                    'Done with %s, removing from set', seedfile.basename)
+                self.seedfile_set.remove_file(seedfile)
+        self._poll_analysis_pool()
+
+    def _do_interval(self):
+        if self.worker_pool is None:
+            return CampaignBase._do_interval(self)
+
+        # Run one interval per worker at a time. Workers only fuzz and run
+        # the target; crashes are verified, minimized, analyzed and scored
+        # back here so that uniqueness and the seedfile set stay consistent.
+        # Workers are idle between batches, so it's safe to clean tmp now.
+        TmpReaper().clean_tmp()
+
+        tasks = []
+        # tries already handed out per seedfile in this batch
+        pending = {}
+        for _ in xrange(self.workers):
+            sf = self.seedfile_set.next_item()
+            logger.info('Selected seedfile: %s', sf.basename)
+
+            interval_limit = self.current_seed + self.seed_interval
+            logger.debug(
+                'Starting interval %d-%d', self.current_seed, interval_limit)
+            for seednum in xrange(self.current_seed, interval_limit):
+                tries = sf.tries + pending.get(sf.md5, 0)
+                pending[sf.md5] = pending.get(sf.md5, 0) + 1
+                tasks.append((sf, seednum, tries))
+            self.current_seed = interval_limit
+
+        results = self.worker_pool.imap(tasks)
+        for ((sf, _seednum, _tries), result) in itertools.izip(tasks, results):
+            if sf.md5 not in self.seedfile_set.things:
+                # We've exhausted what we can do with this seedfile
+                filetools.rm_rf(result.working_dir)
+                continue
+            self._resume_iteration(sf, result)
+
+        # cache our current state
+        self._save_state()
+        self.testcases_seen.flush()
+        self.first_chunk = False
+
+    def go(self):
+        if self.analysis_workers < 1:
+            return self._fuzz()
+
+        # the analysis workers need to share the signature index with us
+        self.testcases_seen.close()
+        try:
+            with AnalysisPool(self.analysis_workers,
+                              queue_dir=self.analysis_queue_dir,
+                              sf_set=self.seedfile_set,
+                              sig_index_file=self.signature_index_file,
+                              crashers_dir=os.path.join(self.outdir,
+                                                        'crashers'),
+                              iteration_cls=LinuxIteration,
+                              outdir=self.outdir,
+                              config=self.config,
+                              fuzzer_cls=self.fuzzer_cls,
+                              runner_cls=self.runner_cls,
+                              limit=self.analysis_queue_limit) as self.analysis_pool:
+                self.testcases_seen = self.analysis_pool.sig_index
+                self._fuzz()
+        finally:
+            self.analysis_pool = None
+            self._load_signature_index()
+
+    def _fuzz(self):
+        if self.workers < 2:
+            return CampaignBase.go(self)
+
+        with WorkerPool(self.workers,
+                        iteration_cls=LinuxIteration,
+                        workdirbase=self.working_dir,
+                        outdir=self.outdir,
+                        config=self.config,
+                        fuzzer_cls=self.fuzzer_cls,
+                        runner_cls=self.runner_cls) as self.worker_pool:
+            CampaignBase.go(self)
@@ -180,6 +180,7 @@ class WindowsCampaign(CampaignBase):
                               outdir=self.outdir,
                               sf_set=self.seedfile_set,
                               uniq_func=self._testcase_is_unique,
+                              sig_index=self.testcases_seen,
                               config=self.config,
                               fuzzer_cls=self.fuzzer_cls,
                               runner_cls=self.runner_cls,
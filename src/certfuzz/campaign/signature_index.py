@@ -0,0 +1,305 @@
+'''
+Created on Oct 18, 2026
+
+Keeps track of the crash signatures a campaign has seen, across restarts, so
+that uniqueness checks are a dict lookup rather than a trip to the
+filesystem.
+
+@organization: cert.org
+'''
+import collections
+import functools
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_EXPLOITABILITY = 'UNKNOWN'
+
+SignatureRecord = collections.namedtuple('SignatureRecord',
+                                         ['signature', 'exploitability',
+                                          'first_seednum', 'last_seednum',
+                                          'hits'])
+
+_schema = '''
+CREATE TABLE IF NOT EXISTS signatures (
+    signature TEXT PRIMARY KEY,
+    exploitability TEXT NOT NULL,
+    first_seednum INTEGER,
+    last_seednum INTEGER,
+    hits INTEGER NOT NULL
+)
+'''
+
+# a NULL signature means the fingerprint has led to more than one
+_fingerprint_schema = '''
+CREATE TABLE IF NOT EXISTS fingerprints (
+    fingerprint TEXT PRIMARY KEY,
+    signature TEXT
+)
+'''
+
+
+def _locked(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class SignatureIndex(object):
+    '''
+    A set of crash signatures, along with their exploitability, the first
+    and last seednum each one showed up at, and how many times it's been
+    hit. Everything lives in memory; if a dbfile is given, changes are also
+    written through to it, and load() reads back what's already there.
+    New signatures get written right away, but more hits on ones we've
+    already got are only written out by flush() (and close()), since
+    those add up to a commit per crash otherwise.
+
+    It also remembers which signature each crash fingerprint (see
+    certfuzz.fuzztools.crash_fingerprint) turned out to have, so that a
+    crash can be recognized before the debugger gets run on it.
+
+    Any sqlite error turns off the database for the rest of the run, and
+    the index carries on in memory.
+
+    Updates are serialized, so one index can be shared between threads
+    (e.g., when it's served to analysis workers, see
+    certfuzz.campaign.analysis_pool).
+    '''
+
+    def __init__(self, dbfile=None):
+        self.dbfile = dbfile
+        self.disabled = dbfile is None
+        self._conn = None
+        self._lock = threading.RLock()
+        # signature -> [exploitability, first_seednum, last_seednum, hits]
+        self._records = {}
+        # str(fingerprint) -> signature, or None if it's ambiguous
+        self._fingerprints = {}
+        # signatures with changes that haven't been written out yet
+        self._dirty = set()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self.__dict__.setdefault('_dirty', set())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, etype, value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, signature):
+        return signature in self._records
+
+    def __iter__(self):
+        for signature in self._records:
+            yield self.get(signature)
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.dbfile,
+                                         check_same_thread=False)
+            # with a write-ahead log, commits don't have to wait on an
+            # fsync of the database itself
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(_schema)
+            self._conn.execute(_fingerprint_schema)
+        return self._conn
+
+    def _execute(self, sql, params=(), many=False):
+        '''
+        Runs sql and returns all the rows it produced, or None if the
+        database is (or just got) disabled. If many is True, params is a
+        sequence of parameter tuples to run sql with, all in one transaction.
+        '''
+        if self.disabled:
+            return None
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    if many:
+                        return conn.executemany(sql, params).fetchall()
+                    return conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                logger.warning('Disabling crash signature index %s: %s',
+                               self.dbfile, e)
+                self.disabled = True
+                self.close()
+                return None
+
+    def _write(self, *signatures):
+        self._dirty.difference_update(signatures)
+        rows = [(signature,) + tuple(self._records[signature])
+                for signature in signatures]
+        self._execute('INSERT OR REPLACE INTO signatures '
+                      '(signature, exploitability, first_seednum, '
+                      'last_seednum, hits) VALUES (?, ?, ?, ?, ?)',
+                      rows, many=True)
+
+    @_locked
+    def flush(self):
+        '''
+        Writes out any hits that haven't been written yet
+        '''
+        if self._dirty:
+            self._write(*sorted(self._dirty))
+
+    @_locked
+    def close(self):
+        self.flush()
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    @_locked
+    def load(self):
+        '''
+        Reads the signatures (and fingerprints) already in the database.
+        Returns the number of signatures read.
+        '''
+        fingerprints = self._execute('SELECT fingerprint, signature '
+                                     'FROM fingerprints') or []
+        for (fingerprint, signature) in fingerprints:
+            if signature is not None:
+                signature = str(signature)
+            self._fingerprints[str(fingerprint)] = signature
+
+        rows = self._execute('SELECT signature, exploitability, '
+                             'first_seednum, last_seednum, hits '
+                             'FROM signatures')
+        if not rows:
+            return 0
+        for (signature, exploitability, first, last, hits) in rows:
+            self._records[str(signature)] = [str(exploitability), first, last,
+                                             hits]
+        logger.info('Loaded %d crash signatures from %s', len(rows),
+                    self.dbfile)
+        return len(rows)
+
+    def get(self, signature):
+        '''
+        Returns the SignatureRecord for signature, or None if we haven't
+        seen it
+        '''
+        try:
+            record = self._records[signature]
+        except KeyError:
+            return None
+        return SignatureRecord(signature, *record)
+
+    @_locked
+    def record(self, signature, exploitability=None, seednum=None):
+        '''
+        Counts a hit on signature at seednum. Returns True if this is the
+        first time we've seen it, False otherwise.
+        '''
+        record = self._records.get(signature)
+        is_new = record is None
+        if is_new:
+            record = [exploitability or UNKNOWN_EXPLOITABILITY, seednum,
+                      seednum, 0]
+            self._records[signature] = record
+        elif seednum is not None:
+            if record[1] is None or seednum < record[1]:
+                record[1] = seednum
+            if record[2] is None or seednum > record[2]:
+                record[2] = seednum
+        record[3] += 1
+        if is_new:
+            self._write(signature)
+        else:
+            self._dirty.add(signature)
+        return is_new
+
+    @_locked
+    def set_exploitability(self, signature, exploitability):
+        '''
+        Updates the exploitability of a signature we've already seen
+        '''
+        record = self._records.get(signature)
+        if record is None or not exploitability:
+            return
+        if record[0] != exploitability:
+            record[0] = exploitability
+            self._write(signature)
+
+    @_locked
+    def import_crashers(self, crashers_dir):
+        '''
+        Adds the signatures of the crashers already in crashers_dir (laid
+        out as <crashers_dir>/<exploitability>/<signature>), for results
+        from before there was an index. Returns the number of signatures
+        added.
+        '''
+        if not os.path.isdir(crashers_dir):
+            return 0
+        added = 0
+        for exploitability in os.listdir(crashers_dir):
+            exp_dir = os.path.join(crashers_dir, exploitability)
+            if not os.path.isdir(exp_dir):
+                continue
+            for signature in os.listdir(exp_dir):
+                if not os.path.isdir(os.path.join(exp_dir, signature)):
+                    continue
+                if signature in self._records:
+                    continue
+                self._records[signature] = [exploitability, None, None, 1]
+                self._dirty.add(signature)
+                added += 1
+        self.flush()
+        if added:
+            logger.info('Added %d existing crash signatures from %s', added,
+                        crashers_dir)
+        return added
+
+    def signature_for(self, fingerprint):
+        '''
+        Returns the signature that crashes with fingerprint have had, or None
+        if we don't know it (or it's had more than one)
+        '''
+        return self._fingerprints.get(str(fingerprint))
+
+    @_locked
+    def learn_fingerprint(self, fingerprint, signature):
+        '''
+        Notes that a crash with fingerprint turned out to have signature.
+        Returns False if the fingerprint has led to some other signature
+        before, in which case it won't be trusted from now on.
+        '''
+        key = str(fingerprint)
+        if key not in self._fingerprints:
+            self._fingerprints[key] = signature
+        elif self._fingerprints[key] == signature:
+            return True
+        elif self._fingerprints[key] is not None:
+            logger.info('Crash fingerprint %s led to both %s and %s', key,
+                        self._fingerprints[key], signature)
+            self._fingerprints[key] = None
+        else:
+            return False
+
+        self._execute('INSERT OR REPLACE INTO fingerprints '
+                      '(fingerprint, signature) VALUES (?, ?)',
+                      (key, self._fingerprints[key]))
+        return self._fingerprints[key] is not None
@@ -0,0 +1,162 @@
+'''
+Created on Oct 18, 2026
+
+Provides a pool of worker processes that fuzz and run the target in
+parallel on behalf of a campaign. Workers only do the fuzz + run part of an
+iteration. Everything that touches shared campaign state (the seedfile set
+bandit, testcases_seen, the cached campaign state) stays in the
+coordinating process, which picks up each worker's IterationResult in
+seednum order.
+
+@organization: cert.org
+'''
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import signal
+import tempfile
+
+from certfuzz.iteration.iteration_base import scratch_base
+
+logger = logging.getLogger(__name__)
+
+# per-process state for workers, set up by _init_worker
+_worker = {}
+
+
+class IterationResult(object):
+    '''
+    What a worker process hands back to the coordinator for a single
+    (seedfile, seednum) pair.
+    '''
+
+    def __init__(self, sf_md5, seednum):
+        self.sf_md5 = sf_md5
+        self.seednum = seednum
+        self.working_dir = None
+        self.fuzzed_file = None
+        self.range = None
+        self.saw_crash = False
+        self.fingerprint = None
+        self.run_seconds = 0.0
+        self.error = None
+
+    def __repr__(self):
+        return '%s' % self.__dict__
+
+
+def _init_worker(iteration_cls, workdirbase, outdir, config, fuzzer_cls,
+                 runner_cls):
+    # put the worker (and therefore anything it spawns) into its own
+    # process group so that killpg() on a hung target stays contained
+    try:
+        os.setsid()
+    except OSError:
+        pass
+    # leave ctrl-c handling to the coordinator
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    _worker['iteration_cls'] = iteration_cls
+    _worker['working_dir'] = tempfile.mkdtemp(prefix='worker_',
+                                              dir=workdirbase)
+    _worker['outdir'] = outdir
+    _worker['config'] = config
+    _worker['fuzzer_cls'] = fuzzer_cls
+    _worker['runner_cls'] = runner_cls
+
+
+def fuzz_and_run(task):
+    '''
+    Fuzzes and runs a single iteration inside a worker process.
+
+    The RNG is reseeded from (seedfile md5, seednum) so that the range
+    selection and mutation do not depend on which worker picks up the task
+    or in what order.
+
+    :param task: a (seedfile, seednum, tries) tuple
+    '''
+    (seedfile, seednum, tries) = task
+    # tries-based fuzzers (swap, wave, drop, ...) need to know where this
+    # task falls among the ones already handed out for the same seedfile
+    seedfile.tries = tries
+    random.seed('%s-%d' % (seedfile.md5, seednum))
+
+    result = IterationResult(seedfile.md5, seednum)
+    iteration = _worker['iteration_cls'](seedfile=seedfile,
+                                         seednum=seednum,
+                                         workdirbase=_worker['working_dir'],
+                                         outdir=_worker['outdir'],
+                                         config=_worker['config'],
+                                         fuzzer_cls=_worker['fuzzer_cls'],
+                                         runner_cls=_worker['runner_cls'],
+                                         )
+    result.working_dir = tempfile.mkdtemp(prefix=iteration._tmpdir_pfx,
+                                          dir=iteration.workdirbase)
+    iteration.working_dir = result.working_dir
+    try:
+        iteration.fuzz()
+        result.fuzzed_file = iteration.fuzzed_file
+        result.range = iteration.r
+        iteration.run()
+        result.saw_crash = iteration.saw_crash
+        result.fingerprint = iteration.fingerprint
+        result.run_seconds = iteration.run_seconds
+    except Exception as e:
+        # hand the exception to the coordinator, which handles it the same
+        # way it would for an iteration it ran itself
+        result.error = e
+
+    # the coordinator cleans up result.working_dir when it's done with it
+    return result
+
+
+class WorkerPool(object):
+    '''
+    Runs (seedfile, seednum) tasks across a multiprocessing.Pool.
+
+    with WorkerPool(workers, ...) as pool:
+        for result in pool.imap(tasks):
+            ...
+    '''
+
+    def __init__(self, workers, iteration_cls, workdirbase, outdir, config,
+                 fuzzer_cls, runner_cls):
+        self.workers = workers
+        self._initargs = (iteration_cls, workdirbase, outdir, config,
+                          fuzzer_cls, runner_cls)
+        self._pool = None
+        self._scratch = None
+        if config.get('runoptions', {}).get('inmemory'):
+            # keep the workers' fuzzed files off the disk
+            self._scratch = scratch_base(config)
+
+    def __enter__(self):
+        logger.info('Starting %d fuzzing workers', self.workers)
+        if self._scratch:
+            self._scratch = tempfile.mkdtemp(prefix='bff_workers_',
+                                             dir=self._scratch)
+            self._initargs = (self._initargs[:1] + (self._scratch,) +
+                              self._initargs[2:])
+        self._pool = multiprocessing.Pool(processes=self.workers,
+                                          initializer=_init_worker,
+                                          initargs=self._initargs)
+        return self
+
+    def __exit__(self, etype, value, traceback):
+        if etype:
+            self._pool.terminate()
+        else:
+            self._pool.close()
+        self._pool.join()
+        logger.debug('Fuzzing workers stopped')
+        if self._scratch:
+            shutil.rmtree(self._scratch, ignore_errors=True)
+
+    def imap(self, tasks):
+        '''
+        Returns an iterator of IterationResults in the same order as tasks
+        :param tasks: an iterable of (seedfile, seednum, tries) tuples
+        '''
+        return self._pool.imap(fuzz_and_run, tasks)
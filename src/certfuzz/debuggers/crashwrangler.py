@@ -86,7 +86,9 @@ class CrashWrangler(Debugger):
         if re.search('gmalloc', self.outfile):
             my_env['CW_USE_GMAL'] = '1'
 
-        subp.run_with_timer(args, self.timeout, self.program, env=my_env)
+        progname = self.program if self.kill_by_name else None
+        subp.run_with_timer(args, self.timeout, progname,
+                            cwd=self.workingdir, env=my_env)
 
         # We're not guaranteed that CrashWrangler will create an output file:
         if not os.path.exists(self.outfile):
@@ -22,6 +22,10 @@ class Debugger(object):
     _platform = None
     _key = 'debugger'
     _ext = 'debug'
+    # run the debugger from here instead of the current directory
+    workingdir = None
+    # on timeout, also kill anything else named program
+    kill_by_name = True
 
     def __init__(self, program=None, cmd_args=None, outfile_base=None, timeout=None, **options):
         '''
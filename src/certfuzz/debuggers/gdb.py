@@ -12,6 +12,7 @@ import tempfile
 
 from certfuzz.debuggers.debugger_base import Debugger
 from certfuzz.debuggers.errors import DebuggerError
+from certfuzz.debuggers.gdb_pool import get_pool
 from certfuzz.debuggers.output_parsers.gdbfile import GDBfile
 from certfuzz.fuzztools import subprocess_helper as subp
 
@@ -24,12 +25,15 @@ class GDB(Debugger):
     _key = 'gdb'
     _ext = 'gdb'
 
-    def __init__(self, program, cmd_args, outfile_base, timeout, template=None, exclude_unmapped_frames=True, keep_uniq_faddr=False, **options):
+    def __init__(self, program, cmd_args, outfile_base, timeout, template=None, exclude_unmapped_frames=True, keep_uniq_faddr=False, persistent=False, **options):
         Debugger.__init__(
             self, program, cmd_args, outfile_base, timeout, **options)
         self.template = template
         self.exclude_unmapped_frames = exclude_unmapped_frames
         self.keep_uniq_faddr = keep_uniq_faddr
+        # reuse a long-lived gdb from the session pool instead of starting
+        # a new one for every run
+        self.persistent = persistent
 
     def _get_cmdline(self):
         self._create_input_file()
@@ -93,6 +97,16 @@ class GDB(Debugger):
         if os.path.exists(self.input_file):
             logger.warning("Failed to delete %s", self.input_file)
 
+    def _run_in_session(self):
+        self._create_input_file()
+        pool = get_pool()
+        session = pool.acquire()
+        try:
+            session.run(self.program, self.input_file, self.timeout,
+                        cwd=self.workingdir)
+        finally:
+            pool.release(session)
+
     def debugger_app(self):
         '''
         Returns the name of the debugger application to use in this class
@@ -115,11 +129,16 @@ class GDB(Debugger):
 
         @return: a GDBfile object with the parsed results
         '''
-        # build the command line in a separate function so we can unit test
-        # it without actually running the command
-        cmdline = self._get_cmdline()
-        subp.run_with_timer(
-            cmdline, self.timeout, self.program, stdout=os.devnull)
+        if self.persistent:
+            self._run_in_session()
+        else:
+            # build the command line in a separate function so we can unit
+            # test it without actually running the command
+            cmdline = self._get_cmdline()
+            progname = self.program if self.kill_by_name else None
+            subp.run_with_timer(
+                cmdline, self.timeout, progname, cwd=self.workingdir,
+                stdout=os.devnull)
 
         self._remove_temp_file()
         if not os.path.exists(self.outfile):
@@ -0,0 +1,239 @@
+'''
+Created on Oct 18, 2026
+
+Provides a pool of long-lived gdb processes so that repeated debugger runs
+(e.g., during minimization) don't pay for gdb startup every time.
+
+Each session is a single gdb process driven over a pipe. For every run the
+GDB wrapper writes its usual command file, and the session sources it. An
+error partway through a sourced file aborts the rest of that file, just
+like it does for 'gdb -batch -command', so the log file that ends up on
+disk (and thus the parsed GDBfile) matches what a fresh gdb would produce.
+The 'file $PROGRAM' line is dropped once the session has loaded the
+program, so only the inferior gets reloaded between runs.
+
+@organization: cert.org
+'''
+import atexit
+import errno
+import logging
+import os
+import select
+import signal
+import subprocess
+import threading
+import time
+
+from certfuzz.debuggers.errors import DebuggerError
+from certfuzz.fuzztools.subprocess_helper import descendants
+
+logger = logging.getLogger(__name__)
+
+_SENTINEL = 'BFF_GDB_SESSION_READY'
+
+# commands sent once when a session starts up
+_SESSION_SETUP = ['set confirm off',
+                  'set pagination off',
+                  'set height 0',
+                  'set width 0',
+                  # keep the inferior off of our command pipe
+                  'set inferior-tty /dev/null',
+                  ]
+
+
+def session_script(script, skip_file=False):
+    '''
+    Converts a gdb batch command script into one suitable for sourcing from
+    a persistent session: drops the trailing 'quit' and, if the session
+    already has the program loaded, the 'file' command.
+    :param script: the gdb command script as a string
+    :param skip_file: drop 'file <program>' lines if True
+    '''
+    lines = []
+    for line in script.splitlines():
+        cmd = line.strip()
+        if cmd == 'quit':
+            continue
+        if skip_file and cmd.startswith('file '):
+            continue
+        lines.append(line)
+    lines.append('')
+    return '\n'.join(lines)
+
+
+class GDBSession(object):
+    '''
+    A single long-lived gdb process.
+    '''
+
+    def __init__(self, gdb='gdb'):
+        self.gdb = gdb
+        self.program = None
+        self.process = None
+        # where gdb started, and where the inferior runs now
+        self.home = None
+        self.cwd = None
+        self._counter = 0
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        args = [self.gdb, '-n', '-q', '-nx']
+        logger.debug('Starting gdb session: %s', ' '.join(args))
+        # give gdb its own process group so we can kill it and whatever
+        # it's debugging in one go
+        self.home = self.cwd = os.getcwd()
+        self.process = subprocess.Popen(args,
+                                        stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE,
+                                        stderr=subprocess.STDOUT,
+                                        preexec_fn=os.setsid,
+                                        )
+        self.program = None
+        if not self._send(_SESSION_SETUP, timeout=30):
+            self.stop()
+            raise DebuggerError('Unable to start gdb session')
+
+    def stop(self):
+        if self.process is None:
+            return
+        # gdb may have put the inferior in a process group of its own, so
+        # find it by ancestry while gdb is still around to be its parent.
+        # Killing by program name would take out every other session's
+        # inferior (and any other worker's target) along with it.
+        for pid in descendants(self.process.pid):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        try:
+            os.killpg(os.getpgid(self.process.pid), signal.SIGKILL)
+        except OSError:
+            # it might already be gone
+            pass
+        try:
+            self.process.wait()
+        except OSError:
+            pass
+        self.process = None
+        self.program = None
+
+    def _send(self, commands, timeout):
+        '''
+        Sends commands to gdb, then waits up to timeout seconds for it to
+        finish them. Returns True if gdb caught up in time.
+        '''
+        self._counter += 1
+        sentinel = '%s_%d' % (_SENTINEL, self._counter)
+        commands = list(commands)
+        commands.append('echo %s\\n' % sentinel)
+        try:
+            self.process.stdin.write('\n'.join(commands) + '\n')
+            self.process.stdin.flush()
+        except IOError as e:
+            logger.debug('Failed to write to gdb session: %s', e)
+            return False
+        return self._wait_for(sentinel, timeout)
+
+    def _wait_for(self, sentinel, timeout):
+        fd = self.process.stdout.fileno()
+        deadline = time.time() + timeout
+        buf = ''
+        while sentinel not in buf:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            try:
+                (ready, _, _) = select.select([fd], [], [], remaining)
+            except select.error as e:
+                if e.args[0] == errno.EINTR:
+                    continue
+                raise
+            if not ready:
+                continue
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                # gdb went away
+                return False
+            # only the tail matters for finding the sentinel
+            buf = buf[-len(sentinel):] + chunk
+        return True
+
+    def run(self, program, script_file, timeout, cwd=None):
+        '''
+        Sources script_file in this session. Kills the session (and the
+        inferior) if it doesn't finish within timeout seconds.
+        :param program: the program being debugged
+        :param script_file: a gdb command file, as written by the GDB class
+        :param timeout: seconds
+        :param cwd: the directory to run the inferior in, defaults to the
+        one the session started in
+        '''
+        if not self.alive:
+            self.start()
+
+        skip_file = (self.program == program)
+        with open(script_file, 'r') as f:
+            script = session_script(f.read(), skip_file=skip_file)
+        with open(script_file, 'w') as f:
+            f.write(script)
+
+        commands = ['source %s' % script_file,
+                    'set logging off',
+                    'kill',
+                    ]
+        cwd = cwd or self.home
+        if cwd != self.cwd:
+            commands.insert(0, 'cd %s' % cwd)
+            self.cwd = cwd
+        if self._send(commands, timeout):
+            self.program = program
+            return True
+
+        logger.debug('gdb session timed out after %ss, killing it', timeout)
+        self.stop()
+        return False
+
+
+class GDBSessionPool(object):
+    '''
+    A thread-safe pool of GDBSessions. Sessions are started on demand, up
+    to max_sessions idle sessions are kept around for reuse.
+    '''
+
+    def __init__(self, max_sessions=4, session_cls=GDBSession):
+        self.max_sessions = max_sessions
+        self.session_cls = session_cls
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            while self._idle:
+                session = self._idle.pop()
+                if session.alive:
+                    return session
+        return self.session_cls()
+
+    def release(self, session):
+        with self._lock:
+            if session.alive and len(self._idle) < self.max_sessions:
+                self._idle.append(session)
+                return
+        session.stop()
+
+    def close(self):
+        with self._lock:
+            sessions, self._idle = self._idle, []
+        for session in sessions:
+            session.stop()
+
+
+_pool = GDBSessionPool()
+atexit.register(_pool.close)
+
+
+def get_pool():
+    return _pool
@@ -11,6 +11,7 @@ from optparse import OptionParser
 import os
 import re
 
+from certfuzz.debuggers.output_parsers.line_scanner import LineScanner
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +36,7 @@ regex = {
     'exit_code': re.compile('Program exited with code (\d+)'),
     'bt_line_from': re.compile(r'\bfrom\b'),
     'bt_line_at': re.compile(r'\bat\b'),
+    'bt_continued': re.compile(r'\b(?:from|at)\b'),
     'register': re.compile('\s\s\s?[0-9a-zA-Z]+:\s(0x[0-9a-zA-Z][0-9a-zA-Z]+)'),
     'exploitability': re.compile('exception=.+:is_exploitable=( no|yes):'),
     'faddr': re.compile('exception=.+:access_address=(0x[0-9a-zA-Z][0-9a-zA-Z]+):'),
@@ -53,6 +55,15 @@ blocklist = ('__kernel_vsyscall', 'abort', 'raise', 'malloc', 'free',
 blocklist_libs = ('libSystem.B.dylib', 'libsystem_malloc.dylib'
                   )
 
+# what the lines the parser looks at start with
+line_scanner = LineScanner([
+    ('thread', r'Thread'),
+    ('frame', r'\d'),
+    ('program', r'Program\s'),
+    ('exception', r'exception='),
+    ('register', r'\s\s'),
+])
+
 
 class CWfile:
 
@@ -91,6 +102,8 @@ class CWfile:
         self.keep_uniq_faddr = keep_uniq_faddr
         self.faddr = None
         self.exp = None
+        # index of the backtrace frame that might continue on the next line
+        self._open_frame = None
 
         self._process_lines()
 
@@ -150,27 +163,24 @@ class CWfile:
                 bt for bt in self.backtrace if not '??' in bt]
         return self.backtrace_without_questionmarks
 
-    def backtrace_line(self, idx, l):
-        self._look_for_crashing_thread(l)
-        m = re.match(regex['bt_line'], l)
+    def _add_frame(self, line):
+        m = regex['bt_line'].match(line)
         if m and self.crashing_thread:
             library = m.group(1)
-            item = m.group(2)  # sometimes gdb splits across lines
-            # so get the next one if it looks like '<anything> at <foo>' or
-            # '<anything> from <foo>'
-            next_idx = idx + 1
-            while next_idx < len(self.lines):
-                nextline = self.lines[next_idx]
-                if re.match(regex['bt_line_basic'], nextline):
-                    break
-                elif re.search(regex['bt_line_from'], nextline) or re.search(regex['bt_line_at'], nextline):
-                    item = ' '.join((item, nextline))
-                next_idx += 1
-
+            item = m.group(2)
             if library not in blocklist_libs:
                 self.backtrace.append(item)
+                self._open_frame = len(self.backtrace) - 1
                 logger.debug('Appending to backtrace: %s', item)
 
+    def _continue_frame(self, line):
+        # sometimes gdb splits across lines
+        # so add the next one if it looks like '<anything> at <foo>' or
+        # '<anything> from <foo>'
+        if regex['bt_continued'].search(line):
+            self.backtrace[self._open_frame] = ' '.join(
+                (self.backtrace[self._open_frame], line))
+
     def _read_file(self):
         '''
         Reads the gdb file into memory
@@ -179,21 +189,32 @@ class CWfile:
         gdb = ""
         if os.path.exists(self.file):
             with open(self.file, 'r') as f:
-                gdb = [s.rstrip() for s in f.readlines()]
+                gdb = [s.rstrip() for s in f]
         return gdb
 
     def _process_lines(self):
         logger.debug('_process_lines')
 
-        for idx, line in enumerate(self.lines):
+        # one pass over the lines, with each line matched once to see which
+        # checks could apply to it
+        for (line, kind) in line_scanner.scan(self.lines):
 
-            self.backtrace_line(idx, line)
+            if kind == 'frame':
+                # a new frame ends the one before it
+                self._open_frame = None
+                self._add_frame(line)
+            else:
+                if kind == 'thread':
+                    self._look_for_crashing_thread(line)
+                if self._open_frame is not None:
+                    self._continue_frame(line)
 
-            if not self.exit_code:
-                self._look_for_exit_code(line)
+            if kind == 'program':
+                if not self.exit_code:
+                    self._look_for_exit_code(line)
 
-            if not self.signal:
-                self._look_for_signal(line)
+                if not self.signal:
+                    self._look_for_signal(line)
 
             if self.is_crash:
                 self._look_for_crash(line)
@@ -207,13 +228,15 @@ class CWfile:
             if not self.is_corrupt_stack:
                 self._look_for_corrupt_stack(line)
 
-            if not self.exp:
-                self._look_for_exploitability(line)
+            if kind == 'exception':
+                if not self.exp:
+                    self._look_for_exploitability(line)
 
-            if not self.faddr:
-                self._look_for_faddr(line)
+                if not self.faddr:
+                    self._look_for_faddr(line)
 
-            self._look_for_registers(line)
+            elif kind == 'register':
+                self._look_for_registers(line)
 
         # if we found that the stack was corrupt,
         # we can no longer trust the last backtrace line
@@ -224,7 +247,7 @@ class CWfile:
                 "Corrupt stack found. Removing backtrace line: %s", removed_bt_line)
 
     def _look_for_crashing_thread(self, line):
-        m = re.match(regex['bt_thread'], line)
+        m = regex['bt_thread'].match(line)
         if m and 'Crashed' in line:
             self.crashing_thread = True
         elif m:
@@ -237,7 +260,7 @@ class CWfile:
         if self.is_64bit:
             return
 
-        m = re.match(regex['code_type'], line)
+        m = regex['code_type'].match(line)
         if m:
             code_type = m.group(0)
             if 'X86-64' in code_type:
@@ -252,19 +275,19 @@ class CWfile:
             self.is_corrupt_stack = True
 
     def _look_for_exit_code(self, line):
-        m = re.match(regex['exit_code'], line)
+        m = regex['exit_code'].match(line)
         if m:
             self.exit_code = m.group(1)
 
     def _look_for_faddr(self, line):
         if self.faddr:
             return
-        m = re.match(regex['faddr'], line)
+        m = regex['faddr'].match(line)
         if m:
             self.faddr = m.group(1)
 
     def _look_for_signal(self, line):
-        m = re.match(regex['signal'], line)
+        m = regex['signal'].match(line)
         if m:
             self.signal = m.group(1)
 
@@ -272,7 +295,7 @@ class CWfile:
         if self.exp:
             return
 
-        m = re.match(regex['exploitability'], line)
+        m = regex['exploitability'].match(line)
         if m:
             exploitable = m.group(1)
             if exploitable == 'yes':
@@ -306,7 +329,7 @@ class CWfile:
         if not len(self.registers_sought):
             return
         # short-circuit if the first thing in the line isn't a register
-        m = re.match(regex['register'], line)
+        m = regex['register'].match(line)
         if not m:
             return
         line = line.lstrip()
@@ -10,6 +10,8 @@ import re
 
 from certfuzz.debuggers.output_parsers.errors import DebuggerFileError, \
     UnknownDebuggerError
+from certfuzz.debuggers.output_parsers.line_scanner import LineScanner
+from certfuzz.fuzztools.module_map import ModuleMap
 
 
 logger = logging.getLogger(__name__)
@@ -32,6 +34,7 @@ regex = {
     'faddr': re.compile(r'^si_addr.+(0x[0-9a-zA-Z]+)'),
     'bt_line_from': re.compile(r'\bfrom\b'),
     'bt_line_at': re.compile(r'\bat\b'),
+    'bt_continued': re.compile(r'\b(?:from|at)\b'),
     'register': re.compile(r'(0x[0-9a-zA-Z]+)\s+(.+)$'),
     'libc_location': re.compile(r'(0x[0-9a-fA-F]+)\s+(0x[0-9a-fA-F]+)\s+0x[0-9a-fA-F]+\s+0(x0)?\s+.+/libc[-.]'),
     'libgcc_location': re.compile(r'(0x[0-9a-fA-F]+)\s+(0x[0-9a-fA-F]+)\s+0x[0-9a-fA-F]+\s+0(x0)?\s+.+/libgcc(_s)?[-.]'),
@@ -61,6 +64,19 @@ blocklist = ('__kernel_vsyscall', 'abort', 'raise', 'malloc', 'free',
              'g_assertion_message', 'g_assertion_message_expr',
              )
 
+# what the lines the parsers look at start with
+line_scanner = LineScanner([
+    ('frame', r'#\d'),
+    ('address', r'0x'),
+    ('program', r'Program\s'),
+    ('si_addr', r'si_addr'),
+    ('exploitability', r'Exploitability Classification: '),
+    ('thread', r'Thread\s'),
+    ('bracket', r'\['),
+    ('register', r'(?:%s)(?=\s|$)' % '|'.join(sorted(set(registers + registers64),
+                                                     key=len, reverse=True))),
+])
+
 
 def check_thread_type(line):
     if regex['detect_konqi'].match(line):
@@ -76,7 +92,7 @@ def check_thread_type(line):
 def detect_format(debugger_output_file):
     logger.debug('Checking format of %s', debugger_output_file)
     with open(debugger_output_file, 'r') as f:
-        for line in f.readlines():
+        for line in f:
             thread_format = check_thread_type(line.strip())
             if thread_format:
                 return thread_format
@@ -91,6 +107,8 @@ class DebuggerFile(object):
     '''
     classdocs
     '''
+    # backtrace frames don't continue onto lines containing these
+    _not_continued = ('Quit anyway', ' = ')
 
     def __init__(self, path, exclude_unmapped_frames=True, keep_uniq_faddr=False):
         '''
@@ -116,7 +134,7 @@ class DebuggerFile(object):
         self.registers_hex = {}
         self.hashable_backtrace = []
         self.hashable_backtrace_string = ''
-        self.module_map = []
+        self.module_map = ModuleMap()
         self.exit_code = None
         self.signal = None
         self.is_corrupt_stack = False
@@ -136,25 +154,13 @@ class DebuggerFile(object):
         self.keep_uniq_faddr = keep_uniq_faddr
         self.faddr = None
         self.exp = 'UNKNOWN'
+        # index of the backtrace frame that might continue on the next line
+        self._open_frame = None
 
-        # a list of functions to be called on each line
-        # if line_callbacks is set in child classes these ones
-        # will not be added
+        # child classes can set line_callbacks to a list of functions to be
+        # called on each line instead of the usual checks in _scan_line()
         if not hasattr(self, 'line_callbacks'):
-            self.line_callbacks = [
-                self._look_for_64bit,
-                self._look_for_exit_code,
-                self._look_for_debug_build,
-                self._look_for_corrupt_stack,
-                self._look_for_libc_location,
-                self._look_for_libgcc_location,
-                self._look_for_signal,
-                self._look_for_crash,
-                self._look_for_registers,
-                self._look_for_faddr,
-                self._build_module_map,
-                self._look_for_exploitability,
-            ]
+            self.line_callbacks = None
         self._read_file()
         self._process_file()
 
@@ -174,7 +180,7 @@ class DebuggerFile(object):
                 bt_frame = None
 
                 # Get the address of the current backtrace frame
-                n = re.match(regex['bt_addr'], bt)
+                n = regex['bt_addr'].match(bt)
                 if n:
                     # Get the frame address from the backtrace line
                     bt_frame = n.group(1)
@@ -196,13 +202,13 @@ class DebuggerFile(object):
                     continue
 
                 # skip blocklisted functions
-                x = re.match(regex['bt_function'], bt)
+                x = regex['bt_function'].match(bt)
                 if x and x.group(1) in blocklist:
                     continue
 
                 # If debug symbols are available, the backtrace will include
                 # the line number
-                m = re.search(regex['bt_at'], bt)
+                m = regex['bt_at'].search(bt)
                 if m:
                     bt_frame = m.group(1)
 
@@ -283,6 +289,29 @@ class DebuggerFile(object):
             self.backtrace.append(item)
             logger.debug('Appending to backtrace: %s', item)
 
+    def _add_frame(self, line):
+        '''
+        Appends the backtrace frame on line (if there is one) to the
+        backtrace. Lines after it get added to it by _continue_frame() until
+        the next frame comes along.
+        '''
+        m = regex['bt_line'].match(line)
+        if m:
+            self.backtrace.append(m.group(1))
+            self._open_frame = len(self.backtrace) - 1
+
+    def _continue_frame(self, line):
+        # sometimes gdb splits across lines
+        # so add the next one if it looks like '<anything> at <foo>' or
+        # '<anything> from <foo>'
+        if not regex['bt_continued'].search(line):
+            return
+        for s in self._not_continued:
+            if s in line:
+                return
+        self.backtrace[self._open_frame] = ' '.join(
+            (self.backtrace[self._open_frame], line))
+
     def _read_file(self):
         '''
         Reads the debugger file into memory
@@ -324,12 +353,50 @@ class DebuggerFile(object):
     def _process_lines(self):
         logger.debug('_process_lines')
 
-        for idx, line in enumerate(self.lines):
-            self.backtrace_line(idx, line)
+        if self.line_callbacks is not None:
+            for idx, line in enumerate(self.lines):
+                self.backtrace_line(idx, line)
 
-            for callback in self.line_callbacks:
-                # callbacks take a line as their argument
-                callback(line)
+                for callback in self.line_callbacks:
+                    # callbacks take a line as their argument
+                    callback(line)
+            return
+
+        # one pass over the lines, with each line matched once to see
+        # which checks could apply to it
+        for (line, kind) in line_scanner.scan(self.lines):
+            if kind == 'frame':
+                # a new frame ends the one before it
+                self._open_frame = None
+            elif self._open_frame is not None:
+                self._continue_frame(line)
+            self._scan_line(line, kind)
+
+    def _scan_line(self, line, kind):
+        '''
+        Looks for what we want to know in line, skipping the checks that
+        can't apply to a line of its kind (see line_scanner)
+        '''
+        if kind == 'frame':
+            self._add_frame(line)
+        elif kind == 'address':
+            self._look_for_64bit(line)
+            self._look_for_libc_location(line)
+            self._look_for_libgcc_location(line)
+            self._build_module_map(line)
+        elif kind == 'program':
+            self._look_for_exit_code(line)
+            self._look_for_signal(line)
+        elif kind == 'si_addr':
+            self._look_for_faddr(line)
+        elif kind == 'exploitability':
+            self._look_for_exploitability(line)
+        elif kind == 'register':
+            self._look_for_registers(line)
+
+        self._look_for_debug_build(line)
+        self._look_for_corrupt_stack(line)
+        self._look_for_crash(line)
 
     def _look_for_corrupt_stack(self, line):
         if self.is_corrupt_stack:
@@ -346,20 +413,18 @@ class DebuggerFile(object):
         '''
         logger.debug('_is_mapped_frame? %s', frame_address)
         if len(self.module_map):
-            for module in self.module_map:
-                logger.debug('Module: %s %s', module['start'], module['end'])
-                if module['start'] < frame_address < module['end']:
-                    logger.debug('Found address %x in module: %s' %
-                                 (frame_address, module['objfile']))
-                    return True
-            # if you got here, it's not mapped
-            return False
+            objfile = self.module_map.find(frame_address)
+            if objfile is None:
+                return False
+            logger.debug('Found address %x in module: %s', frame_address,
+                         objfile)
+            return True
         else:
             # if we don't have a module map, we can't tell, so assume true
             return True
 
     def _get_frame_address(self, bt_line):
-        n = re.match(regex['bt_addr'], bt_line)
+        n = regex['bt_addr'].match(bt_line)
         if n:
             # Get the frame address from the backtrace line
             frame_address = int(n.group(1), 16)
@@ -400,19 +465,19 @@ class DebuggerFile(object):
             logger.debug('Total stack corruption. No backtrace lines left.')
 
     def _look_for_exit_code(self, line):
-        #        if self.exit_code: return
+        if self.exit_code:
+            return
 
-        m = re.match(regex['exit_code'], line)
+        m = regex['exit_code'].match(line)
         if m:
             self.exit_code = m.group(1)
             logger.debug('Exit code: %s', self.exit_code)
-            self.line_callbacks.remove(self._look_for_exit_code)
 
     def _look_for_signal(self, line):
         if self.signal:
             return
 
-        m = re.match(regex['signal'], line)
+        m = regex['signal'].match(line)
         if m:
             self.signal = m.group(1)
             logger.debug('Signal: %s', self.signal)
@@ -425,7 +490,7 @@ class DebuggerFile(object):
         if self.faddr:
             return
 
-        m = re.match(regex['faddr'], line)
+        m = regex['faddr'].match(line)
         if m:
             self.faddr = m.group(1)
             logger.debug('Faulting address: %s', self.faddr)
@@ -434,7 +499,7 @@ class DebuggerFile(object):
         if self.faddr:
             return
 
-        m = re.match(regex['exploitability'], line)
+        m = regex['exploitability'].match(line)
         if m:
             self.exp = m.group(1)
             logger.debug('Exploitability: %s', self.exp)
@@ -499,7 +564,7 @@ class DebuggerFile(object):
         '''
         if self.is_64bit:
             return
-        m = re.match(regex['bt_addr'], line)
+        m = regex['bt_addr'].match(line)
         if m:
             start_addr = m.group(1)
             logger.debug('%s length: %s', start_addr, len(start_addr))
@@ -516,7 +581,7 @@ class DebuggerFile(object):
         if self.libc_start_addr:
             return
 
-        m = re.match(regex['libc_location'], line)
+        m = regex['libc_location'].match(line)
         if m:
             self.libc_start_addr = int(m.group(1), 16)
             self.libc_end_addr = int(m.group(2), 16)
@@ -528,22 +593,19 @@ class DebuggerFile(object):
         if self.libgcc_start_addr:
             return
 
-        m = re.match(regex['libgcc_location'], line)
+        m = regex['libgcc_location'].match(line)
         if m:
             self.libgcc_start_addr = int(m.group(1), 16)
             self.libgcc_end_addr = int(m.group(2), 16)
 
     def _build_module_map(self, line):
         '''
-        Build list of dictionaries that contain start and end addresses for mapped modules
+        Add the start and end addresses of mapped modules to the module map
         '''
-        m = re.match(regex['mapped_frame'], line)
+        m = regex['mapped_frame'].match(line)
         if m:
-            module = {'start': int(m.group(1), 16),
-                      'end': int(m.group(2), 16),
-                      'objfile': m.group(4)
-                      }
-            self.module_map.append(module)
+            self.module_map.add(int(m.group(1), 16), int(m.group(2), 16),
+                                m.group(4))
 
     def _look_for_registers(self, line):
         # short-circuit if we're out of registers to look for
@@ -561,7 +623,7 @@ class DebuggerFile(object):
 
         r = parts[0]
         r_str = ' '.join(parts[1:])
-        m = re.match(regex['register'], r_str)
+        m = regex['register'].match(r_str)
 
         # short-circuit when no match
         if not m:
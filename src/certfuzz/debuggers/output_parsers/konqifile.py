@@ -5,8 +5,8 @@ Created on Jan 18, 2012
 '''
 import re
 import logging
-from certfuzz.debuggers.output_parsers import DebuggerFile
-from certfuzz.debuggers.output_parsers import regex as regex_base
+from certfuzz.debuggers.output_parsers.debugger_file_base import DebuggerFile
+from certfuzz.debuggers.output_parsers.debugger_file_base import regex as regex_base
 
 from optparse import OptionParser
 
@@ -25,6 +25,8 @@ regex.update({
          })
 
 class Konqifile(DebuggerFile):
+    _not_continued = ('Quit anyway',)
+
     def __init__(self, path, exclude_unmapped_frames=True):
         self.has_threads = False
         self.crashing_frame = ''
@@ -35,70 +37,44 @@ class Konqifile(DebuggerFile):
 
         DebuggerFile.__init__(self, path, exclude_unmapped_frames)
 
-    def backtrace_line(self, idx, l):
-        self._look_for_crashing_thread(l)
-        m = re.match(regex['bt_line'], l)
-        if m and self.on_crashing_thread:
-            item = m.group(1)  # sometimes gdb splits across lines
-            # so get the next one if it looks like '<anything> at <foo>' or '<anything> from <foo>'
-            next_idx = idx + 1
-            while next_idx < len(self.lines):
-                nextline = self.lines[next_idx]
-                if re.match(regex['bt_line_basic'], nextline):
-                    break
-                elif re.search(regex['bt_line_from'], nextline) or re.search(regex['bt_line_at'], nextline):
-                    if not "Quit anyway" in nextline:
-                        item = ' '.join((item, nextline))
-                next_idx += 1
-
-            self.backtrace.append(item)
-            logger.debug('Appending to backtrace: %s', item)
-
     def _process_lines(self):
-        logger.debug('_process_lines')
-
-        for idx, line in enumerate(self.lines):
-
-            if not self.dataformat:
-                self._look_for_dataformat(line)
+        DebuggerFile._process_lines(self)
+        self._process_backtrace()
 
-            # Check to see if the input data has threads
-            if not self.has_threads and not self.on_crashing_thread:
-                self._look_for_threads(line)
+    def _scan_line(self, line, kind):
+        # Check to see if the input data has threads
+        if kind == 'bracket' and not self.has_threads and not self.on_crashing_thread:
+            self._look_for_threads(line)
 
-            # If there are threads, look to see which crashed
-            if not self.crashing_frame and self.has_threads:
+        # If there are threads, look to see which crashed
+        if not self.crashing_frame and self.has_threads:
+            if kind == 'frame':
                 self._look_for_crashing_frame(line)
-            # Otherwise, there's just one thread and it's the crashing one
-            else:
-                self.backtrace_line(idx, line)
-
-            if not self.exit_code:
-                self._look_for_exit_code(line)
-
-            if not self.signal:
-                self._look_for_signal(line)
+        # Otherwise, there's just one thread and it's the crashing one
+        elif kind in ('frame', 'thread'):
+            self._look_for_crashing_thread(line)
+            if kind == 'frame' and self.on_crashing_thread:
+                self._add_frame(line)
 
-            if self.is_crash:
-                self._look_for_crash(line)
+        if kind == 'program':
+            self._look_for_exit_code(line)
+            self._look_for_signal(line)
 
-            if not self.is_debugbuild:
-                self._look_for_debug_build(line)
+        self._look_for_crash(line)
+        self._look_for_debug_build(line)
+        self._look_for_corrupt_stack(line)
 
-            if not self.is_corrupt_stack:
-                self._look_for_corrupt_stack(line)
+        if kind == 'address':
+            self._look_for_libc_location(line)
 
-            if not self.libc_start_addr:
-                self._look_for_libc_location(line)
-
-            if not self.has_proc_map:
-                self._look_for_proc_map(line)
+        if not self.has_proc_map:
+            self._look_for_proc_map(line)
 
+        if kind == 'register':
             self._look_for_registers(line)
+        elif kind == 'address':
             self._build_module_map(line)
 
-        self._process_backtrace()
-
     def _look_for_debugger_missed_stack_corruption(self):
         if self.has_proc_map:
             start_bt_length = len(self.backtrace)
@@ -134,20 +110,20 @@ class Konqifile(DebuggerFile):
             logger.debug('No proc map available.  Cannot check for stack corruption')
 
     def _look_for_crashing_frame(self, line):
-        m = re.match(regex['innermost_frame'], line)
+        m = regex['innermost_frame'].match(line)
         if m:
             self.crashing_frame = line
             logger.debug('Crashing frame: %s', self.crashing_frame)
 
     def _look_for_threads(self, line):
         logger.debug('Looking for threads...')
-        m = re.match(regex['gdb_bt_threads'], line)
+        m = regex['gdb_bt_threads'].match(line)
         if m:
             self.has_threads = True
             logger.debug('Threads detected (gdb)')
             return
 
-        m = re.match(regex['konqi_bt_threads'], line)
+        m = regex['konqi_bt_threads'].match(line)
         if m:
             self.has_threads = True
             self.dataformat = "konqi"
@@ -156,7 +132,7 @@ class Konqifile(DebuggerFile):
 
     def _look_for_crashing_thread(self, line):
         if self.dataformat is 'gdb':
-            m = re.match(regex['innermost_frame'], line)
+            m = regex['innermost_frame'].match(line)
             if m and self.crashing_frame in line:
                 self.on_crashing_thread = True
                 logger.debug('Found crashing thread! (gdb)')
@@ -166,7 +142,7 @@ class Konqifile(DebuggerFile):
                 self.on_crashing_thread = True
                 logger.debug('No threads in this data...')
         elif self.dataformat is 'konqi':
-            m = re.match(regex['bt_thread'], line)
+            m = regex['bt_thread'].match(line)
             if m and self.crashing_thread in line:
                 logger.debug('Found crashing thread! (konqi)')
                 self.on_crashing_thread = True
@@ -177,7 +153,7 @@ class Konqifile(DebuggerFile):
         '''
         Check to see if the input file has proc map information
         '''
-        m = re.match(regex['mapped_frame'], line)
+        m = regex['mapped_frame'].match(line)
         if m:
             logger.debug('Found proc map information')
             # self.has_proc_map = True
@@ -0,0 +1,40 @@
+'''
+Created on Oct 18, 2026
+
+Provides a single-pass line classifier for debugger output. Each format
+lists the line prefixes its parser cares about, and they get compiled into
+one alternation regex, so each line is matched once to find out which of
+the parser's checks could apply to it instead of once per check.
+
+@organization: cert.org
+'''
+import re
+
+
+class LineScanner(object):
+    '''
+    Classifies lines by how they start. tokens is a list of (kind, pattern)
+    pairs; a line's kind is that of the first pattern that matches at the
+    start of the line, or None if none of them do. Patterns must not contain
+    capturing groups of their own.
+    '''
+
+    def __init__(self, tokens):
+        self.tokens = list(tokens)
+        self.regex = re.compile('|'.join('(?P<%s>%s)' % token
+                                         for token in self.tokens))
+
+    def kind(self, line):
+        m = self.regex.match(line)
+        if m:
+            return m.lastgroup
+        return None
+
+    def scan(self, lines):
+        '''
+        Yields (line, kind) for each of lines
+        '''
+        match = self.regex.match
+        for line in lines:
+            m = match(line)
+            yield (line, m.lastgroup if m else None)
@@ -4,13 +4,19 @@ Created on Jul 2, 2014
 @organization: cert.org
 '''
 import abc
+import collections
+import copy
 import logging
+import multiprocessing
 import os
 import re
+import tempfile
 
 import cPickle as pickle
+from certfuzz.drillresults.common import eif_text
 from certfuzz.drillresults.errors import DrillResultsError
 from certfuzz.drillresults.errors import TestCaseBundleError
+from certfuzz.fuzztools.filetools import get_file_md5
 
 
 logger = logging.getLogger(__name__)
@@ -19,6 +25,58 @@ regex = {
     'dr_score': re.compile('.+ - Exploitability rank: (\d+)')
 }
 
+# bump this when the cached results change shape
+CACHE_VERSION = 3
+
+# what we remember about each debugger file we've scored, and the crasher
+# it goes with (the EIF check reads the crasher too)
+CacheEntry = collections.namedtuple('CacheEntry', ['size', 'mtime', 'digest',
+                                                   'crasherfile', 'crash_hash',
+                                                   'crasher_size',
+                                                   'crasher_mtime', 'result'])
+
+
+def _size_and_mtime(path):
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return (None, None)
+    return (st.st_size, st.st_mtime)
+
+
+class ScoredTestcase(object):
+    '''
+    The parts of a TestCaseBundle the driller reports on, once it has been
+    scored. Small enough to send back from a worker process and to cache.
+    '''
+
+    def __init__(self, crash_hash, score, details):
+        self.crash_hash = crash_hash
+        self.score = score
+        self.details = details
+
+    def copy(self):
+        return ScoredTestcase(self.crash_hash, self.score,
+                              copy.deepcopy(self.details))
+
+
+def score_testcase(job):
+    '''
+    Scores a testcase. Returns (dbg_file, ScoredTestcase), or (dbg_file,
+    None) if there was nothing in the debugger file worth scoring.
+    :param job: a (tcb_cls, dbg_file, crasherfile, crash_hash, ignore_jit)
+    tuple
+    '''
+    (tcb_cls, dbg_file, crasherfile, crash_hash, ignore_jit) = job
+    try:
+        with tcb_cls(dbg_file, crasherfile, crash_hash, ignore_jit) as tcb:
+            tcb.go()
+            return (dbg_file, ScoredTestcase(tcb.crash_hash, tcb.score,
+                                             tcb.details))
+    except TestCaseBundleError as e:
+        logger.warning('Skipping %s: %s', dbg_file, e)
+        return (dbg_file, None)
+
 
 class ResultDriller(object):
     __metaclass__ = abc.ABCMeta
@@ -27,12 +85,18 @@ class ResultDriller(object):
                  ignore_jit=False,
                  base_dir='../results',
                  force_reload=False,
-                 report_all=False):
+                 report_all=False,
+                 incremental=False,
+                 workers=1):
         self.ignore_jit = ignore_jit
         self.base_dir = base_dir
         self.tld = None
         self.force = force_reload
         self.report_all = report_all
+        # trust cached results for debugger files whose size and mtime
+        # haven't changed, instead of checking their digest
+        self.incremental = incremental
+        self.workers = max(1, workers)
 
         if report_all:
             self.max_score = None
@@ -40,7 +104,10 @@ class ResultDriller(object):
             self.max_score = 70
 
         self.pickle_file = os.path.join('fuzzdir', 'drillresults.pkl')
-        self.cached_testcases = None
+        # debugger file path -> CacheEntry, from the last run
+        self.cached_testcases = {}
+        # and from this one
+        self.scored_testcases = {}
         self.testcase_bundles = []
         self.dr_outputs = {}
         self.dr_scores = {}
@@ -58,9 +125,15 @@ class ResultDriller(object):
 
         return handled
 
+    # the platform's TestCaseBundle class
+    _tcb_cls = None
+
     @abc.abstractmethod
-    def _platform_find_testcases(self, crash_hash):
-        pass
+    def _platform_find_testcases(self, crash_hash, files, root, force=False):
+        '''
+        Returns a list of (debugger file, crasher file) tuples to score for
+        the crash directory root
+        '''
 
     def _load_dr_output(self, crash_hash, drillresults_file):
         logger.debug(
@@ -82,18 +155,104 @@ class ResultDriller(object):
     def process_testcases(self):
         '''
         Crawls self.tld looking for crash directories to process. Puts a list
-        of tuples into self.testcase_bundles.
+        of ScoredTestcases into self.testcase_bundles.
         '''
+        jobs = []
         # Walk the results directory
         for root, dirs, files in os.walk(self.tld):
             logger.debug('Looking for testcases in %s', root)
             dir_basename = os.path.basename(root)
             try:
-                self._platform_find_testcases(
+                found = self._platform_find_testcases(
                     dir_basename, files, root, force=self.force)
             except TestCaseBundleError as e:
                 logger.warning('Skipping %s: %s', dir_basename, e)
                 continue
+            for (dbg_file, crasherfile) in found or []:
+                jobs.append((dbg_file, crasherfile, dir_basename))
+
+        for result in self._score_testcases(jobs):
+            if result is not None:
+                # keep the cached copy as it was scored
+                self._add_result(result.copy())
+
+    def _add_result(self, result):
+        self.testcase_bundles.append(result)
+
+    def _cached_result(self, dbg_file, crasherfile, crash_hash):
+        '''
+        Returns (entry, hit): a CacheEntry describing dbg_file as it is now,
+        and whether its result is still good. On a miss, entry.result is None.
+        '''
+        try:
+            st = os.stat(dbg_file)
+        except OSError:
+            # let the testcase bundle complain about it
+            return (None, False)
+
+        (crasher_size, crasher_mtime) = _size_and_mtime(crasherfile)
+        entry = CacheEntry(st.st_size, st.st_mtime, None, crasherfile,
+                           crash_hash, crasher_size, crasher_mtime, None)
+        cached = self.cached_testcases.get(dbg_file)
+        if cached is None or cached.size != st.st_size:
+            return (entry, False)
+        if cached[3:7] != entry[3:7]:
+            # a different crasher, or it's changed
+            return (entry, False)
+        if self.incremental and cached.mtime == st.st_mtime:
+            return (cached, True)
+
+        entry = entry._replace(digest=get_file_md5(dbg_file))
+        if entry.digest == cached.digest:
+            return (entry._replace(result=cached.result), True)
+        return (entry, False)
+
+    def _score_testcases(self, jobs):
+        '''
+        Returns a ScoredTestcase (or None) for each of jobs, in order.
+        Results are reused from the cache where the debugger file hasn't
+        changed, and the rest are scored in a pool of self.workers processes.
+        :param jobs: a list of (dbg_file, crasherfile, crash_hash) tuples
+        '''
+        results = [None] * len(jobs)
+        todo = []
+        for (i, (dbg_file, crasherfile, crash_hash)) in enumerate(jobs):
+            (entry, hit) = self._cached_result(dbg_file, crasherfile,
+                                               crash_hash)
+            if hit:
+                results[i] = entry.result
+                self.scored_testcases[dbg_file] = entry
+            else:
+                todo.append((i, entry))
+        logger.info('Reusing %d cached results, scoring %d testcases',
+                    len(jobs) - len(todo), len(todo))
+        if not todo:
+            return results
+
+        tasks = [(self._tcb_cls,) + jobs[i] + (self.ignore_jit,)
+                 for (i, _entry) in todo]
+        if self.workers > 1 and len(tasks) > 1:
+            pool = multiprocessing.Pool(processes=min(self.workers,
+                                                      len(tasks)))
+            try:
+                scored = pool.map(score_testcase, tasks, chunksize=16)
+                pool.close()
+            except:
+                pool.terminate()
+                raise
+            finally:
+                pool.join()
+        else:
+            scored = [score_testcase(task) for task in tasks]
+
+        for ((i, entry), (dbg_file, result)) in zip(todo, scored):
+            results[i] = result
+            if entry is None:
+                continue
+            if entry.digest is None:
+                entry = entry._replace(digest=get_file_md5(dbg_file))
+            self.scored_testcases[dbg_file] = entry._replace(result=result)
+        return results
 
     def _check_dirs(self):
         check_dirs = [self.base_dir, 'results', 'crashers']
@@ -113,10 +272,25 @@ class ResultDriller(object):
 
         try:
             with open(self.pickle_file, 'rb') as pkl_file:
-                self.cached_testcases = pickle.load(pkl_file)
+                cached = pickle.load(pkl_file)
         except (IOError, EOFError):
             # No cached results
-            pass
+            return
+        except Exception as e:
+            logger.warning('Ignoring unreadable cached results in %s: %s',
+                           self.pickle_file, e)
+            return
+
+        if not isinstance(cached, dict) or cached.get('version') != CACHE_VERSION:
+            logger.info('Ignoring cached results from an older version')
+            return
+        if cached.get('ignore_jit') != self.ignore_jit:
+            # the scores depend on it
+            logger.info('Ignoring cached results from a run with ignore_jit=%s',
+                        cached.get('ignore_jit'))
+            return
+        self.cached_testcases = cached['testcases']
+        logger.info('Loaded %d cached results', len(self.cached_testcases))
 
     @property
     def crash_scores(self):
@@ -134,10 +308,8 @@ class ResultDriller(object):
         print 'Fuzzed file: %s' % details['fuzzedfile']
         for exception in details['exceptions']:
             shortdesc = details['exceptions'][exception]['shortdesc']
-            eiftext = ''
             efa = '0x' + details['exceptions'][exception]['efa']
-            if details['exceptions'][exception]['EIF']:
-                eiftext = " *** Byte pattern is in fuzzed file! ***"
+            eiftext = eif_text(details['exceptions'][exception])
             print 'exception %s: %s accessing %s  %s' % (exception, shortdesc, efa, eiftext)
             if details['exceptions'][exception]['instructionline']:
                 print details['exceptions'][exception]['instructionline']
@@ -199,10 +371,19 @@ class ResultDriller(object):
 
     def cache_results(self):
         pkldir = os.path.dirname(self.pickle_file)
-        if not os.path.exists(pkldir):
+        if pkldir and not os.path.exists(pkldir):
             os.makedirs(pkldir)
-        with open(self.pickle_file, 'wb') as pkl_file:
-            pickle.dump(self.testcase_bundles, pkl_file, -1)
+        # only keep what we saw this time, so deleted crashes drop out
+        cached = {'version': CACHE_VERSION,
+                  'ignore_jit': self.ignore_jit,
+                  'testcases': self.scored_testcases}
+        # write it alongside and move it into place so an interrupted run
+        # doesn't leave a truncated cache behind
+        (fd, tmp_file) = tempfile.mkstemp(dir=pkldir or '.',
+                                          prefix='.drillresults')
+        with os.fdopen(fd, 'wb') as pkl_file:
+            pickle.dump(cached, pkl_file, -1)
+        os.rename(tmp_file, self.pickle_file)
 
     def drill_results(self):
         logger.debug('drill_results')
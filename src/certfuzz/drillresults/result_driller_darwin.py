@@ -12,12 +12,14 @@ logger = logging.getLogger(__name__)
 
 
 class DarwinResultDriller(ResultDriller):
+    _tcb_cls = TestCaseBundle
 
     def _platform_find_testcases(self, crash_hash, files, root, force=False):
         # Only use directories that are hashes
         # if "0x" in crash_hash:
         # Create dictionary for hashes in results dictionary
         crasherfile = ''
+        found = []
         # Check each of the files in the hash directory
 
         for current_file in files:
@@ -44,7 +46,5 @@ class DarwinResultDriller(ResultDriller):
                 logger.debug('found CrashWrangler file: %s', dbg_file)
                 crasherfile = dbg_file.replace('.gmalloc', '')
                 crasherfile = crasherfile.replace('.cw', '')
-                with TestCaseBundle(dbg_file, crasherfile, crash_hash,
-                                    self.ignore_jit) as tcb:
-                    tcb.go()
-                    self.testcase_bundles.append(tcb)
+                found.append((dbg_file, crasherfile))
+        return found
@@ -12,12 +12,14 @@ logger = logging.getLogger(__name__)
 
 
 class LinuxResultDriller(ResultDriller):
+    _tcb_cls = TestCaseBundle
 
     def _platform_find_testcases(self, crash_hash, files, root, force=False):
         # Only use directories that are hashes
         # if "0x" in crash_hash:
         # Create dictionary for hashes in results dictionary
         crasherfile = ''
+        found = []
         # Check each of the files in the hash directory
 
         for current_file in files:
@@ -45,7 +47,5 @@ class LinuxResultDriller(ResultDriller):
                 logger.debug('found gdb file: %s', dbg_file)
                 crasherfile = dbg_file.replace('.gdb', '')
                 # crasherfile = os.path.join(root, crasherfile)
-                with TestCaseBundle(dbg_file, crasherfile, crash_hash,
-                                    self.ignore_jit) as tcb:
-                    tcb.go()
-                    self.testcase_bundles.append(tcb)
+                found.append((dbg_file, crasherfile))
+        return found
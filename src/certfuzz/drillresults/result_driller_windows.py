@@ -7,7 +7,6 @@ import re
 
 from certfuzz.analyzers.drillresults.testcasebundle_windows import WindowsTestCaseBundle as TestCaseBundle
 from certfuzz.drillresults.result_driller_base import ResultDriller
-from certfuzz.drillresults.errors import TestCaseBundleError
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +16,15 @@ regex = {
 
 
 class WindowsResultDriller(ResultDriller):
+    _tcb_cls = TestCaseBundle
+
+    def __init__(self, *args, **kwargs):
+        ResultDriller.__init__(self, *args, **kwargs)
+        # exceptions from each crash dir's .msec files get merged into one
+        self._bundles_by_hash = {}
 
     def _platform_find_testcases(self, crash_dir, files, root, force=False):
+        found = []
         if "0x" in crash_dir or 'BFF_testcase' in crash_dir:
             # Create dictionary for hashes in results dictionary
             hash_dict = {}
@@ -57,28 +63,18 @@ class WindowsResultDriller(ResultDriller):
                     dbg_file = os.path.join(root, current_file)
                     if crasherfile and root not in crasherfile:
                         crasherfile = os.path.join(root, crasherfile)
-                    with TestCaseBundle(dbg_file, crasherfile, crash_dir,
-                                        self.ignore_jit) as tcb:
-                        try:
-                            tcb.go()
-                        except TestCaseBundleError:
-                            # Nothing useful in this msec file
-                            continue
+                    found.append((dbg_file, crasherfile))
+        return found
 
-                        _updated_existing = False
-                        # if not self.testcase_bundles:
-                        #    continue
-                        for index, tcbundle in enumerate(self.testcase_bundles):
-                            if tcbundle.crash_hash == crash_dir:
-                                # This is a new exception for the same crash
-                                # hash
-                                self.testcase_bundles[index].details[
-                                    'exceptions'].update(tcb.details['exceptions'])
-                                # If the current exception score is lower than
-                                # the existing crash_dir score, update it
-                                self.testcase_bundles[index].score = min(
-                                    self.testcase_bundles[index].score, tcb.score)
-                                _updated_existing = True
-                        if not _updated_existing:
-                            # This is a new crash hash
-                            self.testcase_bundles.append(tcb)
+    def _add_result(self, tcb):
+        tcbundle = self._bundles_by_hash.get(tcb.crash_hash)
+        if tcbundle is not None:
+            # This is a new exception for the same crash hash
+            tcbundle.details['exceptions'].update(tcb.details['exceptions'])
+            # If the current exception score is lower than
+            # the existing crash_dir score, update it
+            tcbundle.score = min(tcbundle.score, tcb.score)
+        else:
+            # This is a new crash hash
+            self._bundles_by_hash[tcb.crash_hash] = tcb
+            self.testcase_bundles.append(tcb)
@@ -3,10 +3,11 @@ Created on Mar 16, 2011
 
 @organization: cert.org
 '''
-import hashlib
 import os
 
-from certfuzz.fuzztools.filetools import check_zip_content, read_bin_file
+from certfuzz.fuzztools.filetools import check_zip_file, hash_file, \
+    read_bin_file
+from certfuzz.file_handlers.metadata_cache import FileMetadata
 
 
 class BasicFile(object):
@@ -14,7 +15,7 @@ class BasicFile(object):
     Object to contain basic info about file: path, basename, dirname, len, md5
     '''
 
-    def __init__(self, path):
+    def __init__(self, path, metadata_cache=None):
         self.path = path
         (self.dirname, self.basename) = os.path.split(self.path)
         if '.' in self.basename:
@@ -32,16 +33,32 @@ class BasicFile(object):
         self.bitlen = None
         self.is_zip = False
 
-        self.refresh()
+        self.refresh(metadata_cache)
 
-    def refresh(self):
-        if self.exists():
-            content = self.read()
-            self.len = len(content)
-            self.bitlen = 8 * self.len
-            self.md5 = hashlib.md5(content).hexdigest()
-            self.sha1 = hashlib.sha1(content).hexdigest()
-            self.is_zip = check_zip_content(content)
+    def refresh(self, metadata_cache=None):
+        '''
+        Reads the file's length, digests and zip check. If metadata_cache
+        (a MetadataCache) is given, it's checked first and updated after.
+        '''
+        if not self.exists():
+            return
+
+        metadata = None
+        if metadata_cache is not None:
+            metadata = metadata_cache.lookup(self.path)
+        if metadata is None:
+            (length, md5, sha1) = hash_file(self.path)
+            metadata = FileMetadata(length, md5, sha1,
+                                    check_zip_file(self.path))
+            if metadata_cache is not None:
+                metadata_cache.store(self.path, metadata)
+
+        (self.len, self.md5, self.sha1, self.is_zip) = metadata
+        self.bitlen = 8 * self.len
+
+    @property
+    def metadata(self):
+        return FileMetadata(self.len, self.md5, self.sha1, self.is_zip)
 
     def read(self):
         '''
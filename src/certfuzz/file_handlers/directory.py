@@ -18,8 +18,9 @@ blocklist = ['.DS_Store', ]
 
 
 class Directory(object):
-    def __init__(self, mydir, create=False):
+    def __init__(self, mydir, create=False, metadata_cache=None):
         self.dir = mydir
+        self.metadata_cache = metadata_cache
 
         if create and not os.path.isdir(self.dir):
             if not os.path.exists(self.dir) and not os.path.islink(self.dir):
@@ -46,7 +47,8 @@ class Directory(object):
         self._verify_dir()
 
         dir_listing = [os.path.join(self.dir, f) for f in os.listdir(self.dir) if not f in blocklist]
-        self.files = [BasicFile(path) for path in dir_listing if os.path.isfile(path)]
+        self.files = [BasicFile(path, self.metadata_cache)
+                      for path in dir_listing if os.path.isfile(path)]
 
     def paths(self):
         '''
@@ -0,0 +1,153 @@
+'''
+Created on Oct 18, 2026
+
+Remembers the length, digests and zip check of files from one campaign start
+to the next, so large seed directories don't have to be rehashed every time.
+
+@organization: cert.org
+'''
+import collections
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+FileMetadata = collections.namedtuple('FileMetadata',
+                                      ['len', 'md5', 'sha1', 'is_zip'])
+
+_schema = '''
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    len INTEGER NOT NULL,
+    md5 TEXT NOT NULL,
+    sha1 TEXT NOT NULL,
+    is_zip INTEGER NOT NULL
+)
+'''
+
+
+def _stat(path):
+    st = os.stat(path)
+    return (st.st_size, st.st_mtime)
+
+
+class MetadataCache(object):
+    '''
+    A sqlite-backed map from file path to FileMetadata. Entries are only
+    trusted while the file's size and mtime match what they were when the
+    entry was stored.
+
+    The database gets opened on first use, and close() can be called at any
+    time to release it. Any sqlite error turns the cache off for the rest of
+    the run rather than taking the campaign down with it.
+    '''
+
+    def __init__(self, dbfile):
+        self.dbfile = dbfile
+        self.disabled = False
+        self._conn = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, etype, value, traceback):
+        self.close()
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.dbfile)
+            # it's only a cache, losing the tail end of it is fine
+            self._conn.execute('PRAGMA synchronous = OFF')
+            self._conn.execute(_schema)
+        return self._conn
+
+    def _execute(self, sql, params=(), many=False):
+        '''
+        Runs sql and returns all the rows it produced, or None if the cache
+        is (or just got) disabled. With many set, params is a list of
+        parameter tuples to run sql with.
+        '''
+        if self.disabled:
+            return None
+        try:
+            conn = self._connect()
+            with conn:
+                if many:
+                    return conn.executemany(sql, params).fetchall()
+                return conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logger.warning('Disabling file metadata cache %s: %s',
+                           self.dbfile, e)
+            self.disabled = True
+            self.close()
+            return None
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def lookup(self, path):
+        '''
+        Returns the FileMetadata stored for path, or None if there isn't any
+        or the file has changed since it was stored.
+        '''
+        path = os.path.abspath(path)
+        rows = self._execute('SELECT size, mtime, len, md5, sha1, is_zip '
+                             'FROM files WHERE path = ?', (path,))
+        if not rows:
+            return None
+
+        (size, mtime, length, md5, sha1, is_zip) = rows[0]
+        try:
+            current = _stat(path)
+        except OSError:
+            current = None
+        if current != (size, mtime):
+            logger.debug('Stale metadata for %s', path)
+            self._execute('DELETE FROM files WHERE path = ?', (path,))
+            return None
+        return FileMetadata(length, str(md5), str(sha1), bool(is_zip))
+
+    def store(self, path, metadata):
+        '''
+        Remembers metadata for path as it is right now.
+        '''
+        path = os.path.abspath(path)
+        (size, mtime) = _stat(path)
+        self._execute('INSERT OR REPLACE INTO files '
+                      '(path, size, mtime, len, md5, sha1, is_zip) '
+                      'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                      (path, size, mtime, metadata.len, metadata.md5,
+                       metadata.sha1, int(metadata.is_zip)))
+
+    def prune(self):
+        '''
+        Forgets about files that no longer exist.
+        '''
+        rows = self._execute('SELECT path FROM files')
+        if not rows:
+            return
+        missing = [(path,) for (path,) in rows if not os.path.exists(path)]
+        if missing:
+            logger.debug('Pruning %d missing files from metadata cache',
+                         len(missing))
+            self._execute('DELETE FROM files WHERE path = ?', missing,
+                          many=True)
+
+    def __len__(self):
+        rows = self._execute('SELECT COUNT(*) FROM files')
+        if not rows:
+            return 0
+        return rows[0][0]
@@ -9,6 +9,7 @@ import os
 from certfuzz.file_handlers.basicfile import BasicFile
 from certfuzz.file_handlers.errors import SeedFileError
 from certfuzz.fuzztools import filetools
+from certfuzz.fuzztools.offset_index import OffsetIndex
 from certfuzz.fuzztools.rangefinder import RangeFinder
 
 
@@ -27,13 +28,18 @@ class SeedFile(BasicFile):
     '''
     '''
 
-    def __init__(self, output_base_dir, path):
+    def __init__(self, output_base_dir, path, metadata_cache=None,
+                 range_strategy=None, cost_aware=False):
         '''
         Creates an output dir for this seedfile based on its md5 hash.
         @param output_base_dir: The base directory for output files
+        @param metadata_cache: a MetadataCache to look the file up in
+        @param range_strategy: the bandit strategy the rangefinder should use
+        @param cost_aware: whether the rangefinder should account for how
+        long each range takes to run
         @raise SeedFileError: zero-length files will raise a SeedFileError
         '''
-        BasicFile.__init__(self, path)
+        BasicFile.__init__(self, path, metadata_cache)
 
         if not self.len > 0:
             raise SeedFileError(
@@ -49,7 +55,11 @@ class SeedFile(BasicFile):
 
         self.tries = 0
 
-        self.rangefinder = RangeFinder(self.range_min, self.range_max)
+        self.rangefinder = RangeFinder(self.range_min, self.range_max,
+                                       range_strategy, cost_aware)
+
+        # fuzzable offsets, shared by the fuzzers that honor range_list
+        self.offsets = OffsetIndex()
 
     def cache_key(self):
         return 'seedfile-%s' % self.md5
@@ -59,6 +69,7 @@ class SeedFile(BasicFile):
 
     def to_json(self, sort_keys=True, indent=None):
         state = self.__dict__.copy()
+        del state['offsets']
         state['rangefinder'] = state['rangefinder'].to_json(
             sort_keys=sort_keys, indent=indent)
         return json.dumps(state, sort_keys=sort_keys, indent=indent)
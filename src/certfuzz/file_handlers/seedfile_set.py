@@ -24,11 +24,20 @@ class SeedfileSet(MultiArmedBandit):
     '''
 
     def __init__(self, campaign_id=None, originpath=None, localpath=None,
-                 outputpath='.', logfile=None):
+                 outputpath='.', logfile=None, metadata_cache=None,
+                 strategy=None, range_strategy=None, cost_aware=False):
         '''
         Constructor
+        @param metadata_cache: a MetadataCache to avoid rehashing seed files
+        that haven't changed since the last time we saw them
+        @param strategy: the bandit strategy for picking seed files
+        @param range_strategy: the bandit strategy for each seed file's
+        rangefinder
+        @param cost_aware: pick seed files and ranges by crashes per second
+        of target run time rather than crashes per iteration
         '''
-        MultiArmedBandit.__init__(self)
+        MultiArmedBandit.__init__(self, strategy, cost_aware)
+        self.range_strategy = range_strategy
 #         self.campaign_id = campaign_id
         self.seedfile_output_base_dir = outputpath
 
@@ -40,6 +49,7 @@ class SeedfileSet(MultiArmedBandit):
         self.origindir = None
         self.localdir = None
         self.outputdir = None
+        self.metadata_cache = metadata_cache
 
         if logfile:
             hdlr = logging.FileHandler(logfile)
@@ -56,17 +66,25 @@ class SeedfileSet(MultiArmedBandit):
         pass
 
     def _setup(self):
+        if self.metadata_cache is not None:
+            self.metadata_cache.prune()
         self._set_directories()
         self._copy_files_to_localdir()
         self._add_local_files_to_set()
+        if self.metadata_cache is not None:
+            # we're done with it until something else gets added
+            self.metadata_cache.close()
 
     def _set_directories(self):
         if self.originpath:
-            self.origindir = Directory(self.originpath)
+            self.origindir = Directory(self.originpath,
+                                       metadata_cache=self.metadata_cache)
         if self.localpath:
-            self.localdir = Directory(self.localpath, create=True)
+            self.localdir = Directory(self.localpath, create=True,
+                                      metadata_cache=self.metadata_cache)
         if self.outputpath:
-            self.outputdir = Directory(self.outputpath, create=True)
+            self.outputdir = Directory(self.outputpath, create=True,
+                                       metadata_cache=self.metadata_cache)
 
     def _copy_files_to_localdir(self):
         for f in self.origindir:
@@ -80,7 +98,9 @@ class SeedfileSet(MultiArmedBandit):
     def add_file(self, *files):
         for f in files:
             try:
-                seedfile = SeedFile(self.seedfile_output_base_dir, f)
+                seedfile = SeedFile(self.seedfile_output_base_dir, f,
+                                    self.metadata_cache, self.range_strategy,
+                                    self.cost_aware)
             except SeedFileError:
                 logger.warning('Skipping empty file %s', f)
                 continue
@@ -99,9 +119,24 @@ class SeedfileSet(MultiArmedBandit):
         basename = 'sf_' + f.md5 + f.ext
         targets = [os.path.join(d, basename)
                    for d in (self.localpath, self.outputpath)]
+        targets = [t for t in targets if not self._already_copied(f, t)]
+        if not targets:
+            return
         filetools.copy_file(f.path, *targets)
         for target in targets:
             filetools.make_writable(target)
+            if self.metadata_cache is not None:
+                # same content, so no need to hash it again
+                self.metadata_cache.store(target, f.metadata)
+
+    def _already_copied(self, f, target):
+        '''
+        Returns True if the metadata cache says target is a copy of f
+        '''
+        if self.metadata_cache is None:
+            return False
+        cached = self.metadata_cache.lookup(target)
+        return cached is not None and cached.md5 == f.md5
 
     def paths(self):
         for x in self.things.values():
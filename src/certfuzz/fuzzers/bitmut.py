@@ -1,9 +1,33 @@
+from certfuzz.fuzzers.errors import FuzzerError
 from certfuzz.fuzzers.fuzzer_base import MinimizableFuzzer
+from certfuzz.fuzztools.probability import sample_distinct
 from random import jumpahead, sample, uniform, seed
 import logging
 
+import numpy
+
 logger = logging.getLogger(__name__)
 
+# How BitMutFuzzer turns (rng_seed, iteration) into bit flips. A given
+# version always produces the same output for the same seed file and
+# iteration, so old results can still be reproduced by setting rng_version.
+#   1: python random, sample() over a list of every fuzzable bit
+#   2: numpy RandomState, picks the k bits to flip directly
+RNG_VERSIONS = (1, 2)
+DEFAULT_RNG_VERSION = 2
+
+
+def _split_words(x):
+    '''
+    Splits a non-negative int into a list of 32-bit words, low word first
+    '''
+    words = [x & 0xffffffff]
+    x >>= 32
+    while x:
+        words.append(x & 0xffffffff)
+        x >>= 32
+    return words
+
 
 class BitMutFuzzer(MinimizableFuzzer):
     '''
@@ -12,6 +36,14 @@ class BitMutFuzzer(MinimizableFuzzer):
     range_list specifies a range in the file to fuzz. Roughly similar to zzuf's
     mutation strategy.
     '''
+    supports_mmap = True
+
+    def _parse_options(self):
+        self.rng_version = self.options.get('rng_version', DEFAULT_RNG_VERSION)
+        if self.rng_version not in RNG_VERSIONS:
+            raise FuzzerError('Unknown rng_version %s, must be one of %s'
+                              % (self.rng_version, RNG_VERSIONS))
+
     def _fuzz(self):
         """Twiddle bits of input_file_path and write output to output_file_path"""
         # rng_seed is the based on the input file
@@ -20,60 +52,74 @@ class BitMutFuzzer(MinimizableFuzzer):
 
         # select a ratio of bytes to fuzz
         self.range = self.sf.rangefinder.next_item()
-        self.ratio = uniform(self.range.min, self.range.max)
 
-        chooselist = []
-        # only add bytes in range to the bytes we can fuzz
+        if self.rng_version == 1:
+            self._fuzz_v1()
+        else:
+            self._fuzz_v2()
+
+        self.output = self.input
+
+    def _rng(self):
+        '''
+        Returns a numpy RandomState seeded from rng_seed and iteration
+        '''
+        # keep the two apart so (seed, iteration) pairs can't collide
+        words = _split_words(self.rng_seed)
+        words += [0] * (4 - len(words))
+        words += _split_words(self.iteration)
+        return numpy.random.RandomState(words)
+
+    def _fuzz_v2(self):
+        rng = self._rng()
+        self.ratio = rng.uniform(self.range.min, self.range.max)
+
         range_list = self.options.get('range_list')
         if range_list:
-            max_index = len(self.input) - 1
-            for (start, end) in range_list:
-                if start > end:
-                    logger.warning('Skipping range_list item %s-%s (start exceeds end)', start, end)
-                    continue
-                elif start > max_index:
-                    # we can't go past the end of the file
-                    logger.debug('Skipping range_list item %s-%s (start exceeds max)', start, end)
-                    continue
-
-                # figure out where the actual end of this range is
-                last = min(end, max_index)
-                if last != end:
-                    logger.debug('Reset range end from to %s to %s (file length exceeded)', end, last)
-
-                # seems legit...proceed
-                chooselist.extend(xrange(start, last + 1))
+            byte_offsets = self.sf.offsets.bytes_including(self.input,
+                                                           range_list)
+            nbits = 8 * len(byte_offsets)
         else:
-            # they're all available to fuzz
-            chooselist.extend(xrange(len(self.input)))
-
-        # build the list of bits we're allowed to flip
-        # since chooselist is the list of bytes we can fuzz
-        # protobitlist will be the base position of the first
-        # bit we are allowed to fuzz in each of those bytes
-        protobitlist = [x * 8 for x in chooselist]
-        bitlist = []
-        for b in protobitlist:
-            for i in xrange(0, 8):
-                # here we fill in the actual bits we are
-                # allowed to fuzz
-                # this will add b, b+1, b+2...b+7
-                bitlist.append(b + i)
+            nbits = 8 * len(self.input)
+
+        # pick which of the fuzzable bits to flip
+        bit_flip_count = int(round(self.ratio * nbits))
+        picked = sample_distinct(rng, nbits, bit_flip_count)
+
+        if range_list:
+            # overlapping ranges can make two picks land on the same bit
+            picked = numpy.unique(byte_offsets[picked >> 3] * 8 + (picked & 7))
+
+        # flip them in place
+        data = numpy.frombuffer(self.input, dtype=numpy.uint8)
+        masks = numpy.left_shift(1, picked & 7).astype(numpy.uint8)
+        numpy.bitwise_xor.at(data, picked >> 3, masks)
+
+    def _fuzz_v1(self):
+        self.ratio = uniform(self.range.min, self.range.max)
+
+        # the bytes we're allowed to touch
+        byte_offsets = self.sf.offsets.bytes_including(self.input,
+                                                       self.options.get('range_list'))
+        nbits = 8 * len(byte_offsets)
 
         # calculate num of bits to flip
-        bit_flip_count = int(round(self.ratio * len(bitlist)))
-        indices_to_flip = sample(bitlist, bit_flip_count)
+        bit_flip_count = int(round(self.ratio * nbits))
+        # sample() only looks at the length of its population to decide
+        # which positions to pick, so sampling positions in the (never
+        # built) list of fuzzable bits picks the same bits as sampling the
+        # list itself did.
+        indices_to_flip = sample(xrange(nbits), bit_flip_count)
 
         # create mask to xor with input
         mask = bytearray(len(self.input))
         for i in indices_to_flip:
-            (byte_index, bit_index) = divmod(i, 8)
+            byte_index = byte_offsets[i >> 3]
+            bit_index = i & 7
             mask[byte_index] = mask[byte_index] | (1 << bit_index)
 
         # apply the mask to the input
         for idx, val in enumerate(self.input):
             self.input[idx] = mask[idx] ^ val
 
-        self.output = self.input
-
 _fuzzer_class = BitMutFuzzer
@@ -2,16 +2,21 @@ import logging
 import random
 
 from certfuzz.fuzzers.fuzzer_base import MinimizableFuzzer
-from certfuzz.fuzzers.fuzzer_base import is_fuzzable as _fuzzable
+from certfuzz.fuzztools.offset_index import excluding
 
 
 logger = logging.getLogger(__name__)
 
 
 def fuzz(fuzz_input=None, seed_val=None, jump_idx=None, ratio_min=0.0,
-         ratio_max=1.0, range_list=None, fuzzable_chars=None):
+         ratio_max=1.0, range_list=None, fuzzable_chars=None,
+         offsets=None):
     '''
     Twiddle bytes of input and return output
+
+    offsets is a sorted array of the offsets we may fuzz, as returned by
+    offset_index.excluding(fuzz_input, range_list, fuzzable_chars). It gets
+    built here if it isn't given.
     '''
     logging.debug('fuzz params: %d %d %f %f %s', seed_val, jump_idx, ratio_min, ratio_max, range_list)
 
@@ -29,16 +34,18 @@ def fuzz(fuzz_input=None, seed_val=None, jump_idx=None, ratio_min=0.0,
     if range_list:
         chunksize = inputlen
 
+    if offsets is None and (range_list or fuzzable_chars is not None):
+        offsets = excluding(fuzz_input, range_list, fuzzable_chars)
+
     for chunk_start in xrange(0, inputlen, chunksize):
         chunk_end = min(chunk_start + chunksize, inputlen)
         chunk_len = chunk_end - chunk_start
 
-        if range_list:
-            chooselist = [x for x in xrange(inputlen) if _fuzzable(x, range_list)]
-        else:
+        if offsets is None:
             chooselist = xrange(chunk_len)
-        if fuzzable_chars is not None:
-            chooselist = [x for x in chooselist if fuzz_input[x + chunk_start] in fuzzable_chars]
+        else:
+            (lo, hi) = offsets.searchsorted([chunk_start, chunk_end])
+            chooselist = (offsets[lo:hi] - chunk_start).tolist()
 
         nbytes_to_fuzz = int(round(ratio * len(chooselist)))
         bytes_to_fuzz = random.sample(chooselist, nbytes_to_fuzz)
@@ -59,10 +66,13 @@ class ByteMutFuzzer(MinimizableFuzzer):
     efficient.
     '''
     fuzzable_chars = None
+    supports_mmap = True
 
     def _fuzz(self):
         self.range = self.sf.rangefinder.next_item()
         range_list = self.options.get('range_list')
+        offsets = self.sf.offsets.bytes_excluding(self.input, range_list,
+                                                  self.fuzzable_chars)
 
         self.output = fuzz(fuzz_input=self.input,
                            seed_val=self.rng_seed,
@@ -71,6 +81,7 @@ class ByteMutFuzzer(MinimizableFuzzer):
                            ratio_max=self.range.max,
                            range_list=range_list,
                            fuzzable_chars=self.fuzzable_chars,
+                           offsets=offsets,
                            )
 
 _fuzzer_class = ByteMutFuzzer
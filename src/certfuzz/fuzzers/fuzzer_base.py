@@ -3,13 +3,13 @@ Created on Feb 3, 2012
 
 @organization: cert.org
 '''
-import StringIO
 import collections
 import logging
 import os
-import zipfile
 
-from certfuzz.fuzztools.filetools import find_or_create_dir, write_file
+from certfuzz.fuzztools.filetools import find_or_create_dir, map_file, \
+    write_file
+from certfuzz.fuzztools.zipcache import get_zip_contents
 from certfuzz.helpers.misc import log_object
 
 
@@ -20,6 +20,26 @@ BACKOFF_FACTOR = 2
 logger = logging.getLogger(__name__)
 
 
+# reusable input buffer for fuzzers with reuse_buffer set, and the seed
+# content it gets refilled from
+_buffer = bytearray()
+_buffer_src = {'md5': None, 'content': None}
+
+
+def reusable_input(seedfile):
+    '''
+    Returns the contents of seedfile in a bytearray that gets reused from one
+    call to the next. The seed is only read from disk when it changes.
+    Anything holding on to the previous result will see it get overwritten.
+    '''
+    if _buffer_src['md5'] != seedfile.md5:
+        _buffer_src['content'] = seedfile.read()
+        _buffer_src['md5'] = seedfile.md5
+    # slice assignment reuses the existing allocation when it can
+    _buffer[:] = _buffer_src['content']
+    return _buffer
+
+
 def logerror(func, path, excinfo):
     logger.warning('%s failed to remove %s: %s', func, path, excinfo)
 
@@ -51,6 +71,13 @@ class Fuzzer(object):
     # Not all fuzzers are minimizable. Default to false, and those
     # child classes that are can set it themselves
     is_minimizable = False
+    # fuzz in a shared buffer instead of a fresh copy of the seed (see
+    # reusable_input)
+    reuse_buffer = False
+    # fuzzers that only overwrite bytes in place (and don't care what kind
+    # of buffer self.input is, as long as it's indexable) can set this to
+    # fuzz large seeds in a copy-on-write mapping (see mmap_threshold)
+    supports_mmap = False
 
     def __init__(self, seedfile_obj, outdir_base, iteration, options):
         '''
@@ -84,28 +111,85 @@ class Fuzzer(object):
 
         log_object(self, logger)
 
+    @classmethod
+    def fuzz_batch(cls, seedfile, seednums, options=None, outdir_base=''):
+        '''
+        Fuzzes seedfile once for each of seednums. The seed is only read
+        once, and anything the fuzzer can work out from the seed and options
+        alone (zip contents, the list of fuzzable offsets, etc.) is reused
+        across the whole batch. Each output is the same as what you'd get from
+        the regular with/fuzz() path for that seednum.
+
+        This is a generator that yields a fuzzer per seednum, with the result
+        in its output attribute. Call write_fuzzed() on it to write the
+        result to disk.
+        :param seedfile: a SeedFile
+        :param seednums: an iterable of seednums (iterations)
+        :param options: the fuzzer options
+        :param outdir_base: where write_fuzzed() should put things
+        '''
+        if options is None:
+            options = {}
+        content = None
+        for seednum in seednums:
+            fuzzer = cls(seedfile, outdir_base, seednum, options)
+            if fuzzer._use_mmap():
+                fuzzer.input = map_file(seedfile.path)
+            else:
+                if content is None:
+                    content = seedfile.read()
+                fuzzer.input = bytearray(content)
+            fuzzer._validate()
+            fuzzer._prefuzz()
+            fuzzer._fuzz()
+            fuzzer._postfuzz()
+            yield fuzzer
+
     def __enter__(self):
         find_or_create_dir(self.tmpdir)
-        self.input = bytearray(self.sf.read())
+        if self._use_mmap():
+            logger.debug('Mapping %s (%d bytes)', self.sf.path, self.sf.len)
+            self.input = map_file(self.sf.path)
+        elif self.reuse_buffer:
+            self.input = reusable_input(self.sf)
+        else:
+            self.input = bytearray(self.sf.read())
         self._validate()
         return self
 
     def __exit__(self, etype, value, traceback):
         pass
 
+    def _use_mmap(self):
+        '''
+        Returns True if the seed is big enough to be fuzzed in a mapping
+        rather than read into memory
+        '''
+        threshold = self.options.get('mmap_threshold')
+        if not (self.supports_mmap and threshold):
+            return False
+        if self.sf.len < threshold:
+            return False
+        # zip seeds get their contents unpacked into memory anyway
+        return self.options.get('fuzz_zip_container') or not self.sf.is_zip
+
+    def _have_output(self):
+        # output may be a numpy array, which has no truth value
+        return self.output is not None and len(self.output) > 0
+
     def write_fuzzed(self, outdir=None):
         if outdir:
             outfile = os.path.join(outdir, self.basename_fuzzed)
         else:
             outfile = self.output_file_path
 
-        if self.output:
+        if self._have_output():
             write_file(self.output, outfile)
         self.output_file_path = outfile
         return os.path.exists(outfile)
 
     def fuzz(self):
-        if not self.output:
+        if not self._have_output():
             self._prefuzz()
             self._fuzz()
             self._postfuzz()
@@ -174,43 +258,19 @@ class MinimizableFuzzer(Fuzzer):
             return
 
         # If the seed is zip-based, fuzz the contents rather than the container
-        inmemseed = StringIO.StringIO(self.input)
         try:
-            tempzip = zipfile.ZipFile(inmemseed, 'r')
-        except:
+            self.zip_contents = get_zip_contents(self.sf.md5, self.input)
+        except Exception:
+            # BadZipfile or encrypted
             logger.warning('Bad zip file. Falling back to mutating container.')
             self.sf.is_zip = False
-            inmemseed.close()
             return
 
-        '''
-        get info on all the archived files and concatentate their contents
-        into self.input
-        '''
-        self.zipinput = bytearray()
-        logger.debug('Reading files from zip...')
-        for i in tempzip.namelist():
-            try:
-                data = tempzip.read(i)
-            except:
-                # BadZipfile or encrypted
-                logger.warning('Bad zip file. Falling back to mutating container.')
-                self.sf.is_zip = False
-                tempzip.close()
-                inmemseed.close()
-                return
-
-            # save split indices and compression type for archival
-            # reconstruction
-
-            # save compress type
-            self.saved_arcinfo[i] = (len(self.zipinput), len(data),
-                                    tempzip.getinfo(i).compress_type)
-            self.zipinput += data
-        tempzip.close()
-        inmemseed.close()
+        # save split indices and compression type for archival
+        # reconstruction
+        self.saved_arcinfo = self.zip_contents.arcinfo
         # Zip processing went fine, so use the zip contents as self.input to fuzzer
-        self.input = self.zipinput
+        self.input = bytearray(self.zip_contents.content)
 
     def _postfuzz(self):
         if self.options.get('fuzz_zip_container') or not self.sf.is_zip:
@@ -221,27 +281,5 @@ class MinimizableFuzzer(Fuzzer):
         of the archived files, otherwise we won't be able to properly
         split self.output
         '''
-
         logger.debug('Creating in-memory zip with mutated contents.')
-        inmemzip = StringIO.StringIO()
-        tempzip = zipfile.ZipFile(inmemzip, 'w')
-
-        '''
-        reconstruct archived files, using the same compression scheme as the
-        source
-        '''
-        for name, info in self.saved_arcinfo.iteritems():
-            # write out output file
-            if info[2] == 0 or info[2] == 8:
-                # Python zipfile only supports compression types 0 and 8
-                compressiontype = info[2]
-            else:
-                logger.warning('Compression type %s is not supported. Overriding', info[2])
-                compressiontype = 8
-            tempzip.writestr(name, str(self.output[info[0]:info[0] + info[1]]),
-                             compress_type=compressiontype)
-        tempzip.close()
-
-        # get the byte string version of the archive and put in self.output
-        self.output = inmemzip.getvalue()
-        inmemzip.close()
+        self.output = self.zip_contents.rebuild_str(self.output)
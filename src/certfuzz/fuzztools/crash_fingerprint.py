@@ -0,0 +1,196 @@
+'''
+Created on Oct 18, 2026
+
+Provides a cheap fingerprint for a crash: the signal plus the faulting
+instruction, as a module and offset, read straight out of the notes in the
+core file the kernel left behind. It takes a few small reads instead of a
+debugger run, so it can be used to spot crashes we already know about.
+
+@organization: cert.org
+'''
+import collections
+import glob
+import logging
+import os
+import struct
+
+logger = logging.getLogger(__name__)
+
+NT_PRSTATUS = 1
+NT_FILE = 0x46494c45
+PT_NOTE = 4
+ET_CORE = 4
+
+# e_machine -> (offset of pr_pid, offset of the pc in pr_reg) within
+# struct elf_prstatus
+_prstatus_layout = {3: (24, 72 + 12 * 4),  # i386: eip
+                    40: (24, 72 + 15 * 4),  # arm: r15
+                    62: (32, 112 + 16 * 8),  # x86_64: rip
+                    183: (32, 112 + 32 * 8),  # aarch64: pc
+                    }
+# pr_cursig is at the same place everywhere
+_CURSIG_OFFSET = 12
+
+# don't wander through huge note segments in broken cores
+MAX_NOTES_SIZE = 16 * 1024 * 1024
+
+CoreInfo = collections.namedtuple('CoreInfo', ['signal', 'pid', 'pc',
+                                               'mappings'])
+
+
+class CrashFingerprint(collections.namedtuple('CrashFingerprint',
+                                              ['signal', 'module', 'offset'])):
+    '''
+    Where and how a process died. module is the basename of the mapped file
+    the pc was in (or '' if it wasn't in one, in which case offset is the
+    pc itself).
+    '''
+    __slots__ = ()
+
+    def __str__(self):
+        return '%d:%s+%#x' % (self.signal, self.module, self.offset)
+
+
+def _unpack(fmt, data, offset):
+    return struct.unpack_from(fmt, data, offset)
+
+
+def _notes(data, endian):
+    '''
+    Yields (type, desc) for each note in a PT_NOTE segment
+    '''
+    pos = 0
+    while pos + 12 <= len(data):
+        (namesz, descsz, ntype) = _unpack(endian + 'III', data, pos)
+        pos += 12
+        pos += (namesz + 3) & ~3
+        desc = data[pos:pos + descsz]
+        pos += (descsz + 3) & ~3
+        yield (ntype, desc)
+
+
+def _mappings(desc, endian, word):
+    '''
+    Parses an NT_FILE note into a list of (start, end, file_offset, path)
+    '''
+    (count, page_size) = _unpack(endian + word * 2, desc, 0)
+    size = struct.calcsize(word)
+    pos = 2 * size
+    ranges = []
+    for _ in xrange(count):
+        ranges.append(_unpack(endian + word * 3, desc, pos))
+        pos += 3 * size
+    paths = desc[pos:].split('\0')
+    return [(start, end, ofs * page_size, path)
+            for ((start, end, ofs), path) in zip(ranges, paths)]
+
+
+def read_core(path):
+    '''
+    Reads the signal, pid and pc of the thread that crashed, along with the
+    mapped files, from the notes in the ELF core file at path. Returns a
+    CoreInfo, or None if it isn't a core we know how to read.
+    '''
+    try:
+        with open(path, 'rb') as f:
+            ident = f.read(16)
+            if len(ident) < 16 or ident[:4] != '\x7fELF':
+                return None
+            is_64 = ident[4] == '\x02'
+            endian = '<' if ident[5] == '\x01' else '>'
+            if is_64:
+                (word, ehdr, phdr) = ('Q', 'HHIQQQIHHHHHH', 'IIQQQQQQ')
+            else:
+                (word, ehdr, phdr) = ('I', 'HHIIIIIHHHHHH', 'IIIIIIII')
+
+            header = f.read(struct.calcsize(endian + ehdr))
+            fields = struct.unpack(endian + ehdr, header)
+            (e_type, e_machine) = fields[:2]
+            (e_phoff, e_phentsize, e_phnum) = (fields[4], fields[8], fields[9])
+            if e_type != ET_CORE or e_machine not in _prstatus_layout:
+                return None
+
+            segments = []
+            for i in xrange(e_phnum):
+                f.seek(e_phoff + i * e_phentsize)
+                ph = struct.unpack(endian + phdr,
+                                   f.read(struct.calcsize(endian + phdr)))
+                if is_64:
+                    (p_type, p_offset, p_filesz) = (ph[0], ph[2], ph[5])
+                else:
+                    (p_type, p_offset, p_filesz) = (ph[0], ph[1], ph[4])
+                if p_type == PT_NOTE:
+                    segments.append((p_offset, min(p_filesz, MAX_NOTES_SIZE)))
+
+            signal = pid = pc = None
+            mappings = []
+            for (p_offset, p_filesz) in segments:
+                f.seek(p_offset)
+                for (ntype, desc) in _notes(f.read(p_filesz), endian):
+                    if ntype == NT_PRSTATUS and pc is None:
+                        # the kernel puts the thread that died first
+                        (pid_ofs, pc_ofs) = _prstatus_layout[e_machine]
+                        signal = _unpack(endian + 'h', desc, _CURSIG_OFFSET)[0]
+                        pid = _unpack(endian + 'i', desc, pid_ofs)[0]
+                        pc = _unpack(endian + word, desc, pc_ofs)[0]
+                    elif ntype == NT_FILE:
+                        mappings = _mappings(desc, endian, word)
+    except (IOError, OSError, struct.error) as e:
+        logger.debug('Unable to read core %s: %s', path, e)
+        return None
+
+    if pc is None:
+        return None
+    return CoreInfo(signal, pid, pc, mappings)
+
+
+def from_core_info(info):
+    '''
+    Returns the CrashFingerprint for a CoreInfo
+    '''
+    for (start, end, file_offset, path) in info.mappings:
+        if start <= info.pc < end:
+            return CrashFingerprint(info.signal, os.path.basename(path),
+                                    info.pc - start + file_offset)
+    return CrashFingerprint(info.signal, '', info.pc)
+
+
+def find_core(dirname, pid=None):
+    '''
+    Returns the path to the core file the kernel would have left in dirname
+    (core.<pid> or core), or None if there isn't one
+    '''
+    candidates = [os.path.join(dirname, 'core')]
+    if pid is not None:
+        candidates.insert(0, os.path.join(dirname, 'core.%d' % pid))
+    else:
+        candidates.extend(glob.glob(os.path.join(dirname, 'core.*')))
+    found = [c for c in candidates if os.path.isfile(c)]
+    if not found:
+        return None
+    # newest first, in case some were left behind
+    return max(found, key=os.path.getmtime)
+
+
+def fingerprint_core(path, signal=None, pid=None):
+    '''
+    Returns a CrashFingerprint for the core file at path, or None if there
+    isn't a usable one. If signal or pid are given (e.g. from the runner's
+    wait status), a core that doesn't match them is taken to be left over
+    from some other crash and ignored.
+    '''
+    if not path:
+        return None
+    info = read_core(path)
+    if info is None:
+        return None
+    if signal is not None and info.signal != signal:
+        logger.debug('Core %s is from signal %d, not %d', path, info.signal,
+                     signal)
+        return None
+    if pid is not None and info.pid != pid:
+        logger.debug('Core %s is from pid %d, not %d', path, info.pid, pid)
+        return None
+    fingerprint = from_core_info(info)
+    logger.debug('Crash fingerprint: %s', fingerprint)
+    return fingerprint
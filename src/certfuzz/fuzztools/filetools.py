@@ -10,6 +10,7 @@ import errno
 import fnmatch
 import hashlib
 import logging
+import mmap
 import os
 import shutil
 import stat
@@ -17,6 +18,8 @@ import tempfile
 import time
 import zipfile
 
+import numpy
+
 
 MAXDEPTH = 5
 SLEEPTIMER = 0.5
@@ -228,12 +231,46 @@ def write_oneline_to_file(line, dst, mode):
 
 
 def get_file_md5(infile):
-    h = hashlib.md5()
+    return hash_file(infile)[1]
+
+
+# read files this much at a time when hashing them
+HASH_CHUNKSIZE = 2 ** 20
 
+
+def hash_file(infile, chunksize=HASH_CHUNKSIZE):
+    '''
+    Returns (length, md5, sha1) of infile. The file is read a chunk at a
+    time, so it never has to fit in memory.
+    :param infile: the path to the file
+    :param chunksize: how much to read at a time
+    '''
+    md5 = hashlib.md5()
+    sha1 = hashlib.sha1()
+    length = 0
     with open(infile, 'rb') as f:
-        h.update(f.read())
+        while True:
+            chunk = f.read(chunksize)
+            if not chunk:
+                break
+            md5.update(chunk)
+            sha1.update(chunk)
+            length += len(chunk)
+    return (length, md5.hexdigest(), sha1.hexdigest())
+
 
-    return h.hexdigest()
+def map_file(infile):
+    '''
+    Returns the contents of infile as a writable numpy uint8 array backed by
+    a copy-on-write mapping of the file. Changes to the array never reach
+    the file, and only the pages that actually get changed take up memory.
+    The mapping is released along with the array.
+    :param infile: the path to the file
+    '''
+    with open(infile, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    # the array holds on to the mapping
+    return numpy.frombuffer(mapped, dtype=numpy.uint8)
 
 
 @exponential_backoff
@@ -7,10 +7,15 @@ Provides the ability to calculate byte-wise or bit-wise Hamming Distance
 between objects. P
 '''
 import itertools
+import numpy
 import os
 
 from certfuzz.fuzztools.filetools import get_zipcontents
 
+# number of set bits in every possible byte value
+_POPCOUNT = [bin(i).count('1') for i in xrange(256)]
+POPCOUNT_TABLE = numpy.array(_POPCOUNT, dtype=numpy.uint8)
+
 def vector_compare(v1, v2):
     '''
     Given two sparse vectors (lists of indices whose value is 1), return the distance between them
@@ -91,16 +96,8 @@ def bitwise_hd(x, y):
     '''
     assert len(x) == len(y)
 
-    hd = 0
-    for (a, b) in itertools.izip(x, y):
-        a = ord(a)
-        b = ord(b)
-
-        v = a ^ b
-        while v:
-            v = v & (v - 1)
-            hd += 1
-    return hd
+    popcount = _POPCOUNT
+    return sum(popcount[ord(a) ^ ord(b)] for (a, b) in itertools.izip(x, y))
 
 
 def bitwise_hamming_distance(file1, file2):
@@ -118,3 +115,45 @@ def bitwise_zip_hamming_distance(file1, file2):
     unless file1 and file2 are the same size.
     '''
     return _file_compare(bitwise_hd, True, file1, file2)
+
+
+def to_uint8(s):
+    '''
+    Returns s as a numpy uint8 array. Strings are wrapped without copying,
+    arrays are passed through as-is.
+    '''
+    if isinstance(s, numpy.ndarray):
+        return s
+    if not isinstance(s, basestring):
+        # e.g., a list of 1-char strings
+        s = ''.join(s)
+    return numpy.frombuffer(s, dtype=numpy.uint8)
+
+
+def bytemap_array(a, b):
+    '''
+    Vectorized bytemap(). Takes strings or uint8 arrays, returns an array
+    of the indices where a and b differ.
+    '''
+    assert len(a) == len(b)
+    (a, b) = (to_uint8(a), to_uint8(b))
+    return numpy.flatnonzero(a != b)
+
+
+def bytewise_hd_array(a, b):
+    '''
+    Vectorized bytewise_hd(). Takes strings or uint8 arrays.
+    '''
+    assert len(a) == len(b)
+    (a, b) = (to_uint8(a), to_uint8(b))
+    return int(numpy.count_nonzero(a != b))
+
+
+def bitwise_hd_array(a, b):
+    '''
+    Vectorized bitwise_hd() using a popcount lookup table. Takes strings or
+    uint8 arrays.
+    '''
+    assert len(a) == len(b)
+    (a, b) = (to_uint8(a), to_uint8(b))
+    return int(POPCOUNT_TABLE[numpy.bitwise_xor(a, b)].sum(dtype=numpy.int64))
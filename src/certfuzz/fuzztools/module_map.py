@@ -0,0 +1,78 @@
+'''
+Created on Oct 18, 2026
+
+Keeps the address ranges of the modules loaded in a crashed process (as
+listed in a debugger's proc map or module list), sorted so that finding the
+module an address falls in is a bisection instead of a scan of every module.
+
+@organization: cert.org
+'''
+import bisect
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ModuleMap(object):
+    '''
+    The address ranges of loaded modules. An address is in a module if it
+    lies strictly between the module's start and end addresses. If modules
+    overlap, the one added first wins.
+    '''
+
+    def __init__(self, modules=None):
+        # (start, end, name) in the order they were added
+        self._modules = []
+        # sorted by start address, built on the first lookup after an add
+        self._starts = None
+        self._by_start = None
+        self._max_end = None
+        for module in modules or []:
+            self.add(*module)
+
+    def __len__(self):
+        return len(self._modules)
+
+    def __iter__(self):
+        return iter(self._modules)
+
+    def __contains__(self, address):
+        return self.find(address) is not None
+
+    def add(self, start, end, name):
+        self._modules.append((start, end, name))
+        self._starts = None
+
+    def _build(self):
+        self._by_start = sorted((start, end, order, name) for
+                                (order, (start, end, name)) in
+                                enumerate(self._modules))
+        self._starts = [m[0] for m in self._by_start]
+        # the furthest any module at or before each position reaches, so we
+        # know when there's no point looking further back for overlaps
+        self._max_end = []
+        furthest = None
+        for m in self._by_start:
+            furthest = max(furthest, m[1])
+            self._max_end.append(furthest)
+
+    def find(self, address):
+        '''
+        Returns the name of the module address lies in, or None
+        :param address: an int
+        '''
+        if self._starts is None:
+            self._build()
+
+        found = None
+        # modules that start before address
+        i = bisect.bisect_left(self._starts, address) - 1
+        while i >= 0 and self._max_end[i] > address:
+            (_start, end, order, name) = self._by_start[i]
+            if end > address and (found is None or order < found[0]):
+                found = (order, name)
+            i -= 1
+
+        if found is None:
+            return None
+        return found[1]
@@ -0,0 +1,133 @@
+'''
+Created on Oct 18, 2026
+
+Keeps the offsets a fuzzer is allowed to touch in a seed file, so they only
+get worked out once per seed file instead of once per iteration.
+
+@organization: cert.org
+'''
+import logging
+
+import numpy
+
+logger = logging.getLogger(__name__)
+
+
+def _ranges_key(range_list):
+    if not range_list:
+        return None
+    return tuple((start, end) for (start, end) in range_list)
+
+
+def _chars_key(fuzzable_chars):
+    if fuzzable_chars is None:
+        return None
+    return tuple(sorted(set(fuzzable_chars)))
+
+
+def excluding(content, exclude_list=None, fuzzable_chars=None):
+    '''
+    Returns a sorted array of the offsets in content that are not in any
+    (start, end) range of exclude_list (both ends inclusive). If
+    fuzzable_chars is given, only offsets holding one of those byte values
+    are kept.
+    :param content: a str or bytearray
+    :param exclude_list: a list of (start, end) tuples
+    :param fuzzable_chars: a list of byte values
+    '''
+    inputlen = len(content)
+    allowed = numpy.ones(inputlen, dtype=bool)
+    for (start, end) in exclude_list or []:
+        allowed[max(start, 0):max(end + 1, 0)] = False
+    if fuzzable_chars is not None:
+        data = numpy.frombuffer(buffer(content), dtype=numpy.uint8)
+        allowed &= numpy.in1d(data, list(fuzzable_chars))
+    return numpy.flatnonzero(allowed)
+
+
+def including(inputlen, range_list):
+    '''
+    Returns an array of the offsets covered by the (start, end) ranges in
+    range_list (both ends inclusive), in range_list order. Ranges are
+    clipped to inputlen, and ones that start past the end of the input are
+    skipped.
+    :param inputlen: the length of the input
+    :param range_list: a list of (start, end) tuples
+    '''
+    max_index = inputlen - 1
+    chunks = []
+    for (start, end) in range_list:
+        if start > end:
+            logger.warning('Skipping range_list item %s-%s (start exceeds end)', start, end)
+            continue
+        elif start > max_index:
+            # we can't go past the end of the file
+            logger.debug('Skipping range_list item %s-%s (start exceeds max)', start, end)
+            continue
+
+        # figure out where the actual end of this range is
+        last = min(end, max_index)
+        if last != end:
+            logger.debug('Reset range end from to %s to %s (file length exceeded)', end, last)
+
+        chunks.append(numpy.arange(start, last + 1))
+    if not chunks:
+        return numpy.arange(0)
+    return numpy.concatenate(chunks)
+
+
+class OffsetIndex(object):
+    '''
+    Caches the fuzzable offsets of a seed file's content for each set of
+    fuzzer options it's been asked about. Since a seed file's content
+    doesn't change, the same index can be shared by every fuzzer (and every
+    iteration) that works on it.
+    '''
+
+    def __init__(self):
+        self._cache = {}
+
+    def __getstate__(self):
+        # cheap to rebuild, no point in carrying it around
+        return {'_cache': {}}
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+
+    def _get(self, key, build):
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        value = build()
+        self._cache[key] = value
+        return value
+
+    def bytes_excluding(self, content, exclude_list=None, fuzzable_chars=None):
+        '''
+        Returns a sorted array of the offsets in content outside of
+        exclude_list, holding one of fuzzable_chars (if given).
+        Returns None if every offset is fuzzable.
+        '''
+        if not exclude_list and fuzzable_chars is None:
+            return None
+        key = ('exclude', len(content), _ranges_key(exclude_list),
+               _chars_key(fuzzable_chars))
+        return self._get(key, lambda: excluding(content, exclude_list,
+                                                fuzzable_chars))
+
+    def bytes_including(self, content, range_list=None):
+        '''
+        Returns an array of the offsets in content covered by range_list,
+        or all of them if there's no range_list.
+        '''
+        key = ('include', len(content), _ranges_key(range_list))
+
+        def build():
+            if range_list:
+                return including(len(content), range_list)
+            return numpy.arange(len(content))
+        return self._get(key, build)
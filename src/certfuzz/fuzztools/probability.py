@@ -9,6 +9,8 @@ looking for is how_many_misses_until_quit().
 import random
 import math
 
+import numpy
+
 
 def beta_estimate(m, N, a_prior=1.0, b_prior=1.0):
     numerator = alpha = m + a_prior
@@ -78,6 +80,33 @@ def p_max_hit(x, c=0.95):
     return p
 
 
+def sample_distinct(rng, n, k):
+    '''
+    Return a sorted numpy array of k distinct integers picked at random
+    from range(n), in O(k log k) time and O(k) space. The result only
+    depends on the state of rng.
+    @param rng: a numpy.random.RandomState
+    @param n: The size of the population
+    @param k: How many to pick
+    '''
+    if not 0 <= k <= n:
+        raise ValueError('sample larger than population')
+
+    if 2 * k > n:
+        # cheaper to pick the ones to leave out
+        left_out = sample_distinct(rng, n, n - k)
+        keep = numpy.ones(n, dtype=bool)
+        keep[left_out] = False
+        return numpy.flatnonzero(keep)
+
+    picked = numpy.unique(rng.randint(0, n, size=k))
+    while len(picked) < k:
+        # top up with as many as we're short, minus any repeats
+        more = rng.randint(0, n, size=k - len(picked))
+        picked = numpy.union1d(picked, more)
+    return picked
+
+
 class FuzzRun:
     '''
     Calculates various probabilities related to a fuzz run given:
@@ -24,8 +24,8 @@ class RangeFinder(MultiArmedBandit):
     as well as a picker method to randomly choose a range based on the probability distribution.
     '''
 
-    def __init__(self, low, high):
-        MultiArmedBandit.__init__(self)
+    def __init__(self, low, high, strategy=None, cost_aware=False):
+        MultiArmedBandit.__init__(self, strategy, cost_aware)
 
         self.min = low
         self.max = high
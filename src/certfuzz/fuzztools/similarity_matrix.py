@@ -9,22 +9,38 @@ import math
 import operator
 import sys
 
+import numpy
+
 from certfuzz.analyzers.callgrind.annotation_file import AnnotationFile
 from certfuzz.fuzztools.errors import SimilarityMatrixError
 from certfuzz.fuzztools.filetools import all_files_nonzero_length
-from certfuzz.fuzztools.vectors import compare
+
+try:
+    from scipy import sparse
+except ImportError:
+    # fall back to dense numpy arrays
+    sparse = None
 
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# how many similarities to work out at a time
+BLOCK_SIZE = 2 ** 22
+
 
 class SimilarityMatrix(object):
 
-    def __init__(self, dirs):
+    def __init__(self, dirs, top_k=None):
+        '''
+        :param dirs: the dirs to look for callgrind annotation files in
+        :param top_k: if set, only keep the similarities between each file
+        and the top_k files most like it instead of every pair of files
+        '''
         self.dirs = dirs
         self.pattern = '*.annotated'
         self.precision = '3'
+        self.top_k = top_k
 
         self.files = []
         # coverage is a dict of coverages keyed by file
@@ -83,18 +99,80 @@ class SimilarityMatrix(object):
             # store the vector for this file
             self.tf_idf[f] = tf_idf
 
+    def _unit_vectors(self):
+        '''
+        Returns the TF-IDF vectors of self.files as the rows of a matrix
+        (sparse if scipy is available), scaled to unit length so that their
+        dot products are their cosine similarities
+        '''
+        column = dict((term, n) for (n, term) in enumerate(self.idf))
+        rows = []
+        cols = []
+        weights = []
+        for (i, f) in enumerate(self.files):
+            for (term, weight) in self.tf_idf[f].iteritems():
+                rows.append(i)
+                cols.append(column[term])
+                weights.append(weight)
+        rows = numpy.array(rows, dtype=numpy.intp)
+        cols = numpy.array(cols, dtype=numpy.intp)
+        weights = numpy.array(weights, dtype=numpy.float64)
+
+        shape = (len(self.files), len(column))
+        norms = numpy.sqrt(numpy.bincount(rows, weights=weights * weights,
+                                          minlength=shape[0]))
+        # a file with nothing to weigh isn't like anything
+        norms[norms == 0] = 1.0
+        weights /= norms[rows]
+
+        if sparse is not None:
+            return sparse.csr_matrix((weights, (rows, cols)), shape=shape)
+        vectors = numpy.zeros(shape)
+        vectors[rows, cols] = weights
+        return vectors
+
+    def _similarity_rows(self):
+        '''
+        Yields (i, similarities of self.files[i] to each file) a block of
+        rows at a time, so the whole matrix never has to be in memory
+        '''
+        vectors = self._unit_vectors()
+        transposed = vectors.T
+        count = len(self.files)
+        block = max(1, BLOCK_SIZE // count)
+        for start in xrange(0, count, block):
+            sims = vectors[start:start + block].dot(transposed)
+            if sparse is not None:
+                sims = sims.toarray()
+            # round off floating point error (BFF-234)
+            sims = numpy.clip(numpy.round(sims, 6), 0.0, 1.0)
+            for (n, row) in enumerate(sims):
+                yield (start + n, row)
+
     def build_matrix(self):
         logger.info('Building similarity matrix')
         # we're only doing the lower triangle of the matrix since
         # a) it's symmetric
         # b) the diagonal is 1.0
-
-        for i in range(len(self.files)):
-            for j in range(i):
-                f = self.files[i]
-                g = self.files[j]
+        files = self.files
+        for (i, row) in self._similarity_rows():
+            f = files[i]
+            if self.top_k is None:
                 # create similarity matrix
-                self.sim[(f, g)] = compare(self.tf_idf[f], self.tf_idf[g])
+                self.sim.update(((f, files[j]), sim) for (j, sim) in
+                                enumerate(row[:i].tolist()))
+                continue
+
+            # just the nearest neighbors
+            row[i] = -1.0
+            k = min(self.top_k, len(files) - 1)
+            if k < 1:
+                continue
+            for j in numpy.argpartition(-row, k - 1)[:k].tolist():
+                if j < i:
+                    self.sim[(f, files[j])] = float(row[j])
+                else:
+                    self.sim[(files[j], f)] = float(row[j])
 
     def _crash_id_from_path(self, path):
         parts = path.split('/')
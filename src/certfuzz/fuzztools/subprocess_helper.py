@@ -118,6 +118,40 @@ def _kill(p, returncode, progname):  # @UnusedVariable
     return (0 != ret)
 
 
+def descendants(pid):
+    '''
+    Returns the pids of pid's children, their children, and so on. Only
+    works where there's a /proc to read; returns an empty list elsewhere.
+    @param pid: the process id to start from
+    '''
+    if not os.path.isdir('/proc'):
+        return []
+    children = {}
+    for folder in os.listdir('/proc'):
+        if not folder.isdigit():
+            continue
+        try:
+            with open(os.path.join('/proc', folder, 'stat')) as f:
+                stat = f.read()
+        except IOError:
+            # it went away, or we can't look at it
+            continue
+        # the command name is in parens and might contain spaces or parens
+        # itself, so the parent pid is the 2nd field after the last ')'
+        fields = stat.rsplit(')', 1)[-1].split()
+        if len(fields) < 2:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(folder))
+
+    found = []
+    todo = [pid]
+    while todo:
+        kids = children.get(todo.pop(), [])
+        found.extend(kids)
+        todo.extend(kids)
+    return found
+
+
 def killall(processname, killsignal):
     '''
     Python equivalent of the killall command
@@ -149,3 +183,41 @@ def killall(processname, killsignal):
             except OSError:
                 # skip it if the process has gone away on its own
                 continue
+
+
+def kill_in_dir(path, killsignal):
+    '''
+    Sends killsignal to the process group of every process whose working
+    directory is path (or somewhere under it). Processes in our own group
+    only get signaled themselves. Only works where there's a /proc to
+    read. Returns the number of processes found.
+    @param path: the directory
+    @param killsignal: signal to send
+    '''
+    if not os.path.isdir('/proc'):
+        return 0
+    path = os.path.realpath(path)
+    own_group = os.getpgid(0)
+    found = 0
+    for folder in os.listdir('/proc'):
+        if not folder.isdigit():
+            continue
+        try:
+            cwd = os.readlink(os.path.join('/proc', folder, 'cwd'))
+        except OSError:
+            # it went away, or we can't look at it
+            continue
+        if cwd != path and not cwd.startswith(path + os.sep):
+            continue
+        pid = int(folder)
+        found += 1
+        try:
+            pgid = os.getpgid(pid)
+            if pgid == own_group:
+                os.kill(pid, killsignal)
+            else:
+                os.killpg(pgid, killsignal)
+        except OSError:
+            # it's gone already
+            continue
+    return found
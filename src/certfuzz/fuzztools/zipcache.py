@@ -0,0 +1,182 @@
+'''
+Created on Oct 18, 2026
+
+Unpacks zip-based seed files once, and rebuilds them without recompressing
+the members a fuzzer (or minimizer) didn't touch.
+
+@organization: cert.org
+'''
+import StringIO
+import collections
+import logging
+import struct
+import time
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+# Python zipfile only supports compression types 0 and 8
+SUPPORTED_COMPRESSION = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+
+# how many unpacked seed files to keep around
+CACHE_SIZE = 8
+
+ZipMember = collections.namedtuple('ZipMember',
+                                   ['name', 'offset', 'length',
+                                    'compress_type', 'data', 'raw', 'crc'])
+
+
+def _read_raw(fp, zinfo):
+    '''
+    Returns the compressed bytes of the zinfo member, straight from fp
+    '''
+    fp.seek(zinfo.header_offset)
+    fheader = fp.read(zipfile.sizeFileHeader)
+    if len(fheader) != zipfile.sizeFileHeader:
+        raise zipfile.BadZipfile('Truncated file header')
+    fheader = struct.unpack(zipfile.structFileHeader, fheader)
+    if fheader[zipfile._FH_SIGNATURE] != zipfile.stringFileHeader:
+        raise zipfile.BadZipfile('Bad magic number for file header')
+    fp.seek(fheader[zipfile._FH_FILENAME_LENGTH] +
+            fheader[zipfile._FH_EXTRA_FIELD_LENGTH], 1)
+    return fp.read(zinfo.compress_size)
+
+
+def _new_zinfo(name, compress_type):
+    # the same defaults ZipFile.writestr() uses
+    zinfo = zipfile.ZipInfo(filename=name,
+                            date_time=time.localtime(time.time())[:6])
+    zinfo.compress_type = compress_type
+    if zinfo.filename[-1] == '/':
+        zinfo.external_attr = 0o40775 << 16
+        zinfo.external_attr |= 0x10
+    else:
+        zinfo.external_attr = 0o600 << 16
+    return zinfo
+
+
+def _write_raw(tempzip, member):
+    '''
+    Adds member to tempzip, reusing its already compressed bytes
+    '''
+    zinfo = _new_zinfo(member.name, member.compress_type)
+    zinfo.file_size = member.length
+    zinfo.compress_size = len(member.raw)
+    zinfo.CRC = member.crc
+    zinfo.header_offset = tempzip.fp.tell()
+    tempzip._writecheck(zinfo)
+    tempzip._didModify = True
+    zip64 = (zinfo.file_size > zipfile.ZIP64_LIMIT or
+             zinfo.compress_size > zipfile.ZIP64_LIMIT)
+    tempzip.fp.write(zinfo.FileHeader(zip64))
+    tempzip.fp.write(member.raw)
+    tempzip.filelist.append(zinfo)
+    tempzip.NameToInfo[zinfo.filename] = zinfo
+
+
+class ZipContents(object):
+    '''
+    The members of a zip file, along with their concatenated contents.
+    '''
+
+    def __init__(self, members):
+        self.members = members
+        self.content = ''.join(m.data for m in members)
+
+    @property
+    def arcinfo(self):
+        '''
+        Returns an OrderedDict of name -> (offset, length, compress_type)
+        '''
+        return collections.OrderedDict((m.name, (m.offset, m.length,
+                                                 m.compress_type))
+                                       for m in self.members)
+
+    def rebuild(self, content, fileobj):
+        '''
+        Writes a zip file to fileobj (a path or file-like object) with each
+        member's bytes taken from the matching slice of content. Members
+        whose bytes didn't change are copied over without recompressing.
+        Returns the number of members that had to be compressed.
+        Note: We assume that the lengths of the members haven't changed.
+        :param content: the (possibly mutated) concatenated contents
+        :param fileobj: where to write the zip
+        '''
+        compressed = 0
+        tempzip = zipfile.ZipFile(fileobj, 'w')
+        try:
+            for m in self.members:
+                data = content[m.offset:m.offset + m.length]
+                if m.compress_type not in SUPPORTED_COMPRESSION:
+                    logger.warning('Compression type %s is not supported. Overriding', m.compress_type)
+                    compress_type = zipfile.ZIP_DEFLATED
+                elif data == m.data:
+                    _write_raw(tempzip, m)
+                    continue
+                else:
+                    compress_type = m.compress_type
+                tempzip.writestr(m.name, str(data),
+                                 compress_type=compress_type)
+                compressed += 1
+        finally:
+            tempzip.close()
+        return compressed
+
+    def rebuild_str(self, content):
+        '''
+        Same as rebuild() but returns the zip as a string
+        '''
+        inmemzip = StringIO.StringIO()
+        self.rebuild(content, inmemzip)
+        value = inmemzip.getvalue()
+        inmemzip.close()
+        return value
+
+
+def read_zip(fileobj):
+    '''
+    Returns a ZipContents for the zip in fileobj (a path or file-like
+    object). Raises zipfile.BadZipfile (or whatever else zipfile raises) if
+    it can't be read.
+    '''
+    members = []
+    offset = 0
+    tempzip = zipfile.ZipFile(fileobj, 'r')
+    try:
+        for zinfo in tempzip.infolist():
+            data = tempzip.read(zinfo)
+            raw = _read_raw(tempzip.fp, zinfo)
+            members.append(ZipMember(zinfo.filename, offset, len(data),
+                                     zinfo.compress_type, data, raw,
+                                     zinfo.CRC))
+            offset += len(data)
+    finally:
+        tempzip.close()
+    return ZipContents(members)
+
+
+_cache = collections.OrderedDict()
+
+
+def get_zip_contents(md5, content):
+    '''
+    Returns the ZipContents for the zip with the given md5, unpacking it
+    from content (a str or bytearray) if it isn't cached already.
+    '''
+    try:
+        contents = _cache.pop(md5)
+    except KeyError:
+        inmemzip = StringIO.StringIO(str(content))
+        try:
+            contents = read_zip(inmemzip)
+        finally:
+            inmemzip.close()
+    # most recently used goes last
+    _cache[md5] = contents
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return contents
+
+
+def clear_cache():
+    _cache.clear()
@@ -3,10 +3,13 @@ Created on Feb 13, 2014
 
 @author: adh
 '''
+import atexit
 import logging
+import os
+import shutil
 import tempfile
 import abc
-from certfuzz.fuzztools.filetools import rm_rf
+from certfuzz.fuzztools.filetools import rm_rf, delete_contents_of
 from certfuzz.fuzzers.errors import FuzzerExhaustedError, \
     FuzzerInputMatchesOutputError, FuzzerError
 from certfuzz.minimizer.errors import MinimizerError
@@ -18,6 +21,49 @@ logger = logging.getLogger(__name__)
 IOERROR_COUNT = 0
 MAX_IOERRORS = 5
 
+# in-memory mode puts fuzzed files here when it can
+TMPFS_DIR = '/dev/shm'
+
+# (pid, workdirbase) -> scratch dir reused by in-memory iterations
+_scratch_dirs = {}
+
+
+def scratch_base(cfg, default=None):
+    '''
+    Returns the directory that in-memory iterations should put their files
+    in: runoptions.inmemory_dir if set, otherwise tmpfs if we have it,
+    otherwise default.
+    '''
+    base = cfg.get('runoptions', {}).get('inmemory_dir')
+    if base:
+        return os.path.expanduser(base)
+    if os.path.isdir(TMPFS_DIR) and os.access(TMPFS_DIR, os.W_OK):
+        return TMPFS_DIR
+    return default
+
+
+def get_scratch_dir(cfg, workdirbase):
+    '''
+    Returns a scratch dir that gets reused by every in-memory iteration in
+    this process, creating it on first use.
+    '''
+    key = (os.getpid(), workdirbase)
+    if key not in _scratch_dirs:
+        d = tempfile.mkdtemp(prefix='bff_scratch_',
+                             dir=scratch_base(cfg, workdirbase))
+        _scratch_dirs[key] = d
+        logger.debug('scratch dir=%s', d)
+    return _scratch_dirs[key]
+
+
+def _remove_scratch_dirs():
+    for (pid, _base), d in _scratch_dirs.items():
+        if pid == os.getpid():
+            shutil.rmtree(d, ignore_errors=True)
+
+
+atexit.register(_remove_scratch_dirs)
+
 
 class IterationBase(object):
     __metaclass__ = abc.ABCMeta
@@ -31,9 +77,11 @@ class IterationBase(object):
                  outdir=None,
                  sf_set=None,
                  uniq_func=None,
+                 sig_index=None,
                  config=None,
                  fuzzer_cls=None,
                  runner_cls=None,
+                 analysis_queue=None,
                  ):
 
         logger.debug('init')
@@ -47,6 +95,12 @@ class IterationBase(object):
         self.runner_cls = runner_cls
 
         self.r = None
+        self.fuzzed_file = None
+        self.saw_crash = False
+        # where the runner says the target died, if it knows
+        self.fingerprint = None
+        # how long the runner took, for cost-aware scheduling
+        self.run_seconds = 0.0
 
         minimizable = self.fuzzer_cls.is_minimizable and self.cfg[
             'runoptions'].get('minimize', False)
@@ -56,11 +110,24 @@ class IterationBase(object):
         self.pipeline_options = {'minimizable': minimizable, }
 
         if uniq_func is None:
-            self.uniq_func = lambda _tc_id: True
+            self.uniq_func = lambda _tc_id, **_kwargs: True
         else:
             self.uniq_func = uniq_func
+        # where to record what we learn about crash signatures
+        self.sig_index = sig_index
+        # if set, crashes get handed off to it (see
+        # certfuzz.campaign.analysis_pool) instead of analyzed right here
+        self.analysis_queue = analysis_queue
+        self.deferred = False
+        # gets each testcase once the pipeline has verified it
+        self.verified_func = None
+        self.recycled = []
 
         self.working_dir = None
+        # in-memory mode: fuzz into a reused buffer and a scratch dir that's
+        # on tmpfs if possible, and only get a dir of our own if we need one
+        self.inmemory = self.cfg['runoptions'].get('inmemory', False)
+        self.in_scratch = False
 
         self.testcases = []
 
@@ -80,8 +147,14 @@ class IterationBase(object):
         '''
 
     def __enter__(self):
-        self.working_dir = tempfile.mkdtemp(prefix=self._tmpdir_pfx,
-                                            dir=self.workdirbase)
+        # a worker process may have already created our working dir
+        # (see resume())
+        if self.working_dir is None and self.inmemory:
+            self.working_dir = get_scratch_dir(self.cfg, self.workdirbase)
+            self.in_scratch = True
+        elif self.working_dir is None:
+            self.working_dir = tempfile.mkdtemp(prefix=self._tmpdir_pfx,
+                                                dir=self.workdirbase)
         logger.debug('workdir=%s', self.working_dir)
 #        self._setup_analysis_pipeline()
 
@@ -96,7 +169,10 @@ class IterationBase(object):
         # increment the seedfile try counter
         self.seedfile.tries += 1
 
-        if self.success:
+        if self.deferred:
+            # the analysis queue scores it once the crash is verified
+            pass
+        elif self.success:
             # score it so we can learn
             self.record_success()
         else:
@@ -146,16 +222,40 @@ class IterationBase(object):
             # leave it behind if we're in debug mode
             # and there's a problem
             logger.debug('Skipping cleanup since we are in debug mode.')
+            if self.in_scratch:
+                # the next iteration would clobber it
+                self._leave_scratch()
             return handled
 
         # clean up
-        rm_rf(self.working_dir)
+        if self.in_scratch:
+            # empty it out for the next iteration, but keep the dir
+            delete_contents_of([self.working_dir])
+        else:
+            rm_rf(self.working_dir)
 
         return handled
 
+    def _leave_scratch(self):
+        '''
+        Moves whatever is in the scratch dir into a working dir of our own,
+        for when there's something worth keeping.
+        '''
+        working_dir = tempfile.mkdtemp(prefix=self._tmpdir_pfx,
+                                       dir=self.workdirbase)
+        for name in os.listdir(self.working_dir):
+            shutil.move(os.path.join(self.working_dir, name), working_dir)
+        if self.fuzzed_file is not None:
+            self.fuzzed_file = os.path.join(working_dir,
+                                            os.path.basename(self.fuzzed_file))
+        logger.debug('workdir=%s', working_dir)
+        self.working_dir = working_dir
+        self.in_scratch = False
+
     def _pre_fuzz(self):
         self.fuzzer = self.fuzzer_cls(
             self.seedfile, self.working_dir, self.seednum, self._fuzz_opts)
+        self.fuzzer.reuse_buffer = self.inmemory
 
     def _fuzz(self):
         with self.fuzzer:
@@ -165,11 +265,13 @@ class IterationBase(object):
         if self.r is not None:
             logger.debug('Selected r: %s', self.r)
 
+        self.fuzzed_file = self.fuzzer.output_file_path
+
     def _post_fuzz(self):
         pass
 
     def _pre_run(self):
-        fuzzed_file = self.fuzzer.output_file_path
+        fuzzed_file = self.fuzzed_file
         workingdir_base = self.working_dir
         self.cmd_template = self.cfg['target']['cmdline_template']
 
@@ -192,6 +294,10 @@ class IterationBase(object):
         with self.runner:
             self.runner.run()
 
+        self.saw_crash = self.runner.saw_crash
+        self.fingerprint = self.runner.fingerprint
+        self.run_seconds = self.runner.elapsed
+
     def _post_run(self):
         pass
 
@@ -200,9 +306,13 @@ class IterationBase(object):
         If the runner saw a crash, construct a test case
         and append it to the list of testcases to be analyzed further.
         '''
-        if not self.runner.saw_crash:
+        if not self.saw_crash:
             return
 
+        if self.in_scratch:
+            # testcases get built and analyzed in our working dir
+            self._leave_scratch()
+
         logger.debug('Building testcase object')
         self._construct_testcase()
 
@@ -230,6 +340,8 @@ class IterationBase(object):
         self._post_run()
 
     def record_success(self):
+        # successes don't count as trials (see BFF-521), so their run time
+        # doesn't get charged either, or it would skew seconds per trial
         self.sf_set.record_success(key=self.seedfile.md5)
         if hasattr(self.r, 'id'):
             self.seedfile.rangefinder.record_success(key=self.r.id)
@@ -240,9 +352,11 @@ class IterationBase(object):
     def record_tries(self):
         if self.seedfile.md5 in self.sf_set.arms:
             # Only record tries for seedfiles that haven't been removed
-            self.sf_set.record_tries(key=self.seedfile.md5, tries=1)
+            self.sf_set.record_tries(key=self.seedfile.md5, tries=1,
+                                     seconds=self.run_seconds)
             if hasattr(self.r, 'id'):
-                self.seedfile.rangefinder.record_tries(key=self.r.id, tries=1)
+                self.seedfile.rangefinder.record_tries(key=self.r.id, tries=1,
+                                                       seconds=self.run_seconds)
 
     def process_testcases(self):
         if not len(self.testcases):
@@ -252,6 +366,9 @@ class IterationBase(object):
         # hand it off to our pipeline class
         with self.tcpipeline_cls(testcases=self.testcases,
                                  uniq_func=self.uniq_func,
+                                 sig_index=self.sig_index,
+                                 seednum=self.seednum,
+                                 verified_func=self.verified_func,
                                  cfg=self.cfg,
                                  options=self.pipeline_options,
                                  outdir=self.outdir,
@@ -260,10 +377,52 @@ class IterationBase(object):
             pipeline.go()
 
         self.success = pipeline.success
+        self.recycled = pipeline.recycled
+
+    def analyze_crash(self):
+        '''
+        Builds and analyzes a testcase if the runner saw a crash, or hands it
+        off to the analysis queue if there is one.
+        '''
+        if self.saw_crash and self.analysis_queue is not None:
+            self._defer_analysis()
+            return
+        self.construct_testcase()
+        self.process_testcases()
+
+    def _defer_analysis(self):
+        self.analysis_queue.submit(seedfile=self.seedfile,
+                                   seednum=self.seednum,
+                                   range_obj=self.r,
+                                   working_dir=self.working_dir,
+                                   fuzzed_file=self.fuzzed_file,
+                                   fingerprint=self.fingerprint,
+                                   run_seconds=self.run_seconds)
+        self.deferred = True
+
+    def resume(self, result):
+        '''
+        Picks up an iteration that a worker process has already fuzzed and
+        run (see certfuzz.campaign.worker_pool) and carries on from there.
+        The working dir must already have been set to result.working_dir.
+        :param result: an IterationResult
+        '''
+        logger.debug('resume')
+        if result.error is not None:
+            # let __exit__ deal with it as if it had happened here
+            raise result.error
+
+        self.r = result.range
+        self.fuzzed_file = result.fuzzed_file
+        self.saw_crash = result.saw_crash
+        self.fingerprint = result.fingerprint
+        self.run_seconds = result.run_seconds
+        self.cmd_template = self.cfg['target']['cmdline_template']
+
+        self.analyze_crash()
 
     def go(self):
         logger.debug('go')
         self.fuzz()
         self.run()
-        self.construct_testcase()
-        self.process_testcases()
+        self.analyze_crash()
@@ -28,9 +28,11 @@ class LinuxIteration(IterationBase):
                  outdir=None,
                  sf_set=None,
                  uniq_func=None,
+                 sig_index=None,
                  config=None,
                  fuzzer_cls=None,
                  runner_cls=None,
+                 analysis_queue=None,
                  ):
 
         IterationBase.__init__(self,
@@ -40,9 +42,11 @@ class LinuxIteration(IterationBase):
                                outdir=outdir,
                                sf_set=sf_set,
                                uniq_func=uniq_func,
+                               sig_index=sig_index,
                                config=config,
                                fuzzer_cls=fuzzer_cls,
                                runner_cls=runner_cls,
+                               analysis_queue=analysis_queue,
                                )
 
         self.testcase_base_dir = os.path.join(self.outdir, 'crashers')
@@ -59,23 +63,26 @@ class LinuxIteration(IterationBase):
         return IterationBase.__enter__(self)
 
     def _construct_testcase(self):
-        with LinuxTestcase(cfg=self.cfg,
-                           seedfile=self.seedfile,
-                           fuzzedfile=BasicFile(self.fuzzer.output_file_path),
-                           program=self.cfg['target']['program'],
-                           cmd_template=self.cmd_template,
-                           debugger_timeout=self.cfg['debugger']['runtimeout'],
-                           cmdlist=get_command_args_list(self.cmd_template,
-                                                         infile=self.fuzzer.output_file_path,
-                                                         posix=True)[1],
-                           backtrace_lines=self.cfg[
-                               'debugger']['backtracelevels'],
-                           crashers_dir=self.testcase_base_dir,
-                           workdir_base=self.working_dir,
-                           keep_faddr=self.cfg['runoptions'].get(
-                               'keep_unique_faddr', False),
-                           save_failed_asserts=self.cfg['analyzer'].get(
-                               'savefailedasserts', False),
-                           exclude_unmapped_frames=self.cfg['analyzer']['exclude_unmapped_frames']) as testcase:
-            # put it on the list for the analysis pipeline
-            self.testcases.append(testcase)
+        # The debugger doesn't get run on it until the pipeline's verify
+        # step, which may not need to run it at all
+        testcase = LinuxTestcase(cfg=self.cfg,
+                                 seedfile=self.seedfile,
+                                 fuzzedfile=BasicFile(self.fuzzed_file),
+                                 program=self.cfg['target']['program'],
+                                 cmd_template=self.cmd_template,
+                                 debugger_timeout=self.cfg['debugger']['runtimeout'],
+                                 cmdlist=get_command_args_list(self.cmd_template,
+                                                               infile=self.fuzzed_file,
+                                                               posix=True)[1],
+                                 backtrace_lines=self.cfg[
+                                     'debugger']['backtracelevels'],
+                                 crashers_dir=self.testcase_base_dir,
+                                 workdir_base=self.working_dir,
+                                 keep_faddr=self.cfg['runoptions'].get(
+                                     'keep_unique_faddr', False),
+                                 save_failed_asserts=self.cfg['analyzer'].get(
+                                     'savefailedasserts', False),
+                                 exclude_unmapped_frames=self.cfg['analyzer']['exclude_unmapped_frames'],
+                                 fingerprint=self.fingerprint)
+        # put it on the list for the analysis pipeline
+        self.testcases.append(testcase)
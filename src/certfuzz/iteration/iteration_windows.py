@@ -30,6 +30,7 @@ class WindowsIteration(IterationBase):
                  outdir=None,
                  sf_set=None,
                  uniq_func=None,
+                 sig_index=None,
                  config=None,
                  fuzzer_cls=None,
                  runner_cls=None,
@@ -42,6 +43,7 @@ class WindowsIteration(IterationBase):
                                outdir=outdir,
                                sf_set=sf_set,
                                uniq_func=uniq_func,
+                               sig_index=sig_index,
                                config=config,
                                fuzzer_cls=fuzzer_cls,
                                runner_cls=runner_cls,
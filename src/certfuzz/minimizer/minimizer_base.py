@@ -11,20 +11,25 @@ import os
 import random
 import shutil
 import tempfile
+import threading
 import time
-import zipfile
 import collections
+import signal
 
 from certfuzz.file_handlers.basicfile import BasicFile
 from certfuzz.fuzztools import hamming, filetools, probability, text
 from certfuzz.fuzztools.filetools import delete_files, write_file, check_zip_file
 from certfuzz.fuzztools.filetools import exponential_backoff
+from certfuzz.fuzztools.zipcache import read_zip
 from certfuzz.minimizer.errors import MinimizerError
 from certfuzz.analyzers import pin_calltrace
 from certfuzz.analyzers.errors import AnalyzerEmptyOutputError
 from certfuzz.debuggers.output_parsers.calltracefile import Calltracefile
 from certfuzz.fuzztools.command_line_templating import get_command_args_list
 import copy
+from multiprocessing import TimeoutError
+from multiprocessing.pool import ThreadPool
+from certfuzz.fuzztools.subprocess_helper import kill_in_dir
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,12 @@ logger = logging.getLogger(__name__)
 # going to abort the minimization early
 MAX_OTHER_CRASHES = 20
 
+# valid values for runoptions.minimize_strategy
+MINIMIZE_STRATEGIES = ('probabilistic', 'ddmin')
+
+# valid values for runoptions.minimize_parallel_keep
+PARALLEL_KEEP = ('first', 'lowest_hd')
+
 
 class Minimizer(object):
     use_watchdog = False
@@ -72,6 +83,7 @@ class Minimizer(object):
         logger.setLevel(logging.INFO)
 
         self.saved_arcinfo = None
+        self.zip_contents = None
         self.is_zipfile = check_zip_file(testcase.fuzzedfile.path)
 
         if tempdir and os.path.isdir(tempdir):
@@ -81,10 +93,30 @@ class Minimizer(object):
 
         logger.debug('Minimizer tempdir is %s', self.tempdir)
 
+        self.strategy = str(
+            cfg['runoptions'].get('minimize_strategy', 'probabilistic')).lower()
+        if self.strategy not in MINIMIZE_STRATEGIES:
+            self._raise('Unknown minimize_strategy: %s' % self.strategy)
+
+        # vectorized mode does the swapping with numpy, and only looks at the
+        # bytes that differ between the seed and the fuzzed content
+        self.vectorized = bool(
+            cfg['runoptions'].get('minimize_vectorized', False))
+        # seeded from random so that random.seed() still makes runs repeatable
+        self._np_random = numpy.random.RandomState(random.getrandbits(32))
+        self._np_state = None
+        self._np_candidate = None
+
         # decide whether we're doing a bitwise comparison or bytewise
-        if self.bitwise:
+        if self.bitwise and self.vectorized:
+            self.hd_func = hamming.bitwise_hd_array
+            self.swap_func = self.bitwise_swap_array
+        elif self.bitwise:
             self.hd_func = hamming.bitwise_hd
             self.swap_func = self.bitwise_swap2
+        elif self.vectorized:
+            self.hd_func = hamming.bytewise_hd_array
+            self.swap_func = self.bytewise_swap_array
         else:
             self.hd_func = hamming.bytewise_hd
             self.swap_func = self.bytewise_swap2
@@ -156,6 +188,9 @@ class Minimizer(object):
         self.files_tried = set()
         self.files_tried_at_hd = {}
         self.files_tried_singlebyte_at_hd = {}
+        # content md5 -> is_same_crash() result, for ddmin
+        self.ddmin_results = {}
+        self._ddmin_fuzzed = None
         self.bytemap = []
 #         self.saved_arcinfo = {}
 #         self.is_zipfile = False
@@ -197,6 +232,31 @@ class Minimizer(object):
             logger.debug("Executing postprocess " + postprocessfuzzed)
             os.system(postprocessfuzzed)
 
+        # speculative parallel trials: draw this many candidates at a time
+        # and run the debugger on them concurrently
+        self.parallel_trials = int(
+            cfg['runoptions'].get('minimize_parallel_trials', 1) or 1)
+        self.parallel_keep = str(
+            cfg['runoptions'].get('minimize_parallel_keep', 'first')).lower()
+        if self.parallel_keep not in PARALLEL_KEEP:
+            self._raise('Unknown minimize_parallel_keep: %s' %
+                        self.parallel_keep)
+        if self.parallel_trials > 1 and ('copyfuzzedto' in self.cfg['target'] or
+                                         'postprocessfuzzed' in self.cfg['target']):
+            # these need the one and only fuzzed file location
+            logger.warning(
+                'Parallel minimizer trials do not work with copyfuzzedto or postprocessfuzzed. Using 1.')
+            self.parallel_trials = 1
+        self._batch = collections.deque()
+        self._batch_key = None
+        # content md5 -> (signature, signal) for speculative trials
+        self._batch_results = {}
+        self._trial_files = []
+        self._thread_pool = None
+        # paths of trials that were called off after another one hit
+        self._cancelled = set()
+        self._runs_lock = threading.Lock()
+
         # figure out what testcase signatures belong to this fuzzedfile
         self.debugger_timeout = self.cfg['debugger']['runtimeout']
         self.crash_hashes = []
@@ -234,6 +294,9 @@ class Minimizer(object):
         return self
 
     def __exit__(self, etype, value, traceback):
+        if self._thread_pool is not None:
+            self._thread_pool.close()
+            self._thread_pool.join()
         self.log_file_hdlr.close()
         self.logger.removeHandler(self.log_file_hdlr)
         if not etype:
@@ -287,32 +350,17 @@ class Minimizer(object):
     def _readzip(self, filepath):
         # If the seed is zip-based, fuzz the contents rather than the container
         logger.debug('Reading zip file: %s', filepath)
-        tempzip = zipfile.ZipFile(filepath, 'r')
+        self.zip_contents = read_zip(filepath)
 
-        '''
-        get info on all the archived files and concatentate their contents
-        into self.input
-        '''
-        self.saved_arcinfo = collections.OrderedDict()
-        unzippedbytes = ''
-        logger.debug('Reading files from zip...')
-        for i in tempzip.namelist():
-            data = tempzip.read(i)
-
-            # save split indices and compression type for archival
-            # reconstruction. Keeping the same compression types is
-            # probably unnecessary since it's the content that matters
-
-            self.saved_arcinfo[i] = (len(unzippedbytes), len(data),
-                                     tempzip.getinfo(i).compress_type)
-            unzippedbytes += data
-        tempzip.close()
-        return unzippedbytes
+        # save split indices and compression type for archival
+        # reconstruction. Keeping the same compression types is
+        # probably unnecessary since it's the content that matters
+        self.saved_arcinfo = self.zip_contents.arcinfo
+        return self.zip_contents.content
 
     @exponential_backoff
-    def _safe_createzip(self, filepath):
-        tempzip = zipfile.ZipFile(filepath, 'w')
-        return tempzip
+    def _safe_open(self, filepath):
+        return open(filepath, 'wb')
 
     def _writezip(self):
         '''rebuild the zip file and put it in self.fuzzed
@@ -323,28 +371,13 @@ class Minimizer(object):
         if self.saved_arcinfo is None:
             self._raise('_readzip was not called')
 
-        filedata = ''.join(self.newfuzzed)
+        filedata = self._newfuzzed_bytes()
         filepath = self.tempfile
 
         logger.debug('Creating zip with mutated contents.')
-        tempzip = self._safe_createzip(filepath)
-
-        '''
-        reconstruct archived files, using the same compression scheme as
-        the source
-        '''
-        for name, info in self.saved_arcinfo.iteritems():
-            # write out fuzzed file
-            if info[2] == 0 or info[2] == 8:
-                # Python zipfile only supports compression types 0 and 8
-                compressiontype = info[2]
-            else:
-                logger.warning(
-                    'Compression type %s is not supported. Overriding', info[2])
-                compressiontype = 8
-            tempzip.writestr(
-                name, str(filedata[info[0]:info[0] + info[1]]), compress_type=compressiontype)
-        tempzip.close()
+        # only the members that changed get recompressed
+        with self._safe_open(filepath) as fp:
+            self.zip_contents.rebuild(filedata, fp)
 
     def _logger_setup(self):
         dirname = os.path.dirname(self.minimizer_logfile)
@@ -422,12 +455,18 @@ class Minimizer(object):
 
         return self.crash_hashes
 
-    def run_debugger(self, infile, outfile):
-        self.debugger_runs += 1
+    def run_debugger(self, infile, outfile, workingdir=None,
+                     kill_by_name=True):
+        # speculative trials call us from multiple threads
+        with self._runs_lock:
+            self.debugger_runs += 1
         cmd_args = get_command_args_list(
             self.cfg['target']['cmdline_template'], infile)[1]
         cmd = cmd_args[0]
         cmd_args = cmd_args[1:]
+        if workingdir and os.path.exists(cmd):
+            # a relative program path won't resolve from somewhere else
+            cmd = os.path.abspath(cmd)
 
         exclude_unmapped_frames = self.cfg['analyzer'].get(
             'exclude_unmapped_frames', True)
@@ -439,15 +478,20 @@ class Minimizer(object):
                                  template=self.testcase.debugger_template,
                                  exclude_unmapped_frames=exclude_unmapped_frames,
                                  keep_uniq_faddr=self.keep_uniq_faddr,
-                                 workingdir=self.tempdir,
-                                 watchcpu=self.watchcpu
+                                 workingdir=workingdir or self.tempdir,
+                                 kill_by_name=kill_by_name,
+                                 watchcpu=self.watchcpu,
+                                 persistent=self.cfg['debugger'].get(
+                                     'persistent_sessions', False)
                                  )
         parsed_debugger_output = dbg.go()
 
         return parsed_debugger_output
 
-    def _crash_builder(self):
+    def _crash_builder(self, infile=None):
         self.logger.debug('Building new testcase object.')
+        if infile is None:
+            infile = self.tempfile
 
         # copy our original testcase as the basis for the new testcase
         new_testcase = copy.deepcopy(self.testcase)
@@ -470,13 +514,13 @@ class Minimizer(object):
 
         if os.path.exists(outfile):
             self._raise('Outfile should not already exist: %s' % outfile)
-        self.logger.debug('\tCopying %s to %s', self.tempfile, outfile)
-        filetools.copy_file(self.tempfile, outfile)
+        self.logger.debug('\tCopying %s to %s', infile, outfile)
+        filetools.copy_file(infile, outfile)
 
         if 'copyfuzzedto' in self.cfg['target']:
             copyfuzzedto = str(self.cfg['target'].get('copyfuzzedto', ''))
             logger.debug("Copying fuzzed file to " + copyfuzzedto)
-            filetools.copy_file(self.tempfile, copyfuzzedto)
+            filetools.copy_file(infile, copyfuzzedto)
 
         if 'postprocessfuzzed' in self.cfg['target']:
             postprocessfuzzed = str(self.cfg['target']['postprocessfuzzed'])
@@ -529,7 +573,15 @@ class Minimizer(object):
         return signature
 
     def is_same_crash(self):
+        (newfuzzed_hash, signal) = self._debug_signature(self.tempfile)
+        return self._record_signature(newfuzzed_hash, signal, self.tempfile)
 
+    def _debug_signature(self, infile, workingdir=None, kill_by_name=True):
+        '''
+        Runs the debugger on infile and returns a (signature, signal) tuple.
+        The signature is None if there was no crash. Speculative trials call
+        this from multiple threads.
+        '''
         # get debugger output filename
         (fd, f) = tempfile.mkstemp(
             dir=self.tempdir, prefix="minimizer_is_same_crash_")
@@ -540,12 +592,25 @@ class Minimizer(object):
             raise MinimizerError('Unable to get temporary debug file')
 
         # create debugger output
-        dbg = self.run_debugger(self.tempfile, f)
+        dbg = self.run_debugger(infile, f, workingdir, kill_by_name)
 
         if dbg.is_crash:
             newfuzzed_hash = self.get_signature(dbg, self.backtracelevels)
         else:
             newfuzzed_hash = None
+
+        # ditch the temp file
+        delete_files(dbg.file)
+        if os.path.exists(dbg.file):
+            raise MinimizerError('Unable to remove temporary debug file')
+
+        return (newfuzzed_hash, dbg.signal)
+
+    def _record_signature(self, newfuzzed_hash, signal, infile):
+        '''
+        Tallies up a signature we got from infile, and returns True if it's
+        one of the crashes we're minimizing.
+        '''
         # initialize or increment the counter for this hash
         if newfuzzed_hash in self.crash_sigs_found:
             self.crash_sigs_found[newfuzzed_hash] += 1
@@ -556,13 +621,13 @@ class Minimizer(object):
             # the testcase is new to this minimization run
             self.crash_sigs_found[newfuzzed_hash] = 1
             self.logger.info(
-                'testcase=%s signal=%s', newfuzzed_hash, dbg.signal)
+                'testcase=%s signal=%s', newfuzzed_hash, signal)
 
             if self.save_others and newfuzzed_hash not in self.crash_hashes:
                 # the testcase is not one of the crashes we're looking for
                 # so add it to the other_crashes dict in case our
                 # caller wants to do something with it
-                newcrash = self._crash_builder()
+                newcrash = self._crash_builder(infile)
                 if newcrash.is_crash:
                     # note that since we're doing this every time we see a testcase
                     # that's not in self.crash_hashes, we're also effectively
@@ -571,11 +636,6 @@ class Minimizer(object):
                     # process
                     self.other_crashes[newfuzzed_hash] = newcrash
 
-        # ditch the temp file
-        delete_files(dbg.file)
-        if os.path.exists(dbg.file):
-            raise MinimizerError('Unable to remove temporary debug file')
-
         return newfuzzed_hash in self.crash_hashes
 
     def set_discard_chance(self):
@@ -654,11 +714,21 @@ class Minimizer(object):
         # otherwise return true
         return(self.use_timer and (elapsed_time > self.max_time))
 
+    def _newfuzzed_bytes(self):
+        '''
+        Returns the current candidate as a string. The vectorized swap
+        functions already hand back strings, and joining those a character
+        at a time would cost more than the swap itself.
+        '''
+        if isinstance(self.newfuzzed, basestring):
+            return self.newfuzzed
+        return ''.join(self.newfuzzed)
+
     def _write_file(self):
         if self.is_zipfile:
             self._writezip()
         else:
-            write_file(''.join(self.newfuzzed), self.tempfile)
+            write_file(self._newfuzzed_bytes(), self.tempfile)
 
         if 'copyfuzzedto' in self.cfg['target']:
             copyfuzzedto = str(self.cfg['target'].get('copyfuzzedto', ''))
@@ -672,7 +742,11 @@ class Minimizer(object):
 
     def _set_bytemap(self):
         if self.fuzzed_content and not self.bytemap:
-            self.bytemap = hamming.bytemap(self.seed, self.fuzzed_content)
+            if self.vectorized:
+                self.bytemap = hamming.bytemap_array(
+                    self.seed, self.fuzzed_content).tolist()
+            else:
+                self.bytemap = hamming.bytemap(self.seed, self.fuzzed_content)
 
     def go(self):
         # start by copying the fuzzed_content file since as of now it's our
@@ -685,6 +759,11 @@ class Minimizer(object):
         self.logger.info(
             'Attempting to minimize testcase(es) [%s]', self._crash_hashes_string())
 
+        if self.strategy == 'ddmin':
+            # ddmin leaves us 1-minimal, so there's nothing left for the
+            # probabilistic search or the exhaustive check to do
+            self.ddmin()
+
         # keep going until either:
         # a. we find a minimum hd of 1
         # b. we run out of discard_chances
@@ -720,7 +799,7 @@ class Minimizer(object):
                 if not self.set_n_misses():
                     break
 
-                self.swap_bytes()
+                self._next_candidate()
 
                 self.total_tries += 1
 
@@ -782,9 +861,7 @@ class Minimizer(object):
                     raise MinimizerError(
                         'New fuzzed_content content is empty.')
 
-                self._write_file()
-
-                if self.is_same_crash():
+                if self._check_candidate():
                     # record the result
                     # 1. copy the tempfile
                     filetools.best_effort_move(self.tempfile, self.outputfile)
@@ -859,6 +936,306 @@ class Minimizer(object):
                 hex_bytemap.append(hex(offset))
             self.logger.info('Bytemap: %s', hex_bytemap)
 
+    def _ddmin_content(self, offsets):
+        '''
+        Returns the seed with the bytes at offsets taken from the original
+        fuzzed content
+        '''
+        if self.vectorized:
+            (a, b, _idx) = self._diff_state(self.seed, self._ddmin_fuzzed)
+            content = a.copy()
+            content[offsets] = b[offsets]
+            return content.tobytes()
+
+        content = list(self.seed)
+        for offset in offsets:
+            content[offset] = self._ddmin_fuzzed[offset]
+        return content
+
+    def _ddmin_test(self, offsets):
+        '''
+        Returns True if the file built from offsets still produces one of
+        the crashes we're looking for. Results are memoized by content md5
+        so we never run the debugger twice on the same file.
+        '''
+        if self.use_watchdog:
+            open(self.watchdogfile, 'w').close()
+
+        self.newfuzzed = self._ddmin_content(offsets)
+        self.newfuzzed_hd = self.hd_func(self.seed, self.newfuzzed)
+        self.newfuzzed_md5 = hashlib.md5(self._newfuzzed_bytes()).hexdigest()
+        self.total_tries += 1
+
+        if self.newfuzzed_md5 in self.ddmin_results:
+            return self.ddmin_results[self.newfuzzed_md5]
+        self.files_tried.add(self.newfuzzed_md5)
+
+        self._write_file()
+        result = self.is_same_crash()
+        self.ddmin_results[self.newfuzzed_md5] = result
+
+        if result:
+            filetools.best_effort_move(self.tempfile, self.outputfile)
+            self.testcase.fuzzedfile = BasicFile(self.outputfile)
+            self.fuzzed_content = self.newfuzzed
+            self.min_distance = self.newfuzzed_hd
+        else:
+            self.total_misses += 1
+        return result
+
+    def _ddmin_log(self, deltas, n):
+        parts = []
+        parts.append('start=%d' % self.start_distance)
+        parts.append('min=%d' % self.min_distance)
+        parts.append('bytes=%d' % len(deltas))
+        parts.append('granularity=%d' % n)
+        parts.append('total_misses=%d/%d' %
+                     (self.total_misses, self.total_tries))
+        parts.append('debugger_runs=%d' % self.debugger_runs)
+        parts.append('u_crashes=%d' % len(self.crash_sigs_found.items()))
+        self.logger.info('ddmin: %s', ' '.join(parts))
+
+    def ddmin(self):
+        '''
+        Delta debugging over the set of bytes that differ between seed and
+        fuzzed content (Zeller & Hildebrandt's ddmin). Splits the differing
+        bytes into n chunks, and keeps either a single chunk or the
+        complement of one if it still crashes the same way. When neither
+        works it doubles n, until n reaches the number of bytes left.
+        The result is 1-minimal: putting back any single remaining byte
+        from the seed loses the crash.
+        '''
+        self._ddmin_fuzzed = self.fuzzed_content
+        if self.vectorized:
+            deltas = hamming.bytemap_array(
+                self.seed, self.fuzzed_content).tolist()
+        else:
+            deltas = hamming.bytemap(self.seed, self.fuzzed_content)
+        n = 2
+
+        while len(deltas) > 1:
+            if self._time_exceeded():
+                logger.info(
+                    'Max time for minimization exceeded, ending minimizer early.')
+                break
+            if len(self.other_crashes) > MAX_OTHER_CRASHES and self.seedfile_as_target:
+                logger.info('Exceeded maximum number of other crashes (%d), ending minimizer early.',
+                            MAX_OTHER_CRASHES)
+                break
+
+            self._ddmin_log(deltas, n)
+            chunk_size = float(len(deltas)) / n
+            chunks = [deltas[int(i * chunk_size):int((i + 1) * chunk_size)]
+                      for i in xrange(n)]
+
+            reduced = False
+            for chunk in chunks:
+                if self._ddmin_test(chunk):
+                    deltas = chunk
+                    n = 2
+                    reduced = True
+                    break
+
+            if not reduced and n > 2:
+                # with n == 2 the complements are the same as the chunks
+                for i in xrange(n):
+                    complement = list(itertools.chain.from_iterable(
+                        chunks[:i] + chunks[i + 1:]))
+                    if self._ddmin_test(complement):
+                        deltas = complement
+                        n = max(n - 1, 2)
+                        reduced = True
+                        break
+
+            if not reduced:
+                if n >= len(deltas):
+                    # every single byte is needed
+                    break
+                n = min(len(deltas), 2 * n)
+
+        self._ddmin_log(deltas, n)
+        self.bytemap = list(deltas)
+        self.min_found = True
+
+    def _next_candidate(self):
+        '''
+        Sets self.newfuzzed and friends to the next candidate. With parallel
+        trials, candidates come out of a batch that has already been through
+        the debugger, in the order they were drawn.
+        '''
+        if self.parallel_trials < 2:
+            self.swap_bytes()
+            return
+
+        key = (self.discard_chance, self.min_distance)
+        if key != self._batch_key:
+            # anything left over was drawn with different odds
+            self._batch.clear()
+        if not self._batch:
+            self._fill_batch()
+            self._batch_key = key
+        (self.newfuzzed, self.newfuzzed_hd,
+         self.newfuzzed_md5) = self._batch.popleft()
+
+    def _check_candidate(self):
+        '''
+        Writes the current candidate to self.tempfile and returns True if it
+        produces one of the crashes we're minimizing
+        '''
+        if self.parallel_trials < 2:
+            self._write_file()
+            return self.is_same_crash()
+
+        (sig, signal) = self._batch_results[self.newfuzzed_md5]
+        if self._is_trial_hit(self.newfuzzed_md5) or (
+                sig and sig not in self.crash_sigs_found):
+            # go() keeps the file on a hit, and _record_signature() might
+            # build a testcase out of a new signature. The trial file may
+            # have been reused since, so write a fresh copy.
+            self._write_file()
+        result = self._record_signature(sig, signal, self.tempfile)
+        if result:
+            # whatever is left in the batch was drawn against the old
+            # minimum, so toss it
+            self._batch.clear()
+        return result
+
+    def _is_trial_hit(self, md5):
+        (sig, _signal) = self._batch_results.get(md5, (None, None))
+        return bool(sig) and sig in self.crash_hashes
+
+    def _get_trial_files(self):
+        if not self._trial_files:
+            # one dir per trial, but keep the file name the same since some
+            # targets care. The target runs in that dir too so that
+            # anything it writes to its cwd doesn't clobber the others
+            name = os.path.basename(self.tempfile)
+            for _ in xrange(self.parallel_trials):
+                d = tempfile.mkdtemp(prefix='minimizer_trial_', dir=self.tempdir)
+                self._trial_files.append(os.path.join(d, name))
+        return self._trial_files
+
+    def _write_trial_file(self, content, path):
+        saved = (self.newfuzzed, self.tempfile)
+        (self.newfuzzed, self.tempfile) = (content, path)
+        try:
+            self._write_file()
+        finally:
+            (self.newfuzzed, self.tempfile) = saved
+
+    def _debug_trial(self, path):
+        # concurrent trials must not kill each other's targets on timeout
+        return self._debug_signature(path, workingdir=os.path.dirname(path),
+                                     kill_by_name=False)
+
+    def _run_trial(self, trial):
+        (md5, path) = trial
+        if path in self._cancelled:
+            return (md5, None)
+        return (md5, self._debug_trial(path))
+
+    def _cancel_trials(self, paths):
+        # each trial runs in its own dir, so whatever is running there
+        # belongs to it
+        for path in paths:
+            kill_in_dir(os.path.dirname(path), signal.SIGKILL)
+
+    def _run_trials(self, to_check):
+        '''
+        Runs the debugger on the (md5, path) trials in to_check concurrently.
+        Returns a dict of md5 -> (signature, signal) for the trials that got
+        to finish, and the set of md5s of the ones that didn't.
+
+        With parallel_keep set to first, there's no point waiting on the
+        rest once one hits, so the trials still running at that point get
+        killed and left out, as if they were never drawn. lowest_hd has to
+        see every result, so it waits for all of them.
+        '''
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPool(self.parallel_trials)
+        self._cancelled = set()
+        if self.parallel_keep != 'first':
+            sigs = self._thread_pool.map(self._debug_trial,
+                                         [path for (_md5, path) in to_check])
+            return (dict(zip([md5 for (md5, _path) in to_check], sigs)),
+                    set())
+
+        results = {}
+        undrawn = set()
+        pending = dict(to_check)
+        trials = self._thread_pool.imap_unordered(self._run_trial, to_check)
+        while pending:
+            if not self._cancelled:
+                (md5, result) = trials.next()
+            else:
+                try:
+                    (md5, result) = trials.next(1.0)
+                except TimeoutError:
+                    # one might have gotten going after we last looked
+                    self._cancel_trials(pending.values())
+                    continue
+            path = pending.pop(md5)
+            if path in self._cancelled:
+                undrawn.add(md5)
+                continue
+            results[md5] = result
+            (sig, _signal) = result
+            if sig and sig in self.crash_hashes and not self._cancelled:
+                self._cancelled.update(pending.values())
+                self._cancel_trials(pending.values())
+        return (results, undrawn)
+
+    def _fill_batch(self):
+        '''
+        Draws self.parallel_trials candidates, runs the debugger on the new
+        ones concurrently, and queues them up in self._batch.
+
+        Replaying the batch through go() one candidate at a time in draw
+        order keeps the miss accounting the same as in the serial case:
+        misses ahead of the first hit are counted, and candidates after it
+        are discarded as if they were never drawn. So are trials that were
+        still running when the first hit came back, which get killed (see
+        _run_trials). Signatures only get tallied as candidates are
+        replayed. With parallel_keep set to lowest_hd every trial runs to
+        the end, and the lowest-HD hit is moved to the end of the batch,
+        behind only as many misses as can be counted without ending the
+        search before it, and the rest are discarded.
+        '''
+        candidates = []
+        for _ in xrange(self.parallel_trials):
+            self.swap_bytes()
+            candidates.append(
+                (self.newfuzzed, self.newfuzzed_hd, self.newfuzzed_md5))
+
+        # only run the debugger on files we haven't checked already
+        trial_files = self._get_trial_files()
+        to_check = []
+        for (content, _hd, md5) in candidates:
+            if md5 in self.files_tried or md5 in self._batch_results:
+                continue
+            if md5 in [m for (m, _f) in to_check]:
+                continue
+            path = trial_files[len(to_check)]
+            self._write_trial_file(content, path)
+            to_check.append((md5, path))
+
+        (results, undrawn) = self._run_trials(to_check)
+        self._batch_results.update(results)
+        candidates = [c for c in candidates if c[2] not in undrawn]
+
+        if self.parallel_keep == 'lowest_hd':
+            hits = [c for c in candidates if self._is_trial_hit(c[2])]
+            if hits:
+                best = min(hits, key=lambda c: c[1])
+                misses = [c for c in candidates
+                          if not self._is_trial_hit(c[2])]
+                # go() stops once consecutive_misses exceeds n_misses_allowed
+                room = max(0, self.n_misses_allowed - self.consecutive_misses)
+                candidates = misses[:room]
+                candidates.append(best)
+
+        self._batch.extend(candidates)
+
     def get_mask(self):
         mask = 0
         for i in range(8):
@@ -883,9 +1260,12 @@ class Minimizer(object):
         # we know our hd is > 0 and < what it was when we started
         self.newfuzzed = newfuzzed
         self.newfuzzed_hd = newfuzzed_hd
-        self.newfuzzed_md5 = hashlib.md5(''.join(self.newfuzzed)).hexdigest()
+        self.newfuzzed_md5 = hashlib.md5(self._newfuzzed_bytes()).hexdigest()
 
     def revert_byte(self, offset):
+        if isinstance(self.newfuzzed, basestring):
+            # the vectorized swap functions hand back strings
+            self.newfuzzed = list(self.newfuzzed)
         self.newfuzzed[offset] = self.seed[offset]
         self.newfuzzed_hd -= 1
 
@@ -941,3 +1321,57 @@ class Minimizer(object):
             else:
                 swapped.append(a)
         return swapped, hd
+
+    def _diff_state(self, seed, fuzzed):
+        '''
+        Returns (seed, fuzzed, diff index) as numpy arrays for the vectorized
+        swap functions. The diff index only gets recomputed from scratch when
+        seed or fuzzed have changed to something other than our last
+        candidate.
+        '''
+        state = self._np_state
+        if state is not None and state[0] is seed and state[1] is fuzzed:
+            return state[2:]
+
+        a = hamming.to_uint8(seed)
+        cand = self._np_candidate
+        if cand is not None and cand[0] is fuzzed:
+            # the last candidate was a hit and is now our fuzzed content,
+            # we already know which bytes it kept
+            (b, idx) = cand[1:]
+        else:
+            b = hamming.to_uint8(fuzzed)
+            idx = hamming.bytemap_array(a, b)
+        self._np_state = (seed, fuzzed, a, b, idx)
+        return (a, b, idx)
+
+    def bytewise_swap_array(self, seed, fuzzed):
+        (a, b, idx) = self._diff_state(seed, fuzzed)
+
+        keep = self._np_random.random_sample(len(idx)) > self.discard_chance
+        revert = idx[~keep]
+        swapped = b.copy()
+        swapped[revert] = a[revert]
+
+        newfuzzed = swapped.tobytes()
+        self._np_candidate = (newfuzzed, swapped, idx[keep])
+        return newfuzzed, int(numpy.count_nonzero(keep))
+
+    def bitwise_swap_array(self, seed, fuzzed):
+        (a, b, idx) = self._diff_state(seed, fuzzed)
+        seed_bytes = a[idx]
+        fuzzed_bytes = b[idx]
+
+        # one random bit mask per differing byte, set bits go back to the seed
+        bits = self._np_random.random_sample((len(idx), 8)) <= self.discard_chance
+        mask = numpy.packbits(bits, axis=1).ravel()
+        new_bytes = (seed_bytes & mask) ^ (fuzzed_bytes & ~mask)
+
+        swapped = b.copy()
+        swapped[idx] = new_bytes
+        delta = numpy.bitwise_xor(seed_bytes, new_bytes)
+        hd = int(hamming.POPCOUNT_TABLE[delta].sum(dtype=numpy.int64))
+
+        newfuzzed = swapped.tobytes()
+        self._np_candidate = (newfuzzed, swapped, idx[delta != 0])
+        return newfuzzed, hd
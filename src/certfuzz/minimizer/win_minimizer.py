@@ -1,10 +1,9 @@
-import collections
 import logging
-import zipfile
 import os
 
 from certfuzz.fuzztools.filetools import check_zip_file, write_file
 from certfuzz.fuzztools.filetools import exponential_backoff
+from certfuzz.fuzztools.zipcache import read_zip
 from certfuzz.minimizer.minimizer_base import Minimizer as MinimizerBase
 from certfuzz.minimizer.errors import WindowsMinimizerError
 from certfuzz.debuggers.msec import MsecDebugger
@@ -23,6 +22,7 @@ class WindowsMinimizer(MinimizerBase):
                  keep_uniq_faddr=False, watchcpu=False):
 
         self.saved_arcinfo = None
+        self.zip_contents = None
         self.is_zipfile = check_zip_file(testcase.fuzzedfile.path)
 
         MinimizerBase.__init__(self, cfg, testcase, crash_dst_dir,
@@ -67,32 +67,17 @@ class WindowsMinimizer(MinimizerBase):
     def _readzip(self, filepath):
         # If the seed is zip-based, fuzz the contents rather than the container
         logger.debug('Reading zip file: %s', filepath)
-        tempzip = zipfile.ZipFile(filepath, 'r')
+        self.zip_contents = read_zip(filepath)
 
-        '''
-        get info on all the archived files and concatentate their contents
-        into self.input
-        '''
-        self.saved_arcinfo = collections.OrderedDict()
-        unzippedbytes = ''
-        logger.debug('Reading files from zip...')
-        for i in tempzip.namelist():
-            data = tempzip.read(i)
-
-            # save split indices and compression type for archival
-            # reconstruction. Keeping the same compression types is
-            # probably unnecessary since it's the content that matters
-
-            self.saved_arcinfo[i] = (len(unzippedbytes), len(data),
-                                     tempzip.getinfo(i).compress_type)
-            unzippedbytes += data
-        tempzip.close()
-        return unzippedbytes
+        # save split indices and compression type for archival
+        # reconstruction. Keeping the same compression types is
+        # probably unnecessary since it's the content that matters
+        self.saved_arcinfo = self.zip_contents.arcinfo
+        return self.zip_contents.content
 
     @exponential_backoff
-    def _safe_createzip(self, filepath):
-        tempzip = zipfile.ZipFile(filepath, 'w')
-        return tempzip
+    def _safe_open(self, filepath):
+        return open(filepath, 'wb')
 
     def _writezip(self):
         '''rebuild the zip file and put it in self.fuzzed
@@ -107,24 +92,9 @@ class WindowsMinimizer(MinimizerBase):
         filepath = self.tempfile
 
         logger.debug('Creating zip with mutated contents.')
-        tempzip = self._safe_createzip(filepath)
-
-        '''
-        reconstruct archived files, using the same compression scheme as
-        the source
-        '''
-        for name, info in self.saved_arcinfo.iteritems():
-            # write out fuzzed file
-            if info[2] == 0 or info[2] == 8:
-                # Python zipfile only supports compression types 0 and 8
-                compressiontype = info[2]
-            else:
-                logger.warning(
-                    'Compression type %s is not supported. Overriding', info[2])
-                compressiontype = 8
-            tempzip.writestr(
-                name, str(filedata[info[0]:info[0] + info[1]]), compress_type=compressiontype)
-        tempzip.close()
+        # only the members that changed get recompressed
+        with self._safe_open(filepath) as fp:
+            self.zip_contents.rebuild(filedata, fp)
 
     def _write_file(self):
         if self.is_zipfile:
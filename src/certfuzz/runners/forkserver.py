@@ -0,0 +1,286 @@
+'''
+Created on Oct 18, 2026
+
+Runs the target under a fork server instead of starting zzuf and the target
+from scratch on every iteration.
+
+The target is started once with the bff_forkserver.so stub (see
+linux/forkserver) in LD_PRELOAD. The stub stops the target once the dynamic
+loader is done, and from then on forks a fresh child for every test case.
+Each test case gets copied to the same input path that the server's command
+line refers to, and crashes are detected from the child's waitpid() status.
+
+@organization: cert.org
+'''
+import atexit
+import errno
+import logging
+import os
+import select
+import shlex
+import shutil
+import signal
+import struct
+import subprocess
+import tempfile
+import time
+
+from certfuzz.fuzztools import crash_fingerprint
+from certfuzz.helpers.misc import quoted
+from certfuzz.runners.errors import RunnerError, RunnerNotFoundError
+from certfuzz.runners.runner_base import Runner
+
+logger = logging.getLogger(__name__)
+
+_stub_basename = 'bff_forkserver.so'
+_stub_search_path = [os.path.expanduser('~/forkserver'),
+                     os.path.join(os.path.dirname(__file__), '..', '..',
+                                  'linux', 'forkserver'),
+                     ]
+_stub_loc = None
+
+# must match forkserver.c
+CTL_FD = 198
+ST_FD = 199
+
+# how long to wait for the target to get to the fork server
+STARTUP_TIMEOUT = 10
+
+# signals we count as crashes. SIGKILL is what we use on timeouts.
+CRASH_SIGNALS = frozenset([signal.SIGSEGV, signal.SIGBUS, signal.SIGILL,
+                           signal.SIGFPE, signal.SIGABRT, signal.SIGTRAP,
+                           signal.SIGSYS])
+
+
+def _find_stub(options=None):
+    global _stub_loc
+    if options and options.get('forkserver_lib'):
+        candidates = [os.path.expanduser(options['forkserver_lib'])]
+    else:
+        candidates = [os.path.join(d, _stub_basename)
+                      for d in _stub_search_path]
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            _stub_loc = os.path.abspath(candidate)
+            return _stub_loc
+    raise RunnerNotFoundError('Unable to locate %s, tried %s (run make in linux/forkserver?)'
+                              % (_stub_basename, candidates))
+
+
+def check_runner():
+    _find_stub()
+
+
+def is_crash(status):
+    '''
+    Returns True if a waitpid() status means the target crashed
+    '''
+    return os.WIFSIGNALED(status) and os.WTERMSIG(status) in CRASH_SIGNALS
+
+
+class ForkServer(object):
+    '''
+    A single target process waiting to fork children for us.
+    '''
+
+    def __init__(self, cmd_parts, input_path, cwd, stub, hideoutput=True):
+        self.cmd_parts = cmd_parts
+        self.input_path = input_path
+        self.cwd = cwd
+        self.stub = stub
+        self.hideoutput = hideoutput
+        self.process = None
+        # the pid of the last child we forked
+        self.last_pid = None
+        self._ctl = None
+        self._st = None
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        (ctl_r, ctl_w) = os.pipe()
+        (st_r, st_w) = os.pipe()
+
+        def _setup_fds():
+            os.dup2(ctl_r, CTL_FD)
+            os.dup2(st_w, ST_FD)
+            for fd in (ctl_r, ctl_w, st_r, st_w):
+                if fd not in (CTL_FD, ST_FD):
+                    os.close(fd)
+
+        env = dict(os.environ)
+        env['LD_PRELOAD'] = self.stub
+        env['BFF_FORKSRV'] = '1'
+        env['BFF_FORKSRV_INPUT'] = self.input_path
+
+        devnull = open(os.devnull, 'r+b')
+        out = devnull if self.hideoutput else None
+        logger.debug('Starting fork server: %s', ' '.join(self.cmd_parts))
+        try:
+            # close_fds would close our pipes before _setup_fds gets to them
+            self.process = subprocess.Popen(self.cmd_parts,
+                                            cwd=self.cwd,
+                                            env=env,
+                                            stdin=devnull,
+                                            stdout=out,
+                                            stderr=out,
+                                            close_fds=False,
+                                            preexec_fn=_setup_fds)
+        finally:
+            devnull.close()
+            os.close(ctl_r)
+            os.close(st_w)
+        self._ctl = ctl_w
+        self._st = st_r
+
+        # the stub says hello with its pid
+        if self._read_int(STARTUP_TIMEOUT) is None:
+            self.stop()
+            raise RunnerError('Target did not start the fork server. Is it statically linked?')
+
+    def stop(self):
+        for fd in (self._ctl, self._st):
+            if fd is not None:
+                os.close(fd)
+        self._ctl = self._st = None
+        if self.process is None:
+            return
+        try:
+            self.process.kill()
+        except OSError:
+            pass
+        self.process.wait()
+        self.process = None
+
+    def _read_int(self, timeout):
+        '''
+        Reads a 32-bit int from the status pipe. Returns None if there was
+        nothing to read within timeout seconds, or if the server went away.
+        '''
+        deadline = time.time() + timeout
+        buf = ''
+        while len(buf) < 4:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            try:
+                (ready, _, _) = select.select([self._st], [], [], remaining)
+            except select.error as e:
+                if e.args[0] == errno.EINTR:
+                    continue
+                raise
+            if not ready:
+                continue
+            chunk = os.read(self._st, 4 - len(buf))
+            if not chunk:
+                return None
+            buf += chunk
+        return struct.unpack('i', buf)[0]
+
+    def run(self, timeout):
+        '''
+        Forks a child to run the current input file, and returns its
+        waitpid() status. The child gets killed if it is still running after
+        timeout seconds.
+        '''
+        if not self.alive:
+            self.start()
+
+        try:
+            os.write(self._ctl, struct.pack('I', 0))
+        except OSError as e:
+            self.stop()
+            raise RunnerError('Lost the fork server: %s' % e)
+
+        pid = self._read_int(STARTUP_TIMEOUT)
+        if pid is None:
+            self.stop()
+            raise RunnerError('Fork server did not fork')
+        self.last_pid = pid
+
+        status = self._read_int(timeout)
+        if status is None:
+            logger.debug('Killing pid %d after %ss', pid, timeout)
+            for kill in (os.killpg, os.kill):
+                try:
+                    kill(pid, signal.SIGKILL)
+                except OSError:
+                    # it could have exited in the meantime
+                    pass
+            status = self._read_int(STARTUP_TIMEOUT)
+            if status is None:
+                self.stop()
+                raise RunnerError('Fork server did not report on pid %d' % pid)
+        return status
+
+
+# one server per command line, for the life of the process
+_servers = {}
+
+
+def _stop_servers():
+    for (server, tmpdir) in _servers.values():
+        server.stop()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    _servers.clear()
+
+
+atexit.register(_stop_servers)
+
+
+def get_server(cmd_template, ext, stub, hideoutput=True):
+    '''
+    Returns the ForkServer for cmd_template, starting one up if needed.
+    '''
+    key = (cmd_template.template, ext, stub, hideoutput)
+    if key not in _servers:
+        tmpdir = tempfile.mkdtemp(prefix='bff_forkserver_')
+        input_path = os.path.join(tmpdir, 'input%s' % ext)
+        cmd = cmd_template.substitute(SEEDFILE=quoted(input_path))
+        cmd_parts = shlex.split(cmd)
+        cmd_parts[0] = os.path.expanduser(cmd_parts[0])
+        server = ForkServer(cmd_parts, input_path, tmpdir, stub, hideoutput)
+        _servers[key] = (server, tmpdir)
+    return _servers[key][0]
+
+
+class ForkServerRunner(Runner):
+
+    def __init__(self, options, cmd_template, fuzzed_file, workingdir_base):
+        Runner.__init__(self, options, cmd_template, fuzzed_file,
+                        workingdir_base)
+        self._quiet = options.get('hideoutput', True)
+        self._cmd_template = cmd_template
+        self.status = None
+
+        stub = _find_stub(options)
+        ext = os.path.splitext(fuzzed_file)[1] if fuzzed_file else ''
+        self.server = get_server(cmd_template, ext, stub, self._quiet)
+
+    def _run(self):
+        shutil.copyfile(self.fuzzed_file, self.server.input_path)
+        self.status = self.server.run(self.runtimeout)
+        self.saw_crash = is_crash(self.status)
+
+    def _postrun(self):
+        if self.saw_crash:
+            logger.debug('Crash seen: signal %d', os.WTERMSIG(self.status))
+        else:
+            logger.debug('No crash seen')
+
+        if not os.WIFSIGNALED(self.status) or not os.WCOREDUMP(self.status):
+            return
+        # children run in the server's dir, so that's where their cores go
+        core = crash_fingerprint.find_core(self.server.cwd,
+                                           self.server.last_pid)
+        if self.saw_crash:
+            self.fingerprint = crash_fingerprint.fingerprint_core(
+                core, os.WTERMSIG(self.status), self.server.last_pid)
+        if core is not None:
+            # the next child would leave its own anyway
+            os.remove(core)
+
+
+_runner_class = ForkServerRunner
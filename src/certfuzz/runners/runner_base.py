@@ -4,6 +4,7 @@ Created on Oct 23, 2012
 @organization: cert.org
 '''
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +26,11 @@ class Runner(object):
         self.hideoutput = options.get('hideoutput', False)
         self.runtimeout = options.get('runtimeout', 5)
         self.saw_crash = False
+        # a CrashFingerprint, if the runner can tell where the target died
+        self.fingerprint = None
         self.fuzzed_file = fuzzed_file
+        # wall-clock seconds the last run() took
+        self.elapsed = 0.0
 
         self.workingdir = workingdir_base
 
@@ -49,9 +54,13 @@ class Runner(object):
         raise NotImplementedError
 
     def run(self):
-        self._prerun()
-        self._run()
-        self._postrun()
+        start = time.time()
+        try:
+            self._prerun()
+            self._run()
+            self._postrun()
+        finally:
+            self.elapsed = time.time() - start
 
     def _prerun(self):
         pass
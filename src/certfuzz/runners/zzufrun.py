@@ -12,6 +12,7 @@ import logging
 from certfuzz.runners.errors import RunnerNotFoundError
 import shlex
 from certfuzz.helpers.misc import quoted
+from certfuzz.fuzztools import crash_fingerprint
 from certfuzz.fuzztools.zzuflog import ZzufLog
 
 logger = logging.getLogger(__name__)
@@ -49,6 +50,7 @@ def check_runner():
         if all(x in line for x in check_for):
             _use_cert_version_of_zzuf = True
 
+
 class ZzufRunner(Runner):
     def __init__(self, options, cmd_template, fuzzed_file, workingdir_base):
         Runner.__init__(self, options, cmd_template, fuzzed_file, workingdir_base)
@@ -121,5 +123,19 @@ class ZzufRunner(Runner):
         # report the exit code in its output log.  The exit code is 128 + the signal number.
         self.saw_crash = zzuf_log.crash_logged()
 
+        if self.saw_crash:
+            self.fingerprint = crash_fingerprint.fingerprint_core(
+                crash_fingerprint.find_core(self.workingdir),
+                _crash_signal(zzuf_log))
+
+
+def _crash_signal(zzuf_log):
+    # zzuf reports either the signal or an exit code of 128 + signal
+    if zzuf_log.signal:
+        return int(zzuf_log.signal)
+    if zzuf_log.exitcode and zzuf_log.exitcode > 128:
+        return zzuf_log.exitcode - 128
+    return None
+
 
 _runner_class = ZzufRunner
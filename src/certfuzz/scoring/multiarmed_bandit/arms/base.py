@@ -9,16 +9,24 @@ from certfuzz.scoring.multiarmed_bandit.arms.errors import BanditArmError
 
 logger = logging.getLogger(__name__)
 
+# changes to these get passed along to the arm's owner
+_watched_attrs = frozenset(['successes', 'trials', 'seconds', 'probability'])
+
 
 class BanditArmBase(object):
     '''
     Base class for multi-armed bandit arms. The base class simply counts
-    successes and trials, and maintains a constant probability of 1.0.
+    successes and trials (and the seconds those trials took), and maintains
+    a constant probability of 1.0.
     '''
     def __init__(self):
         self.successes = 0
         self.trials = 0
+        self.seconds = 0.0
         self.probability = None
+        # the bandit (if any) that wants to hear about updates to this arm
+        self._owner = None
+        self._key = None
 
         # initialize probability
         self.update()
@@ -27,17 +35,50 @@ class BanditArmBase(object):
     def failures(self):
         return self.trials - self.successes
 
+    @property
+    def seconds_per_trial(self):
+        '''
+        Returns the average cost of a trial, or None if we don't know it
+        '''
+        if not (self.trials and self.seconds):
+            return None
+        return self.seconds / self.trials
+
     def __repr__(self):
-        return '%s' % self.__dict__
+        return '%s' % self.as_dict()
+
+    def as_dict(self):
+        '''
+        Returns the arm's public attributes as a dict
+        '''
+        return {k: v for (k, v) in self.__dict__.iteritems()
+                if not k.startswith('_')}
+
+    def watch(self, owner, key):
+        '''
+        Tells the arm to call owner.arm_updated(key) whenever its successes,
+        trials, seconds or probability change, or to stop doing so if owner
+        is None.
+        '''
+        self._owner = owner
+        self._key = key
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in _watched_attrs and self.__dict__.get('_owner') is not None:
+            self._owner.arm_updated(self._key)
 
-    def update(self, successes=0, trials=0):
+    def update(self, successes=0, trials=0, seconds=0.0):
         '''
-        Update total successes and trials, recalculate probability
+        Update total successes, trials and seconds, recalculate probability
         :param successes:
         :param trials:
+        :param seconds: wall-clock time spent on the trials
         '''
         self.successes += successes
         self.trials += trials
+        if seconds:
+            self.seconds += seconds
         self._update_p(successes, trials)
         if self.probability is None:
             logger.debug("MAB arm: %s", self)
@@ -66,14 +107,20 @@ class BanditArmBase(object):
         if self.successes > 0:
             scaled_trials = int(float(self.trials) / float(self.successes))
             # make sure trials is at least 1
-            self.trials = max(scaled_trials, 1)
+            scaled_trials = max(scaled_trials, 1)
+            if self.trials:
+                # keep the same cost per trial
+                self.seconds = self.seconds * scaled_trials / self.trials
+            self.trials = scaled_trials
             self.successes = 1
             self.update()
 
     def forget(self):
         '''
-        Resets successes and trials to zero, then updates probability.
+        Resets successes, trials and seconds to zero, then updates
+        probability.
         '''
         self.successes = 0
         self.trials = 0
+        self.seconds = 0.0
         self.update()
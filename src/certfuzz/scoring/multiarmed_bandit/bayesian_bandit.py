@@ -3,18 +3,111 @@ Created on Feb 22, 2013
 
 @organization: cert.org
 '''
-from certfuzz.fuzztools.probability import weighted_choice
+import random
+
 from certfuzz.scoring.multiarmed_bandit.multiarmed_bandit_base import MultiArmedBanditBase
 from certfuzz.scoring.multiarmed_bandit.arms.bayes_laplace import BanditArmBayesLaplace
+from certfuzz.scoring.multiarmed_bandit.errors import MultiArmedBanditError
+from certfuzz.scoring.multiarmed_bandit.strategies import STRATEGIES, DEFAULT_STRATEGY, cost, \
+    shared_cost, shares_cost
+from certfuzz.scoring.multiarmed_bandit.sum_tree import SumTree
 
 
 class BayesianMultiArmedBandit(MultiArmedBanditBase):
     '''
-    Bayesian arms, weighted choice proportionate to each arm's share
-    of the total across all arms.
+    Bayesian arms. By default, weighted choice proportionate to each arm's
+    share of the total across all arms, but any of the selection rules in
+    strategies.STRATEGIES can be used instead. They all keep the same arm
+    state, so saved scores carry over from one strategy to another.
     '''
     arm_type = BanditArmBayesLaplace
 
+    def __init__(self, strategy=None, cost_aware=False):
+        '''
+        :param strategy: the name of a selection rule from
+        strategies.STRATEGIES (default: proportional)
+        :param cost_aware: go after successes per second rather than
+        successes per trial
+        '''
+        MultiArmedBanditBase.__init__(self)
+        self.cost_aware = cost_aware
+        # probability per second of each arm with times of its own, for
+        # proportional picks
+        self._rates = SumTree()
+        # probability of each arm that goes by the bandit-wide average time
+        # instead. That average changes with every update, so these get
+        # scaled by it when we pick rather than when they're stored.
+        self._shared_rates = SumTree()
+        # set up by the ucb strategies on their first pick
+        self._ucb_index = None
+        if strategy is None:
+            strategy = DEFAULT_STRATEGY
+        if strategy not in STRATEGIES:
+            raise MultiArmedBanditError('Unknown bandit strategy: %s' % strategy)
+        self.strategy = strategy
+        # anything with random(), choice() and betavariate() will do
+        self.rng = random
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if state['rng'] is random:
+            # modules don't pickle
+            del state['rng']
+        # cheap enough to rebuild on the next pick
+        state['_ucb_index'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if 'rng' not in state:
+            self.rng = random
+        if '_ucb_index' not in state:
+            self._ucb_index = None
+        if '_shared_rates' not in state:
+            # saved back when every arm's rate got stored as is
+            self._shared_rates = SumTree()
+            for key in self.arms:
+                self.arm_updated(key)
+
+    def arm_updated(self, key):
+        MultiArmedBanditBase.arm_updated(self, key)
+        if self._ucb_index is not None:
+            self._ucb_index.update(key)
+        if self.cost_aware:
+            arm = self.arms[key]
+            if shares_cost(self, arm):
+                self._rates.remove(key)
+                self._shared_rates.set(key, arm.probability)
+            else:
+                self._shared_rates.remove(key)
+                self._rates.set(key, arm.probability / cost(self, arm))
+
+    def _forget_arm(self, key):
+        MultiArmedBanditBase._forget_arm(self, key)
+        self._rates.remove(key)
+        self._shared_rates.remove(key)
+        if self._ucb_index is not None:
+            self._ucb_index.remove(key)
+
+    @property
+    def _total_rate(self):
+        return self._rates.total + self._shared_rates.total / shared_cost(self)
+
+    def _sample_rates(self, rng):
+        '''
+        Returns a key picked in proportion to its arm's probability per
+        second, or None if there aren't any
+        '''
+        x = rng.random() * self._total_rate
+        if x < self._rates.total:
+            return self._rates.find(x)
+        key = self._shared_rates.find((x - self._rates.total) *
+                                      shared_cost(self))
+        if key is None:
+            # float rounding pushed us past the end
+            key = self._rates.find(x)
+        return key
+
     def _scaled_scores(self):
         scaled_scores = {}
         total = self._total_p
@@ -25,7 +118,7 @@ class BayesianMultiArmedBandit(MultiArmedBanditBase):
         return scaled_scores
 
     def _next_key(self):
-        return weighted_choice(self._scaled_scores())
+        return STRATEGIES[self.strategy](self, self.rng)
 
     def next(self):
         # if there aren't any arms, we're done.
@@ -7,6 +7,7 @@ import logging
 
 from certfuzz.scoring.multiarmed_bandit.errors import MultiArmedBanditError
 from certfuzz.scoring.multiarmed_bandit.arms.base import BanditArmBase
+from certfuzz.scoring.multiarmed_bandit.sum_tree import SumTree
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +22,29 @@ class MultiArmedBanditBase(object):
         self.things = {}
         self.arms = {}
 
+        # running totals across all arms, kept up to date by arm_updated()
+        # so we don't have to add them up again every time we're asked
+        self._successes = 0
+        self._trials = 0
+        self._seconds = 0.0
+        self._seen = {}
+        self._weights = SumTree()
+
     def arms_as_dict(self):
-        return {k: dict(arm.__dict__) for k, arm in self.arms.iteritems()}
+        return {k: arm.as_dict() for k, arm in self.arms.iteritems()}
+
+    def arm_updated(self, key):
+        '''
+        Brings the running totals up to date with the arm for key. Arms
+        call this themselves when they get updated.
+        '''
+        arm = self.arms[key]
+        (successes, trials, seconds) = self._seen.get(key, (0, 0, 0.0))
+        self._successes += arm.successes - successes
+        self._trials += arm.trials - trials
+        self._seconds += arm.seconds - seconds
+        self._seen[key] = (arm.successes, arm.trials, arm.seconds)
+        self._weights.set(key, arm.probability)
 
     def add_item(self, key=None, obj=None):
         if key is None:
@@ -37,17 +59,35 @@ class MultiArmedBanditBase(object):
         # set the new arm's params based on the results we've already found
         new_arm.successes = self.successes
         new_arm.trials = self.trials
+        new_arm.seconds = self.seconds
 
         # but don't trust those averages too strongly
         new_arm.doubt()
 
+        # if we're replacing an arm, forget about the old one first
+        self._forget_arm(key)
+
         # add the new arm to the set
         self.arms[key] = new_arm
+        new_arm.watch(self, key)
+        self.arm_updated(key)
+
+    def _forget_arm(self, key):
+        arm = self.arms.get(key)
+        if arm is None:
+            return
+        arm.watch(None, None)
+        (successes, trials, seconds) = self._seen.pop(key, (0, 0, 0.0))
+        self._successes -= successes
+        self._trials -= trials
+        self._seconds -= seconds
+        self._weights.remove(key)
 
     def del_item(self, key=None):
         if key is None:
             return
 
+        self._forget_arm(key)
         for d in (self.things, self.arms):
             try:
                 del(d[key])
@@ -55,35 +95,51 @@ class MultiArmedBanditBase(object):
                 # if there was a keyerror, our job is already done
                 pass
 
-    def record_result(self, key, successes=0, trials=0):
+    def record_result(self, key, successes=0, trials=0, seconds=0.0):
         logger.debug(
-            'Recording result: key=%s successes=%d trials=%d', key, successes, trials)
+            'Recording result: key=%s successes=%d trials=%d seconds=%f', key, successes, trials, seconds)
         arm = self.arms[key]
-        arm.update(successes, trials)
+        arm.update(successes, trials, seconds)
 
-    def record_tries(self, key=None, tries=1):
-        self.record_result(key, successes=0, trials=tries)
+    def record_tries(self, key=None, tries=1, seconds=0.0):
+        self.record_result(key, successes=0, trials=tries, seconds=seconds)
 
     def _log_arm_p(self):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         logger.debug('Updated probabilities')
         for k, v in self.arms.iteritems():
             logger.debug('key=%s probability=%f', k, v.probability)
 
-    def record_success(self, key=None, successes=1):
-        self.record_result(key, successes, trials=0)
+    def record_success(self, key=None, successes=1, seconds=0.0):
+        self.record_result(key, successes, trials=0, seconds=seconds)
         self._log_arm_p()
 
     @property
     def successes(self):
-        return sum([a.successes for a in self.arms.values()])
+        return self._successes
 
     @property
     def trials(self):
-        return sum([a.trials for a in self.arms.values()])
+        return self._trials
+
+    @property
+    def seconds(self):
+        return self._seconds
+
+    @property
+    def seconds_per_trial(self):
+        '''
+        Returns the average cost of a trial across all arms, or None if we
+        don't know it
+        '''
+        if not (self._trials and self._seconds):
+            return None
+        return self._seconds / self._trials
 
     @property
     def _total_p(self):
-        return sum([a.probability for a in self.arms.itervalues()])
+        return self._weights.total
 
     @property
     def mean_p(self):
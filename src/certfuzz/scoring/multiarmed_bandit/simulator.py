@@ -0,0 +1,136 @@
+'''
+Created on Oct 18, 2026
+
+Plays bandit strategies against the seed file scores recorded by a real
+campaign, so their crash yield per CPU hour can be compared offline.
+
+@organization: cert.org
+'''
+import collections
+import json
+import logging
+import random
+
+from certfuzz.scoring.multiarmed_bandit.bayesian_bandit import BayesianMultiArmedBandit
+from certfuzz.scoring.multiarmed_bandit.errors import MultiArmedBanditError
+
+logger = logging.getLogger(__name__)
+
+# assumed cost of one iteration when the campaign didn't record any
+DEFAULT_SECONDS_PER_TRIAL = 1.0
+
+ArmRecord = collections.namedtuple('ArmRecord',
+                                   ['key', 'successes', 'trials', 'seconds'])
+
+
+class SimResult(collections.namedtuple('SimResult', ['strategy', 'trials',
+                                                     'successes', 'seconds'])):
+    '''
+    The totals from simulating a strategy
+    '''
+    __slots__ = ()
+
+    @property
+    def cpu_hours(self):
+        return self.seconds / 3600.0
+
+    @property
+    def successes_per_cpu_hour(self):
+        if not self.seconds:
+            return 0.0
+        return self.successes / self.cpu_hours
+
+
+def records_from_state(state, seconds_per_trial=DEFAULT_SECONDS_PER_TRIAL):
+    '''
+    Returns a list of ArmRecords for the seed files in state (as saved in a
+    campaign's cached state file). Each record's seconds is the average time
+    the campaign recorded for one iteration of that seed file.
+    :param state: a dict, as returned by CampaignBase._get_state_as_dict()
+    :param seconds_per_trial: the cost of one iteration, for seed files the
+    campaign didn't record times for
+    '''
+    records = []
+    for (key, score) in sorted(state['seedfile_scores'].iteritems()):
+        seconds = seconds_per_trial
+        if score.get('seconds') and score['trials']:
+            seconds = float(score['seconds']) / score['trials']
+        records.append(ArmRecord(key, score['successes'], score['trials'],
+                                 seconds))
+    return records
+
+
+def read_records(path, seconds_per_trial=DEFAULT_SECONDS_PER_TRIAL):
+    '''
+    Same as records_from_state(), but reads the state from the json file at
+    path
+    '''
+    with open(path, 'rb') as fp:
+        state = json.load(fp)
+    return records_from_state(state, seconds_per_trial)
+
+
+def _success_rate(record):
+    trials = max(record.trials, record.successes)
+    if not trials:
+        # we know nothing about it, so assume it never pays off
+        return 0.0
+    return float(record.successes) / trials
+
+
+def simulate(records, strategy, iterations, seed=0, cost_aware=False):
+    '''
+    Runs iterations pulls of a fresh bandit using strategy over records.
+    Each pull of an arm succeeds with the success rate the campaign saw for
+    it and costs its seconds per trial. Returns a SimResult.
+    With cost_aware set, the bandit goes after successes per second.
+
+    Only totals are recorded per seed file, so pulls are drawn from those
+    rates rather than replayed one by one.
+    '''
+    if not records:
+        raise MultiArmedBanditError('Nothing to simulate')
+
+    bandit = BayesianMultiArmedBandit(strategy, cost_aware)
+    # separate streams, so every strategy faces the same luck
+    bandit.rng = random.Random(seed)
+    outcomes = random.Random(seed + 1)
+
+    rates = {}
+    for record in records:
+        bandit.add_item(record.key, record)
+        rates[record.key] = _success_rate(record)
+
+    successes = 0
+    seconds = 0.0
+    for _ in xrange(iterations):
+        record = bandit.next()
+        hit = int(outcomes.random() < rates[record.key])
+        bandit.record_result(record.key, successes=hit, trials=1,
+                             seconds=record.seconds)
+        successes += hit
+        seconds += record.seconds
+    return SimResult(strategy, iterations, successes, seconds)
+
+
+def compare(records, strategies, iterations, runs=1, seed=0,
+            cost_aware=False):
+    '''
+    Simulates each strategy runs times and returns a SimResult per strategy
+    with the totals across all its runs
+    '''
+    results = []
+    for strategy in strategies:
+        trials = 0
+        successes = 0
+        seconds = 0.0
+        for run in xrange(runs):
+            result = simulate(records, strategy, iterations, seed + 2 * run,
+                              cost_aware)
+            trials += result.trials
+            successes += result.successes
+            seconds += result.seconds
+        logger.debug('%s: %d successes in %d trials', strategy, successes,
+                     trials)
+        results.append(SimResult(strategy, trials, successes, seconds))
+    return results
@@ -0,0 +1,328 @@
+'''
+Created on Oct 18, 2026
+
+Rules for picking the next arm of a bandit whose arms count successes and
+trials. Each one takes the bandit and a random number generator and returns
+the key of the arm to pull next.
+
+If the bandit's cost_aware flag is set, each arm's score is divided by the
+time its trials take, so the rules go after successes per second instead of
+successes per trial.
+
+Thompson sampling has to draw for every arm on every pick, so it costs
+O(n) per pick in the number of arms. UCB1 and KL-UCB keep their indices in
+a UCBIndex between picks and only recompute the ones near the top.
+
+@organization: cert.org
+'''
+import heapq
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+# how close KL-UCB gets to the exact upper confidence bound
+KL_UCB_TOLERANCE = 1e-6
+# values of q are clamped this far away from 0 and 1 to keep the logs finite
+_EPSILON = 1e-12
+# never treat a trial as cheaper than this many seconds
+MIN_SECONDS_PER_TRIAL = 0.001
+
+
+def _counts(arm):
+    # successes can get ahead of trials within an iteration (see BFF-521)
+    trials = max(arm.trials, arm.successes)
+    return (arm.successes, trials)
+
+
+def shares_cost(bandit, arm):
+    '''
+    Returns True if arm's trials cost whatever the bandit's average is,
+    because the bandit is cost aware and the arm hasn't got times of its own
+    '''
+    return (getattr(bandit, 'cost_aware', False) and
+            arm.seconds_per_trial is None)
+
+
+def shared_cost(bandit):
+    '''
+    Returns the cost of a trial of an arm that shares_cost(): the bandit's
+    average seconds per trial, or 1.0 if the bandit isn't cost aware
+    '''
+    if not getattr(bandit, 'cost_aware', False):
+        return 1.0
+    seconds = bandit.seconds_per_trial
+    if seconds is None:
+        # nobody knows yet, so they all cost the same
+        return 1.0
+    return max(seconds, MIN_SECONDS_PER_TRIAL)
+
+
+def cost(bandit, arm):
+    '''
+    Returns the cost of a trial of arm: 1.0 unless the bandit is cost aware,
+    in which case it's the arm's average seconds per trial (or the bandit's,
+    if the arm hasn't got one yet).
+    '''
+    if not getattr(bandit, 'cost_aware', False):
+        return 1.0
+    if shares_cost(bandit, arm):
+        return shared_cost(bandit)
+    return max(arm.seconds_per_trial, MIN_SECONDS_PER_TRIAL)
+
+
+def _best(scored, rng):
+    '''
+    Returns the key with the highest score out of (key, score) pairs,
+    breaking ties at random
+    '''
+    best_score = None
+    best_keys = []
+    for (key, score) in scored:
+        if best_score is None or score > best_score:
+            best_score = score
+            best_keys = [key]
+        elif score == best_score:
+            best_keys.append(key)
+    if not best_keys:
+        return None
+    return rng.choice(best_keys)
+
+
+def proportional(bandit, rng):
+    '''
+    Picks each arm in proportion to its probability (the original BFF
+    behavior), or its probability per second if the bandit is cost aware
+    '''
+    if getattr(bandit, 'cost_aware', False):
+        return bandit._sample_rates(rng)
+    return bandit._weights.sample(rng)
+
+
+def thompson(bandit, rng):
+    '''
+    Thompson sampling: draws a success rate for each arm from its
+    Beta(successes + 1, failures + 1) posterior and picks the arm with the
+    highest draw. That's a fresh draw for every arm on every pick, so this
+    is O(n) per pick and best left to bandits with few arms.
+    '''
+    scored = []
+    for (key, arm) in bandit.arms.iteritems():
+        (successes, trials) = _counts(arm)
+        draw = rng.betavariate(successes + 1.0, trials - successes + 1.0)
+        scored.append((key, draw / cost(bandit, arm)))
+    return _best(scored, rng)
+
+
+def ucb1_bound(mean, trials, log_total):
+    '''
+    Returns the UCB1 index of an arm
+    '''
+    return mean + math.sqrt(2.0 * log_total / trials)
+
+
+def bernoulli_kl(p, q):
+    '''
+    Returns the Kullback-Leibler divergence between Bernoulli(p) and
+    Bernoulli(q)
+    '''
+    p = min(max(p, _EPSILON), 1.0 - _EPSILON)
+    q = min(max(q, _EPSILON), 1.0 - _EPSILON)
+    return p * math.log(p / q) + (1.0 - p) * math.log((1.0 - p) / (1.0 - q))
+
+
+def kl_upper_bound(mean, trials, log_total, tolerance=KL_UCB_TOLERANCE):
+    '''
+    Returns the largest q in [mean, 1] with
+    trials * KL(mean, q) <= log_total, found by bisection.
+    '''
+    limit = log_total / trials
+    low = mean
+    high = 1.0
+    while high - low > tolerance:
+        q = (low + high) / 2.0
+        if bernoulli_kl(mean, q) > limit:
+            high = q
+        else:
+            low = q
+    return low
+
+
+class UCBIndex(object):
+    '''
+    Keeps the arms of a bandit in max-heaps ordered by an upper bound on
+    their UCB index, so a pick only has to compute the exact index of the
+    arms near the top instead of every arm's.
+
+    An arm's index changes when the arm gets updated, or when the bandit's
+    total trials t grow. The heaps hold each arm's index as of a horizon of
+    2t, which can only overestimate it (the index grows with t), and get
+    rebuilt once t passes the horizon: O(n) work every time t doubles.
+    Updated arms are only marked dirty, and get their bounds recomputed at
+    the next pick. Arms that cost whatever the bandit-wide average is go in
+    a heap of their own, scaled by the current average at pick time, so
+    they never go stale when some other arm's times change the average.
+
+    The bandit calls update() and remove() as its arms change. Anything
+    that isn't in the index yet gets picked up by the rebuild on first use.
+    '''
+
+    def __init__(self, bound):
+        '''
+        :param bound: function(mean, trials, log_total) returning an arm's
+        index, non-decreasing in log_total
+        '''
+        self.bound = bound
+        self._horizon = None
+        self._dirty = set()
+        self._untried = set()
+        # key -> (version, shared, -upper bound)
+        self._entries = {}
+        # shared -> heap of (-upper bound, version, key)
+        self._heaps = {False: [], True: []}
+        self._version = 0
+
+    def update(self, key):
+        self._dirty.add(key)
+
+    def remove(self, key):
+        self._dirty.discard(key)
+        self._untried.discard(key)
+        self._entries.pop(key, None)
+
+    def _refresh(self, bandit, key):
+        self._entries.pop(key, None)
+        arm = bandit.arms.get(key)
+        if arm is None:
+            self._untried.discard(key)
+            return
+        (successes, trials) = _counts(arm)
+        if not trials:
+            self._untried.add(key)
+            return
+        self._untried.discard(key)
+
+        shared = shares_cost(bandit, arm)
+        upper = self.bound(float(successes) / trials, trials,
+                           math.log(self._horizon))
+        if not shared:
+            upper /= cost(bandit, arm)
+        self._version += 1
+        self._entries[key] = (self._version, shared, -upper)
+        heapq.heappush(self._heaps[shared], (-upper, self._version, key))
+
+    def _rebuild(self, bandit):
+        self._horizon = 2 * max(bandit.trials, 1)
+        self._dirty = set(bandit.arms)
+        self._untried = set()
+        self._entries = {}
+        self._heaps = {False: [], True: []}
+
+    def _compact(self):
+        # drop the stale entries that updates leave behind
+        for shared in (False, True):
+            heap = [(neg_upper, version, key) for (key, (version, s, neg_upper))
+                    in self._entries.iteritems() if s == shared]
+            heapq.heapify(heap)
+            self._heaps[shared] = heap
+
+    def _top(self, shared):
+        '''
+        Returns the heap entry with the highest upper bound from one of the
+        heaps, or None if it's empty
+        '''
+        heap = self._heaps[shared]
+        while heap:
+            (neg_upper, version, key) = heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def pick(self, bandit, rng):
+        if self._horizon is None or bandit.trials > self._horizon:
+            self._rebuild(bandit)
+        for key in self._dirty:
+            self._refresh(bandit, key)
+        self._dirty.clear()
+        queued = len(self._heaps[False]) + len(self._heaps[True])
+        if queued > 2 * len(self._entries) + 64:
+            self._compact()
+
+        if self._untried:
+            return rng.choice(sorted(self._untried))
+
+        log_total = math.log(max(bandit.trials, 1))
+        shared_scale = 1.0 / shared_cost(bandit)
+        best_score = None
+        best_keys = []
+        popped = []
+        while True:
+            own = self._top(False)
+            shared = self._top(True)
+            own_upper = -own[0] if own else None
+            shared_upper = -shared[0] * shared_scale if shared else None
+            if own is None and shared is None:
+                break
+            if shared is None or (own is not None and own_upper >= shared_upper):
+                (top, upper, heap) = (own, own_upper, self._heaps[False])
+            else:
+                (top, upper, heap) = (shared, shared_upper, self._heaps[True])
+            if best_score is not None and upper < best_score:
+                # nothing left can beat what we've got
+                break
+            popped.append((heap, heapq.heappop(heap)))
+
+            key = top[2]
+            arm = bandit.arms[key]
+            (successes, trials) = _counts(arm)
+            score = self.bound(float(successes) / trials, trials, log_total)
+            score /= cost(bandit, arm)
+            if best_score is None or score > best_score:
+                best_score = score
+                best_keys = [key]
+            elif score == best_score:
+                best_keys.append(key)
+
+        for (heap, item) in popped:
+            heapq.heappush(heap, item)
+        if not best_keys:
+            return None
+        return rng.choice(sorted(best_keys))
+
+
+def _index(bandit, bound):
+    index = getattr(bandit, '_ucb_index', None)
+    if index is None or index.bound is not bound:
+        index = UCBIndex(bound)
+        bandit._ucb_index = index
+    return index
+
+
+def ucb1(bandit, rng):
+    '''
+    UCB1 (Auer et al.): picks the arm with the highest observed success rate
+    plus sqrt(2 ln(total trials) / arm trials). Arms that have never been
+    tried go first.
+    '''
+    return _index(bandit, ucb1_bound).pick(bandit, rng)
+
+
+def kl_ucb(bandit, rng):
+    '''
+    KL-UCB (Garivier & Cappe): like UCB1, but the confidence bound comes
+    from the Bernoulli KL divergence, which is much tighter for the small
+    success rates fuzzing usually sees. Arms that have never been tried go
+    first.
+    '''
+    return _index(bandit, kl_upper_bound).pick(bandit, rng)
+
+
+STRATEGIES = {'proportional': proportional,
+              'thompson': thompson,
+              'ucb1': ucb1,
+              'kl_ucb': kl_ucb,
+              }
+
+DEFAULT_STRATEGY = 'proportional'
@@ -0,0 +1,122 @@
+'''
+Created on Oct 18, 2026
+
+An array-backed binary tree of partial sums over a set of keyed weights,
+so that changing one weight and picking a key in proportion to its weight
+both take O(log n) time instead of a pass over every arm.
+
+@organization: cert.org
+'''
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SumTree(object):
+    '''
+    Maps keys to non-negative weights. Leaves live in the back half of
+    self._tree, and every internal node holds the sum of its two children.
+    Internal nodes are recomputed from their children (rather than nudged
+    by the difference) whenever a weight changes, so the totals never drift
+    no matter how many updates go by.
+    '''
+
+    def __init__(self):
+        self._capacity = 1
+        self._tree = [0.0, 0.0]
+        self._slots = {}
+        self._keys = [None]
+        self._free = [0]
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    @property
+    def total(self):
+        return self._tree[1]
+
+    def _grow(self):
+        old_capacity = self._capacity
+        old_leaves = self._tree[old_capacity:]
+        self._capacity *= 2
+        self._tree = [0.0] * (2 * self._capacity)
+        self._tree[self._capacity:self._capacity + old_capacity] = old_leaves
+        for node in xrange(self._capacity - 1, 0, -1):
+            self._tree[node] = self._tree[2 * node] + self._tree[2 * node + 1]
+        self._keys.extend([None] * old_capacity)
+        # hand out the lowest new slot first
+        self._free.extend(xrange(self._capacity - 1, old_capacity - 1, -1))
+
+    def _set_leaf(self, slot, weight):
+        tree = self._tree
+        node = self._capacity + slot
+        tree[node] = weight
+        node //= 2
+        while node:
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+            node //= 2
+
+    def get(self, key):
+        return self._tree[self._capacity + self._slots[key]]
+
+    def set(self, key, weight):
+        '''
+        Sets the weight for key, adding key if it isn't there already
+        '''
+        if weight < 0.0:
+            raise ValueError('weight must be non-negative: %s' % weight)
+        try:
+            slot = self._slots[key]
+        except KeyError:
+            if not self._free:
+                self._grow()
+            slot = self._free.pop()
+            self._slots[key] = slot
+            self._keys[slot] = key
+        self._set_leaf(slot, float(weight))
+
+    def remove(self, key):
+        '''
+        Removes key, if it's there
+        '''
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        self._keys[slot] = None
+        self._set_leaf(slot, 0.0)
+        self._free.append(slot)
+
+    def find(self, x):
+        '''
+        Returns the key whose weight covers position x along the running
+        total of all weights, i.e. the first key (in slot order) for which
+        the cumulative weight exceeds x. Returns None if there are no
+        positive weights.
+        :param x: a number in [0, total)
+        '''
+        tree = self._tree
+        if not tree[1] > 0.0:
+            return None
+
+        node = 1
+        while node < self._capacity:
+            left = 2 * node
+            if x < tree[left] or not tree[left + 1] > 0.0:
+                # either it's in the left subtree, or float rounding pushed
+                # x past the end and the left subtree is all we've got
+                node = left
+            else:
+                x -= tree[left]
+                node = left + 1
+        return self._keys[node - self._capacity]
+
+    def sample(self, rng):
+        '''
+        Returns a key picked with probability proportional to its weight,
+        or None if there are no positive weights.
+        :param rng: anything with a random() method, e.g. the random module
+        '''
+        return self.find(rng.random() * self.total)
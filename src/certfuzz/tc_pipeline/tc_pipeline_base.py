@@ -7,6 +7,9 @@ import Queue
 import abc
 import logging
 import os
+import random
+import sys
+import threading
 
 from certfuzz.analyzers.errors import AnalyzerEmptyOutputError
 from certfuzz.file_handlers.watchdog_file import touch_watchdog_file
@@ -18,6 +21,13 @@ from certfuzz.minimizer.errors import MinimizerError
 
 logger = logging.getLogger(__name__)
 
+# how often a crash we think we recognize gets the full treatment anyway
+DEFAULT_PRE_DEDUP_RECHECK_RATE = 0.05
+# how many analyzers run at once on a testcase
+DEFAULT_ANALYZER_CONCURRENCY = 1
+# how often (in seconds) to touch the watchdog file while analyzers run
+ANALYZER_POLL_INTERVAL = 5.0
+
 
 class TestCasePipelineBase(object):
     '''
@@ -27,18 +37,33 @@ class TestCasePipelineBase(object):
     pipes = ['verify', 'minimize', 'recycle', 'analyze', 'report']
 
     def __init__(self, testcases=None, uniq_func=None, cfg=None, options=None,
-                 outdir=None, workdirbase=None, sf_set=None):
+                 outdir=None, workdirbase=None, sf_set=None, sig_index=None,
+                 seednum=None, verified_func=None):
         '''
         Constructor
+        @param uniq_func: called with a signature (and seednum=) to find out
+        whether it's new to the campaign
+        @param sf_set: the SeedfileSet to recycle crashers into. If it's None,
+        recycled crashers are only listed in self.recycled.
+        @param sig_index: a SignatureIndex to record the exploitability of
+        analyzed testcases in
+        @param seednum: the seednum the testcases came from
+        @param verified_func: called with each testcase once it's been
+        verified
         '''
         self.cfg = cfg
         self.options = options
         self.uniq_func = uniq_func
+        self.sig_index = sig_index
+        self.seednum = seednum
         self.outdir = outdir
         self.tc_dir = os.path.join(self.outdir, 'crashers')
 
         self.working_dir = workdirbase
         self.sf_set = sf_set
+        self.verified_func = verified_func
+        # paths of crashers copied into the seedfile dir
+        self.recycled = []
 
         self.tc_candidate_q = Queue.Queue()
 
@@ -107,8 +132,14 @@ class TestCasePipelineBase(object):
 
             logger.debug('verify testcase')
             self._pre_verify(testcase)
-            self._verify(testcase)
+            if self._is_known_crash(testcase):
+                testcase.should_proceed_with_analysis = False
+            else:
+                self._verify(testcase)
+                self._learn_fingerprint(testcase)
             self._post_verify(testcase)
+            if self.verified_func is not None:
+                self.verified_func(testcase)
 
             logger.debug('Testcase data:')
             for line in testcase.__repr__().splitlines():
@@ -165,6 +196,7 @@ class TestCasePipelineBase(object):
             logger.debug('report testcase')
             self._pre_report(testcase)
             self._report(testcase)
+            self._record_exploitability(testcase)
             self._post_report(testcase)
 
             for target in targets:
@@ -173,6 +205,48 @@ class TestCasePipelineBase(object):
     def _pre_verify(self, testcase):
         pass
 
+    def _is_known_crash(self, testcase):
+        '''
+        Returns True if the testcase's crash fingerprint has always led to a
+        signature we've already seen, in which case there's no need to run
+        the debugger on it. Every so often (runoptions.pre_dedup_recheck_rate)
+        it says no anyway, so the fingerprint gets checked again.
+        '''
+        fingerprint = getattr(testcase, 'fingerprint', None)
+        if fingerprint is None or self.sig_index is None:
+            return False
+
+        runoptions = self.cfg['runoptions']
+        if not runoptions.get('pre_dedup', False):
+            return False
+        if runoptions.get('keep_duplicates', False):
+            return False
+
+        signature = self.sig_index.signature_for(fingerprint)
+        if signature is None or signature not in self.sig_index:
+            return False
+
+        recheck_rate = runoptions.get('pre_dedup_recheck_rate',
+                                      DEFAULT_PRE_DEDUP_RECHECK_RATE)
+        if random.random() < recheck_rate:
+            logger.debug('Rechecking crash fingerprint %s', fingerprint)
+            return False
+
+        # count the hit
+        self.uniq_func(signature, seednum=self.seednum)
+        logger.info('Crash fingerprint %s matches %s, skipping the debugger',
+                    fingerprint, signature)
+        testcase.signature = signature
+        return True
+
+    def _learn_fingerprint(self, testcase):
+        fingerprint = getattr(testcase, 'fingerprint', None)
+        if fingerprint is None or self.sig_index is None:
+            return
+        if not testcase.is_crash or not testcase.signature:
+            return
+        self.sig_index.learn_fingerprint(fingerprint, testcase.signature)
+
     @abc.abstractmethod
     def _verify(self, testcase):
         pass
@@ -253,7 +327,9 @@ class TestCasePipelineBase(object):
                     self.cfg['directories']['seedfile_dir'], crasherseedname)
                 filetools.copy_file(
                     testcase.fuzzedfile.path, crasherseed_path)
-                self.sf_set.add_file(crasherseed_path)
+                self.recycled.append(crasherseed_path)
+                if self.sf_set is not None:
+                    self.sf_set.add_file(crasherseed_path)
 
             for target in targets:
                 target.send(testcase)
@@ -261,21 +337,83 @@ class TestCasePipelineBase(object):
     def _pre_analyze(self, testcase):
         pass
 
+    def _analyzer_concurrency(self):
+        if not self.cfg:
+            return DEFAULT_ANALYZER_CONCURRENCY
+        return max(1, int(self.cfg['runoptions'].get(
+            'analyzer_concurrency', DEFAULT_ANALYZER_CONCURRENCY)))
+
     def _analyze(self, testcase):
         '''
-        Loops through all known analyzer_classes for a given testcase
+        Runs all known analyzer_classes on a given testcase, up to
+        runoptions.analyzer_concurrency of them at a time
         :param testcase:
         '''
+        concurrency = min(self._analyzer_concurrency(),
+                          len(self.analyzer_classes))
+        if concurrency > 1:
+            self._analyze_concurrently(testcase, concurrency)
+            return
+
         for analyzer_class in self.analyzer_classes:
-            touch_watchdog_file()
+            self._run_analyzer(analyzer_class, testcase)
+
+    def _run_analyzer(self, analyzer_class, testcase, isolate=False):
+        touch_watchdog_file()
 
-            analyzer_instance = analyzer_class(self.cfg, testcase)
-            if analyzer_instance:
+        analyzer_instance = analyzer_class(self.cfg, testcase)
+        if not analyzer_instance:
+            return
+        if isolate:
+            analyzer_instance.isolate()
+        try:
+            analyzer_instance.go()
+        except AnalyzerEmptyOutputError:
+            logger.warning(
+                'Unexpected empty output from analyzer_class. Continuing')
+        finally:
+            if isolate:
+                analyzer_instance.clean_workdir()
+
+    def _analyze_concurrently(self, testcase, concurrency):
+        '''
+        Runs the analyzers in concurrency threads. The analyzers only read
+        the testcase and each writes its own output file, so the slowest one
+        sets the pace. Each gets its own working directory (see
+        Analyzer.isolate()) so they stay out of each other's way.
+        '''
+        todo = Queue.Queue()
+        for analyzer_class in self.analyzer_classes:
+            todo.put(analyzer_class)
+        errors = []
+
+        def worker():
+            while True:
                 try:
-                    analyzer_instance.go()
-                except AnalyzerEmptyOutputError:
-                    logger.warning(
-                        'Unexpected empty output from analyzer_class. Continuing')
+                    analyzer_class = todo.get_nowait()
+                except Queue.Empty:
+                    return
+                try:
+                    self._run_analyzer(analyzer_class, testcase, isolate=True)
+                except Exception:
+                    logger.warning('%s failed', analyzer_class.__name__)
+                    errors.append(sys.exc_info())
+
+        logger.debug('Running %d analyzers, %d at a time',
+                     len(self.analyzer_classes), concurrency)
+        threads = [threading.Thread(target=worker) for _ in xrange(concurrency)]
+        for t in threads:
+            t.daemon = True
+            t.start()
+        for t in threads:
+            while t.is_alive():
+                t.join(ANALYZER_POLL_INTERVAL)
+                touch_watchdog_file()
+
+        if errors:
+            # pass the first failure on, as if they'd run one at a time
+            (etype, value, tb) = errors[0]
+            raise etype, value, tb
 
     def _post_analyze(self, testcase):
         pass
@@ -292,6 +430,12 @@ class TestCasePipelineBase(object):
     def _post_report(self, testcase):
         pass
 
+    def _record_exploitability(self, testcase):
+        # now that it's been analyzed, we know more than we did in _verify
+        if self.sig_index is not None and testcase.signature:
+            self.sig_index.set_exploitability(testcase.signature,
+                                              testcase.exp)
+
     def go(self):
         while not self.tc_candidate_q.empty():
             testcase = self.tc_candidate_q.get()
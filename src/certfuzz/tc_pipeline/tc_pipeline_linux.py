@@ -70,18 +70,15 @@ class LinuxTestCasePipeline(TestCasePipelineBase):
         with testcase as tc:
             if tc.is_crash:
 
-                is_new_to_campaign = self.uniq_func(tc.signature)
-
-                # fall back to checking if the crash directory exists
-                #
-                # TODO: Before getting the full debugger ouput, the output dir will always
-                # be in UNKNOWN.  Fix this logic
-                crash_dir_found = os.path.exists(tc.target_dir)
+                # the campaign's signature index remembers crashes from
+                # earlier runs too, so there's no need to go looking for
+                # their crash directories
+                is_new_to_campaign = self.uniq_func(tc.signature,
+                                                    seednum=self.seednum)
 
                 keep_all = self.cfg['runoptions'].get('keep_duplicates', False)
 
-                tc.should_proceed_with_analysis = keep_all or (
-                    is_new_to_campaign and not crash_dir_found)
+                tc.should_proceed_with_analysis = keep_all or is_new_to_campaign
 
                 if tc.should_proceed_with_analysis:
                     logger.info('%s is new', tc.signature)
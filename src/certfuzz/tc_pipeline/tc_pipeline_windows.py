@@ -65,7 +65,7 @@ class WindowsTestCasePipeline(TestCasePipelineBase):
         if testcase.is_crash:
             if self.options['keep_duplicates']:
                 return (True, 'keep duplicates')
-            elif self.uniq_func(testcase.signature):
+            elif self.uniq_func(testcase.signature, seednum=self.seednum):
                 # Check if crasher directory exists already
                 target_dir = testcase._get_output_dir(self.outdir)
                 if os.path.exists(target_dir):
@@ -52,6 +52,8 @@ class TestCaseBase(object):
         self.hd_bits = None
         self.hd_bytes = None
         self.faddr = None
+        # a CrashFingerprint from the runner, if it had one
+        self.fingerprint = None
         self.fuzzedfile = fuzzedfile
         self.is_corrupt_stack = False
         # Not a crash until we're sure
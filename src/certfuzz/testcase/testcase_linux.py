@@ -43,7 +43,8 @@ class LinuxTestcase(TestCaseBase):
                  workdir_base,
                  keep_faddr=False,
                  save_failed_asserts=False,
-                 exclude_unmapped_frames=False):
+                 exclude_unmapped_frames=False,
+                 fingerprint=None):
 
         TestCaseBase.__init__(self,
                               cfg,
@@ -64,6 +65,7 @@ class LinuxTestcase(TestCaseBase):
         self.set_debugger_template('bt_only')
         self.signature = None
         self.keep_uniq_faddr = keep_faddr
+        self.fingerprint = fingerprint
 
     def set_debugger_template(self, option='bt_only'):
         if host_info.is_osx():
@@ -134,7 +136,9 @@ class LinuxTestcase(TestCaseBase):
                                           self.debugger_timeout,
                                           template=self.debugger_template,
                                           exclude_unmapped_frames=self.exclude_unmapped_frames,
-                                          keep_uniq_faddr=self.keep_uniq_faddr
+                                          keep_uniq_faddr=self.keep_uniq_faddr,
+                                          persistent=self.cfg['debugger'].get(
+                                              'persistent_sessions', False)
                                           )
         self.dbg = debugger_obj.go()
         self.dbg_files[0] = self.dbg.file
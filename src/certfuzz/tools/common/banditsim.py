@@ -0,0 +1,71 @@
+'''
+Created on Oct 18, 2026
+
+Compares bandit strategies for picking seed files, using the seed file
+scores from one or more campaign state files (campaign_<id>.json in the
+campaign's working directory).
+
+@organization: cert.org
+'''
+import logging
+from optparse import OptionParser
+
+from certfuzz.scoring.multiarmed_bandit.simulator import read_records, compare
+from certfuzz.scoring.multiarmed_bandit.simulator import DEFAULT_SECONDS_PER_TRIAL
+from certfuzz.scoring.multiarmed_bandit.strategies import STRATEGIES
+
+logger = logging.getLogger()
+logger.setLevel(logging.WARNING)
+
+
+def format_results(results):
+    lines = ['%-14s %10s %10s %10s %14s' % ('strategy', 'trials', 'crashes',
+                                            'cpu_hours', 'crashes/cpu_hr')]
+    for r in sorted(results, key=lambda r: r.successes_per_cpu_hour,
+                    reverse=True):
+        lines.append('%-14s %10d %10d %10.2f %14.4f' % (r.strategy, r.trials,
+                                                       r.successes,
+                                                       r.cpu_hours,
+                                                       r.successes_per_cpu_hour))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = OptionParser(usage='%prog [options] <campaign_state.json> ...')
+    parser.add_option('', '--debug', dest='debug', action='store_true', help='Enable debug messages')
+    parser.add_option('', '--iterations', dest='iterations', type='int', default=10000, help='Iterations per simulated campaign (default: %default)')
+    parser.add_option('', '--runs', dest='runs', type='int', default=10, help='Simulated campaigns per strategy (default: %default)')
+    parser.add_option('', '--seed', dest='seed', type='int', default=0, help='Random seed (default: %default)')
+    parser.add_option('', '--seconds-per-trial', dest='seconds_per_trial', type='float', default=DEFAULT_SECONDS_PER_TRIAL, help='CPU seconds per iteration, for seed files without recorded times (default: %default)')
+    parser.add_option('', '--cost-aware', dest='cost_aware', action='store_true', help='Simulate cost_aware_scheduling')
+    parser.add_option('', '--strategies', dest='strategies', default=','.join(sorted(STRATEGIES)), help='Comma-separated strategies to compare (default: %default)')
+
+    (options, args) = parser.parse_args()
+
+    hdlr = logging.StreamHandler()
+    logger.addHandler(hdlr)
+    if options.debug:
+        logger.setLevel(logging.DEBUG)
+
+    if not args:
+        parser.error('You must specify at least one campaign state file')
+
+    strategies = [s.strip() for s in options.strategies.split(',') if s.strip()]
+    for s in strategies:
+        if s not in STRATEGIES:
+            parser.error('Unknown strategy: %s' % s)
+
+    for path in args:
+        records = read_records(path, options.seconds_per_trial)
+        if not records:
+            print '%s: no seed file scores found' % path
+            continue
+        results = compare(records, strategies, options.iterations,
+                          options.runs, options.seed, options.cost_aware)
+        print path
+        print format_results(results)
+        print
+
+
+if __name__ == '__main__':
+    main()
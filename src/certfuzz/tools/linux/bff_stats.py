@@ -9,6 +9,7 @@ from optparse import OptionParser
 import os
 import re
 import sys
+from certfuzz.campaign.signature_index import SignatureIndex
 from certfuzz.config.simple_loader import load_and_fix_config
 
 
@@ -47,6 +48,25 @@ def record_stats(key, seed_list, counters, first_seeds, last_seeds):
     logger.debug('%s first=%d last=%d count=%d', key, first_seeds[key], last_seeds[key], counters[key])
 
 
+def read_signature_index(dbfile, counters, first_seeds, last_seeds):
+    '''
+    Fills in counters, first_seeds and last_seeds from the campaign's crash
+    signature index. Returns the number of signatures read.
+    '''
+    index = SignatureIndex(dbfile)
+    try:
+        index.load()
+    finally:
+        index.close()
+
+    for record in index:
+        # crashers imported from before there was an index have no seednums
+        first_seeds[record.signature] = record.first_seednum or 0
+        last_seeds[record.signature] = record.last_seednum or 0
+        counters[record.signature] = record.hits
+    return len(index)
+
+
 def get_sort_key(options, counters, bit_hds, byte_hds, first_seeds, last_seeds):
     if options.sort_by_first:
         sort_by = first_seeds
@@ -72,7 +92,7 @@ def prepare_output(options, counters, bit_hds, byte_hds, first_seeds, last_seeds
     output_lines.append(header_line)
     sort_by, reverse = get_sort_key(options, counters, bit_hds, byte_hds, first_seeds, last_seeds)
     for dummy, k in sorted([(value, key) for (key, value) in sort_by.items()], reverse=reverse):
-        parts = [k, counters[k], first_seeds[k], last_seeds[k], bit_hds[k], byte_hds[k]]
+        parts = [k, counters[k], first_seeds[k], last_seeds[k], bit_hds.get(k, -1), byte_hds.get(k, -1)]
         output_lines.append(format_line(parts))
     return output_lines
 
@@ -106,7 +126,8 @@ def main():
     _campaign_id = cfg['campaign']['id']
     _campaign_id_no_space = re.sub('\s', '_', _campaign_id)
 
-    result_dir = os.path.join(cfg['directories']['results_dir'], _campaign_id_no_space, 'crashers')
+    campaign_dir = os.path.join(cfg['directories']['results_dir'], _campaign_id_no_space)
+    result_dir = os.path.join(campaign_dir, 'crashers')
     logger.debug('Reading results from %s', result_dir)
 
     counters = {}
@@ -115,6 +136,15 @@ def main():
     first_seeds = {}
     last_seeds = {}
 
+    # newer campaigns keep count of their crashes, so use that if it's there
+    sig_index_file = os.path.join(campaign_dir, 'crash_signatures.sqlite')
+    if os.path.isfile(sig_index_file):
+        logger.debug('Reading crash signature index %s', sig_index_file)
+        read_signature_index(sig_index_file, counters, first_seeds, last_seeds)
+        output_lines = prepare_output(options, counters, bit_hds, byte_hds, first_seeds, last_seeds)
+        [logger.info(l) for l in output_lines]
+        return
+
     if not os.path.isdir(result_dir):
         logger.info('No results dir found at %s', result_dir)
         sys.exit()
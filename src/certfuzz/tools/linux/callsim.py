@@ -21,6 +21,7 @@ def main():
     parser.add_option('', '--outfile', dest='outfile', help='file to write output to')
     parser.add_option('', '--precision', dest='precision', help='Number of digits to print in similarity')
     parser.add_option('', '--style', dest='style', help='Either "list" or "tree"')
+    parser.add_option('', '--top', dest='top_k', type='int', help='Only list the TOP_K most similar crashes to each crash (list style only)')
 
     (options, args) = parser.parse_args()
 
@@ -39,8 +40,13 @@ def main():
     else:
         logger.debug('Args: %s', args)
 
+    if options.top_k is not None and options.style == 'tree':
+        print "--top can't be used with --style tree, which needs every pair of crashes"
+        parser.print_help()
+        exit(-1)
+
     try:
-        sim = SimilarityMatrix(args)
+        sim = SimilarityMatrix(args, top_k=options.top_k)
     except SimilarityMatrixError, e:
         print 'Error:', e
         exit(-1)
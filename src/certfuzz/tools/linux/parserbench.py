@@ -0,0 +1,136 @@
+'''
+Created on Oct 18, 2026
+
+Times the debugger output parsers (GDBfile, ABRTfile, Konqifile and
+CWfile) over a set of debugger output files, such as the backtraces in
+test_certfuzz/debuggers/output_parsers. With --signatures it also prints the
+signature each file gets, so the output of two versions of the parsers can
+be diffed to make sure they agree.
+
+@organization: cert.org
+'''
+import collections
+import logging
+from optparse import OptionParser
+import os
+import time
+
+from certfuzz.debuggers.output_parsers.abrtfile import ABRTfile
+from certfuzz.debuggers.output_parsers.cwfile import CWfile
+from certfuzz.debuggers.output_parsers.debugger_file_base import detect_format
+from certfuzz.debuggers.output_parsers.errors import UnknownDebuggerError
+from certfuzz.debuggers.output_parsers.gdbfile import GDBfile
+from certfuzz.debuggers.output_parsers.konqifile import Konqifile
+from certfuzz.fuzztools.filetools import all_files
+
+logger = logging.getLogger()
+logger.setLevel(logging.WARNING)
+
+PARSERS = {'gdb': GDBfile,
+           'abrt': ABRTfile,
+           'konqi': Konqifile,
+           'cw': CWfile,
+           }
+
+ParseResult = collections.namedtuple('ParseResult', ['path', 'fmt', 'lines',
+                                                     'seconds', 'signature'])
+
+
+def file_format(path):
+    '''
+    Returns the kind of debugger output in path (one of PARSERS), or None
+    '''
+    if os.path.splitext(path)[1] == '.cw':
+        return 'cw'
+    try:
+        return detect_format(path)
+    except (UnknownDebuggerError, IOError):
+        return None
+
+
+def parse(path, fmt, repeat=1, level=5):
+    '''
+    Parses path repeat times, and returns a ParseResult with the best time
+    '''
+    cls = PARSERS[fmt]
+    best = None
+    for _ in xrange(repeat):
+        started = time.time()
+        parsed = cls(path)
+        elapsed = time.time() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return ParseResult(path, fmt, len(parsed.lines), best,
+                       parsed.get_testcase_signature(level))
+
+
+def benchmark(paths, repeat=1, level=5):
+    '''
+    Returns a ParseResult for each debugger output file in paths (which may
+    include directories)
+    '''
+    results = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(all_files(path))
+        else:
+            files = [path]
+        for f in files:
+            fmt = file_format(f)
+            if fmt is None:
+                logger.info('Skipping %s: unknown format', f)
+                continue
+            results.append(parse(f, fmt, repeat, level))
+    return results
+
+
+def format_results(results, signatures=False):
+    lines = []
+    if signatures:
+        for r in results:
+            lines.append('%-6s %-32s %s' % (r.fmt, r.signature, r.path))
+        lines.append('')
+
+    lines.append('%-6s %6s %8s %10s %10s %12s' % ('format', 'files', 'lines',
+                                                  'ms', 'ms/file',
+                                                  'lines/sec'))
+    for fmt in sorted(set(r.fmt for r in results)):
+        these = [r for r in results if r.fmt == fmt]
+        nlines = sum(r.lines for r in these)
+        seconds = sum(r.seconds for r in these)
+        rate = nlines / seconds if seconds else 0.0
+        lines.append('%-6s %6d %8d %10.2f %10.3f %12.0f' % (fmt, len(these),
+                                                            nlines,
+                                                            seconds * 1000,
+                                                            seconds * 1000 / len(these),
+                                                            rate))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = OptionParser(usage='%prog [options] <file-or-dir> ...')
+    parser.add_option('', '--debug', dest='debug', action='store_true', help='Enable debug messages')
+    parser.add_option('', '--repeat', dest='repeat', type='int', default=10, help='Parse each file this many times and keep the best time (default: %default)')
+    parser.add_option('', '--level', dest='level', type='int', default=5, help='Backtrace level for signatures (default: %default)')
+    parser.add_option('', '--signatures', dest='signatures', action='store_true', help='Print the signature of each file')
+    (options, args) = parser.parse_args()
+
+    hdlr = logging.StreamHandler()
+    logger.addHandler(hdlr)
+    if options.debug:
+        logger.setLevel(logging.DEBUG)
+    else:
+        # the parsers are chatty
+        logging.getLogger('certfuzz').setLevel(logging.ERROR)
+
+    if not args:
+        parser.error('You must specify at least one file or directory')
+
+    results = benchmark(args, max(1, options.repeat), options.level)
+    if not results:
+        parser.error('No debugger output files found')
+    print format_results(results, options.signatures)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+/*
+ * BFF fork server stub
+ *
+ * Load into the target with LD_PRELOAD. Once the dynamic loader has done
+ * its work, the constructor below takes over and waits for commands from
+ * certfuzz.runners.forkserver on BFF_FORKSRV_CTL_FD. Each command forks a
+ * child that returns from the constructor and runs main() as usual. The
+ * child's pid and then its waitpid() status are written back on
+ * BFF_FORKSRV_ST_FD.
+ *
+ * If the status fd isn't there (i.e., the target wasn't started by the
+ * runner) the stub does nothing.
+ *
+ * Build with: make
+ */
+#include <fcntl.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+#define BFF_FORKSRV_CTL_FD 198
+#define BFF_FORKSRV_ST_FD 199
+
+static void
+bff_forkserver(void) __attribute__((constructor));
+
+static void
+bff_forkserver(void)
+{
+    const char *input;
+    uint32_t cmd;
+    int32_t pid;
+    int status;
+    int fd;
+
+    if (!getenv("BFF_FORKSRV"))
+        return;
+
+    /* don't let anything the target execs turn into a fork server too */
+    input = getenv("BFF_FORKSRV_INPUT");
+    unsetenv("BFF_FORKSRV");
+    unsetenv("LD_PRELOAD");
+
+    /* say hello, if nobody is listening just run the target */
+    pid = (int32_t) getpid();
+    if (write(BFF_FORKSRV_ST_FD, &pid, 4) != 4)
+        return;
+
+    for (;;) {
+        if (read(BFF_FORKSRV_CTL_FD, &cmd, 4) != 4)
+            _exit(0);
+
+        pid = (int32_t) fork();
+        if (pid < 0)
+            _exit(1);
+
+        if (!pid) {
+            /* child: own process group so the runner can kill it and
+             * anything it spawns in one go */
+            setpgid(0, 0);
+            close(BFF_FORKSRV_CTL_FD);
+            close(BFF_FORKSRV_ST_FD);
+            if (input) {
+                fd = open(input, O_RDONLY);
+                if (fd >= 0) {
+                    dup2(fd, 0);
+                    close(fd);
+                }
+            }
+            return;
+        }
+
+        if (write(BFF_FORKSRV_ST_FD, &pid, 4) != 4)
+            _exit(1);
+        if (waitpid(pid, &status, 0) < 0)
+            _exit(1);
+        if (write(BFF_FORKSRV_ST_FD, &status, 4) != 4)
+            _exit(1);
+    }
+}
@@ -104,6 +104,16 @@ class Test(unittest.TestCase):
         self.assertEqual(None, tcb.classification)
         self.assertEqual(None, tcb.shortdesc)
 
+    def test_find_in_testcase(self):
+        # not read in yet
+        self.assertEqual(None, self.tcb._crasherdata)
+        self.assertEqual({'ar': [1], 'r': [2]},
+                         self.tcb.find_in_testcase(['ar', 'r']))
+        self.assertEqual(None, self.tcb._crasherdata)
+        # once it's in memory, that's what gets searched
+        self.tcb.crasherdata = 'ararar'
+        self.assertEqual({'ar': [0, 2, 4]}, self.tcb.find_in_testcase(['ar']))
+
     def test_runtime_context(self):
         self.assertTrue(hasattr(self.tcb, '__enter__'))
         self.assertTrue(hasattr(self.tcb, '__exit__'))
@@ -141,6 +151,27 @@ class Test(unittest.TestCase):
         self.tcb._look_for_loaded_module = lambda x, y: 'foo'
         self.assertEqual('foo', self.tcb.pc_in_mapped_address('zzz'))
 
+    def test_module_map(self):
+        self.tcb.reporttext = 'mod 1000 2000 foo\nabc\nmod 2000 3000 bar\n'
+        parsed = []
+
+        def _parse(line):
+            parsed.append(line)
+            parts = line.split()
+            if parts[0] == 'mod':
+                return (int(parts[1], 16), int(parts[2], 16), parts[3])
+        self.tcb._parse_loaded_module = _parse
+
+        self.assertEqual('foo', self.tcb.pc_in_mapped_address('1800'))
+        self.assertEqual('bar', self.tcb.pc_in_mapped_address('00002800'))
+        self.assertEqual('unloaded', self.tcb.pc_in_mapped_address('3800'))
+        # TCB stubs out the line-at-a-time check
+        look = testcasebundle_base.TestCaseBundle._look_for_loaded_module
+        self.assertEqual('foo', look(self.tcb, '1800', 'mod 1000 2000 foo'))
+        self.assertEqual(None, look(self.tcb, '2800', 'mod 1000 2000 foo'))
+        # the debugger output only got read once
+        self.assertEqual(5, len(parsed))
+
     def test_get_ex_num(self):
         self.assertEqual(0, self.tcb.get_ex_num())
 
@@ -3,17 +3,46 @@ Created on Jul 2, 2014
 
 @organization: cert.org
 '''
+import os
+import shutil
+import tempfile
 import unittest
 from certfuzz.analyzers.drillresults import testcasebundle_linux
 
+gdb_output = '''Program received signal SIGSEGV, Segmentation fault.
+#0  0xb7ea2b3c in foo () from /lib/libfoo.so.1
+	Start Addr   End Addr       Size     Offset objfile
+	 0x8048000  0x8050000     0x8000          0       /usr/bin/bar
+	0xb7e90000 0xb7eb0000    0x20000          0       /lib/libfoo.so.1
+	0xb7fe2000 0xb7fe3000     0x1000          0           [vdso]
+'''
+
 
 class Test(unittest.TestCase):
 
     def setUp(self):
-        pass
+        self.tmpdir = tempfile.mkdtemp()
+        dbgf = os.path.join(self.tmpdir, 'debugfile')
+        tcf = os.path.join(self.tmpdir, 'testcasefile')
+        with open(dbgf, 'wb') as fp:
+            fp.write(gdb_output)
+        with open(tcf, 'wb') as fp:
+            fp.write('bar\n')
+        self.tcb = testcasebundle_linux.LinuxTestCaseBundle(dbgf, tcf,
+                                                            'abracadabra')
 
     def tearDown(self):
-        pass
+        shutil.rmtree(self.tmpdir)
+
+    def test_pc_in_mapped_address(self):
+        self.assertEqual(3, len(self.tcb.module_map))
+        self.assertEqual('/lib/libfoo.so.1',
+                         self.tcb.pc_in_mapped_address('b7ea2b3c'))
+        self.assertEqual('/usr/bin/bar',
+                         self.tcb.pc_in_mapped_address('08049000'))
+        self.assertEqual('[vdso]', self.tcb.pc_in_mapped_address('b7fe2800'))
+        self.assertEqual('unloaded',
+                         self.tcb.pc_in_mapped_address('c0000000'))
 
     def testName(self):
         pass
@@ -4,6 +4,7 @@ Created on Aug 8, 2011
 @organization: cert.org
 '''
 
+import os
 import unittest
 from certfuzz.analyzers.analyzer_base import Analyzer
 from test_certfuzz.mocks import MockCrash, MockFixupCfg
@@ -23,6 +24,26 @@ class Test(unittest.TestCase):
     def testName(self):
         pass
 
+    def test_isolate(self):
+        self.assertEqual(None, self.analyzer.workdir)
+        self.assertTrue(self.analyzer.kill_by_name)
+
+        self.analyzer.isolate()
+        workdir = self.analyzer.workdir
+        self.assertTrue(os.path.isdir(workdir))
+        self.assertFalse(self.analyzer.kill_by_name)
+        # each gets its own
+        other = Analyzer(MockFixupCfg(), MockCrash(), timeout=0)
+        other.isolate()
+        self.assertNotEqual(workdir, other.workdir)
+
+        for a in (self.analyzer, other):
+            a.clean_workdir()
+        self.assertFalse(os.path.exists(workdir))
+        self.assertEqual(None, self.analyzer.workdir)
+        # nothing left to clean
+        self.analyzer.clean_workdir()
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
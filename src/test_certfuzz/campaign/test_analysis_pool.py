@@ -0,0 +1,229 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+from certfuzz.campaign import analysis_pool
+from certfuzz.campaign.analysis_pool import AnalysisJob, AnalysisPool
+from certfuzz.campaign.signature_index import SignatureIndex
+from certfuzz.fuzztools.crash_fingerprint import CrashFingerprint
+
+
+class MockTestcase(object):
+
+    def __init__(self, signature):
+        self.signature = signature
+        self.should_proceed_with_analysis = False
+
+
+class MockIteration(object):
+    '''
+    Treats the contents of the fuzzed file as the crash signature
+    '''
+
+    def __init__(self, seedfile=None, seednum=None, workdirbase=None,
+                 outdir=None, uniq_func=None, sig_index=None, config=None,
+                 fuzzer_cls=None, runner_cls=None):
+        self.seednum = seednum
+        self.uniq_func = uniq_func
+        self.sig_index = sig_index
+        self.cfg = config
+        self.working_dir = None
+        self.fuzzed_file = None
+        self.saw_crash = False
+        self.fingerprint = None
+        self.verified_func = None
+        self.success = False
+        self.recycled = []
+        self.testcase = None
+
+    def construct_testcase(self):
+        with open(self.fuzzed_file, 'rb') as f:
+            self.testcase = MockTestcase(f.read())
+
+    def process_testcases(self):
+        tc = self.testcase
+        if tc.signature == 'boom':
+            raise ValueError('boom')
+        is_new = self.uniq_func(tc.signature, seednum=self.seednum)
+        tc.should_proceed_with_analysis = (
+            is_new or self.cfg['runoptions'].get('keep_duplicates', False))
+        self.verified_func(tc)
+        self.success = tc.should_proceed_with_analysis
+        if self.success:
+            self.sig_index.set_exploitability(tc.signature, 'EXPLOITABLE')
+            if self.cfg['runoptions'].get('recycle_crashers'):
+                self.recycled = [self.fuzzed_file]
+
+
+class MockRange(object):
+
+    def __init__(self, rmin, rmax):
+        self.min = rmin
+        self.max = rmax
+
+
+class MockBandit(object):
+
+    def __init__(self, things):
+        self.things = things
+        self.successes = {}
+        self.tries = {}
+
+    def record_success(self, key):
+        self.successes[key] = self.successes.get(key, 0) + 1
+
+    def record_tries(self, key, tries=1, seconds=0.0):
+        self.tries[key] = self.tries.get(key, 0) + tries
+
+
+class MockSeedfile(object):
+
+    def __init__(self, md5):
+        self.md5 = md5
+        self.rangefinder = MockBandit({'r1': MockRange(0.1, 0.2)})
+
+
+class MockSeedfileSet(MockBandit):
+
+    def __init__(self, *seedfiles):
+        MockBandit.__init__(self, dict((sf.md5, sf) for sf in seedfiles))
+        self.added = []
+
+    def add_file(self, path):
+        self.added.append(path)
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.queue_dir = os.path.join(self.tmpdir, 'analysis_queue')
+        self.sf = MockSeedfile('abc')
+        self.sf_set = MockSeedfileSet(self.sf)
+        self.config = {'runoptions': {}, 'target': {'cmdline_template': ''}}
+        self.sig_index_file = os.path.join(self.tmpdir, 'sigs.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _pool(self, workers=2, limit=None):
+        return AnalysisPool(workers,
+                            queue_dir=self.queue_dir,
+                            sf_set=self.sf_set,
+                            sig_index_file=self.sig_index_file,
+                            crashers_dir=os.path.join(self.tmpdir,
+                                                      'crashers'),
+                            iteration_cls=MockIteration,
+                            outdir=self.tmpdir,
+                            config=self.config,
+                            fuzzer_cls=None,
+                            runner_cls=None,
+                            limit=limit)
+
+    def _working_dir(self, signature):
+        d = tempfile.mkdtemp(dir=self.tmpdir)
+        fuzzed = os.path.join(d, 'sf_abc-1.txt')
+        with open(fuzzed, 'wb') as f:
+            f.write(signature)
+        return (d, fuzzed)
+
+    def _submit(self, pool, seednum, signature, range_obj=None):
+        (d, fuzzed) = self._working_dir(signature)
+        job = pool.submit(self.sf, seednum, range_obj, d, fuzzed,
+                          CrashFingerprint(11, 'target', seednum), 0.5)
+        # the files went with it
+        self.assertEqual([], os.listdir(d))
+        return job
+
+    def test_job_roundtrip(self):
+        path = tempfile.mkdtemp(prefix=analysis_pool.JOB_PREFIX,
+                                dir=self.tmpdir)
+        job = AnalysisJob(path, 'abc', 7, (0.1, 0.2), 'fuzzed.txt',
+                          CrashFingerprint(11, 'libc.so.6', 0x10), 1.5)
+        job.save()
+        loaded = AnalysisJob.load(path)
+        self.assertEqual(job.as_dict(), loaded.as_dict())
+        self.assertEqual(job.fingerprint, loaded.fingerprint)
+        self.assertEqual(job.id, loaded.id)
+
+        job = AnalysisJob(path, 'abc', 8)
+        job.save()
+        self.assertEqual(None, AnalysisJob.load(path).fingerprint)
+
+    def test_analyze(self):
+        self.config['runoptions']['recycle_crashers'] = True
+        with self._pool() as pool:
+            for (seednum, sig) in enumerate(['foo', 'bar', 'foo', 'boom']):
+                self._submit(pool, seednum, sig, MockRange(0.1, 0.2))
+            pool.drain()
+            self.assertEqual(0, len(pool))
+            self.assertEqual(2, len(pool.sig_index))
+            self.assertEqual('EXPLOITABLE',
+                             pool.sig_index.get('foo').exploitability)
+
+        # two new crashes, a duplicate and a failure
+        self.assertEqual({'abc': 2}, self.sf_set.successes)
+        self.assertEqual({'abc': 2}, self.sf_set.tries)
+        self.assertEqual({'r1': 2}, self.sf.rangefinder.successes)
+        self.assertEqual(2, len(self.sf_set.added))
+        # nothing left behind
+        self.assertEqual([], os.listdir(self.queue_dir))
+
+    def test_backpressure(self):
+        with self._pool(workers=1, limit=2) as pool:
+            for seednum in xrange(5):
+                self._submit(pool, seednum, 'sig%d' % seednum)
+                self.assertTrue(len(pool) <= 2)
+        self.assertEqual({'abc': 5}, self.sf_set.successes)
+
+    def test_recover(self):
+        os.makedirs(self.queue_dir)
+        # seen before the campaign stopped
+        index = SignatureIndex(self.sig_index_file)
+        index.record('qux', seednum=0)
+        index.close()
+
+        def _job(seednum, signature, sf_md5='abc', verified=None):
+            path = tempfile.mkdtemp(prefix=analysis_pool.JOB_PREFIX,
+                                    dir=self.queue_dir)
+            with open(os.path.join(path, 'fuzzed.txt'), 'wb') as f:
+                f.write(signature)
+            AnalysisJob(path, sf_md5, seednum, fuzzed_file='fuzzed.txt',
+                        verified=verified).save()
+
+        # not verified yet
+        _job(1, 'foo')
+        # verified as new, so it gets analyzed even though qux is known now
+        _job(2, 'qux', verified=True)
+        # verified as a duplicate, so there's nothing left to do
+        _job(3, 'bar', verified=False)
+        # its seed file is gone
+        _job(4, 'baz', sf_md5='def')
+        # unreadable
+        os.makedirs(os.path.join(self.queue_dir,
+                                 analysis_pool.JOB_PREFIX + 'broken'))
+
+        self.config['runoptions']['recycle_crashers'] = True
+        with self._pool() as pool:
+            pool.drain()
+            self.assertFalse('bar' in pool.sig_index)
+            self.assertFalse('baz' in pool.sig_index)
+            self.assertEqual(1, pool.sig_index.get('foo').hits)
+            self.assertEqual(2, pool.sig_index.get('qux').hits)
+
+        # only the unverified one gets scored now
+        self.assertEqual({'abc': 1}, self.sf_set.successes)
+        self.assertEqual({}, self.sf_set.tries)
+        self.assertEqual(2, len(self.sf_set.added))
+        self.assertEqual([], os.listdir(self.queue_dir))
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
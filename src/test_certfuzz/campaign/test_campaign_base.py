@@ -155,7 +155,7 @@ class Test(unittest.TestCase):
 
         # verify the data structures
         for score in x['seedfile_scores'].values():
-            for k in ['successes', 'trials', 'probability']:
+            for k in ['successes', 'trials', 'seconds', 'probability']:
                 self.assertTrue(k in score)
 
         for items in x['rangefinder_scores'].values():
@@ -163,7 +163,7 @@ class Test(unittest.TestCase):
                 for k in ['range_key', 'range_score']:
                     self.assertTrue(k in item)
             score = item['range_score']
-            for k in ['successes', 'trials', 'probability']:
+            for k in ['successes', 'trials', 'seconds', 'probability']:
                 self.assertTrue(k in score)
 
     def _populate_sf_set(self):
@@ -221,11 +221,13 @@ class Test(unittest.TestCase):
         for score in d['seedfile_scores'].itervalues():
             score['successes'] = 10
             score['trials'] = 100
+            score['seconds'] = 25.0
 
         for sf in d['rangefinder_scores'].values():
             for r in sf:
                 r['range_score']['successes'] = 5
                 r['range_score']['trials'] = 50
+                r['range_score']['seconds'] = 12.5
 
         with open(fpath, 'wb') as f:
             json.dump(d, f)
@@ -256,11 +258,17 @@ class Test(unittest.TestCase):
                   for x in self.campaign.seedfile_set.arms_as_dict().values()]
         for _score in trials:
             self.assertEqual(100, _score)
+        seconds = [x['seconds']
+                   for x in self.campaign.seedfile_set.arms_as_dict().values()]
+        for _seconds in seconds:
+            self.assertEqual(25.0, _seconds)
+        self.assertEqual(25.0 * len(seconds), self.campaign.seedfile_set.seconds)
 
         for sf in self.campaign.seedfile_set.things.values():
             for r in sf.rangefinder.arms.values():
                 self.assertEqual(5, r.successes)
                 self.assertEqual(50, r.trials)
+                self.assertEqual(12.5, r.seconds)
 
     def test_reject_cached_data_if_newer_config(self):
         fd, fpath = tempfile.mkstemp(
@@ -0,0 +1,158 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from certfuzz.campaign.signature_index import SignatureIndex
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.dbfile = os.path.join(self.tmpdir, 'crash_signatures.sqlite')
+        self.index = SignatureIndex(self.dbfile)
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_record(self):
+        self.assertEqual(0, len(self.index))
+        self.assertTrue(self.index.record('abc', seednum=5))
+        self.assertFalse(self.index.record('abc', seednum=2))
+        self.assertFalse(self.index.record('abc', seednum=9))
+        self.assertFalse(self.index.record('abc'))
+        self.assertEqual(1, len(self.index))
+        self.assertTrue('abc' in self.index)
+        self.assertFalse('def' in self.index)
+
+        record = self.index.get('abc')
+        self.assertEqual('UNKNOWN', record.exploitability)
+        self.assertEqual(2, record.first_seednum)
+        self.assertEqual(9, record.last_seednum)
+        self.assertEqual(4, record.hits)
+        self.assertEqual(None, self.index.get('def'))
+
+    def test_load(self):
+        self.index.record('abc', 'EXPLOITABLE', seednum=1)
+        self.index.record('abc', seednum=3)
+        self.index.record('def', seednum=2)
+        self.index.set_exploitability('def', 'PROBABLY_NOT_EXPLOITABLE')
+        self.index.close()
+
+        index = SignatureIndex(self.dbfile)
+        self.assertEqual(2, index.load())
+        self.assertEqual(tuple(self.index.get('abc')), tuple(index.get('abc')))
+        self.assertEqual('PROBABLY_NOT_EXPLOITABLE',
+                         index.get('def').exploitability)
+        self.assertFalse(index.record('def', seednum=4))
+        index.close()
+
+    def test_set_exploitability(self):
+        # nothing to update yet
+        self.index.set_exploitability('abc', 'EXPLOITABLE')
+        self.assertFalse('abc' in self.index)
+
+        self.index.record('abc')
+        self.index.set_exploitability('abc', 'EXPLOITABLE')
+        self.assertEqual('EXPLOITABLE', self.index.get('abc').exploitability)
+        # we don't forget what we learned
+        self.index.set_exploitability('abc', None)
+        self.assertEqual('EXPLOITABLE', self.index.get('abc').exploitability)
+
+    def test_fingerprints(self):
+        self.assertEqual(None, self.index.signature_for('11:libc.so.6+0x10'))
+        self.assertTrue(self.index.learn_fingerprint('11:libc.so.6+0x10',
+                                                     'abc'))
+        self.assertTrue(self.index.learn_fingerprint('11:libc.so.6+0x10',
+                                                     'abc'))
+        self.assertTrue(self.index.learn_fingerprint('6:foo+0x20', 'def'))
+        self.assertEqual('abc', self.index.signature_for('11:libc.so.6+0x10'))
+
+        # once it's ambiguous, it stays that way
+        self.assertFalse(self.index.learn_fingerprint('6:foo+0x20', 'ghi'))
+        self.assertEqual(None, self.index.signature_for('6:foo+0x20'))
+        self.assertFalse(self.index.learn_fingerprint('6:foo+0x20', 'def'))
+        self.assertEqual(None, self.index.signature_for('6:foo+0x20'))
+
+        # and it's all still there next time
+        self.index.close()
+        index = SignatureIndex(self.dbfile)
+        index.load()
+        self.assertEqual('abc', index.signature_for('11:libc.so.6+0x10'))
+        self.assertFalse(index.learn_fingerprint('6:foo+0x20', 'def'))
+        index.close()
+
+    def test_import_crashers(self):
+        crashers = os.path.join(self.tmpdir, 'crashers')
+        self.assertEqual(0, self.index.import_crashers(crashers))
+
+        for exp, sig in [('EXPLOITABLE', 'abc'), ('UNKNOWN', 'def')]:
+            os.makedirs(os.path.join(crashers, exp, sig))
+        # stray files don't count
+        open(os.path.join(crashers, 'UNKNOWN', 'ghi'), 'w').close()
+
+        self.assertEqual(2, self.index.import_crashers(crashers))
+        self.assertEqual('EXPLOITABLE', self.index.get('abc').exploitability)
+        self.assertFalse('ghi' in self.index)
+        self.assertFalse(self.index.record('def'))
+        # already got them
+        self.assertEqual(0, self.index.import_crashers(crashers))
+
+    def test_memory_only(self):
+        index = SignatureIndex()
+        self.assertTrue(index.disabled)
+        self.assertTrue(index.record('abc'))
+        self.assertFalse(index.record('abc'))
+        self.assertEqual(0, index.load())
+
+    def test_bad_dbfile(self):
+        with open(self.dbfile, 'wb') as f:
+            f.write('this is not a database' * 100)
+        self.assertEqual(0, self.index.load())
+        self.assertTrue(self.index.disabled)
+        # keeps going in memory
+        self.assertTrue(self.index.record('abc'))
+        self.assertFalse(self.index.record('abc'))
+
+    def _rows(self):
+        conn = sqlite3.connect(self.dbfile)
+        try:
+            return conn.execute('SELECT signature, hits FROM signatures '
+                                'ORDER BY signature').fetchall()
+        finally:
+            conn.close()
+
+    def test_written_through(self):
+        self.index.record('abc', seednum=7)
+        self.assertEqual([(u'abc', 1)], self._rows())
+
+    def test_flush(self):
+        self.index.record('abc')
+        self.index.record('abc')
+        self.index.record('def')
+        # new signatures go straight out, more hits wait for a flush
+        self.assertEqual([(u'abc', 1), (u'def', 1)], self._rows())
+        self.index.flush()
+        self.assertEqual([(u'abc', 2), (u'def', 1)], self._rows())
+
+        self.index.record('def')
+        self.index.close()
+        self.assertEqual([(u'abc', 2), (u'def', 2)], self._rows())
+
+    def test_wal(self):
+        self.index.record('abc')
+        mode = self.index._conn.execute('PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual('wal', mode.lower())
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,117 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+from certfuzz.campaign import worker_pool
+from certfuzz.campaign.worker_pool import IterationResult, WorkerPool, \
+    fuzz_and_run
+from certfuzz.fuzzers.errors import FuzzerExhaustedError
+from test_certfuzz.mocks import MockSeedfile
+
+
+class MockIteration(object):
+    _tmpdir_pfx = 'iteration_'
+
+    def __init__(self, seedfile=None, seednum=None, workdirbase=None,
+                 outdir=None, config=None, fuzzer_cls=None, runner_cls=None):
+        self.seedfile = seedfile
+        self.seednum = seednum
+        self.workdirbase = workdirbase
+        self.working_dir = None
+        self.fuzzed_file = None
+        self.r = None
+        self.saw_crash = False
+        self.fingerprint = None
+        self.run_seconds = 0.0
+
+    def fuzz(self):
+        if self.seedfile.tries > 2:
+            raise FuzzerExhaustedError('out of tries')
+        self.fuzzed_file = os.path.join(self.working_dir, 'fuzzed')
+        self.r = 'range'
+
+    def run(self):
+        # crash on odd seednums
+        self.saw_crash = bool(self.seednum % 2)
+        if self.saw_crash:
+            self.fingerprint = '11:target+0x%x' % self.seednum
+        self.run_seconds = 0.25
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self._saved_worker = dict(worker_pool._worker)
+        worker_pool._worker.update({'iteration_cls': MockIteration,
+                                    'working_dir': self.tmpdir,
+                                    'outdir': self.tmpdir,
+                                    'config': {},
+                                    'fuzzer_cls': None,
+                                    'runner_cls': None,
+                                    })
+
+    def tearDown(self):
+        worker_pool._worker.clear()
+        worker_pool._worker.update(self._saved_worker)
+        shutil.rmtree(self.tmpdir)
+
+    def test_iteration_result(self):
+        r = IterationResult('abc', 7)
+        self.assertEqual('abc', r.sf_md5)
+        self.assertEqual(7, r.seednum)
+        self.assertFalse(r.saw_crash)
+        self.assertEqual(None, r.error)
+
+    def test_fuzz_and_run(self):
+        sf = MockSeedfile()
+        for seednum in range(4):
+            result = fuzz_and_run((sf, seednum, 0))
+            self.assertEqual(sf.md5, result.sf_md5)
+            self.assertEqual(seednum, result.seednum)
+            self.assertEqual(bool(seednum % 2), result.saw_crash)
+            self.assertEqual(None, result.error)
+            self.assertEqual('range', result.range)
+            self.assertEqual(0.25, result.run_seconds)
+            if result.saw_crash:
+                self.assertEqual('11:target+0x%x' % seednum,
+                                 result.fingerprint)
+            else:
+                self.assertEqual(None, result.fingerprint)
+            # the working dir is left for the coordinator
+            self.assertTrue(os.path.isdir(result.working_dir))
+            self.assertEqual(self.tmpdir, os.path.dirname(result.working_dir))
+
+    def test_fuzz_and_run_passes_tries(self):
+        sf = MockSeedfile()
+        result = fuzz_and_run((sf, 0, 3))
+        self.assertEqual(3, sf.tries)
+        self.assertTrue(isinstance(result.error, FuzzerExhaustedError))
+        self.assertFalse(result.saw_crash)
+
+    def test_worker_pool(self):
+        sf = MockSeedfile()
+        tasks = [(sf, seednum, 0) for seednum in range(10)]
+        with WorkerPool(3, MockIteration, self.tmpdir, self.tmpdir, {},
+                        None, None) as pool:
+            results = list(pool.imap(tasks))
+
+        self.assertEqual(range(10), [r.seednum for r in results])
+        for r in results:
+            self.assertEqual(bool(r.seednum % 2), r.saw_crash)
+            self.assertTrue(os.path.isdir(r.working_dir))
+            # each worker gets its own dir under the campaign working dir
+            worker_dir = os.path.dirname(r.working_dir)
+            self.assertTrue(os.path.basename(worker_dir).startswith('worker_'))
+            self.assertEqual(self.tmpdir, os.path.dirname(worker_dir))
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
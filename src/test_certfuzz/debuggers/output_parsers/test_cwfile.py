@@ -3,18 +3,53 @@ Created on Apr 10, 2012
 
 @organization: cert.org
 '''
+import os
+import tempfile
 import unittest
 
+from certfuzz.debuggers.output_parsers.cwfile import CWfile
+
+cw_output = '''Code Type:       X86 (Native)
+exception=EXC_BAD_ACCESS:signal=11:is_exploitable=yes:instruction_disassembly=mov:instruction_address=0x00001234:access_type=read:access_address=0x00000040:
+Thread 0:
+0   libsystem_kernel.dylib        \t0x9000 mach_msg_trap + 10
+Thread 1 Crashed:
+0   foo                           \t0x1234 parse + 52
+    called from somewhere
+1   libSystem.B.dylib             \t0x5678 free + 20
+    at free.c:1
+2   foo                           \t0x1300 main + 10
+Thread 2:
+0   foo                           \t0x1400 idle + 1
+
+Thread 1 crashed with X86 Thread State (32-bit):
+  eax: 0x00000000  ebx: 0x00000001  ecx: 0x00000002  edx: 0x00000003
+   eip: 0x00001234  cs: 0x00000017
+'''
+
+
 class Test(unittest.TestCase):
 
     def setUp(self):
-        pass
+        (fd, self.file) = tempfile.mkstemp(suffix='.cw', text=True)
+        os.write(fd, cw_output)
+        os.close(fd)
 
     def tearDown(self):
-        pass
+        os.remove(self.file)
 
-    def testName(self):
-        pass
+    def test_parse(self):
+        cw = CWfile(self.file)
+        # only the crashed thread, less the blocklisted libraries, with
+        # continued lines joined on
+        self.assertEqual(['parse + 52     called from somewhere',
+                          'main + 10'], cw.backtrace)
+        self.assertEqual('EXPLOITABLE', cw.exp)
+        self.assertEqual('0x00000040', cw.faddr)
+        self.assertEqual('0x00001234', cw.registers_hex['eip'])
+        self.assertEqual('0x00000003', cw.registers_hex['edx'])
+        self.assertTrue(cw.is_crash)
+        self.assertTrue(cw.get_testcase_signature(5))
 
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
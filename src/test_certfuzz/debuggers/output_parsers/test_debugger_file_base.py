@@ -9,6 +9,53 @@ import glob
 import os
 from certfuzz.debuggers.output_parsers.debugger_file_base import detect_format
 from certfuzz.debuggers.output_parsers.errors import UnknownDebuggerError
+from certfuzz.debuggers.output_parsers.abrtfile import ABRTfile
+from certfuzz.debuggers.output_parsers.gdbfile import GDBfile
+from certfuzz.debuggers.output_parsers.konqifile import Konqifile
+
+# the signatures the backtraces have always had
+corpus_signatures = {
+    '_abrt-kcrash.txt': ('gdb', '5ff66bfc7341e9845156278dd51becd2'),
+    '_abrt-manual_bt_and_thread_bt.txt': ('gdb', '2c5ced835edb350d452107295ba54687'),
+    '_abrt-manual_gdb_disass.txt': ('gdb', '3c8a84da06a43cdb0de80ed7c6f0067d'),
+    '_abrt-manual_gdb_nautilus.txt': ('gdb', '85f543a95928e64f64b919c114993b24'),
+    'abrt-1.txt': ('abrt', '6e154608f9aaafa9ebe6cc2350f0ac2a'),
+    'abrt-2.txt': ('abrt', 'c33c4d5fedd5f6759c0fa8d49a40f6ee'),
+    'abrt-3.txt': ('abrt', '3fb91405eb4267b175d5d23c5cdd3d3e'),
+    'abrt-av_on_eip.txt': ('abrt', '285c3a0d4351f18fd52ac3b135020ede'),
+    'abrt-cannot_access_memory.txt': ('gdb', '583ed787a2b0e194788f6d3b08044f3b'),
+    'abrt-corrupt.txt': ('abrt', None),
+    'abrt-debuginfo_warn_extra_procmapcol.txt': ('abrt', '03b3a22a7f1ec00d442e98b8c396eec2'),
+    'abrt-gdu-notification-daemon.txt': ('abrt', '9f217354b92b17a61a6ec94971b6e15a'),
+    'abrt-glibc_detected_inkskape.txt': ('abrt', 'aa838718758a21f99a9e5fa774f0a132'),
+    'abrt-hdparm.txt': ('abrt', 'ec9f3000be3e1eb5bf77009fb301cd32'),
+    'abrt-multithread.txt': ('abrt', 'eaf03a1df8d2e98d646ec51679f772d6'),
+    'abrt-multithread2.txt': ('abrt', 'c1c9b339e6dac8947293f733dae29aa8'),
+    'abrt-multithread_firefox.txt': ('abrt', '88db4e3443ae1f5c4727e50d047a957f'),
+    'abrt-multithread_firefox_dupe1.txt': ('abrt', 'e7d7bc012826c798e25b6e08df8481a4'),
+    'abrt-multithread_firefox_dupe2.txt': ('abrt', '54f10a9fecc1b5c8ff76d6d5fe18d6c1'),
+    'abrt-multithread_firefox_dupe3.txt': ('abrt', 'e7d7bc012826c798e25b6e08df8481a4'),
+    'abrt-no_shared_libraries.txt': ('abrt', '238927e84147e78cbef6d31c0d865bdb'),
+    'abrt-onethread.txt': ('abrt', '687cdd9f875d14a28c8f3a3a3c8270f0'),
+    'abrt-onethread_procmap_regs_disass.txt': ('abrt', 'cf75ce5d9c81acd9ff005b39640ac547'),
+    'abrt-openoffice.txt': ('abrt', 'e3900d49ef5f6c0d86be7e3a5c4e8749'),
+    'abrt-should_not_pop.txt': ('gdb', '5b0ceeece95d38cbf5cae4a304b902f8'),
+    'bff-ffmpeg_total_stack_corruption.gdb': ('gdb', 'd098f7bb8818ed49849c63091de5fa82'),
+    'bff-flash_no_proc_map_jit.gdb': ('gdb', '012473c1e232c72d72c7e85b867a7632'),
+    'bff-glibc_detected_in_bt.gdb': ('gdb', 'b0994916c107cb0232f134c61f28f14f'),
+    'bff-no_proc_map-openoffice.gdb': ('gdb', 'b730a581d84b8814bd71cd0e969774df'),
+    'bff-outside-in-detected_stack_corruption.gdb': ('gdb', '8b68e314c1892623c587302c86dfc34d'),
+    'bff-outside-in-undetected_stack_corruption.gdb': ('gdb', '1de456f2bf462dfe0a04bb6cfd6a326e'),
+    'bff-outside-in-undetected_stack_corruption2.gdb': ('gdb', '0117a85d861488cf231f263ca8d4da3c'),
+    'bff-outside_in.gdb': ('gdb', '6d6f53034e58cbe5de6828617c412951'),
+    'bff-xpdf.gdb': ('gdb', '4ec81383d8b5205d3dc9ab463907fc99'),
+    'bff-xpdf_libjpeg_btfirst.gdb': ('gdb', '7c71aa4e28d7fa67e2d76dc9c5f62ab1'),
+    'konqi-k9copy.txt': ('konqi', 'ce10f0ec238991a5d9b6ecd6ee9a7867'),
+    'konqi-kdesvn-backtrace_only.txt': ('konqi', None),
+    'konqi-openoffice.txt': ('konqi', '34d19bfe017b8c01efab0c8d9fe50e3c'),
+    'konqi-reconq.txt': ('konqi', '51b47db47da78c46ae5f2a1c54b2dc52'),
+    'konqi-tellico.txt': ('konqi', None),
+}
 
 
 class Test(unittest.TestCase):
@@ -50,6 +97,16 @@ class Test(unittest.TestCase):
     def test_formats_that_should_fail(self):
         self.detect_format_fail(self.expect2fail)
 
+    def test_corpus_signatures(self):
+        btdir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'backtraces')
+        parsers = {'gdb': GDBfile, 'abrt': ABRTfile, 'konqi': Konqifile}
+        for (name, (fmt, signature)) in corpus_signatures.items():
+            path = os.path.join(btdir, name)
+            self.assertEqual(fmt, detect_format(path), name)
+            parsed = parsers[fmt](path)
+            self.assertEqual(signature, parsed.get_testcase_signature(5), name)
+
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
@@ -0,0 +1,59 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import unittest
+
+from certfuzz.debuggers.output_parsers.line_scanner import LineScanner
+from certfuzz.debuggers.output_parsers.debugger_file_base import line_scanner
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.scanner = LineScanner([('frame', r'#\d'),
+                                    ('address', r'0x'),
+                                    ('word', r'(?:foo|fo)(?=\s|$)'),
+                                    ])
+
+    def tearDown(self):
+        pass
+
+    def test_kind(self):
+        self.assertEqual('frame', self.scanner.kind('#0  0x1234 in main ()'))
+        self.assertEqual('address', self.scanner.kind('0x08048000 0x0804c000'))
+        self.assertEqual('word', self.scanner.kind('foo bar'))
+        self.assertEqual('word', self.scanner.kind('fo'))
+        # only at the start of the line
+        self.assertEqual(None, self.scanner.kind(' #0'))
+        self.assertEqual(None, self.scanner.kind('food'))
+        self.assertEqual(None, self.scanner.kind(''))
+
+    def test_scan(self):
+        lines = ['#1 a', 'b', '0x1']
+        self.assertEqual([('#1 a', 'frame'), ('b', None), ('0x1', 'address')],
+                         list(self.scanner.scan(lines)))
+
+    def test_gdb_line_scanner(self):
+        for (line, kind) in [('#12 0x0804 in foo () at foo.c:3', 'frame'),
+                             ('0x8048000  0x8050000     0x8000 0 /bin/foo',
+                              'address'),
+                             ('Program received signal SIGSEGV', 'program'),
+                             ('si_addr:$1 = (void *) 0x0', 'si_addr'),
+                             ('Exploitability Classification: UNKNOWN',
+                              'exploitability'),
+                             ('Thread 2 (Thread 0xb7 (LWP 4)):', 'thread'),
+                             ('[New Thread 0xb7 (LWP 4)]', 'bracket'),
+                             ('eip            0x1234\t0x1234', 'register'),
+                             ('r15            0x0\t0', 'register'),
+                             ('esi', 'register'),
+                             ('eflags         0x286\t[ SF ]', None),
+                             ('Starting program: /bin/foo', None),
+                             ]:
+            self.assertEqual(kind, line_scanner.kind(line), line)
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
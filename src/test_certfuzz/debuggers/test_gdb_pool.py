@@ -0,0 +1,195 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+from distutils.spawn import find_executable
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from certfuzz.debuggers.gdb_pool import GDBSession, GDBSessionPool, \
+    session_script
+
+# Stands in for gdb: answers 'echo' and 'cd' commands. When it sources a
+# file containing 'pwd' it writes its cwd next to it. When it sources one
+# containing 'hang' it starts an inferior in its own session (recording its
+# pid next to the sourced file) and then sleeps forever
+_fake_gdb = '''#!%s
+import os
+import subprocess
+import sys
+import time
+while True:
+    line = sys.stdin.readline()
+    if not line:
+        break
+    line = line.strip()
+    if line.startswith('cd '):
+        os.chdir(line[3:])
+    elif line.startswith('source '):
+        if 'pwd' in open(line[7:]).read():
+            open(line[7:] + '.cwd', 'w').write(os.getcwd())
+        if 'hang' in open(line[7:]).read():
+            p = subprocess.Popen(['sleep', '60'], preexec_fn=os.setsid)
+            open(line[7:] + '.pid', 'w').write(str(p.pid))
+            time.sleep(60)
+    elif line.startswith('echo '):
+        sys.stdout.write(line[5:].replace('\\\\n', '\\n'))
+        sys.stdout.flush()
+'''
+
+
+class MockSession(object):
+
+    def __init__(self):
+        self.alive = True
+        self.stopped = False
+
+    def stop(self):
+        self.alive = False
+        self.stopped = True
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.gdb = os.path.join(self.tmpdir, 'gdb')
+        with open(self.gdb, 'w') as f:
+            f.write(_fake_gdb % sys.executable)
+        os.chmod(self.gdb, stat.S_IRWXU)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _script(self, content):
+        (fd, f) = tempfile.mkstemp(dir=self.tmpdir)
+        os.write(fd, content)
+        os.close(fd)
+        return f
+
+    def test_session_script(self):
+        script = 'set logging on\nfile /bin/foo\nrun a b c\nbt\nquit'
+        self.assertEqual('set logging on\nfile /bin/foo\nrun a b c\nbt\n',
+                         session_script(script))
+        self.assertEqual('set logging on\nrun a b c\nbt\n',
+                         session_script(script, skip_file=True))
+
+    def test_session_run(self):
+        session = GDBSession(gdb=self.gdb)
+        self.assertFalse(session.alive)
+        try:
+            f = self._script('file /bin/foo\nrun\nquit\n')
+            self.assertTrue(session.run('/bin/foo', f, 10))
+            self.assertTrue(session.alive)
+            self.assertEqual('/bin/foo', session.program)
+            # quit is always dropped
+            self.assertEqual('file /bin/foo\nrun\n', open(f).read())
+
+            # same program, so no need to load it again
+            f = self._script('file /bin/foo\nrun\nquit\n')
+            self.assertTrue(session.run('/bin/foo', f, 10))
+            self.assertEqual('run\n', open(f).read())
+        finally:
+            session.stop()
+        self.assertFalse(session.alive)
+
+    def test_session_cwd(self):
+        session = GDBSession(gdb=self.gdb)
+        try:
+            f = self._script('pwd\n')
+            self.assertTrue(session.run('/bin/foo', f, 10, cwd=self.tmpdir))
+            self.assertEqual(os.path.realpath(self.tmpdir),
+                             os.path.realpath(open(f + '.cwd').read()))
+
+            # and back to where it started
+            f = self._script('pwd\n')
+            self.assertTrue(session.run('/bin/foo', f, 10))
+            self.assertEqual(os.path.realpath(os.getcwd()),
+                             os.path.realpath(open(f + '.cwd').read()))
+        finally:
+            session.stop()
+
+    def _running(self, pid):
+        try:
+            with open('/proc/%d/stat' % pid) as f:
+                state = f.read().rsplit(')', 1)[-1].split()[0]
+        except IOError:
+            return False
+        return state != 'Z'
+
+    def test_session_timeout(self):
+        session = GDBSession(gdb=self.gdb)
+        # something else running the same program as the session
+        other = subprocess.Popen(['sleep', '60'])
+        try:
+            f = self._script('file /bin/sleep\nrun hang\nquit\n')
+            self.assertFalse(session.run('sleep', f, 0.5))
+            # a timed out session gets killed
+            self.assertFalse(session.alive)
+            self.assertEqual(None, session.program)
+
+            if os.path.isdir('/proc'):
+                # along with its inferior, but nobody else's
+                inferior = int(open(f + '.pid').read())
+                self.assertFalse(self._running(inferior))
+                self.assertEqual(None, other.poll())
+        finally:
+            other.kill()
+            other.wait()
+
+    def test_real_session(self):
+        gdb = find_executable('gdb')
+        if gdb is None:
+            self.skipTest('gdb not found')
+        session = GDBSession(gdb=gdb)
+        try:
+            f = self._script('file /bin/true\nrun\nquit\n')
+            self.assertTrue(session.run('/bin/true', f, 30))
+            self.assertTrue(session.alive)
+            self.assertEqual('/bin/true', session.program)
+
+            f = self._script('file /bin/sleep\nrun 60\nquit\n')
+            self.assertFalse(session.run('/bin/sleep', f, 1))
+            self.assertFalse(session.alive)
+        finally:
+            session.stop()
+
+    def test_pool(self):
+        pool = GDBSessionPool(max_sessions=1, session_cls=MockSession)
+        s1 = pool.acquire()
+        s2 = pool.acquire()
+        self.assertNotEqual(s1, s2)
+
+        pool.release(s1)
+        # only one idle session is kept
+        pool.release(s2)
+        self.assertTrue(s2.stopped)
+        self.assertFalse(s1.stopped)
+
+        # idle sessions get reused
+        self.assertEqual(s1, pool.acquire())
+        pool.release(s1)
+
+        # dead sessions don't
+        s1.alive = False
+        self.assertNotEqual(s1, pool.acquire())
+
+    def test_pool_close(self):
+        pool = GDBSessionPool(session_cls=MockSession)
+        sessions = [pool.acquire() for _ in range(3)]
+        for s in sessions:
+            pool.release(s)
+        pool.close()
+        for s in sessions:
+            self.assertTrue(s.stopped)
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -8,6 +8,7 @@ from certfuzz.drillresults import common as drillresults
 import tempfile
 import shutil
 import os
+import zipfile
 
 
 
@@ -67,6 +68,47 @@ class Test(unittest.TestCase):
         for s in expect_false:
             self.assertFalse(drillresults.is_number(s))
 
+    def test_find_patterns(self):
+        data = 'xxABABAxxCDxxABA'
+        hits = drillresults.find_patterns(data, ['ABA', 'CD', 'A', 'EF', ''])
+        self.assertEqual({'ABA': [2, 4, 13], 'CD': [9], 'A': [2, 4, 6, 13, 15],
+                          'EF': []}, hits)
+
+        hits = drillresults.find_patterns('\x00' * 100, ['\x00' * 4],
+                                          max_hits=3)
+        self.assertEqual([0, 1, 2], hits['\x00' * 4])
+
+    def test_find_patterns_in_file(self):
+        path = os.path.join(self.tmpdir, 'fuzzed')
+        with open(path, 'wb') as f:
+            f.write('\x00\x01\x02\x03foo\x02\x03')
+        hits = drillresults.find_patterns_in_file(path, ['\x02\x03', 'bar'])
+        self.assertEqual({'\x02\x03': [2, 7], 'bar': []}, hits)
+
+        # empty files can't be mapped
+        open(path, 'wb').close()
+        self.assertEqual({'foo': []},
+                         drillresults.find_patterns_in_file(path, ['foo']))
+
+        # zip contents are searched too, past the end of the file
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as z:
+            z.writestr('inner', 'xxxx\xde\xad\xbe\xefxxxx')
+        size = os.path.getsize(path)
+        hits = drillresults.find_patterns_in_file(path, ['\xde\xad\xbe\xef'])
+        self.assertEqual([size + 4], hits['\xde\xad\xbe\xef'])
+        with open(path, 'rb') as f:
+            self.assertFalse('\xde\xad\xbe\xef' in f.read())
+        self.assertTrue('\xde\xad\xbe\xef' in drillresults.read_bin_file(path))
+
+    def test_eif_text(self):
+        self.assertEqual('', drillresults.eif_text({'EIF': False}))
+        self.assertEqual(' *** Byte pattern is in fuzzed file! ***',
+                         drillresults.eif_text({'EIF': True}))
+        self.assertEqual(' *** Byte pattern is in fuzzed file! *** '
+                         '(offset 0x10, 0x1f)',
+                         drillresults.eif_text({'EIF': True,
+                                                'efa_offsets': [16, 31]}))
+
 
 
 if __name__ == "__main__":
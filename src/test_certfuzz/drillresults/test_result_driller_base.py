@@ -3,13 +3,54 @@ Created on Jul 2, 2014
 
 @organization: cert.org
 '''
+import os
+import shutil
+import tempfile
 import unittest
 import certfuzz.drillresults.result_driller_base
 from certfuzz.drillresults.result_driller_base import ResultDriller
+from certfuzz.drillresults.errors import TestCaseBundleError
 
 alphabet = 'abcdefghijklmnopqrstuvwxyz'
 
 
+class MockTCB(object):
+    '''
+    Scores a testcase by the number in its debugger file
+    '''
+
+    def __init__(self, dbg_outfile, testcase_file, crash_hash, ignore_jit):
+        self.crash_hash = crash_hash
+        with open(dbg_outfile) as f:
+            self.reporttext = f.read()
+        self.details = {'fuzzedfile': testcase_file,
+                        'pid': os.getpid(),
+                        'ignore_jit': ignore_jit,
+                        'exceptions': {}}
+        if os.path.exists(testcase_file):
+            with open(testcase_file) as f:
+                self.details['crasher'] = f.read()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, etype, value, traceback):
+        pass
+
+    def go(self):
+        if not self.reporttext.strip():
+            raise TestCaseBundleError('No faulting address means no crash')
+        self.score = int(self.reporttext)
+
+
+class MockDriller(ResultDriller):
+    _tcb_cls = MockTCB
+
+    def _platform_find_testcases(self, crash_hash, files, root, force=False):
+        return [(os.path.join(root, f), os.path.join(root, f[:-4]))
+                for f in sorted(files) if f.endswith('.dbg')]
+
+
 class MockRd(ResultDriller):
     # really_exploitable expects a list
     really_exploitable = list(alphabet)
@@ -35,6 +76,120 @@ class Test(unittest.TestCase):
     def test_rd_acts_as_metaclass(self):
         self.assertRaises(TypeError, ResultDriller)
 
+    def _drill(self, **kwargs):
+        rd = MockDriller(base_dir=self.results, **kwargs)
+        rd.pickle_file = self.pickle_file
+        rd._check_dirs()
+        rd.load_cached()
+        rd.process_testcases()
+        rd.cache_results()
+        return rd
+
+    def _write_dbg(self, crash_hash, content):
+        d = os.path.join(self.results, crash_hash)
+        if not os.path.isdir(d):
+            os.makedirs(d)
+        path = os.path.join(d, 'sf_foo.txt.dbg')
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_cached_results(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.results = os.path.join(self.tmpdir, 'results')
+        self.pickle_file = os.path.join(self.tmpdir, 'fuzzdir',
+                                        'drillresults.pkl')
+        for (i, score) in enumerate([50, 20, 80, 30]):
+            self._write_dbg('0x%d' % i, str(score))
+        # nothing to score in this one
+        self._write_dbg('0x9', '')
+
+        rd = self._drill(workers=2)
+        expected = {'0x0': 50, '0x1': 20, '0x2': 80, '0x3': 30}
+        self.assertEqual(expected, rd.crash_scores)
+        self.assertEqual(5, len(rd.scored_testcases))
+        self.assertTrue(os.path.exists(self.pickle_file))
+
+        # change one, and it's the only one that gets scored again
+        dbg_file = self._write_dbg('0x3', '10')
+        os.utime(dbg_file, (1000000000, 1000000000))
+        rd = self._drill()
+        self.assertEqual(5, len(rd.cached_testcases))
+        expected['0x3'] = 10
+        self.assertEqual(expected, rd.crash_scores)
+        pids = set(tcb.details['pid'] for tcb in rd.testcase_bundles
+                   if tcb.crash_hash != '0x3')
+        self.assertFalse(os.getpid() in pids)
+
+        # same size and mtime is enough for an incremental run
+        with open(dbg_file, 'w') as f:
+            f.write('40')
+        os.utime(dbg_file, (1000000000, 1000000000))
+        rd = self._drill(incremental=True)
+        self.assertEqual(10, rd.crash_scores['0x3'])
+        # but not a full one, which checks the digest
+        rd = self._drill()
+        self.assertEqual(40, rd.crash_scores['0x3'])
+
+        # deleted crashes drop out of the cache, and --force ignores it
+        shutil.rmtree(os.path.join(self.results, '0x0'))
+        rd = self._drill(force_reload=True)
+        self.assertEqual({}, rd.cached_testcases)
+        self.assertEqual(4, len(rd.scored_testcases))
+        self.assertEqual(3, len(rd.crash_scores))
+
+    def test_cache_invalidated(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.results = os.path.join(self.tmpdir, 'results')
+        self.pickle_file = os.path.join(self.tmpdir, 'drillresults.pkl')
+        dbg_file = self._write_dbg('0x0', '50')
+        crasher = dbg_file[:-4]
+        with open(crasher, 'w') as f:
+            f.write('abc')
+        os.utime(crasher, (1000000000, 1000000000))
+        self._drill()
+
+        def details(rd):
+            return rd.testcase_bundles[0].details
+
+        rd = self._drill()
+        self.assertEqual(1, len(rd.cached_testcases))
+        self.assertEqual('abc', details(rd)['crasher'])
+
+        # the crasher changed
+        with open(crasher, 'w') as f:
+            f.write('abcd')
+        os.utime(crasher, (1000000000, 1000000000))
+        rd = self._drill(incremental=True)
+        self.assertEqual('abcd', details(rd)['crasher'])
+        with open(crasher, 'w') as f:
+            f.write('wxyz')
+        os.utime(crasher, (1000000001, 1000000001))
+        rd = self._drill(incremental=True)
+        self.assertEqual('wxyz', details(rd)['crasher'])
+
+        # scores from a run with a different ignore_jit don't count
+        rd = self._drill(ignore_jit=True)
+        self.assertEqual({}, rd.cached_testcases)
+        self.assertTrue(details(rd)['ignore_jit'])
+        rd = self._drill(ignore_jit=True)
+        self.assertEqual(1, len(rd.cached_testcases))
+
+    def test_old_cache_ignored(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.results = os.path.join(self.tmpdir, 'results')
+        self.pickle_file = os.path.join(self.tmpdir, 'drillresults.pkl')
+        # what older versions left behind
+        with open(self.pickle_file, 'wb') as f:
+            certfuzz.drillresults.result_driller_base.pickle.dump([], f)
+        self._write_dbg('0x0', '50')
+        rd = self._drill()
+        self.assertEqual({}, rd.cached_testcases)
+        self.assertEqual({'0x0': 50}, rd.crash_scores)
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
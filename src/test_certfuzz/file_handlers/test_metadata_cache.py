@@ -0,0 +1,98 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from certfuzz.file_handlers.basicfile import BasicFile
+from certfuzz.file_handlers.metadata_cache import MetadataCache, FileMetadata
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.dbfile = os.path.join(self.tmpdir, 'cache.sqlite')
+        self.cache = MetadataCache(self.dbfile)
+        self.path = os.path.join(self.tmpdir, 'foo.txt')
+        self._write('abcdef')
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, content, mtime=1000000000):
+        with open(self.path, 'wb') as f:
+            f.write(content)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_store_and_lookup(self):
+        self.assertEqual(None, self.cache.lookup(self.path))
+        meta = FileMetadata(6, 'md5', 'sha1', False)
+        self.cache.store(self.path, meta)
+        self.assertEqual(meta, self.cache.lookup(self.path))
+        self.assertEqual(1, len(self.cache))
+
+        # survives a restart
+        self.cache.close()
+        with MetadataCache(self.dbfile) as cache:
+            self.assertEqual(meta, cache.lookup(self.path))
+
+    def test_stale(self):
+        self.cache.store(self.path, FileMetadata(6, 'md5', 'sha1', False))
+        # same size, different mtime
+        self._write('ghijkl', mtime=1000000001)
+        self.assertEqual(None, self.cache.lookup(self.path))
+        # and the stale entry is gone
+        self.assertEqual(0, len(self.cache))
+
+        self.cache.store(self.path, FileMetadata(6, 'md5', 'sha1', False))
+        # same mtime, different size
+        self._write('ghijklm', mtime=1000000001)
+        self.assertEqual(None, self.cache.lookup(self.path))
+
+    def test_prune(self):
+        self.cache.store(self.path, FileMetadata(6, 'md5', 'sha1', False))
+        other = os.path.join(self.tmpdir, 'bar.txt')
+        open(other, 'w').close()
+        self.cache.store(other, FileMetadata(0, 'md5', 'sha1', False))
+        os.remove(other)
+        self.cache.prune()
+        self.assertEqual(1, len(self.cache))
+        self.assertNotEqual(None, self.cache.lookup(self.path))
+
+    def test_basicfile(self):
+        expected = BasicFile(self.path).metadata
+        # first time through it gets hashed and remembered
+        self.assertEqual(expected, BasicFile(self.path, self.cache).metadata)
+        self.assertEqual(expected, self.cache.lookup(self.path))
+
+        # so the cache is what gets used the second time
+        fake = FileMetadata(6, 'x' * 32, 'y' * 40, True)
+        self.cache.store(self.path, fake)
+        self.assertEqual(fake, BasicFile(self.path, self.cache).metadata)
+
+    def test_bad_db(self):
+        with open(self.dbfile, 'wb') as f:
+            f.write('this is not a database' * 100)
+        # falls back to not caching
+        bf = BasicFile(self.path, self.cache)
+        self.assertEqual(6, bf.len)
+        self.assertTrue(self.cache.disabled)
+        self.assertEqual(None, self.cache.lookup(self.path))
+
+    def test_pickle(self):
+        self.cache.store(self.path, FileMetadata(6, 'md5', 'sha1', False))
+        cache = pickle.loads(pickle.dumps(self.cache))
+        self.assertEqual(6, cache.lookup(self.path).len)
+        cache.close()
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
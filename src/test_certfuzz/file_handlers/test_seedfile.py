@@ -27,6 +27,13 @@ class Test(unittest.TestCase):
     def test_init(self):
         pass
 
+    def test_offsets(self):
+        offsets = self.sf.offsets.bytes_excluding(self.content, [(0, 10)])
+        self.assertEqual(range(11, len(self.content)), offsets.tolist())
+        # it's computed once per seedfile
+        self.assertTrue(offsets is self.sf.offsets.bytes_excluding(self.content,
+                                                                   [(0, 10)]))
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
@@ -11,6 +11,8 @@ import shutil
 from certfuzz.file_handlers.seedfile_set import SeedfileSet
 from certfuzz.file_handlers.directory import Directory
 from certfuzz.file_handlers.seedfile import SeedFile
+from certfuzz.file_handlers import basicfile
+from certfuzz.file_handlers.metadata_cache import MetadataCache
 
 
 class Test(unittest.TestCase):
@@ -58,6 +60,16 @@ class Test(unittest.TestCase):
 #        self.assertTrue(hasattr(unpickled, 'things'))
 #        self.assertEqual(self.file_count, len(unpickled.things))
 
+    def test_strategies(self):
+        self.assertEqual('proportional', self.sfs.strategy)
+        sfs = SeedfileSet('x', self.origindir, self.localdir, self.outputdir,
+                          strategy='thompson', range_strategy='kl_ucb')
+        sfs._setup()
+        self.assertEqual('thompson', sfs.strategy)
+        for sf in sfs.things.itervalues():
+            self.assertEqual('kl_ucb', sf.rangefinder.strategy)
+        self.assertTrue(sfs.next_item().md5 in sfs.things)
+
     def test_set_directories(self):
         self.assertEqual(self.sfs.originpath, self.origindir)
         self.assertEqual(self.sfs.localpath, self.localdir)
@@ -98,6 +110,42 @@ class Test(unittest.TestCase):
         for thing in self.sfs.things.itervalues():
             self.assertEqual(SeedFile, thing.__class__)
 
+    def test_metadata_cache(self):
+        dbdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, dbdir)
+        dbfile = os.path.join(dbdir, 'cache.sqlite')
+        hashed = []
+        real_hash_file = basicfile.hash_file
+
+        def counting_hash_file(path):
+            hashed.append(path)
+            return real_hash_file(path)
+
+        basicfile.hash_file = counting_hash_file
+        try:
+            with SeedfileSet('testcampaign', self.origindir, self.localdir,
+                             self.outputdir,
+                             metadata_cache=MetadataCache(dbfile)) as sfs:
+                self.assertEqual(self.file_count, len(sfs.things))
+            # each origin file got hashed once, copies never did
+            self.assertEqual(sorted(self.files), sorted(set(hashed)))
+            self.assertEqual(self.file_count, len(hashed))
+
+            # a restart into a fresh local dir doesn't hash anything
+            del hashed[:]
+            localdir = tempfile.mkdtemp()
+            try:
+                with SeedfileSet('testcampaign', self.origindir, localdir,
+                                 self.outputdir,
+                                 metadata_cache=MetadataCache(dbfile)) as sfs2:
+                    self.assertEqual(sorted(sfs.things), sorted(sfs2.things))
+                    self.assertEqual(self.file_count, len(os.listdir(localdir)))
+            finally:
+                shutil.rmtree(localdir)
+            self.assertEqual([], hashed)
+        finally:
+            basicfile.hash_file = real_hash_file
+
     def test_init(self):
         self.assertEqual(self.outputdir, self.sfs.seedfile_output_base_dir)
         self.assertEqual(0, len(self.sfs.things))
@@ -8,7 +8,10 @@ import tempfile
 import os
 from test_certfuzz.mocks import MockSeedfile
 import shutil
-from certfuzz.fuzzers.bitmut import BitMutFuzzer
+from certfuzz.fuzzers.bitmut import BitMutFuzzer, RNG_VERSIONS
+from certfuzz.fuzzers.errors import FuzzerError
+from certfuzz.fuzztools.hamming import bitwise_hd
+from random import jumpahead, sample, seed, uniform
 
 class Test(unittest.TestCase):
 
@@ -31,6 +34,18 @@ class Test(unittest.TestCase):
         else:
             self.fail('Input not fuzzed')
 
+    def test_fuzz_batch(self):
+        self.sf.is_zip = False
+        for options in ({}, {'range_list': [(10, 50), (500, 700)]}):
+            single = []
+            for x in xrange(10):
+                with BitMutFuzzer(self.sf, self.outdir, x, options) as f:
+                    f.fuzz()
+                    single.append(str(f.output))
+            batch = [str(f.output) for f in
+                     BitMutFuzzer.fuzz_batch(self.sf, range(10), options)]
+            self.assertEqual(single, batch)
+
     def test_is_minimizable(self):
         f = BitMutFuzzer(*self.args)
         self.assertTrue(f.is_minimizable)
@@ -47,6 +62,66 @@ class Test(unittest.TestCase):
                 # confirm ratio
 #                self.assertAlmostEqual(f.ratio, f.fuzzed_bit_ratio(), 2)
 
+    def _fuzzed(self, x, options):
+        with BitMutFuzzer(self.sf, self.outdir, x, options) as f:
+            f._fuzz()
+            return (f, str(f.output))
+
+    def test_rng_versions(self):
+        self.assertRaises(FuzzerError, BitMutFuzzer, self.sf, self.outdir, 0,
+                          {'rng_version': 3})
+        for x in xrange(10):
+            outputs = [self._fuzzed(x, {'rng_version': v})[1]
+                       for v in RNG_VERSIONS]
+            # each version is deterministic...
+            for (v, output) in zip(RNG_VERSIONS, outputs):
+                self.assertEqual(output,
+                                 self._fuzzed(x, {'rng_version': v})[1])
+            # ...but they don't agree with each other
+            self.assertEqual(len(RNG_VERSIONS), len(set(outputs)))
+
+    def test_fuzz_v1_range_list(self):
+        # overlapping ranges, one clipped at the end of the input
+        r = [(10, 50), (500, 700), (40, 60), (900, 10000)]
+        for x in xrange(20):
+            (f, output) = self._fuzzed(x, {'rng_version': 1, 'range_list': r})
+
+            # v1 output must match sampling from the full list of bits
+            bitlist = []
+            for (start, end) in r:
+                for b in xrange(start, min(end, self.sf.len - 1) + 1):
+                    bitlist.extend(xrange(b * 8, b * 8 + 8))
+            seed(f.rng_seed)
+            jumpahead(x)
+            self.assertEqual(f.ratio, uniform(f.range.min, f.range.max))
+            mask = bytearray(self.sf.len)
+            for i in sample(bitlist, int(round(f.ratio * len(bitlist)))):
+                mask[i >> 3] |= 1 << (i & 7)
+            expected = bytearray(a ^ m for (a, m) in
+                                 zip(bytearray(self.sf.value), mask))
+            self.assertEqual(str(expected), output)
+
+    def test_fuzz_v2(self):
+        for x in xrange(20):
+            (f, output) = self._fuzzed(x, {'rng_version': 2})
+            # flips exactly the number of bits the ratio calls for
+            self.assertEqual(int(round(f.ratio * 8 * self.sf.len)),
+                             bitwise_hd(self.sf.value, output))
+
+    def test_fuzz_v2_range_list(self):
+        # overlapping ranges
+        r = [(10, 50), (500, 700), (40, 60)]
+        allowed = set()
+        for (start, end) in r:
+            allowed.update(xrange(start, end + 1))
+        for x in xrange(20):
+            (f, output) = self._fuzzed(x, {'rng_version': 2, 'range_list': r})
+            for (i, (a, b)) in enumerate(zip(self.sf.value, output)):
+                if a != b:
+                    self.assertTrue(i in allowed, 'offset %d fuzzed' % i)
+            hd = bitwise_hd(self.sf.value, output)
+            self.assertTrue(0 < hd <= int(round(f.ratio * 8 * 263)))
+
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
@@ -7,7 +7,8 @@ Created on Feb 14, 2012
 import unittest
 import os
 import shutil
-from certfuzz.fuzzers.bytemut import fuzz, _fuzzable
+from certfuzz.fuzzers.bytemut import fuzz
+from certfuzz.fuzzers.fuzzer_base import is_fuzzable as _fuzzable
 from certfuzz.fuzzers.bytemut import ByteMutFuzzer
 from test_certfuzz.mocks import MockSeedfile, MockRange
 import tempfile
@@ -143,6 +144,28 @@ class Test(unittest.TestCase):
                     else:
                         last_result = result
 
+    def _single(self, cls, sf, seednum, options):
+        with cls(sf, self.outdir, seednum, options) as f:
+            f.fuzz()
+            return str(f.output)
+
+    def test_fuzz_batch(self):
+        # a seed with a few CRs in it
+        sf = MockSeedfile()
+        sf.value = ('A' * 99 + '\r') * 10
+        sf.is_zip = False
+
+        class CRFuzzer(ByteMutFuzzer):
+            fuzzable_chars = [0x0d]
+
+        for options in ({}, {'range_list': [(10, 50), (500, 700)]}):
+            for cls in (ByteMutFuzzer, CRFuzzer):
+                seednums = range(20)
+                single = [self._single(cls, sf, x, options) for x in seednums]
+                batch = [(f.iteration, str(f.output)) for f in
+                         cls.fuzz_batch(sf, seednums, options, self.outdir)]
+                self.assertEqual(zip(seednums, single), batch)
+
     def test_is_minimizable(self):
         f = ByteMutFuzzer(*self.args)
         self.assertTrue(f.is_minimizable)
@@ -4,14 +4,21 @@ Created on Feb 14, 2012
 @organization: cert.org
 '''
 
+import StringIO
+import hashlib
 import unittest
 import os
+import zipfile
 from certfuzz.fuzzers.fuzzer_base import Fuzzer
-from test_certfuzz.mocks import MockSeedfile
+from test_certfuzz.mocks import MockSeedfile, MockRangefinder
 import shutil
 from certfuzz.fuzzers.fuzzer_base import MinimizableFuzzer
 import tempfile
 from certfuzz.fuzzers.fuzzer_base import is_fuzzable as _fuzzable
+from certfuzz.fuzzers.bitmut import BitMutFuzzer
+from certfuzz.fuzzers.bytemut import ByteMutFuzzer
+from certfuzz.fuzzers.crlfmut import CRLFMutFuzzer
+from certfuzz.file_handlers.seedfile import SeedFile
 
 class Test(unittest.TestCase):
 
@@ -31,6 +38,90 @@ class Test(unittest.TestCase):
         with Fuzzer(*self.args) as f:
             self.assertEqual(f.input, self.sf.read())
 
+    def test_reuse_buffer(self):
+        f1 = Fuzzer(*self.args)
+        f1.reuse_buffer = True
+        with f1:
+            self.assertEqual(f1.input, self.sf.read())
+            f1.input[0] = 'B'
+
+        f2 = Fuzzer(*self.args)
+        f2.reuse_buffer = True
+        with f2:
+            # same buffer, refilled from the seed
+            self.assertTrue(f1.input is f2.input)
+            self.assertEqual(f2.input, self.sf.read())
+
+        # a different seed gets read in
+        sf = MockSeedfile(sz=10)
+        f3 = Fuzzer(sf, self.outdir, 0, {})
+        f3.reuse_buffer = True
+        with f3:
+            self.assertEqual(f3.input, sf.read())
+
+    def test_fuzz_batch(self):
+        fuzzers = list(Fuzzer.fuzz_batch(self.sf, [3, 4, 5], {}, self.outdir))
+        self.assertEqual([3, 4, 5], [f.iteration for f in fuzzers])
+        for f in fuzzers:
+            self.assertEqual(self.sf.read(), f.output)
+            self.assertTrue(f.write_fuzzed())
+            self.assertEqual(self.outdir, os.path.dirname(f.output_file_path))
+
+    def test_fuzz_batch_zip(self):
+        inmem = StringIO.StringIO()
+        z = zipfile.ZipFile(inmem, 'w')
+        z.writestr('a.txt', 'A' * 100)
+        z.writestr('b.txt', 'B' * 100, compress_type=zipfile.ZIP_DEFLATED)
+        z.close()
+        self.sf.value = inmem.getvalue()
+        self.sf.md5 = hashlib.md5(self.sf.value).hexdigest()
+        self.sf.is_zip = True
+
+        seen = []
+        for f in MinimizableFuzzer.fuzz_batch(self.sf, range(3), {}):
+            # same as the regular path
+            with MinimizableFuzzer(self.sf, self.outdir, f.iteration, {}) as f2:
+                f2.fuzz()
+            self.assertEqual(f2.output, f.output)
+            self.assertEqual('A' * 100 + 'B' * 100, str(f.input))
+            seen.append(f)
+        # the zip only got unpacked once
+        for f in seen[1:]:
+            self.assertTrue(f.zip_contents is seen[0].zip_contents)
+
+    def test_mmap(self):
+        path = os.path.join(self.tempdir, 'seed.bin')
+        with open(path, 'wb') as f:
+            f.write('AB\r\nC' * 2000)
+        sf = SeedFile(self.tempdir, path)
+        # bytemut picks a range before seeding the rng
+        sf.rangefinder = MockRangefinder()
+
+        for cls in (ByteMutFuzzer, CRLFMutFuzzer, BitMutFuzzer):
+            for options in ({}, {'range_list': [(10, 50), (500, 700)]}):
+                mapped_options = dict(options, mmap_threshold=sf.len)
+                for x in xrange(5):
+                    with cls(sf, self.outdir, x, options) as f:
+                        self.assertFalse(f._use_mmap())
+                        f.fuzz()
+                        expected = open(f.output_file_path, 'rb').read()
+                    with cls(sf, self.outdir, x, mapped_options) as f:
+                        self.assertTrue(f._use_mmap())
+                        f.fuzz()
+                        self.assertEqual(expected,
+                                         open(f.output_file_path, 'rb').read())
+                # the seed is left alone
+                self.assertEqual('AB\r\nC' * 2000, sf.read())
+
+        # too small to bother
+        with ByteMutFuzzer(sf, self.outdir, 0, {'mmap_threshold': sf.len + 1}) as f:
+            self.assertFalse(f._use_mmap())
+            self.assertTrue(isinstance(f.input, bytearray))
+
+        # not for fuzzers that can't work in place
+        with Fuzzer(sf, self.outdir, 0, {'mmap_threshold': 1}) as f:
+            self.assertFalse(f._use_mmap())
+
     def test_no_write_if_not_fuzzed(self):
         with Fuzzer(*self.args) as f:
             self.assertFalse(os.path.exists(f.output_file_path), f.output_file_path)
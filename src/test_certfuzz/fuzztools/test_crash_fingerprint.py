@@ -0,0 +1,129 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import os
+import shutil
+import struct
+import tempfile
+import time
+import unittest
+
+from certfuzz.fuzztools import crash_fingerprint
+from certfuzz.fuzztools.crash_fingerprint import CrashFingerprint
+
+
+def _note(ntype, desc):
+    name = 'CORE\0'
+    pad = lambda s: s + '\0' * (-len(s) % 4)
+    return (struct.pack('<III', len(name), len(desc), ntype) + pad(name) +
+            pad(desc))
+
+
+def _x86_64_core(signal, pid, pc, mappings):
+    '''
+    Builds just enough of an x86_64 core file for read_core()
+    '''
+    prstatus = bytearray(336)
+    struct.pack_into('<h', prstatus, 12, signal)
+    struct.pack_into('<i', prstatus, 32, pid)
+    struct.pack_into('<Q', prstatus, 112 + 16 * 8, pc)
+
+    page_size = 4096
+    nt_file = struct.pack('<QQ', len(mappings), page_size)
+    for (start, end, ofs, _path) in mappings:
+        nt_file += struct.pack('<QQQ', start, end, ofs // page_size)
+    nt_file += ''.join(path + '\0' for (_s, _e, _o, path) in mappings)
+
+    notes = (_note(crash_fingerprint.NT_PRSTATUS, str(prstatus)) +
+             _note(crash_fingerprint.NT_FILE, nt_file))
+
+    ehdr_size = 64
+    phdr_size = 56
+    ident = '\x7fELF\x02\x01\x01' + '\0' * 9
+    ehdr = ident + struct.pack('<HHIQQQIHHHHHH', crash_fingerprint.ET_CORE, 62,
+                               1, 0, ehdr_size, 0, 0, ehdr_size, phdr_size, 1,
+                               0, 0, 0)
+    phdr = struct.pack('<IIQQQQQQ', crash_fingerprint.PT_NOTE, 0,
+                       ehdr_size + phdr_size, 0, 0, len(notes), 0, 4)
+    return ehdr + phdr + notes
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.mappings = [(0x400000, 0x401000, 0, '/usr/bin/target'),
+                         (0x7f0000000000, 0x7f0000010000, 0x2000,
+                          '/lib/libc.so.6'),
+                         ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _core(self, name='core', signal=11, pid=1234, pc=0x7f0000000123):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'wb') as f:
+            f.write(_x86_64_core(signal, pid, pc, self.mappings))
+        return path
+
+    def test_read_core(self):
+        info = crash_fingerprint.read_core(self._core())
+        self.assertEqual(11, info.signal)
+        self.assertEqual(1234, info.pid)
+        self.assertEqual(0x7f0000000123, info.pc)
+        self.assertEqual(self.mappings, info.mappings)
+
+    def test_read_core_not_a_core(self):
+        path = os.path.join(self.tmpdir, 'core')
+        with open(path, 'wb') as f:
+            f.write('not an elf file')
+        self.assertEqual(None, crash_fingerprint.read_core(path))
+        # truncated
+        with open(path, 'wb') as f:
+            f.write(_x86_64_core(11, 1, 2, self.mappings)[:80])
+        self.assertEqual(None, crash_fingerprint.read_core(path))
+        self.assertEqual(None, crash_fingerprint.read_core(
+            os.path.join(self.tmpdir, 'nope')))
+
+    def test_from_core_info(self):
+        info = crash_fingerprint.read_core(self._core())
+        fp = crash_fingerprint.from_core_info(info)
+        self.assertEqual(CrashFingerprint(11, 'libc.so.6', 0x2123), fp)
+        self.assertEqual('11:libc.so.6+0x2123', str(fp))
+
+        # not in any mapped file
+        info = crash_fingerprint.read_core(self._core(pc=0x10))
+        fp = crash_fingerprint.from_core_info(info)
+        self.assertEqual(CrashFingerprint(11, '', 0x10), fp)
+
+    def test_fingerprint_core(self):
+        core = self._core()
+        self.assertEqual(None, crash_fingerprint.fingerprint_core(None))
+        fp = crash_fingerprint.fingerprint_core(core, 11, 1234)
+        self.assertEqual('libc.so.6', fp.module)
+        # left over from some other crash
+        self.assertEqual(None, crash_fingerprint.fingerprint_core(core, 6))
+        self.assertEqual(None,
+                         crash_fingerprint.fingerprint_core(core, 11, 999))
+
+    def test_find_core(self):
+        self.assertEqual(None, crash_fingerprint.find_core(self.tmpdir))
+        core = self._core()
+        self.assertEqual(core, crash_fingerprint.find_core(self.tmpdir))
+        self.assertEqual(core, crash_fingerprint.find_core(self.tmpdir, 42))
+
+        core_42 = self._core('core.42')
+        self.assertEqual(core_42, crash_fingerprint.find_core(self.tmpdir, 42))
+        self.assertEqual(core, crash_fingerprint.find_core(self.tmpdir, 43))
+
+        # without a pid, the newest one wins
+        then = time.time() - 60
+        os.utime(core, (then, then))
+        self.assertEqual(core_42, crash_fingerprint.find_core(self.tmpdir))
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -171,6 +171,36 @@ class Test(unittest.TestCase):
         os.close(fd)
         self.delete_file(f)
 
+    def test_hash_file(self):
+        content = os.urandom(1000)
+        (fd, f) = tempfile.mkstemp(dir=self.tempdir)
+        os.write(fd, content)
+        os.close(fd)
+        expected = (1000, hashlib.md5(content).hexdigest(),
+                    hashlib.sha1(content).hexdigest())
+        for chunksize in (1, 7, 1000, 4096):
+            self.assertEqual(expected, filetools.hash_file(f, chunksize))
+
+    def test_map_file(self):
+        (fd, f) = tempfile.mkstemp(dir=self.tempdir)
+        os.write(fd, 'A' * 10000)
+        os.close(fd)
+
+        mapped = filetools.map_file(f)
+        self.assertEqual(10000, len(mapped))
+        self.assertEqual('A' * 10000, mapped.tostring())
+
+        # changes stay in memory
+        mapped[5000] = ord('B')
+        self.assertEqual('AAB', mapped[4998:5001].tostring())
+        self.assertEqual('A' * 10000, open(f, 'rb').read())
+
+        # and can be written out
+        outfile = os.path.join(self.tempdir, 'out')
+        filetools.write_file(mapped, outfile)
+        self.assertEqual('A' * 5000 + 'B' + 'A' * 4999,
+                         open(outfile, 'rb').read())
+
     def test_make_writable(self):
         (fd, f) = tempfile.mkstemp(dir=self.tempdir)
         os.chmod(f, 0444)
@@ -4,6 +4,11 @@ from certfuzz.fuzztools.hamming import bytemap
 from certfuzz.fuzztools.hamming import bitwise_hamming_distance
 from certfuzz.fuzztools.hamming import vector_compare
 from certfuzz.fuzztools.hamming import bytewise_hd
+from certfuzz.fuzztools.hamming import bytewise_hd_array
+from certfuzz.fuzztools.hamming import bitwise_hd_array
+from certfuzz.fuzztools.hamming import bytemap_array
+from certfuzz.fuzztools.hamming import to_uint8
+import numpy
 import os
 import tempfile
 import itertools
@@ -109,6 +114,30 @@ class Test(unittest.TestCase):
         self.assertEqual(bitwise_hamming_distance(self.f1, self.f1), 0)
         self.assertEqual(bitwise_hamming_distance(self.f2, self.f2), 0)
 
+    def test_to_uint8(self):
+        a = to_uint8('abc')
+        self.assertEqual(numpy.uint8, a.dtype)
+        self.assertEqual([97, 98, 99], a.tolist())
+        self.assertEqual(a.tolist(), to_uint8(['a', 'b', 'c']).tolist())
+        self.assertTrue(to_uint8(a) is a)
+
+    def test_array_functions(self):
+        strings = ["xxxxxxxxxxxxxx", "12xx345xxxx678", "000x00000xx00x"]
+        for x, y in itertools.product(strings, strings):
+            self.assertEqual(bytewise_hd(x, y), bytewise_hd_array(x, y))
+            self.assertEqual(bitwise_hd(x, y), bitwise_hd_array(x, y))
+            self.assertEqual(bytemap(x, y), bytemap_array(x, y).tolist())
+            # arrays work too
+            (a, b) = (to_uint8(x), to_uint8(y))
+            self.assertEqual(bitwise_hd(x, y), bitwise_hd_array(a, b))
+
+        # every bit of every byte
+        allbytes = ''.join(chr(i) for i in xrange(256))
+        self.assertEqual(1024, bitwise_hd_array('\x00' * 256, allbytes))
+        self.assertEqual(1024, bitwise_hd('\x00' * 256, allbytes))
+
+        self.assertRaises(AssertionError, bitwise_hd_array, 'a', 'ab')
+
     def test_vector_compare(self):
         v1 = [0, 1, 2, 3]
         v2 = [2, 3, 4, 5]
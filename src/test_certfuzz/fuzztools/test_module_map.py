@@ -0,0 +1,84 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import random
+import unittest
+
+from certfuzz.fuzztools.module_map import ModuleMap
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.mm = ModuleMap([(0x3000, 0x4000, 'c'),
+                             (0x1000, 0x2000, 'a'),
+                             (0x2000, 0x3000, 'b'),
+                             ])
+
+    def tearDown(self):
+        pass
+
+    def test_find(self):
+        self.assertEqual('a', self.mm.find(0x1001))
+        self.assertEqual('a', self.mm.find(0x1fff))
+        self.assertEqual('b', self.mm.find(0x2500))
+        self.assertEqual('c', self.mm.find(0x3fff))
+        # the ends don't count
+        for addr in [0x1000, 0x2000, 0x3000, 0x4000]:
+            self.assertEqual(None, self.mm.find(addr))
+        self.assertEqual(None, self.mm.find(0))
+        self.assertEqual(None, self.mm.find(0xffffffff))
+        self.assertTrue(0x1500 in self.mm)
+        self.assertFalse(0x5000 in self.mm)
+
+    def test_add(self):
+        self.assertEqual(None, self.mm.find(0x5500))
+        self.mm.add(0x5000, 0x6000, 'd')
+        self.assertEqual('d', self.mm.find(0x5500))
+        self.assertEqual(4, len(self.mm))
+        # iterates in the order modules were added
+        self.assertEqual(['c', 'a', 'b', 'd'], [m[2] for m in self.mm])
+
+    def test_empty(self):
+        mm = ModuleMap()
+        self.assertEqual(0, len(mm))
+        self.assertEqual(None, mm.find(0x1000))
+
+    def test_overlapping(self):
+        mm = ModuleMap([(0x1000, 0x9000, 'big'),
+                        (0x2000, 0x3000, 'small'),
+                        (0x2800, 0x2900, 'tiny'),
+                        ])
+        # the first one listed wins
+        self.assertEqual('big', mm.find(0x2500))
+        self.assertEqual('big', mm.find(0x2850))
+        self.assertEqual('big', mm.find(0x8000))
+
+        mm = ModuleMap([(0x2000, 0x3000, 'small'),
+                        (0x1000, 0x9000, 'big'),
+                        ])
+        self.assertEqual('small', mm.find(0x2500))
+        self.assertEqual('big', mm.find(0x3500))
+
+    def test_matches_linear_scan(self):
+        r = random.Random(0)
+        modules = []
+        for i in xrange(200):
+            start = r.randint(0, 0x100000)
+            modules.append((start, start + r.randint(1, 0x4000), str(i)))
+        mm = ModuleMap(modules)
+
+        def linear(addr):
+            for (start, end, name) in modules:
+                if start < addr < end:
+                    return name
+
+        for _ in xrange(2000):
+            addr = r.randint(0, 0x110000)
+            self.assertEqual(linear(addr), mm.find(addr))
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,74 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import pickle
+import unittest
+
+from certfuzz.fuzzers.fuzzer_base import is_fuzzable
+from certfuzz.fuzztools import offset_index
+from certfuzz.fuzztools.offset_index import OffsetIndex
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.content = bytearray(('AB\r\nC' * 200))
+        self.index = OffsetIndex()
+
+    def test_excluding(self):
+        r = [(0, 100), (600, 1000), (-5, 3), (50, 20)]
+        expected = [x for x in xrange(len(self.content)) if is_fuzzable(x, r)]
+        self.assertEqual(expected,
+                         offset_index.excluding(self.content, r).tolist())
+
+        chars = [0x0d, 0x0a]
+        expected = [x for x in expected if self.content[x] in chars]
+        self.assertEqual(expected,
+                         offset_index.excluding(self.content, r, chars).tolist())
+        # works on strings too
+        self.assertEqual(expected,
+                         offset_index.excluding(str(self.content), r, chars).tolist())
+
+    def test_including(self):
+        # ranges are kept in order, clipped or skipped at the end of input
+        r = [(10, 12), (2, 4), (8, 5), (998, 2000), (1000, 1001)]
+        self.assertEqual([10, 11, 12, 2, 3, 4, 998, 999],
+                         offset_index.including(1000, r).tolist())
+        self.assertEqual([], offset_index.including(10, [(20, 30)]).tolist())
+
+    def test_bytes_excluding(self):
+        self.assertEqual(None, self.index.bytes_excluding(self.content))
+        self.assertEqual(0, len(self.index))
+
+        offsets = self.index.bytes_excluding(self.content, [(0, 10)], [0x0d])
+        self.assertEqual(1, len(self.index))
+        # the same options get the same array back
+        self.assertTrue(offsets is self.index.bytes_excluding(self.content,
+                                                              [(0, 10)],
+                                                              [0x0d]))
+        # different options don't
+        self.index.bytes_excluding(self.content, [(0, 10)], [0x0a])
+        self.index.bytes_excluding(self.content, [(0, 11)], [0x0d])
+        self.assertEqual(3, len(self.index))
+
+    def test_bytes_including(self):
+        offsets = self.index.bytes_including(self.content, [(3, 4), (1, 1)])
+        self.assertEqual([3, 4, 1], offsets.tolist())
+        self.assertTrue(offsets is self.index.bytes_including(self.content,
+                                                              [(3, 4), (1, 1)]))
+
+        offsets = self.index.bytes_including(self.content)
+        self.assertEqual(range(len(self.content)), offsets.tolist())
+        self.assertEqual(2, len(self.index))
+
+    def test_pickle(self):
+        self.index.bytes_including(self.content)
+        self.assertTrue(len(self.index) > 0)
+        self.assertEqual(0, len(pickle.loads(pickle.dumps(self.index))))
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -8,8 +8,11 @@ import math
 from certfuzz.fuzztools.probability import lnfactorial
 from certfuzz.fuzztools.probability import shot_size
 from certfuzz.fuzztools.probability import misses_until_quit
+from certfuzz.fuzztools.probability import sample_distinct
 import unittest
 
+import numpy
+
 class Test(unittest.TestCase):
 
     def setUp(self):
@@ -66,6 +69,22 @@ class Test(unittest.TestCase):
         for x in range(should_be_false + 1, should_be_false + 1000):
             self.assertTrue(self.fuzzrun.should_I_stop_yet(x, 0.5))
 
+    def test_sample_distinct(self):
+        for (n, k) in [(0, 0), (10, 0), (10, 10), (1000, 3), (1000, 400),
+                       (1000, 600), (1000, 999)]:
+            picked = sample_distinct(numpy.random.RandomState(0), n, k)
+            self.assertEqual(k, len(picked))
+            self.assertEqual(k, len(set(picked)))
+            self.assertEqual(sorted(picked), list(picked))
+            for x in picked:
+                self.assertTrue(0 <= x < n)
+            # same rng state, same picks
+            self.assertEqual(list(picked),
+                             list(sample_distinct(numpy.random.RandomState(0), n, k)))
+
+        self.assertRaises(ValueError, sample_distinct,
+                          numpy.random.RandomState(0), 10, 11)
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
@@ -3,19 +3,81 @@ Created on Apr 10, 2012
 
 @organization: cert.org
 '''
+import os
+import random
+import shutil
+import tempfile
 import unittest
 
+from certfuzz.fuzztools import similarity_matrix
+from certfuzz.fuzztools.errors import SimilarityMatrixError
+from certfuzz.fuzztools.similarity_matrix import SimilarityMatrix
+from certfuzz.fuzztools.vectors import compare
+
+
 class Test(unittest.TestCase):
 
     def setUp(self):
-        pass
+        self.tmpdir = tempfile.mkdtemp()
+        r = random.Random(0)
+        funcs = ['f%d.c:func%d [/lib/lib%d.so]' % (i % 5, i, i % 3)
+                 for i in xrange(60)]
+        for i in xrange(12):
+            d = os.path.join(self.tmpdir, 'crashers', 'EXPLOITABLE',
+                             '0x%02x' % i)
+            os.makedirs(d)
+            with open(os.path.join(d, 'sf_foo.callgrind.annotated'), 'w') as f:
+                for func in r.sample(funcs, r.randint(1, 20)):
+                    f.write('%s  %s\n' % ('{:,}'.format(r.randint(1, 5000)),
+                                          func))
+        self._sparse = similarity_matrix.sparse
 
     def tearDown(self):
-        pass
+        similarity_matrix.sparse = self._sparse
+        shutil.rmtree(self.tmpdir)
+
+    def _pairwise(self, sm):
+        # what build_matrix used to do
+        expected = {}
+        for i in xrange(len(sm.files)):
+            for j in xrange(i):
+                (f, g) = (sm.files[i], sm.files[j])
+                expected[(f, g)] = compare(sm.tf_idf[f], sm.tf_idf[g])
+        return expected
+
+    def test_build_matrix(self):
+        sm = SimilarityMatrix([self.tmpdir])
+        self.assertEqual(12, len(sm.files))
+        expected = self._pairwise(sm)
+        self.assertEqual(sorted(expected), sorted(sm.sim))
+        for (k, v) in expected.iteritems():
+            self.assertAlmostEqual(v, sm.sim[k], places=6)
+
+    def test_build_matrix_dense(self):
+        similarity_matrix.sparse = None
+        sm = SimilarityMatrix([self.tmpdir])
+        for (k, v) in self._pairwise(sm).iteritems():
+            self.assertAlmostEqual(v, sm.sim[k], places=6)
+
+    def test_top_k(self):
+        full = SimilarityMatrix([self.tmpdir]).sim
+        sm = SimilarityMatrix([self.tmpdir], top_k=3)
+        # each file's 3 nearest neighbors
+        expected = set()
+        for f in sm.files:
+            nearest = sorted(((v, k) for (k, v) in full.iteritems() if f in k),
+                             reverse=True)
+            expected.update(k for (_v, k) in nearest[:3])
+        self.assertEqual(expected, set(sm.sim))
+        for (k, v) in sm.sim.iteritems():
+            self.assertEqual(full[k], v)
+        self.assertTrue(len(sm.sim) < len(full))
 
-    def testName(self):
-        pass
+    def test_too_few_files(self):
+        self.assertRaises(SimilarityMatrixError, SimilarityMatrix,
+                          [os.path.join(self.tmpdir, 'crashers', 'EXPLOITABLE',
+                                        '0x00')])
 
 if __name__ == "__main__":
-    #import sys;sys.argv = ['', 'Test.testName']
+    # import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
@@ -4,8 +4,12 @@ Created on Apr 8, 2011
 @organization: cert.org
 '''
 import os
+import signal
+import subprocess
 import tempfile
-from certfuzz.fuzztools.subprocess_helper import run_with_timer
+from certfuzz.fuzztools.subprocess_helper import run_with_timer, descendants, \
+    kill_in_dir
+import shutil
 import unittest
 
 
@@ -47,6 +51,45 @@ class Test(unittest.TestCase):
         #TODO: how do you test this?
         pass
 
+    def test_descendants(self):
+        if not os.path.isdir('/proc'):
+            self.skipTest('no /proc to read')
+        # a shell with a child of its own
+        p = subprocess.Popen(['sh', '-c', 'sleep 60 & echo $!; wait'],
+                             stdout=subprocess.PIPE)
+        try:
+            child = int(p.stdout.readline())
+            found = descendants(p.pid)
+            self.assertTrue(child in found)
+            self.assertFalse(p.pid in found)
+            self.assertEqual([], descendants(child))
+        finally:
+            os.kill(child, signal.SIGKILL)
+            p.wait()
+
+    def test_kill_in_dir(self):
+        if not os.path.isdir('/proc'):
+            self.skipTest('no /proc to read')
+        d = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, d)
+        sub = os.path.join(d, 'sub')
+        os.mkdir(sub)
+        inside = subprocess.Popen(['sleep', '60'], cwd=sub,
+                                  preexec_fn=os.setsid)
+        # in our own process group
+        also_inside = subprocess.Popen(['sleep', '60'], cwd=d)
+        outside = subprocess.Popen(['sleep', '60'])
+        try:
+            self.assertEqual(2, kill_in_dir(d, signal.SIGKILL))
+            self.assertEqual(-signal.SIGKILL, inside.wait())
+            self.assertEqual(-signal.SIGKILL, also_inside.wait())
+            self.assertEqual(None, outside.poll())
+        finally:
+            for p in (inside, also_inside, outside):
+                if p.poll() is None:
+                    p.kill()
+                    p.wait()
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
@@ -0,0 +1,96 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import StringIO
+import hashlib
+import unittest
+import zipfile
+
+from certfuzz.fuzztools import zipcache
+
+
+def _make_zip(members):
+    inmem = StringIO.StringIO()
+    z = zipfile.ZipFile(inmem, 'w')
+    for (name, data, compress_type) in members:
+        z.writestr(name, data, compress_type=compress_type)
+    z.close()
+    return inmem.getvalue()
+
+
+def _unzip(content):
+    z = zipfile.ZipFile(StringIO.StringIO(content), 'r')
+    try:
+        return [(i.filename, z.read(i), i.compress_type) for i in z.infolist()]
+    finally:
+        z.close()
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        zipcache.clear_cache()
+        self.members = [('a.txt', 'A' * 100, zipfile.ZIP_STORED),
+                        ('b/c.txt', 'B' * 1000, zipfile.ZIP_DEFLATED),
+                        ('d.xml', '<d>' + 'x' * 500 + '</d>', zipfile.ZIP_DEFLATED),
+                        ]
+        self.zip = _make_zip(self.members)
+
+    def tearDown(self):
+        zipcache.clear_cache()
+
+    def test_read_zip(self):
+        contents = zipcache.read_zip(StringIO.StringIO(self.zip))
+        self.assertEqual(''.join(m[1] for m in self.members), contents.content)
+        self.assertEqual([('a.txt', (0, 100, 0)),
+                          ('b/c.txt', (100, 1000, 8)),
+                          ('d.xml', (1100, 507, 8))],
+                         contents.arcinfo.items())
+        self.assertRaises(zipfile.BadZipfile, zipcache.read_zip,
+                          StringIO.StringIO('PK not a zip'))
+
+    def test_rebuild_unchanged(self):
+        contents = zipcache.read_zip(StringIO.StringIO(self.zip))
+        out = StringIO.StringIO()
+        # nothing needed compressing
+        self.assertEqual(0, contents.rebuild(contents.content, out))
+        self.assertEqual(self.members, _unzip(out.getvalue()))
+
+        # the compressed streams got copied as-is
+        rebuilt = zipcache.read_zip(StringIO.StringIO(out.getvalue()))
+        self.assertEqual([m.raw for m in contents.members],
+                         [m.raw for m in rebuilt.members])
+
+    def test_rebuild_changed(self):
+        contents = zipcache.read_zip(StringIO.StringIO(self.zip))
+        fuzzed = bytearray(contents.content)
+        fuzzed[150] = 'Z'
+        fuzzed[1200] = 'Y'
+        out = contents.rebuild_str(fuzzed)
+
+        expected = [('a.txt', 'A' * 100, 0),
+                    ('b/c.txt', 'B' * 50 + 'Z' + 'B' * 949, 8),
+                    ('d.xml', '<d>' + 'x' * 97 + 'Y' + 'x' * 402 + '</d>', 8)]
+        self.assertEqual(expected, _unzip(out))
+
+        # only the changed members got compressed
+        self.assertEqual(2, contents.rebuild(fuzzed, StringIO.StringIO()))
+
+    def test_get_zip_contents(self):
+        md5 = hashlib.md5(self.zip).hexdigest()
+        contents = zipcache.get_zip_contents(md5, self.zip)
+        # cached, so the content isn't even looked at
+        self.assertTrue(contents is zipcache.get_zip_contents(md5, None))
+
+        # least recently used ones get dropped
+        for i in xrange(zipcache.CACHE_SIZE):
+            zipcache.get_zip_contents('md5_%d' % i, self.zip)
+        self.assertFalse(md5 in zipcache._cache)
+        self.assertEqual(zipcache.CACHE_SIZE, len(zipcache._cache))
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -3,18 +3,47 @@ Created on Oct 7, 2013
 
 @organization: cert.org
 '''
+import os
+import shutil
+import tempfile
 import unittest
 
+from certfuzz.iteration import iteration_base
+from certfuzz.iteration.iteration_base import get_scratch_dir, scratch_base
+
+
 class Test(unittest.TestCase):
 
     def setUp(self):
-        pass
+        self.tmpdir = tempfile.mkdtemp()
+        self._saved = dict(iteration_base._scratch_dirs)
 
     def tearDown(self):
-        pass
+        iteration_base._scratch_dirs.clear()
+        iteration_base._scratch_dirs.update(self._saved)
+        shutil.rmtree(self.tmpdir)
+
+    def test_scratch_base(self):
+        cfg = {'runoptions': {'inmemory_dir': self.tmpdir}}
+        self.assertEqual(self.tmpdir, scratch_base(cfg))
+
+        saved = iteration_base.TMPFS_DIR
+        try:
+            iteration_base.TMPFS_DIR = os.path.join(self.tmpdir, 'nope')
+            self.assertEqual('foo', scratch_base({}, 'foo'))
+            iteration_base.TMPFS_DIR = self.tmpdir
+            self.assertEqual(self.tmpdir, scratch_base({}, 'foo'))
+        finally:
+            iteration_base.TMPFS_DIR = saved
 
-    def testName(self):
-        pass
+    def test_get_scratch_dir(self):
+        cfg = {'runoptions': {'inmemory_dir': self.tmpdir}}
+        d = get_scratch_dir(cfg, 'workdirbase')
+        self.assertTrue(os.path.isdir(d))
+        self.assertEqual(self.tmpdir, os.path.dirname(d))
+        # it gets reused
+        self.assertEqual(d, get_scratch_dir(cfg, 'workdirbase'))
+        self.assertNotEqual(d, get_scratch_dir(cfg, 'otherbase'))
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
@@ -4,7 +4,11 @@ Created on Apr 8, 2011
 @organization: cert.org
 '''
 import os
+import subprocess
 import tempfile
+import threading
+import time
+import zipfile
 from certfuzz.fuzztools import hamming
 from certfuzz.minimizer.minimizer_base import Minimizer
 import shutil
@@ -75,6 +79,272 @@ class Test(unittest.TestCase):
             self.assertNotEqual(self.m.newfuzzed, fuzzed)
             self.assertNotEqual(self.m.newfuzzed, seed)
 
+    def test_swap_bytes_vectorized(self):
+        seed = "ABCDEFGHIJKLMNOPQRSTUVWXYZ" * 4
+        fuzzed = "abcdefghijklmnopqrstuvwxyz" * 4
+        self.m.seed = seed
+        self.m.fuzzed_content = fuzzed
+        self.m.swap_func = self.m.bytewise_swap_array
+
+        for dc in (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9):
+            self.m.discard_chance = dc
+            self.m.min_distance = 104
+            self.m.swap_bytes()
+            self.assertTrue(0 < self.m.newfuzzed_hd < 104)
+            self.assertEqual(self.m.newfuzzed_hd,
+                             hamming.bytewise_hd(seed, self.m.newfuzzed))
+            # every byte came from either the seed or the fuzzed content
+            for (s, f, n) in zip(seed, fuzzed, self.m.newfuzzed):
+                self.assertTrue(n in (s, f))
+
+    def test_vectorized_hit_reuses_diff_index(self):
+        seed = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        self.m.seed = seed
+        self.m.fuzzed_content = "abcdefghijklmnopqrstuvwxyz"
+        self.m.discard_chance = 0.5
+        self.m.min_distance = 26
+        self.m.swap_func = self.m.bytewise_swap_array
+        self.m.swap_bytes()
+
+        # pretend it was a hit
+        self.m.fuzzed_content = self.m.newfuzzed
+        (_a, _b, idx) = self.m._diff_state(seed, self.m.fuzzed_content)
+        self.assertEqual(hamming.bytemap(seed, self.m.newfuzzed), idx.tolist())
+
+        # and the exhaustive search can still revert bytes
+        self.m.revert_byte(idx[0])
+        self.assertEqual(seed[idx[0]], self.m.newfuzzed[idx[0]])
+
+    def test_bitwise_swap_array(self):
+        seed = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        fuzzed = "abcdefghijklmnopqrstuvwxyz"
+        start = hamming.bitwise_hd(seed, fuzzed)
+        self.m.seed = seed
+        self.m.fuzzed_content = fuzzed
+
+        for dc in (0.1, 0.5, 0.9):
+            self.m.discard_chance = dc
+            (newfuzzed, hd) = self.m.bitwise_swap_array(seed, fuzzed)
+            self.assertEqual(hd, hamming.bitwise_hd(seed, newfuzzed))
+            self.assertTrue(hd <= start)
+            # only bits that differ between seed and fuzzed can change
+            for (s, f, n) in zip(seed, fuzzed, newfuzzed):
+                self.assertEqual(0, (ord(n) ^ ord(s)) & ~(ord(s) ^ ord(f)))
+
+    def _ddmin_setup(self, needed):
+        # crash iff all the needed offsets still have their fuzzed values
+        self.m.seed = 'x' * 300
+        self.m.fuzzed_content = ''.join(chr(ord('a') + (i % 26))
+                                        for i in xrange(300))
+        self.m.min_distance = 300
+        fuzzed = self.m.fuzzed_content
+        self.oracle_calls = 0
+
+        def is_same_crash():
+            self.oracle_calls += 1
+            content = open(self.m.tempfile, 'rb').read()
+            return all(content[i] == fuzzed[i] for i in needed)
+        self.m.is_same_crash = is_same_crash
+        # normally set by __enter__
+        self.m.start_time = time.time()
+
+    def test_ddmin(self):
+        needed = [3, 50, 51, 177, 299]
+        self._ddmin_setup(needed)
+        try:
+            self.m.ddmin()
+            self.assertEqual(needed, sorted(self.m.bytemap))
+            self.assertEqual(5, self.m.min_distance)
+            self.assertTrue(self.m.min_found)
+            self.assertEqual(needed, hamming.bytemap(self.m.seed,
+                                                     self.m.fuzzed_content))
+            # nothing gets run through the debugger twice
+            self.assertEqual(len(self.m.ddmin_results), self.oracle_calls)
+            # far fewer runs than reverting the 300 bytes one at a time
+            self.assertTrue(self.oracle_calls < 300)
+        finally:
+            if os.path.exists(self.m.outputfile):
+                os.remove(self.m.outputfile)
+
+    def test_ddmin_vectorized(self):
+        needed = [0, 42, 43, 44, 128]
+        self._ddmin_setup(needed)
+        self.m.vectorized = True
+        self.m.hd_func = hamming.bytewise_hd_array
+        try:
+            self.m.ddmin()
+            self.assertEqual(needed, sorted(self.m.bytemap))
+            self.assertEqual(5, self.m.min_distance)
+        finally:
+            if os.path.exists(self.m.outputfile):
+                os.remove(self.m.outputfile)
+
+    def _parallel_setup(self, needed, trials, keep):
+        self.m.seed = 'x' * 64
+        self.m.fuzzed_content = 'y' * 64
+        self.m.start_distance = self.m.min_distance = 64
+        self.m.crash_hashes = ['crash']
+        self.m.start_time = time.time()
+        self.m.parallel_trials = trials
+        self.m.parallel_keep = keep
+        self.checked = []
+        self.workingdirs = set()
+        self.serial_hits = 0
+
+        def debug_signature(infile, workingdir=None, kill_by_name=True):
+            content = open(infile, 'rb').read()
+            hit = all(content[i] == 'y' for i in needed)
+            if workingdir is None:
+                # the exhaustive check runs one file at a time
+                self.assertTrue(kill_by_name)
+                self.serial_hits += hit
+            else:
+                # trials run side by side, so they mustn't share a working
+                # dir or kill each other's targets
+                self.assertFalse(kill_by_name)
+                self.assertEqual(os.path.dirname(infile), workingdir)
+                self.workingdirs.add(workingdir)
+            self.checked.append(content)
+            if hit:
+                return ('crash', 'SIGSEGV')
+            return (None, None)
+        self.m._debug_signature = debug_signature
+
+    def test_parallel_trials(self):
+        self._check_parallel_trials('first')
+
+    def test_parallel_trials_lowest_hd(self):
+        self._check_parallel_trials('lowest_hd')
+
+    def _check_parallel_trials(self, keep):
+        needed = [5, 17, 40]
+        self._parallel_setup(needed, 4, keep)
+        try:
+            self.m.go()
+            minimized = open(self.m.outputfile, 'rb').read()
+        finally:
+            if os.path.exists(self.m.outputfile):
+                os.remove(self.m.outputfile)
+        # we kept the bytes that matter and got rid of most of the rest
+        for i in needed:
+            self.assertEqual('y', minimized[i])
+        self.assertTrue(set(needed) <= set(self.m.bytemap))
+        self.assertTrue(self.m.min_distance < 64)
+        # the random search got us down to the exhaustive check
+        self.assertTrue(self.m.min_distance <= self.m.exhaustivesearch_threshold)
+        self.assertTrue(self.m.total_misses < self.m.total_tries)
+        self.assertTrue(1 < len(self.workingdirs) <= 4)
+        # only the candidates go() got to see were tallied up
+        self.assertEqual(self.m.crash_sigs_found.get('crash'),
+                         self.m.total_tries - self.m.total_misses +
+                         self.serial_hits)
+
+    def test_parallel_keep_lowest_hd(self):
+        self._parallel_setup([5], 8, 'lowest_hd')
+        self.m.discard_chance = 0.5
+        self.m.n_misses_allowed = 10
+        self.m._fill_batch()
+        batch = list(self.m._batch)
+        hits = [c for c in batch if self.m._is_trial_hit(c[2])]
+        # the lowest hd hit is last, after all the misses
+        self.assertEqual(hits[-1:], batch[-1:])
+        self.assertTrue(len(hits) <= 1)
+        # nothing gets tallied until it's replayed
+        self.assertEqual({}, self.m.crash_sigs_found)
+
+    def test_parallel_first_cancels(self):
+        if not os.path.isdir('/proc'):
+            self.skipTest('no /proc to read')
+        self._parallel_setup([], 4, 'first')
+        self.m.discard_chance = 0.5
+        hits = []
+        lock = threading.Lock()
+
+        def debug_signature(infile, workingdir=None, kill_by_name=True):
+            content = open(infile, 'rb').read()
+            with lock:
+                hit = not hits
+                if hit:
+                    hits.append(content)
+            if hit:
+                return ('crash', 'SIGSEGV')
+            # the rest hang until they get killed
+            subprocess.call(['sleep', '30'], cwd=workingdir)
+            return (None, None)
+        self.m._debug_signature = debug_signature
+
+        start = time.time()
+        self.m._fill_batch()
+        self.assertTrue(time.time() - start < 20)
+        # only the hit is left
+        batch = list(self.m._batch)
+        self.assertEqual(1, len(batch))
+        self.assertEqual(hits[0], ''.join(batch[0][0]))
+        self.assertEqual([batch[0][2]], self.m._batch_results.keys())
+
+    def test_parallel_writes(self):
+        self._parallel_setup([5], 4, 'first')
+        writes = []
+        self.m._write_file = lambda: writes.append(self.m.newfuzzed_md5)
+        self.m._batch_results = {'miss': (None, None),
+                                 'other': ('other', 'SIGABRT'),
+                                 'hit': ('crash', 'SIGSEGV')}
+        self.m.crash_sigs_found = {'other': 1}
+        for md5 in ('miss', 'other'):
+            self.m.newfuzzed_md5 = md5
+            self.assertFalse(self.m._check_candidate())
+        # misses and signatures we've already got don't need the file
+        self.assertEqual([], writes)
+        self.m.newfuzzed_md5 = 'hit'
+        self.assertTrue(self.m._check_candidate())
+        self.assertEqual(['hit'], writes)
+
+    def test_parallel_keep_lowest_hd_misses(self):
+        # every other byte is needed, so most candidates miss
+        self._parallel_setup(range(0, 64, 2), 8, 'lowest_hd')
+        self.m.discard_chance = 0.05
+        self.m.n_misses_allowed = 3
+        self.m.consecutive_misses = 1
+        for _ in xrange(100):
+            self.m._batch.clear()
+            self.m._fill_batch()
+            batch = list(self.m._batch)
+            if any(self.m._is_trial_hit(c[2]) for c in batch):
+                break
+        else:
+            self.fail('no hits')
+        # only as many misses as it takes to still get to the hit
+        self.assertTrue(self.m._is_trial_hit(batch[-1][2]))
+        self.assertTrue(len(batch) - 1 <= 2)
+
+    def test_newfuzzed_bytes(self):
+        content = 'abc' * 1000
+        self.m.newfuzzed = content
+        # strings from the vectorized swaps go out as is
+        self.assertTrue(self.m._newfuzzed_bytes() is content)
+        self.m.newfuzzed = list(content)
+        self.assertEqual(content, self.m._newfuzzed_bytes())
+
+    def test_readzip_writezip(self):
+        zipped = os.path.join(self.tempdir, 'seed.zip')
+        z = zipfile.ZipFile(zipped, 'w')
+        z.writestr('a.txt', 'A' * 100, compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr('b.txt', 'B' * 100)
+        z.close()
+
+        content = self.m._readzip(zipped)
+        self.assertEqual('A' * 100 + 'B' * 100, content)
+        self.assertEqual([('a.txt', (0, 100, 8)), ('b.txt', (100, 100, 0))],
+                         self.m.saved_arcinfo.items())
+
+        self.m.newfuzzed = list(content)
+        self.m.newfuzzed[150] = 'x'
+        self.m._writezip()
+        z = zipfile.ZipFile(self.m.tempfile, 'r')
+        self.assertEqual('A' * 100, z.read('a.txt'))
+        self.assertEqual('B' * 50 + 'x' + 'B' * 49, z.read('b.txt'))
+        z.close()
+
     def test_update_probabilities(self):
         pass
 
@@ -10,6 +10,7 @@ import tempfile
 import os
 from certfuzz.file_handlers.basicfile import BasicFile
 from certfuzz.config.simple_loader import fixup_config
+from certfuzz.fuzztools.offset_index import OffsetIndex
 
 
 class Mock(object):
@@ -77,6 +78,7 @@ class MockSeedfile(Mock):
         self.value = 'A' * sz
         self.md5 = hashlib.md5(self.value).hexdigest()
         self.len = len(self.value)
+        self.offsets = OffsetIndex()
 
     def read(self):
         return self.value
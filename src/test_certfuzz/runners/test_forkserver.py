@@ -0,0 +1,137 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import os
+import resource
+import shutil
+import signal
+import string
+import subprocess
+import tempfile
+import time
+import unittest
+from distutils.spawn import find_executable
+
+from certfuzz.runners import forkserver
+from certfuzz.runners.errors import RunnerNotFoundError
+from certfuzz.runners.forkserver import ForkServerRunner, is_crash
+
+_stub_src = os.path.join(os.path.dirname(__file__), '..', '..', 'linux',
+                         'forkserver', 'forkserver.c')
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.stub = os.path.join(self.tmpdir, 'bff_forkserver.so')
+
+    def tearDown(self):
+        forkserver._stop_servers()
+        shutil.rmtree(self.tmpdir)
+
+    def _build_stub(self):
+        cc = find_executable('cc')
+        if cc is None or not os.path.exists(_stub_src):
+            return False
+        rc = subprocess.call([cc, '-shared', '-fPIC', '-o', self.stub,
+                              _stub_src])
+        return rc == 0
+
+    def _require_stub(self, sh):
+        if not os.path.exists(sh):
+            self.skipTest('%s not found' % sh)
+        if not self._build_stub():
+            self.skipTest('unable to build the fork server stub')
+
+    def _fuzzed(self, content):
+        (fd, f) = tempfile.mkstemp(suffix='.sh', dir=self.tmpdir)
+        os.write(fd, content)
+        os.close(fd)
+        return f
+
+    def test_is_crash(self):
+        self.assertTrue(is_crash(signal.SIGSEGV))
+        self.assertTrue(is_crash(signal.SIGABRT))
+        # killed on timeout
+        self.assertFalse(is_crash(signal.SIGKILL))
+        # exited normally
+        self.assertFalse(is_crash(0))
+        self.assertFalse(is_crash(1 << 8))
+
+    def test_find_stub(self):
+        options = {'forkserver_lib': os.path.join(self.tmpdir, 'nope.so')}
+        self.assertRaises(RunnerNotFoundError, forkserver._find_stub, options)
+
+        open(self.stub, 'w').close()
+        options = {'forkserver_lib': self.stub}
+        self.assertEqual(self.stub, forkserver._find_stub(options))
+
+    def test_run(self):
+        sh = '/bin/sh'
+        self._require_stub(sh)
+
+        options = {'forkserver_lib': self.stub, 'runtimeout': 1}
+        # the target runs the fuzzed file as a shell script
+        cmd_template = string.Template('%s $SEEDFILE' % sh)
+
+        for (content, crash) in [('exit 0', False),
+                                 ('kill -SEGV $$', True),
+                                 ('exit 1', False),
+                                 ('kill -ABRT $$', True),
+                                 ]:
+            ff = self._fuzzed(content)
+            with ForkServerRunner(options, cmd_template, ff, self.tmpdir) as r:
+                r.run()
+                self.assertEqual(crash, r.saw_crash, content)
+
+        # all of that went through a single server
+        self.assertEqual(1, len(forkserver._servers))
+
+    def test_run_fingerprint(self):
+        sh = '/bin/sh'
+        self._require_stub(sh)
+
+        # the server (and so its children) inherits our core limit
+        limits = resource.getrlimit(resource.RLIMIT_CORE)
+        try:
+            resource.setrlimit(resource.RLIMIT_CORE, (limits[1], limits[1]))
+        except ValueError:
+            self.skipTest('unable to raise the core file size limit')
+        try:
+            options = {'forkserver_lib': self.stub, 'runtimeout': 1}
+            cmd_template = string.Template('%s $SEEDFILE' % sh)
+            ff = self._fuzzed('kill -SEGV $$')
+            with ForkServerRunner(options, cmd_template, ff, self.tmpdir) as r:
+                r.run()
+                self.assertTrue(r.saw_crash)
+                if not os.WCOREDUMP(r.status):
+                    self.skipTest('cores go somewhere else on this box')
+                if r.fingerprint is not None:
+                    self.assertEqual(signal.SIGSEGV, r.fingerprint.signal)
+                # the core got cleaned up either way
+                self.assertFalse([f for f in os.listdir(r.server.cwd)
+                                  if f.startswith('core')])
+        finally:
+            resource.setrlimit(resource.RLIMIT_CORE, limits)
+
+    def test_run_timeout(self):
+        sh = '/bin/sh'
+        self._require_stub(sh)
+
+        options = {'forkserver_lib': self.stub, 'runtimeout': 0.5}
+        cmd_template = string.Template('%s $SEEDFILE' % sh)
+        ff = self._fuzzed('sleep 30')
+        start = time.time()
+        with ForkServerRunner(options, cmd_template, ff, self.tmpdir) as r:
+            r.run()
+            self.assertFalse(r.saw_crash)
+            self.assertEqual(signal.SIGKILL, os.WTERMSIG(r.status))
+        self.assertTrue(time.time() - start < 10)
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -3,8 +3,18 @@ Created on Apr 10, 2012
 
 @organization: cert.org
 '''
+import time
 import unittest
 
+from certfuzz.runners.runner_base import Runner
+
+
+class SleepyRunner(Runner):
+
+    def _run(self):
+        time.sleep(0.05)
+
+
 class Test(unittest.TestCase):
 
     def setUp(self):
@@ -16,6 +26,12 @@ class Test(unittest.TestCase):
     def testName(self):
         pass
 
+    def test_elapsed(self):
+        r = SleepyRunner(None, None, 'fuzzed', '.')
+        self.assertEqual(0.0, r.elapsed)
+        r.run()
+        self.assertTrue(0.05 <= r.elapsed < 5.0)
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
@@ -58,6 +58,21 @@ class Test(unittest.TestCase):
         self.assertEqual(85, self.arm.successes)
         self.assertEqual(810, self.arm.trials)
 
+    def test_seconds(self):
+        self.assertEqual(None, self.arm.seconds_per_trial)
+        self.arm.update(successes=2, trials=10, seconds=5.0)
+        self.assertEqual(5.0, self.arm.seconds)
+        self.assertEqual(0.5, self.arm.seconds_per_trial)
+        self.assertEqual(5.0, self.arm.as_dict()['seconds'])
+
+        # doubt keeps the cost per trial
+        self.arm.doubt()
+        self.assertEqual(5, self.arm.trials)
+        self.assertEqual(0.5, self.arm.seconds_per_trial)
+
+        self.arm.forget()
+        self.assertEqual(0.0, self.arm.seconds)
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
@@ -3,8 +3,10 @@ Created on Feb 22, 2013
 
 @organization: cert.org
 '''
+import pickle
 import unittest
 from certfuzz.scoring.multiarmed_bandit.bayesian_bandit import BayesianMultiArmedBandit
+from certfuzz.scoring.multiarmed_bandit.errors import MultiArmedBanditError
 
 
 class Test(unittest.TestCase):
@@ -76,6 +78,25 @@ class Test(unittest.TestCase):
         # probability is always = 1 in default mabbase
         self.assertAlmostEqual(2.0 / 7.0, newarm.probability)
 
+    def test_strategy(self):
+        self.assertEqual('proportional', self.mab.strategy)
+        self.assertRaises(MultiArmedBanditError, BayesianMultiArmedBandit, 'nope')
+
+        mab = BayesianMultiArmedBandit('kl_ucb')
+        for arm in self.arms:
+            mab.add_item(arm, arm)
+        self.assertTrue(mab.next() in self.arms)
+
+    def test_pickle(self):
+        self.mab.record_result('a', 1, 2)
+        mab = pickle.loads(pickle.dumps(self.mab))
+        self.assertEqual(self.mab.arms_as_dict(), mab.arms_as_dict())
+        self.assertEqual(self.mab._total_p, mab._total_p)
+        self.assertTrue(mab.next() in self.arms)
+        # arms still keep the totals up to date
+        mab.arms['b'].update(successes=1, trials=1)
+        self.assertEqual(2, mab.successes)
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
@@ -90,6 +90,33 @@ class Test(unittest.TestCase):
             a.probability = a.probability * 0.5
         self.assertEqual(total * 0.5, self.mab._total_p)
 
+    def test_cached_totals(self):
+        self.mab.record_result('a', 1, 10)
+        self.mab.record_result('b', 2, 20)
+        self.mab.arms['c'].update(successes=3, trials=30)
+        self.assertEqual(6, self.mab.successes)
+        self.assertEqual(60, self.mab.trials)
+
+        self.mab.del_item('b')
+        self.assertEqual(4, self.mab.successes)
+        self.assertEqual(40, self.mab.trials)
+        self.assertEqual(len(self.keys) - 1, self.mab._total_p)
+
+        # a deleted arm doesn't count anymore even if it gets updated
+        arm = self.mab.arms['a']
+        self.mab.del_item('a')
+        arm.update(successes=100, trials=100)
+        self.assertEqual(3, self.mab.successes)
+        self.assertEqual(30, self.mab.trials)
+
+        # replacing an arm replaces its counts too
+        self.mab.add_item('c', 'c')
+        self.assertEqual(1, self.mab.successes)
+        self.assertEqual(10, self.mab.trials)
+
+        self.mab.arms['d'].forget()
+        self.assertEqual(1, self.mab.successes)
+
     def test_next(self):
         # empty set raises StopIteration
         self.assertRaises(StopIteration, self.mab.next)
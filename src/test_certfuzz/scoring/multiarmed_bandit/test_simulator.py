@@ -0,0 +1,79 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from certfuzz.scoring.multiarmed_bandit import simulator
+from certfuzz.scoring.multiarmed_bandit.errors import MultiArmedBanditError
+from certfuzz.scoring.multiarmed_bandit.simulator import ArmRecord, SimResult
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.state = {'current_seed': 10,
+                      'config_timestamp': 0,
+                      'seedfile_scores': {'a': {'successes': 1, 'trials': 100, 'probability': 0.02, 'seconds': 50.0},
+                                          'b': {'successes': 20, 'trials': 100, 'probability': 0.2},
+                                          },
+                      'rangefinder_scores': {},
+                      }
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_read_records(self):
+        path = os.path.join(self.tmpdir, 'campaign.json')
+        with open(path, 'wb') as fp:
+            json.dump(self.state, fp)
+        records = simulator.read_records(path, 2.0)
+        # a has recorded times, b doesn't
+        self.assertEqual([ArmRecord('a', 1, 100, 0.5),
+                          ArmRecord('b', 20, 100, 2.0)], records)
+
+    def test_simulate(self):
+        records = simulator.records_from_state(self.state, 2.0)
+        records = [r._replace(seconds=2.0) for r in records]
+        result = simulator.simulate(records, 'thompson', 1000, seed=1)
+        self.assertEqual('thompson', result.strategy)
+        self.assertEqual(1000, result.trials)
+        self.assertEqual(2000.0, result.seconds)
+        # mostly picks b, which pays off 20% of the time
+        self.assertTrue(100 < result.successes < 250)
+        # same seed, same result
+        self.assertEqual(result, simulator.simulate(records, 'thompson', 1000, seed=1))
+
+        self.assertRaises(MultiArmedBanditError, simulator.simulate, [], 'ucb1', 10)
+
+    def test_compare(self):
+        records = simulator.records_from_state(self.state)
+        results = simulator.compare(records, ['proportional', 'kl_ucb'], 500, runs=2)
+        self.assertEqual(['proportional', 'kl_ucb'], [r.strategy for r in results])
+        for r in results:
+            self.assertEqual(1000, r.trials)
+
+    def test_simulate_cost_aware(self):
+        # b crashes 4x as often but takes 10x as long
+        records = [ArmRecord('a', 5, 100, 0.1), ArmRecord('b', 20, 100, 1.0)]
+        plain = simulator.simulate(records, 'thompson', 2000, seed=1)
+        costly = simulator.simulate(records, 'thompson', 2000, seed=1,
+                                    cost_aware=True)
+        self.assertTrue(costly.successes_per_cpu_hour > plain.successes_per_cpu_hour)
+
+    def test_sim_result(self):
+        r = SimResult('x', 7200, 10, 7200.0)
+        self.assertEqual(2.0, r.cpu_hours)
+        self.assertEqual(5.0, r.successes_per_cpu_hour)
+        self.assertEqual(0.0, SimResult('x', 0, 0, 0.0).successes_per_cpu_hour)
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
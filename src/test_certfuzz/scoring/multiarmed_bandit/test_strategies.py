@@ -0,0 +1,164 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import math
+import pickle
+import random
+import unittest
+from collections import defaultdict
+
+from certfuzz.scoring.multiarmed_bandit import strategies
+from certfuzz.scoring.multiarmed_bandit.bayesian_bandit import BayesianMultiArmedBandit
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def tearDown(self):
+        pass
+
+    def _bandit(self, strategy, scores, cost_aware=False):
+        mab = BayesianMultiArmedBandit(strategy, cost_aware)
+        mab.rng = self.rng
+        for (key, (successes, trials)) in sorted(scores.iteritems()):
+            mab.add_item(key, key)
+            mab.arms[key].forget()
+            mab.record_result(key, successes, trials)
+        return mab
+
+    def _pick_counts(self, mab, n=2000):
+        seen = defaultdict(int)
+        for _ in xrange(n):
+            seen[mab.next()] += 1
+        return seen
+
+    def test_bernoulli_kl(self):
+        self.assertAlmostEqual(0.0, strategies.bernoulli_kl(0.3, 0.3))
+        self.assertTrue(strategies.bernoulli_kl(0.1, 0.5) > 0.0)
+        # finite even at the edges
+        self.assertTrue(strategies.bernoulli_kl(0.0, 1.0) < float('inf'))
+
+    def test_kl_upper_bound(self):
+        ub = strategies.kl_upper_bound(0.1, 100, 5.0)
+        self.assertTrue(0.1 < ub < 1.0)
+        self.assertAlmostEqual(5.0 / 100, strategies.bernoulli_kl(0.1, ub), 4)
+        # more trials, tighter bound
+        self.assertTrue(strategies.kl_upper_bound(0.1, 1000, 5.0) < ub)
+
+    def test_untried_arms_first(self):
+        for strategy in ('ucb1', 'kl_ucb'):
+            mab = self._bandit(strategy, {'a': (1, 10), 'b': (0, 0)})
+            self.assertEqual('b', mab.next())
+
+    def test_prefers_better_arm(self):
+        scores = {'good': (50, 500), 'bad': (1, 500), 'worse': (0, 500)}
+        for strategy in strategies.STRATEGIES:
+            mab = self._bandit(strategy, scores)
+            seen = self._pick_counts(mab)
+            self.assertTrue(seen['good'] > seen['bad'], strategy)
+            self.assertTrue(seen['good'] > seen['worse'], strategy)
+
+    def test_cost(self):
+        mab = self._bandit('ucb1', {'a': (1, 10), 'b': (1, 10)})
+        arm = mab.arms['a']
+        # not cost aware
+        self.assertEqual(1.0, strategies.cost(mab, arm))
+
+        mab.cost_aware = True
+        # nobody has any times yet
+        self.assertEqual(1.0, strategies.cost(mab, arm))
+        mab.record_result('b', seconds=4.0)
+        # falls back to the bandit's average
+        self.assertEqual(0.2, strategies.cost(mab, arm))
+        mab.record_result('a', seconds=1.0)
+        self.assertEqual(0.1, strategies.cost(mab, arm))
+        mab.record_result('a', seconds=-1.0)
+        mab.record_result('a', seconds=0.00001)
+        self.assertEqual(strategies.MIN_SECONDS_PER_TRIAL,
+                         strategies.cost(mab, arm))
+
+    def test_cost_aware_shared(self):
+        mab = self._bandit('proportional', {'a': (1, 10), 'b': (1, 10),
+                                            'c': (2, 10)}, cost_aware=True)
+
+        def total():
+            return sum(arm.probability / strategies.cost(mab, arm)
+                       for arm in mab.arms.itervalues())
+
+        mab.record_result('a', seconds=1.0)
+        self.assertAlmostEqual(total(), mab._total_rate)
+        # b and c go by the average, which just changed
+        mab.record_result('a', seconds=9.0)
+        self.assertAlmostEqual(total(), mab._total_rate)
+        mab.record_result('c', seconds=1.0)
+        self.assertAlmostEqual(total(), mab._total_rate)
+        mab.record_result('b', 0, 20)
+        self.assertAlmostEqual(total(), mab._total_rate)
+
+    def test_cost_aware(self):
+        # same crash rate, but slow takes 10x as long
+        scores = {'fast': (10, 100), 'slow': (10, 100)}
+        for strategy in strategies.STRATEGIES:
+            mab = self._bandit(strategy, scores, cost_aware=True)
+            mab.record_result('fast', seconds=10.0)
+            mab.record_result('slow', seconds=100.0)
+            seen = self._pick_counts(mab)
+            self.assertTrue(seen['fast'] > seen['slow'], strategy)
+
+    def _best_indices(self, mab, bound):
+        log_total = math.log(max(mab.trials, 1))
+        scores = {}
+        for (key, arm) in mab.arms.iteritems():
+            trials = max(arm.trials, arm.successes)
+            index = bound(float(arm.successes) / trials, trials, log_total)
+            scores[key] = index / strategies.cost(mab, arm)
+        best = max(scores.values())
+        return [k for (k, v) in scores.iteritems() if v == best]
+
+    def test_ucb_index(self):
+        # the heaps pick the same arms as recomputing every index would
+        for (strategy, bound) in (('ucb1', strategies.ucb1_bound),
+                                  ('kl_ucb', strategies.kl_upper_bound)):
+            for cost_aware in (False, True):
+                scores = dict(('arm%d' % i, (self.rng.randint(0, 5),
+                                             self.rng.randint(5, 50)))
+                              for i in xrange(30))
+                mab = self._bandit(strategy, scores, cost_aware)
+                for key in ('arm1', 'arm2', 'arm3'):
+                    # the rest cost whatever the average is
+                    mab.record_result(key, seconds=self.rng.random() * 10)
+                for _ in xrange(300):
+                    key = mab.next()
+                    self.assertTrue(key in self._best_indices(mab, bound),
+                                    (strategy, cost_aware))
+                    crashed = int(self.rng.random() < 0.1)
+                    mab.record_result(key, crashed, 1,
+                                      seconds=self.rng.random())
+                    if self.rng.random() < 0.05:
+                        # arms come and go
+                        mab.del_item(key)
+                        mab.add_item(key + 'x', key + 'x')
+
+    def test_ucb_index_pickle(self):
+        mab = self._bandit('ucb1', {'a': (1, 10), 'b': (2, 10)})
+        mab.next()
+        self.assertNotEqual(None, mab._ucb_index)
+        mab = pickle.loads(pickle.dumps(mab))
+        self.assertEqual(None, mab._ucb_index)
+        mab.rng = self.rng
+        self.assertEqual('b', mab.next())
+
+    def test_thompson_explores(self):
+        mab = self._bandit('thompson', {'a': (1, 3), 'b': (1, 4)})
+        seen = self._pick_counts(mab, 500)
+        self.assertTrue(seen['a'] > 0)
+        self.assertTrue(seen['b'] > 0)
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,97 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import random
+import unittest
+from collections import defaultdict
+
+from certfuzz.scoring.multiarmed_bandit.sum_tree import SumTree
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = SumTree()
+
+    def tearDown(self):
+        pass
+
+    def test_set_get_remove(self):
+        self.assertEqual(0, len(self.tree))
+        self.assertEqual(0.0, self.tree.total)
+
+        for i, k in enumerate('abcdefghij'):
+            self.tree.set(k, i)
+        self.assertEqual(10, len(self.tree))
+        self.assertEqual(45.0, self.tree.total)
+        self.assertEqual(3.0, self.tree.get('d'))
+
+        self.tree.set('d', 10)
+        self.assertEqual(52.0, self.tree.total)
+
+        self.tree.remove('d')
+        self.assertFalse('d' in self.tree)
+        self.assertEqual(42.0, self.tree.total)
+        # removing it again is harmless
+        self.tree.remove('d')
+        self.assertEqual(9, len(self.tree))
+
+        # slots get reused
+        capacity = self.tree._capacity
+        self.tree.set('z', 1)
+        self.assertEqual(capacity, self.tree._capacity)
+        self.assertEqual(43.0, self.tree.total)
+
+        self.assertRaises(ValueError, self.tree.set, 'y', -1)
+
+    def test_find(self):
+        self.assertEqual(None, self.tree.find(0.0))
+
+        for k, w in zip('abcd', [1, 0, 2, 3]):
+            self.tree.set(k, w)
+        self.assertEqual('a', self.tree.find(0.0))
+        self.assertEqual('a', self.tree.find(0.99))
+        # zero weights never get picked
+        self.assertEqual('c', self.tree.find(1.0))
+        self.assertEqual('c', self.tree.find(2.99))
+        self.assertEqual('d', self.tree.find(3.0))
+        self.assertEqual('d', self.tree.find(5.99))
+        # past the end (e.g., from rounding) still lands on a real key
+        self.assertEqual('d', self.tree.find(6.0))
+
+    def test_no_drift(self):
+        for k in xrange(100):
+            self.tree.set(k, 0.1)
+        for _ in xrange(10000):
+            self.tree.set(random.randrange(100), random.random())
+        for k in xrange(100):
+            self.tree.set(k, 0.1)
+        self.assertEqual(self.tree.total, _fresh_total(100, 0.1))
+
+    def test_sample(self):
+        weights = {'a': 1.0, 'b': 2.0, 'c': 7.0}
+        for k, w in weights.iteritems():
+            self.tree.set(k, w)
+
+        n = 20000
+        seen = defaultdict(int)
+        rng = random.Random(0)
+        for _ in xrange(n):
+            seen[self.tree.sample(rng)] += 1
+
+        for k, w in weights.iteritems():
+            self.assertAlmostEqual(w / 10.0, seen[k] / float(n), 1)
+
+
+def _fresh_total(n, w):
+    tree = SumTree()
+    for k in xrange(n):
+        tree.set(k, w)
+    return tree.total
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -6,7 +6,11 @@ Created on Oct 29, 2014
 import unittest
 import tempfile
 import shutil
+import threading
+import time
 import certfuzz.tc_pipeline.tc_pipeline_base
+from certfuzz.campaign.signature_index import SignatureIndex
+from certfuzz.fuzztools.crash_fingerprint import CrashFingerprint
 from test_certfuzz.mocks import MockMinimizer
 
 
@@ -117,6 +121,133 @@ class Test(unittest.TestCase):
         self.assertEqual(5, sum(analyzer_count))
         self.assertEqual(5, sum(touch_watchdog_call_count))
 
+    def test_analyze_concurrently(self):
+        cfg = {'runoptions': {'analyzer_concurrency': 3}}
+        tcpl = TCPL_Impl(outdir=self.tmpdir, cfg=cfg)
+        certfuzz.tc_pipeline.tc_pipeline_base.touch_watchdog_file = lambda: None
+
+        lock = threading.Lock()
+        running = []
+        most_running = []
+        ran = []
+        isolated = []
+        cleaned = []
+
+        class MockAnalyzer(object):
+            fail = False
+
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def isolate(self):
+                isolated.append(self)
+
+            def clean_workdir(self):
+                cleaned.append(self)
+
+            def go(self):
+                with lock:
+                    running.append(self)
+                    most_running.append(len(running))
+                time.sleep(0.05)
+                with lock:
+                    running.remove(self)
+                    ran.append(self)
+                if self.fail:
+                    raise ValueError('boom')
+
+        class FailingAnalyzer(MockAnalyzer):
+            fail = True
+
+        tcpl.analyzer_classes = [MockAnalyzer for _ in xrange(7)]
+        tcpl._analyze(object())
+        self.assertEqual(7, len(ran))
+        self.assertEqual(3, max(most_running))
+        self.assertEqual(ran, cleaned)
+        self.assertEqual(sorted(map(id, ran)), sorted(map(id, isolated)))
+
+        # the others still get to run
+        del ran[:]
+        tcpl.analyzer_classes = [FailingAnalyzer] + [MockAnalyzer] * 3
+        self.assertRaises(ValueError, tcpl._analyze, object())
+        self.assertEqual(4, len(ran))
+
+        # one at a time, the way it's always been
+        del isolated[:]
+        cfg['runoptions']['analyzer_concurrency'] = 1
+        tcpl.analyzer_classes = [MockAnalyzer] * 3
+        tcpl._analyze(object())
+        self.assertEqual([], isolated)
+
+    def test_pre_dedup(self):
+        index = SignatureIndex()
+        seen = []
+
+        def uniq_func(signature, seednum=None):
+            seen.append((signature, seednum))
+            return index.record(signature, seednum=seednum)
+
+        cfg = {'runoptions': {'pre_dedup': True,
+                              'pre_dedup_recheck_rate': 0.0}}
+        tcpl = TCPL_Impl(outdir=self.tmpdir, uniq_func=uniq_func, cfg=cfg,
+                         sig_index=index, seednum=7)
+        verified = []
+
+        def _verify(tc):
+            verified.append(tc)
+            tc.is_crash = True
+            tc.signature = 'abc'
+            tc.should_proceed_with_analysis = uniq_func(tc.signature,
+                                                        seednum=tcpl.seednum)
+        tcpl._verify = _verify
+
+        class MockTestCase(object):
+            fingerprint = CrashFingerprint(11, 'libfoo.so', 0x1234)
+            is_crash = False
+            signature = None
+            should_proceed_with_analysis = False
+
+        verify = tcpl.verify()
+
+        # the first one has to go through the debugger
+        tc = MockTestCase()
+        verify.send(tc)
+        self.assertEqual([tc], verified)
+        self.assertEqual('abc', index.signature_for(tc.fingerprint))
+
+        # after that we know what it is
+        tc = MockTestCase()
+        verify.send(tc)
+        self.assertEqual(1, len(verified))
+        self.assertEqual('abc', tc.signature)
+        self.assertFalse(tc.should_proceed_with_analysis)
+        self.assertEqual(2, index.get('abc').hits)
+        self.assertEqual(('abc', 7), seen[-1])
+
+        # every time, if we're told to recheck them all
+        cfg['runoptions']['pre_dedup_recheck_rate'] = 1.0
+        verify.send(MockTestCase())
+        self.assertEqual(2, len(verified))
+
+        # or if it's turned off
+        cfg['runoptions']['pre_dedup_recheck_rate'] = 0.0
+        cfg['runoptions']['pre_dedup'] = False
+        verify.send(MockTestCase())
+        self.assertEqual(3, len(verified))
+
+        # or if the fingerprint turns out to be ambiguous
+        cfg['runoptions']['pre_dedup'] = True
+        self.assertFalse(index.learn_fingerprint(MockTestCase.fingerprint,
+                                                 'def'))
+        verify.send(MockTestCase())
+        self.assertEqual(4, len(verified))
+
+        # a testcase without a fingerprint gets the usual treatment
+        tc = MockTestCase()
+        tc.fingerprint = None
+        verify.send(tc)
+        self.assertEqual(5, len(verified))
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
@@ -0,0 +1,31 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import unittest
+
+from certfuzz.scoring.multiarmed_bandit.simulator import SimResult
+from certfuzz.tools.common.banditsim import format_results
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_format_results(self):
+        results = [SimResult('ucb1', 3600, 1, 3600.0),
+                   SimResult('thompson', 3600, 4, 3600.0)]
+        lines = format_results(results).splitlines()
+        self.assertEqual(3, len(lines))
+        # best first
+        self.assertTrue(lines[1].startswith('thompson'))
+        self.assertTrue(lines[2].startswith('ucb1'))
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
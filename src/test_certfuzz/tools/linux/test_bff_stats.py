@@ -4,22 +4,56 @@ Created on Apr 10, 2012
 @organization: cert.org
 '''
 
+import os
+import shutil
+import tempfile
 import unittest
 
+from certfuzz.campaign.signature_index import SignatureIndex
+from certfuzz.tools.linux import bff_stats
+
 
 class Test(unittest.TestCase):
 
 
     def setUp(self):
-        pass
+        self.tmpdir = tempfile.mkdtemp()
 
 
     def tearDown(self):
-        pass
-
-
-    def testName(self):
-        pass
+        shutil.rmtree(self.tmpdir)
+
+
+    def test_read_signature_index(self):
+        dbfile = os.path.join(self.tmpdir, 'crash_signatures.sqlite')
+        index = SignatureIndex(dbfile)
+        for seednum in (4, 2, 8):
+            index.record('abc', seednum=seednum)
+        index.record('def')
+        index.close()
+
+        counters = {}
+        first_seeds = {}
+        last_seeds = {}
+        n = bff_stats.read_signature_index(dbfile, counters, first_seeds, last_seeds)
+        self.assertEqual(2, n)
+        self.assertEqual({'abc': 3, 'def': 1}, counters)
+        self.assertEqual({'abc': 2, 'def': 0}, first_seeds)
+        self.assertEqual({'abc': 8, 'def': 0}, last_seeds)
+
+        # no hamming distances in the index
+        options = FakeOptions()
+        lines = bff_stats.prepare_output(options, counters, {}, {}, first_seeds, last_seeds)
+        self.assertEqual(3, len(lines))
+        self.assertTrue(lines[1].split()[0] == 'abc')
+        self.assertEqual(['3', '2', '8', '-1', '-1'], lines[1].split()[1:])
+
+
+class FakeOptions(object):
+    sort_by_first = False
+    sort_by_last = False
+    sort_by_bits = False
+    sort_by_bytes = False
 
 
 if __name__ == "__main__":
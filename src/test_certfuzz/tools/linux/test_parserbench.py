@@ -0,0 +1,50 @@
+'''
+Created on Oct 18, 2026
+
+@organization: cert.org
+'''
+import os
+import unittest
+
+from certfuzz.tools.linux import parserbench
+
+btdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                     'debuggers', 'output_parsers', 'backtraces')
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_file_format(self):
+        self.assertEqual('gdb', parserbench.file_format(
+            os.path.join(btdir, 'bff-xpdf.gdb')))
+        self.assertEqual('konqi', parserbench.file_format(
+            os.path.join(btdir, 'konqi-reconq.txt')))
+        self.assertEqual(None, parserbench.file_format(
+            os.path.join(btdir, 'nope.gdb')))
+
+    def test_benchmark(self):
+        results = parserbench.benchmark([btdir], repeat=2)
+        by_name = dict((os.path.basename(r.path), r) for r in results)
+        self.assertEqual('abrt', by_name['abrt-1.txt'].fmt)
+        self.assertEqual('6e154608f9aaafa9ebe6cc2350f0ac2a',
+                         by_name['abrt-1.txt'].signature)
+        self.assertTrue(by_name['abrt-1.txt'].lines > 1000)
+        # unrecognized files get skipped
+        self.assertFalse(
+            'bff-ffmpeg_total_stack_corruption_failed_disass._gdb' in by_name)
+
+        report = parserbench.format_results(results, signatures=True)
+        self.assertTrue('6e154608f9aaafa9ebe6cc2350f0ac2a' in report)
+        for fmt in ('abrt', 'gdb', 'konqi'):
+            self.assertTrue([l for l in report.splitlines()
+                             if l.startswith(fmt + ' ')])
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()